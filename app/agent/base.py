@@ -1,13 +1,24 @@
+import asyncio
+import inspect
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
-from typing import List, Optional
+from typing import Any, AsyncIterator, Callable, List, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
+from app.checkpoint import CheckpointStore, restore_agent, snapshot_agent
 from app.llm import LLM
 from app.logger import logger
-from app.sandbox.client import SANDBOX_CLIENT
-from app.schema import ROLE_TYPE, AgentState, Memory, Message
+from app.sandbox.client import SANDBOX_CLIENT, SANDBOX_HELD
+from app.schema import (
+    ROLE_TYPE,
+    AgentEvent,
+    AgentEventType,
+    AgentState,
+    Memory,
+    Message,
+)
+from app.tenancy import CURRENT_TENANT
 
 
 class BaseAgent(BaseModel, ABC):
@@ -40,6 +51,21 @@ class BaseAgent(BaseModel, ABC):
     max_steps: int = Field(default=10, description="Maximum steps before termination")
     current_step: int = Field(default=0, description="Current step in execution")
 
+    # Checkpointing
+    checkpoint_store: Optional[CheckpointStore] = Field(
+        None, description="Store for a checkpoint saved after each step"
+    )
+    checkpoint_id: Optional[str] = Field(
+        None, description="Run id under which checkpoints are saved"
+    )
+
+    # Events
+    event_hook: Optional[Callable[[AgentEvent], Any]] = Field(
+        None,
+        description="Called with each event of a run, may be a coroutine function",
+        exclude=True,
+    )
+
     duplicate_threshold: int = 2
 
     class Config:
@@ -145,13 +171,103 @@ class BaseAgent(BaseModel, ABC):
                     self.handle_stuck_state()
 
                 results.append(f"Step {self.current_step}: {step_result}")
+                self.save_checkpoint()
+                await self.emit_event(AgentEventType.STEP, step_result)
 
             if self.current_step >= self.max_steps:
                 self.current_step = 0
                 self.state = AgentState.IDLE
                 results.append(f"Terminated: Reached max steps ({self.max_steps})")
-        await SANDBOX_CLIENT.cleanup()
-        return "\n".join(results) if results else "No steps executed"
+        if self.checkpoint_store and self.checkpoint_id:
+            self.checkpoint_store.delete(self.checkpoint_id)
+        # Sessions of an agent server and steps of a flow share the sandbox,
+        # the server or flow cleans it up
+        if CURRENT_TENANT.get() is None and not SANDBOX_HELD.get():
+            await SANDBOX_CLIENT.cleanup()
+        result = "\n".join(results) if results else "No steps executed"
+        await self.emit_event(AgentEventType.FINAL, result)
+        return result
+
+    async def run_stream(
+        self, request: Optional[str] = None
+    ) -> AsyncIterator[AgentEvent]:
+        """Run the agent, yielding its events as they happen.
+
+        The last event is FINAL with the result of the run. If the run fails,
+        its error is raised after the events reported before it.
+
+        Args:
+            request: Optional initial user request to process.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        previous_hook = self.event_hook
+        self.event_hook = events.put_nowait
+
+        async def run() -> None:
+            try:
+                await self.run(request)
+            finally:
+                events.put_nowait(None)
+
+        task = asyncio.create_task(run())
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            await task
+        finally:
+            task.cancel()
+            self.event_hook = previous_hook
+
+    async def emit_event(
+        self, event_type: AgentEventType, content: str = "", **kwargs
+    ) -> None:
+        """Report an event of the current step to the event hook, if any.
+
+        Args:
+            event_type: Type of the event.
+            content: Text of the event.
+            **kwargs: Other AgentEvent fields, such as tool_name.
+        """
+        if self.event_hook is None:
+            return
+        event = AgentEvent(
+            type=event_type, step=self.current_step, content=str(content), **kwargs
+        )
+        try:
+            result = self.event_hook(event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            # A failing listener must not stop the run
+            logger.warning(f"Event hook of {self.name} failed: {e}")
+
+    def save_checkpoint(self) -> None:
+        """Save the memory and step count of the agent to its checkpoint store."""
+        if self.checkpoint_store and self.checkpoint_id:
+            self.checkpoint_store.save(
+                self.checkpoint_id, {"kind": "agent", "agent": snapshot_agent(self)}
+            )
+
+    def restore_checkpoint(self, store: CheckpointStore, run_id: str) -> bool:
+        """Restore the agent from the last checkpoint of an interrupted run.
+
+        The agent keeps saving to the same checkpoint, and calling run without
+        a request continues from the last completed step.
+
+        Args:
+            store: Store holding the checkpoint.
+            run_id: Run id the checkpoint was saved under.
+
+        Returns:
+            False if the run has no agent checkpoint.
+        """
+        state = store.load(run_id)
+        if not state or state.get("kind") != "agent":
+            return False
+        restore_agent(self, state["agent"])
+        self.checkpoint_store = store
+        self.checkpoint_id = run_id
+        return True
 
     @abstractmethod
     async def step(self) -> str:
@@ -3,12 +3,14 @@ from typing import TYPE_CHECKING, Optional
 
 from pydantic import Field, model_validator
 
+from app.agent.compaction import ContextCompactor
 from app.agent.toolcall import ToolCallAgent
 from app.logger import logger
 from app.prompt.browser import NEXT_STEP_PROMPT, SYSTEM_PROMPT
 from app.schema import Message, ToolChoice
 from app.tool import BrowserUseTool, Terminate, ToolCollection
 
+
 # Lazy import SandboxBrowserTool to avoid daytona dependency
 try:
     from app.tool.sandbox.sb_browser_tool import SandboxBrowserTool
@@ -25,13 +27,23 @@ class BrowserContextHelper:
     def __init__(self, agent: "BaseAgent"):
         self.agent = agent
         self._current_base64_image: Optional[str] = None
-
-    async def get_browser_state(self) -> Optional[dict]:
-        browser_tool = self.agent.available_tools.get_tool(BrowserUseTool().name)
-        if not browser_tool:
+        # Step whose prompt last included the browser state
+        self._last_state_step: Optional[int] = None
+
+    def _get_browser_tool(self):
+        # Look tools up by their default names, instantiating them would
+        # create an LLM client on every step
+        browser_tool = self.agent.available_tools.get_tool(
+            BrowserUseTool.model_fields["name"].default
+        )
+        if not browser_tool and SandboxBrowserTool is not None:
             browser_tool = self.agent.available_tools.get_tool(
-                SandboxBrowserTool().name
+                SandboxBrowserTool.model_fields["name"].default
             )
+        return browser_tool
+
+    async def get_browser_state(self) -> Optional[dict]:
+        browser_tool = self._get_browser_tool()
         if not browser_tool or not hasattr(browser_tool, "get_current_state"):
             logger.warning("BrowserUseTool not found or doesn't have get_current_state")
             return None
@@ -51,21 +63,33 @@ class BrowserContextHelper:
 
     async def format_next_step_prompt(self) -> str:
         """Gets browser state and formats the browser prompt."""
+        # Element diffs build on the state in the previous prompt, so start
+        # over with a full listing when that prompt had no browser state
+        differ = getattr(self._get_browser_tool(), "element_differ", None)
+        if differ is not None and self._last_state_step != self.agent.current_step - 1:
+            differ.reset()
+        self._last_state_step = self.agent.current_step
+
         browser_state = await self.get_browser_state()
         url_info, tabs_info, content_above_info, content_below_info = "", "", "", ""
         results_info = ""  # Or get from agent if needed elsewhere
+        elements_info = ""
 
         if browser_state and not browser_state.get("error"):
             url_info = f"\n   URL: {browser_state.get('url', 'N/A')}\n   Title: {browser_state.get('title', 'N/A')}"
             tabs = browser_state.get("tabs", [])
             if tabs:
                 tabs_info = f"\n   {len(tabs)} tab(s) available"
-            pixels_above = browser_state.get("pixels_above", 0)
-            pixels_below = browser_state.get("pixels_below", 0)
+            scroll_info = browser_state.get("scroll_info", browser_state)
+            pixels_above = scroll_info.get("pixels_above", 0)
+            pixels_below = scroll_info.get("pixels_below", 0)
             if pixels_above > 0:
                 content_above_info = f" ({pixels_above} pixels)"
             if pixels_below > 0:
                 content_below_info = f" ({pixels_below} pixels)"
+            elements = browser_state.get("interactive_elements")
+            if elements:
+                elements_info = f"\nInteractive elements:\n{elements}\n"
 
             if self._current_base64_image:
                 image_message = Message.user_message(
@@ -81,6 +105,7 @@ class BrowserContextHelper:
             content_above_placeholder=content_above_info,
             content_below_placeholder=content_below_info,
             results_placeholder=results_info,
+            elements_placeholder=elements_info,
         )
 
     async def cleanup_browser(self):
@@ -106,6 +131,13 @@ class BrowserAgent(ToolCallAgent):
     max_observe: int = 10000
     max_steps: int = 20
 
+    # A screenshot is added every step; only the latest is worth sending
+    compactor: Optional[ContextCompactor] = Field(
+        default_factory=lambda: ContextCompactor(
+            keep_images=1, max_observation_chars=1000
+        )
+    )
+
     # Configure the available tools
     available_tools: ToolCollection = Field(
         default_factory=lambda: ToolCollection(BrowserUseTool(), Terminate())
@@ -0,0 +1,207 @@
+"""
+Context-window compaction for long agent runs.
+
+A ContextCompactor shrinks an agent's message history before each LLM call so
+that it stays within a token budget. Unless set explicitly, the budget is the
+context window of the agent's LLM minus room for the reply, the system prompt
+and the tool definitions. It works in stages, stopping as soon as the history
+fits:
+
+1. Drop stale screenshots, keeping only the most recent ones.
+2. Elide long tool observations, oldest first.
+3. Drop the oldest turns, replacing them with a short marker.
+
+Messages are only ever replaced, never modified in place, and tool results are
+kept together with the assistant message that requested them.
+"""
+
+import re
+from typing import Callable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from app.logger import logger
+from app.schema import Message, Role
+
+
+COMPACTION_MARKER = "[Context compacted]"
+MARKER_PATTERN = re.compile(re.escape(COMPACTION_MARKER) + r" (\d+) ")
+
+
+class ContextCompactor(BaseModel):
+    """Keeps a message history within a token budget before each LLM call"""
+
+    max_tokens: Optional[int] = Field(
+        None,
+        description="Token budget for the history, None to derive it from the LLM",
+    )
+    keep_recent: int = Field(
+        6, description="Number of most recent messages that are never compacted"
+    )
+    keep_images: int = Field(
+        1, description="Number of most recent screenshots kept in the history"
+    )
+    max_observation_chars: int = Field(
+        2000, description="Length above which old tool observations are elided"
+    )
+
+    def budget_for(self, llm, overhead_tokens: int = 0) -> Optional[int]:
+        """Token budget for the history of requests to an LLM
+
+        Args:
+            llm: LLM the history is sent to
+            overhead_tokens: Tokens of the request besides the history, such as
+                the system prompt and tool definitions
+
+        Returns:
+            Optional[int]: max_tokens if set, otherwise the LLM's context window
+                minus its reply tokens and the overhead, or None if unknown
+        """
+        if self.max_tokens is not None:
+            return self.max_tokens
+        context_window = getattr(llm, "context_window", None)
+        if not context_window:
+            return None
+        reply_tokens = getattr(llm, "max_tokens", 0) or 0
+        return max(0, context_window - reply_tokens - overhead_tokens)
+
+    def compact(
+        self,
+        messages: List[Message],
+        count_tokens: Callable[[Message], int],
+        max_tokens: Optional[int] = None,
+    ) -> List[Message]:
+        """Return a history that fits the budget, reusing unchanged messages
+
+        Args:
+            messages: Message history, oldest first
+            count_tokens: Token count of a single message as sent to the LLM
+            max_tokens: Token budget, defaults to self.max_tokens; with neither
+                only stale screenshots are dropped
+
+        Returns:
+            List[Message]: The compacted history, or messages itself if unchanged
+        """
+        compacted = self._drop_stale_images(messages)
+        if max_tokens is None:
+            max_tokens = self.max_tokens
+        if max_tokens is None:
+            return compacted
+
+        counts = [count_tokens(message) for message in compacted]
+        total = sum(counts)
+        if total <= max_tokens:
+            return compacted
+
+        protected_from = max(0, len(compacted) - self.keep_recent)
+
+        # Elide old tool observations, oldest first
+        if compacted is messages:
+            compacted = list(messages)
+        for i in range(protected_from):
+            if total <= max_tokens:
+                break
+            elided = self._elide(compacted[i])
+            if elided is not None:
+                compacted[i] = elided
+                new_count = count_tokens(elided)
+                total += new_count - counts[i]
+                counts[i] = new_count
+
+        # Drop the oldest turns, keeping the initial request
+        if total > max_tokens:
+            compacted, total = self._drop_turns(
+                compacted, counts, total, max_tokens, protected_from, count_tokens
+            )
+
+        if total > max_tokens:
+            logger.warning(
+                f"Context still exceeds budget after compaction ({total} > {max_tokens} tokens)"
+            )
+        return compacted
+
+    def _drop_stale_images(self, messages: List[Message]) -> List[Message]:
+        """Remove screenshots from all but the most recent keep_images messages"""
+        with_images = [i for i, m in enumerate(messages) if m.base64_image]
+        stale = with_images[: max(0, len(with_images) - self.keep_images)]
+        if not stale:
+            return messages
+
+        compacted = list(messages)
+        for i in stale:
+            compacted[i] = _replace(compacted[i], base64_image=None)
+        return compacted
+
+    def _elide(self, message: Message) -> Optional[Message]:
+        """Shorten a long tool observation, or return None if it is short"""
+        content = message.content
+        if (
+            message.role != Role.TOOL
+            or not content
+            or len(content) <= self.max_observation_chars
+        ):
+            return None
+
+        half = self.max_observation_chars // 2
+        elided = len(content) - 2 * half
+        return _replace(
+            message,
+            content=(
+                f"{content[:half]}\n... [{elided} characters elided] ...\n"
+                f"{content[-half:]}"
+            ),
+        )
+
+    def _drop_turns(
+        self,
+        messages: List[Message],
+        counts: List[int],
+        total: int,
+        max_tokens: int,
+        protected_from: int,
+        count_tokens: Callable[[Message], int],
+    ) -> Tuple[List[Message], int]:
+        """Drop whole turns after the initial request until the history fits
+
+        An assistant message is dropped together with its tool results, so no
+        tool result is left without its tool call. A marker recording how many
+        messages were removed replaces them, and is folded into the next one.
+        """
+        # Keep the initial request
+        start = 1 if messages and messages[0].role == Role.USER else 0
+        end = start
+        dropped = 0
+        if start < len(messages) and (
+            match := MARKER_PATTERN.match(messages[start].content or "")
+        ):
+            dropped = int(match.group(1))
+            total -= counts[start]
+            end += 1
+        first_turn = end
+
+        while end < protected_from and total > max_tokens:
+            turn_end = end + 1
+            while turn_end < len(messages) and messages[turn_end].role == Role.TOOL:
+                turn_end += 1
+            total -= sum(counts[end:turn_end])
+            end = turn_end
+
+        if end == first_turn:
+            return messages, total + sum(counts[start:first_turn])
+
+        dropped += end - first_turn
+        marker = Message.user_message(
+            f"{COMPACTION_MARKER} {dropped} earlier messages were removed to fit "
+            "the context window."
+        )
+        logger.info(f"🗜️ Compacted context: removed {end - first_turn} messages")
+        compacted = messages[:start] + [marker] + messages[end:]
+        return compacted, total + count_tokens(marker)
+
+
+def _replace(message: Message, **changes) -> Message:
+    """Copy a message with some fields changed, leaving the original intact"""
+    copy = message.model_copy()
+    for name, value in changes.items():
+        setattr(copy, name, value)
+    return copy
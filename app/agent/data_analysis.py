@@ -1,4 +1,7 @@
-from pydantic import Field
+import weakref
+from uuid import uuid4
+
+from pydantic import Field, model_validator
 
 from app.agent.toolcall import ToolCallAgent
 from app.config import config
@@ -7,6 +10,7 @@ from app.tool import Terminate, ToolCollection
 from app.tool.chart_visualization.chart_prepare import VisualizationPrepare
 from app.tool.chart_visualization.data_visualization import DataVisualization
 from app.tool.chart_visualization.python_execute import NormalPythonExecute
+from app.tool.python_pool import PYTHON_POOL
 
 
 class DataAnalysis(ToolCallAgent):
@@ -35,3 +39,16 @@ class DataAnalysis(ToolCallAgent):
             Terminate(),
         )
     )
+
+    @model_validator(mode="after")
+    def initialize_session(self) -> "DataAnalysis":
+        """Let the python tools of this agent share one stateful session"""
+        if config.python_execute.session_kernel:
+            session_id = f"{self.name}-{uuid4().hex}"
+            for tool in self.available_tools.tools:
+                if isinstance(tool, NormalPythonExecute):
+                    tool.use_session(session_id)
+            # The session lives as long as the agent, across its runs and
+            # the steps of a flow
+            weakref.finalize(self, PYTHON_POOL.close_session, session_id)
+        return self
@@ -3,6 +3,7 @@ from typing import Dict, List, Optional
 from pydantic import Field, model_validator
 
 from app.agent.browser import BrowserContextHelper
+from app.agent.compaction import ContextCompactor
 from app.agent.toolcall import ToolCallAgent
 from app.config import config
 from app.logger import logger
@@ -14,6 +15,7 @@ from app.tool.mcp import MCPClients, MCPClientTool
 from app.tool.python_execute import PythonExecute
 from app.tool.str_replace_editor import StrReplaceEditor
 
+
 # ComputerUseTool requires sandbox environment, so we don't include it in the default Manus agent
 # It's available in SandboxManus instead
 
@@ -30,6 +32,8 @@ class Manus(ToolCallAgent):
     max_observe: int = 10000
     max_steps: int = 20
 
+    compactor: Optional[ContextCompactor] = Field(default_factory=ContextCompactor)
+
     # MCP clients for remote tool access
     mcp_clients: MCPClients = Field(default_factory=MCPClients)
 
@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import Field
 
+from app.agent.compaction import ContextCompactor
 from app.agent.toolcall import ToolCallAgent
 from app.prompt.swe import SYSTEM_PROMPT
 from app.tool import Bash, StrReplaceEditor, Terminate, ToolCollection
@@ -22,3 +23,10 @@ class SWEAgent(ToolCallAgent):
     special_tool_names: List[str] = Field(default_factory=lambda: [Terminate().name])
 
     max_steps: int = 20
+
+    # Keep more recent context and longer observations for file views and diffs
+    compactor: Optional[ContextCompactor] = Field(
+        default_factory=lambda: ContextCompactor(
+            keep_recent=8, max_observation_chars=4000
+        )
+    )
@@ -1,14 +1,23 @@
 import asyncio
 import json
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
+from app.agent.compaction import ContextCompactor
 from app.agent.react import ReActAgent
 from app.exceptions import TokenLimitExceeded
+from app.llm import LLM, MULTIMODAL_MODELS, StreamEventType
 from app.logger import logger
 from app.prompt.toolcall import NEXT_STEP_PROMPT, SYSTEM_PROMPT
-from app.schema import TOOL_CHOICE_TYPE, AgentState, Message, ToolCall, ToolChoice
+from app.schema import (
+    TOOL_CHOICE_TYPE,
+    AgentEventType,
+    AgentState,
+    Message,
+    ToolCall,
+    ToolChoice,
+)
 from app.tool import CreateChatCompletion, Terminate, ToolCollection
 
 
@@ -36,19 +45,32 @@ class ToolCallAgent(ReActAgent):
     max_steps: int = 30
     max_observe: Optional[Union[int, bool]] = None
 
+    # Dispatch tool calls while the LLM response is still streaming
+    stream_tool_calls: bool = False
+    # Run consecutive parallel-safe tool calls concurrently
+    parallel_tool_calls: bool = False
+    max_parallel_tool_calls: int = 4
+    _pending_tool_results: Dict[str, asyncio.Task] = PrivateAttr(default_factory=dict)
+
+    # Keeps the history within a token budget before each LLM call
+    compactor: Optional[ContextCompactor] = None
+
     async def think(self) -> bool:
         """Process current state and decide next actions using tools"""
         if self.next_step_prompt:
             user_msg = Message.user_message(self.next_step_prompt)
             self.messages += [user_msg]
 
+        if self.compactor:
+            self.compact_context()
+
         try:
             # If using CodeBuddy LLM, set the tool collection
             if hasattr(self.llm, "set_tool_collection"):
                 self.llm.set_tool_collection(self.available_tools)
 
             # Get response with tool options
-            response = await self.llm.ask_tool(
+            ask_kwargs = dict(
                 messages=self.messages,
                 system_msgs=(
                     [Message.system_message(self.system_prompt)]
@@ -58,9 +80,15 @@ class ToolCallAgent(ReActAgent):
                 tools=self.available_tools.to_params(),
                 tool_choice=self.tool_choices,
             )
+            if self.stream_tool_calls and hasattr(self.llm, "ask_tool_stream"):
+                response = await self._ask_tool_streaming(**ask_kwargs)
+            else:
+                response = await self.llm.ask_tool(**ask_kwargs)
         except ValueError:
+            self._cancel_pending_tool_calls()
             raise
         except Exception as e:
+            self._cancel_pending_tool_calls()
             # Check if this is a RetryError containing TokenLimitExceeded
             if hasattr(e, "__cause__") and isinstance(e.__cause__, TokenLimitExceeded):
                 token_limit_error = e.__cause__
@@ -91,6 +119,8 @@ class ToolCallAgent(ReActAgent):
                 f"🧰 Tools being prepared: {[call.function.name for call in tool_calls]}"
             )
             logger.info(f"🔧 Tool arguments: {tool_calls[0].function.arguments}")
+        if content:
+            await self.emit_event(AgentEventType.THOUGHT, content)
 
         try:
             if response is None:
@@ -124,6 +154,7 @@ class ToolCallAgent(ReActAgent):
 
             return bool(self.tool_calls)
         except Exception as e:
+            self._cancel_pending_tool_calls()
             logger.error(f"🚨 Oops! The {self.name}'s thinking process hit a snag: {e}")
             self.memory.add_message(
                 Message.assistant_message(
@@ -142,39 +173,178 @@ class ToolCallAgent(ReActAgent):
             return self.messages[-1].content or "No content or commands to execute"
 
         results = []
-        for command in self.tool_calls:
-            # Reset base64_image for each tool call
-            self._current_base64_image = None
-
-            result = await self.execute_tool(command)
+        for batch in self._group_tool_calls(self.tool_calls):
+            outcomes = await self._run_tool_batch(batch)
+            for command, (result, base64_image) in zip(batch, outcomes):
+                if self.max_observe:
+                    result = result[: self.max_observe]
+
+                logger.info(
+                    f"🎯 Tool '{command.function.name}' completed its mission! Result: {result}"
+                )
 
-            if self.max_observe:
-                result = result[: self.max_observe]
+                # Add tool response to memory in the order the model emitted calls
+                tool_msg = Message.tool_message(
+                    content=result,
+                    tool_call_id=command.id,
+                    name=command.function.name,
+                    base64_image=base64_image,
+                )
+                self.memory.add_message(tool_msg)
+                results.append(result)
 
-            logger.info(
-                f"🎯 Tool '{command.function.name}' completed its mission! Result: {result}"
-            )
+        self._cancel_pending_tool_calls()
+        return "\n\n".join(results)
 
-            # Add tool response to memory
-            tool_msg = Message.tool_message(
-                content=result,
-                tool_call_id=command.id,
-                name=command.function.name,
-                base64_image=self._current_base64_image,
-            )
-            self.memory.add_message(tool_msg)
-            results.append(result)
+    def _group_tool_calls(self, tool_calls: List[ToolCall]) -> List[List[ToolCall]]:
+        """Split tool calls into batches, grouping consecutive parallel-safe calls.
+
+        Without `parallel_tool_calls` every call forms its own batch, so calls run
+        strictly one after another.
+        """
+        batches: List[List[ToolCall]] = []
+        previous_parallel = False
+        for command in tool_calls:
+            parallel = self.parallel_tool_calls and self._is_parallel_safe(command)
+            if parallel and previous_parallel:
+                batches[-1].append(command)
+            else:
+                batches.append([command])
+            previous_parallel = parallel
+        return batches
+
+    def _is_parallel_safe(self, command: ToolCall) -> bool:
+        """Check whether a tool call may run concurrently with its neighbours"""
+        if command.id in self._pending_tool_results:
+            return False
+        tool = self.available_tools.get_tool(command.function.name)
+        if tool is None:
+            return False
+        try:
+            args = json.loads(command.function.arguments or "{}")
+        except json.JSONDecodeError:
+            return False
+        return isinstance(args, dict) and tool.is_parallel_safe(**args)
+
+    async def _run_tool_batch(
+        self, batch: List[ToolCall]
+    ) -> List[Tuple[str, Optional[str]]]:
+        """Run a batch of tool calls, concurrently when it holds more than one call"""
+        if len(batch) == 1:
+            command = batch[0]
+            # Reuse the result of a call already dispatched while streaming
+            pending = self._pending_tool_results.pop(command.id, None)
+            if pending is not None:
+                return [await pending]
+            return [await self._run_tool_call(command)]
 
-        return "\n\n".join(results)
+        logger.info(
+            f"🚀 Running {len(batch)} tools concurrently: {[c.function.name for c in batch]}"
+        )
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel_tool_calls))
+
+        async def run_limited(command: ToolCall) -> Tuple[str, Optional[str]]:
+            async with semaphore:
+                return await self._run_tool_call(command)
+
+        return list(await asyncio.gather(*(run_limited(c) for c in batch)))
+
+    def compact_context(self) -> None:
+        """Compact the memory in place so the next request fits the budget"""
+        supports_images = getattr(self.llm, "model", None) in MULTIMODAL_MODELS
+
+        def count_tokens(message: Message) -> int:
+            formatted = LLM.format_messages([message], supports_images)
+            return self.llm.count_message_tokens(formatted) if formatted else 0
+
+        # The system prompt and tool definitions share the context window
+        overhead = 0
+        if self.compactor.max_tokens is None:
+            overhead = self.llm.count_tokens(
+                self.system_prompt or ""
+            ) + self.llm.count_tokens(json.dumps(self.available_tools.to_params()))
+        compacted = self.compactor.compact(
+            self.memory.messages,
+            count_tokens,
+            self.compactor.budget_for(self.llm, overhead),
+        )
+        if compacted is not self.memory.messages:
+            self.memory.messages[:] = compacted
+
+    async def _ask_tool_streaming(self, **ask_kwargs):
+        """Stream the LLM response, dispatching each tool call once it is complete.
+
+        Dispatched calls are chained so they still run one after another in the
+        order the model emitted them; `act` then collects their results.
+        """
+        response = None
+        previous: Optional[asyncio.Task] = None
+        async for event in self.llm.ask_tool_stream(**ask_kwargs):
+            if (
+                event.type == StreamEventType.TOOL_CALL
+                and self.tool_choices != ToolChoice.NONE
+            ):
+                logger.info(
+                    f"⚡ Dispatching tool '{event.tool_call.function.name}' while the response streams"
+                )
+                previous = asyncio.create_task(
+                    self._run_tool_call(event.tool_call, after=previous)
+                )
+                self._pending_tool_results[event.tool_call.id] = previous
+            elif event.type == StreamEventType.DONE:
+                response = event.message
+        return response
+
+    def _cancel_pending_tool_calls(self) -> None:
+        """Cancel tool calls dispatched during streaming that were never collected"""
+        for task in self._pending_tool_results.values():
+            task.cancel()
+        self._pending_tool_results.clear()
+
+    async def _run_tool_call(
+        self, command: ToolCall, after: Optional[asyncio.Task] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Execute a tool call, returning its observation and any captured image.
+
+        Reports the start and the result of the call as agent events.
+        """
+        if after is not None:
+            await asyncio.wait([after])
+        function = command.function if command else None
+        name = function.name if function else None
+        call_id = command.id if command else None
+        await self.emit_event(
+            AgentEventType.TOOL_START,
+            (function.arguments or "") if function else "",
+            tool_name=name,
+            tool_call_id=call_id,
+        )
+        observation, base64_image = await self._execute_tool(command)
+        await self.emit_event(
+            AgentEventType.TOOL_RESULT,
+            observation,
+            tool_name=name,
+            tool_call_id=call_id,
+        )
+        return observation, base64_image
 
     async def execute_tool(self, command: ToolCall) -> str:
         """Execute a single tool call with robust error handling"""
+        observation, self._current_base64_image = await self._run_tool_call(command)
+        return observation
+
+    async def _execute_tool(self, command: ToolCall) -> Tuple[str, Optional[str]]:
+        """Execute a single tool call, returning its observation and any image.
+
+        The image is returned rather than stored on the agent so concurrent
+        calls cannot overwrite each other's screenshots.
+        """
         if not command or not command.function or not command.function.name:
-            return "Error: Invalid command format"
+            return "Error: Invalid command format", None
 
         name = command.function.name
         if name not in self.available_tools.tool_map:
-            return f"Error: Unknown tool '{name}'"
+            return f"Error: Unknown tool '{name}'", None
 
         try:
             # Parse arguments
@@ -188,9 +358,10 @@ class ToolCallAgent(ReActAgent):
             await self._handle_special_tool(name=name, result=result)
 
             # Check if result is a ToolResult with base64_image
+            base64_image = None
             if hasattr(result, "base64_image") and result.base64_image:
-                # Store the base64_image for later use in tool_message
-                self._current_base64_image = result.base64_image
+                # Keep the base64_image for later use in tool_message
+                base64_image = result.base64_image
 
             # Format result for display (standard case)
             observation = (
@@ -199,17 +370,17 @@ class ToolCallAgent(ReActAgent):
                 else f"Cmd `{name}` completed with no output"
             )
 
-            return observation
+            return observation, base64_image
         except json.JSONDecodeError:
             error_msg = f"Error parsing arguments for {name}: Invalid JSON format"
             logger.error(
                 f"📝 Oops! The arguments for '{name}' don't make sense - invalid JSON, arguments:{command.function.arguments}"
             )
-            return f"Error: {error_msg}"
+            return f"Error: {error_msg}", None
         except Exception as e:
             error_msg = f"⚠️ Tool '{name}' encountered a problem: {str(e)}"
             logger.exception(error_msg)
-            return f"Error: {error_msg}"
+            return f"Error: {error_msg}", None
 
     async def _handle_special_tool(self, name: str, result: Any, **kwargs):
         """Handle special tool execution and state changes"""
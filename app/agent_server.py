@@ -0,0 +1,270 @@
+"""Hosts many isolated agent sessions in one event loop."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from app.agent.base import BaseAgent
+from app.config import ServerSettings
+from app.exceptions import ServerBusyError
+from app.logger import logger
+from app.sandbox.client import SANDBOX_CLIENT
+from app.schema import AgentEvent
+from app.tenancy import CURRENT_TENANT, TenantLimits
+from app.tool.browser_pool import BROWSER_POOL
+
+
+class AgentSession:
+    """The agent of one client conversation and the lock serialising its requests."""
+
+    def __init__(self, session_id: str, tenant: str):
+        self.session_id = session_id
+        self.tenant = tenant
+        self.agent: Optional[BaseAgent] = None
+        self.lock = asyncio.Lock()
+        self.pending = 0
+        self.last_used = time.monotonic()
+
+
+class AgentServer:
+    """Runs the requests of many agent sessions concurrently in one event loop.
+
+    Each session has its own agent, created by agent_factory on the first
+    request of the session and kept, memory included, for its later requests
+    until the session is closed or unused for session_idle_timeout seconds.
+    Requests of one session run one at a time, in order.
+
+    All requests pass one admission queue: up to max_running run at once and
+    up to max_queued wait in arrival order. A request beyond that, or one that
+    waits longer than queue_timeout, is rejected with ServerBusyError, so load
+    above capacity turns into fast rejections rather than growing latency.
+    While running, the LLM and sandbox calls of each tenant are capped by
+    tenant_limits, so one busy tenant cannot take every slot.
+
+    Attributes:
+        max_running: Requests run at the same time.
+        max_queued: Requests waiting to run before new ones are rejected.
+        queue_timeout: Seconds a request may wait to run.
+        session_idle_timeout: Seconds before the agent of an unused session is closed.
+        tenant_limits: Concurrent calls per tenant by resource ("llm", "sandbox").
+    """
+
+    # Number of recent requests used for latency statistics
+    LATENCY_WINDOW = 1000
+
+    def __init__(
+        self,
+        agent_factory: Callable[[], Awaitable[BaseAgent]],
+        max_running: int = 8,
+        max_queued: int = 64,
+        queue_timeout: float = 60,
+        session_idle_timeout: float = 1800,
+        tenant_limits: Optional[Dict[str, int]] = None,
+    ):
+        """Initializes the agent server.
+
+        Args:
+            agent_factory: Coroutine function creating the agent of a new session.
+            max_running: Requests run at the same time.
+            max_queued: Requests waiting to run before new ones are rejected.
+            queue_timeout: Seconds a request may wait to run.
+            session_idle_timeout: Seconds before the agent of an unused session is closed.
+            tenant_limits: Concurrent calls per tenant by resource ("llm", "sandbox").
+        """
+        self.agent_factory = agent_factory
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.session_idle_timeout = session_idle_timeout
+        self.tenant_limits = dict(tenant_limits or {})
+
+        self._slots = asyncio.Semaphore(max_running)
+        self._sessions: Dict[str, AgentSession] = {}
+        self._tenants: Dict[str, TenantLimits] = {}
+        self._running = 0
+        self._queued = 0
+
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+        self._queue_waits: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Optional[ServerSettings],
+        agent_factory: Callable[[], Awaitable[BaseAgent]],
+    ) -> "AgentServer":
+        """Create a server from agent server configuration settings"""
+        settings = settings or ServerSettings()
+        return cls(
+            agent_factory,
+            max_running=settings.max_running,
+            max_queued=settings.max_queued,
+            queue_timeout=settings.queue_timeout,
+            session_idle_timeout=settings.session_idle_timeout,
+            tenant_limits={
+                "llm": settings.tenant_llm_concurrency,
+                "sandbox": settings.tenant_sandbox_concurrency,
+            },
+        )
+
+    async def submit(
+        self,
+        session_id: str,
+        request: str,
+        tenant: str = "default",
+        on_event: Optional[Callable[[AgentEvent], Any]] = None,
+    ) -> str:
+        """Run a request in a session, creating the session if it is new.
+
+        Args:
+            session_id: Identifier of the client conversation.
+            request: Request for the session's agent.
+            tenant: Tenant whose limits apply to the request.
+            on_event: Called with each event of the agent while the request runs.
+
+        Returns:
+            str: The result of the agent run.
+
+        Raises:
+            ServerBusyError: If the admission queue is full or the request
+                waited longer than queue_timeout.
+            ValueError: If the session belongs to another tenant.
+        """
+        started = time.perf_counter()
+        await self._close_idle_sessions()
+        if self._queued >= self.max_queued:
+            self._rejected += 1
+            raise ServerBusyError(
+                f"Server busy: {self._queued} requests waiting, try again later"
+            )
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = AgentSession(session_id, tenant)
+        elif session.tenant != tenant:
+            raise ValueError(f"Session {session_id} belongs to another tenant")
+
+        session.pending += 1
+        self._queued += 1
+        try:
+            await asyncio.wait_for(self._admit(session), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise ServerBusyError(
+                f"Request waited more than {self.queue_timeout}s to run, try again later"
+            )
+        finally:
+            self._queued -= 1
+            session.pending -= 1
+        self._queue_waits.append(time.perf_counter() - started)
+
+        self._running += 1
+        token = CURRENT_TENANT.set(self._tenant(tenant))
+        try:
+            if session.agent is None:
+                session.agent = await self.agent_factory()
+            # The agent keeps its memory but starts each request with fresh steps
+            session.agent.current_step = 0
+            session.agent.event_hook = on_event
+            result = await session.agent.run(request)
+            self._completed += 1
+            return result
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            if session.agent is not None:
+                session.agent.event_hook = None
+            CURRENT_TENANT.reset(token)
+            self._running -= 1
+            session.last_used = time.monotonic()
+            self._slots.release()
+            session.lock.release()
+            self._latencies.append(time.perf_counter() - started)
+
+    async def _admit(self, session: AgentSession) -> None:
+        """Wait for the session to be free, then for a running slot"""
+        await session.lock.acquire()
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            session.lock.release()
+            raise
+
+    def _tenant(self, tenant: str) -> TenantLimits:
+        if tenant not in self._tenants:
+            self._tenants[tenant] = TenantLimits(tenant, self.tenant_limits)
+        return self._tenants[tenant]
+
+    async def close_session(self, session_id: str) -> None:
+        """Close a session and clean up its agent"""
+        session = self._sessions.pop(session_id, None)
+        if session is not None and session.agent is not None:
+            await self._cleanup_agent(session.agent)
+
+    async def _close_idle_sessions(self) -> None:
+        now = time.monotonic()
+        expired = [
+            session_id
+            for session_id, session in self._sessions.items()
+            if now - session.last_used > self.session_idle_timeout
+            and not session.pending
+            and not session.lock.locked()
+        ]
+        for session_id in expired:
+            logger.info(f"Closing idle agent session {session_id}")
+            await self.close_session(session_id)
+
+    @staticmethod
+    async def _cleanup_agent(agent: BaseAgent) -> None:
+        cleanup = getattr(agent, "cleanup", None)
+        if cleanup is None:
+            return
+        try:
+            await cleanup()
+        except Exception as e:
+            logger.warning(f"Error cleaning up agent {agent.name}: {e}")
+
+    async def close(self) -> None:
+        """Close all sessions, the shared sandbox and the browser pool"""
+        for session_id in list(self._sessions):
+            await self.close_session(session_id)
+        await SANDBOX_CLIENT.cleanup()
+        await BROWSER_POOL.close()
+
+    def get_stats(self) -> Dict:
+        """Gets server statistics.
+
+        Latencies are in seconds, from submission to result, and cover the
+        most recent requests.
+
+        Returns:
+            Dict: Statistics information.
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            return latencies[int(p * (len(latencies) - 1))] if latencies else 0.0
+
+        return {
+            "sessions": len(self._sessions),
+            "running": self._running,
+            "queued": self._queued,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "queue_wait_avg": (
+                sum(self._queue_waits) / len(self._queue_waits)
+                if self._queue_waits
+                else 0.0
+            ),
+            "latency_p50": percentile(0.5),
+            "latency_p99": percentile(0.99),
+            "tenants": {
+                name: limits.get_stats() for name, limits in self._tenants.items()
+            },
+        }
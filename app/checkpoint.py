@@ -0,0 +1,105 @@
+"""Durable checkpoints that let interrupted flow and agent runs resume."""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from app.config import PROJECT_ROOT, CheckpointSettings
+from app.logger import logger
+from app.schema import Memory
+
+
+if TYPE_CHECKING:
+    from app.agent.base import BaseAgent
+
+
+class CheckpointStore:
+    """Keeps the latest checkpoint of each run as a JSON file in a directory.
+
+    A checkpoint is written after every completed step and replaces the
+    previous one atomically, so a run that dies at any point can resume
+    from its last completed step. Checkpoints of finished runs are deleted.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        if not self.directory.is_absolute():
+            self.directory = PROJECT_ROOT / self.directory
+
+    @classmethod
+    def from_settings(
+        cls, settings: Optional[CheckpointSettings]
+    ) -> Optional["CheckpointStore"]:
+        """Create a store from checkpoint settings, or None if disabled"""
+        settings = settings or CheckpointSettings()
+        return cls(settings.directory) if settings.enabled else None
+
+    def _path(self, run_id: str) -> Path:
+        return self.directory / f"{run_id}.json"
+
+    def save(self, run_id: str, state: Dict[str, Any]) -> None:
+        """Replace the checkpoint of a run.
+
+        Args:
+            run_id: Identifier of the run.
+            state: JSON-serializable run state.
+        """
+        path = self._path(run_id)
+        temp = path.with_suffix(".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with temp.open("w", encoding="utf-8") as f:
+                json.dump({"saved_at": time.time(), **state}, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            temp.replace(path)
+        except OSError as e:
+            # A missed checkpoint only costs progress on a later resume
+            logger.warning(f"Failed to write checkpoint {path}: {e}")
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get the checkpoint of a run, or None if there is none"""
+        try:
+            return json.loads(self._path(run_id).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def delete(self, run_id: str) -> None:
+        """Remove the checkpoint of a finished run"""
+        self._path(run_id).unlink(missing_ok=True)
+
+    def list_runs(self, prefix: str = "") -> List[str]:
+        """List the runs with a checkpoint, most recently saved first.
+
+        Args:
+            prefix: Only list run ids starting with this prefix.
+        """
+        if not self.directory.is_dir():
+            return []
+        paths = sorted(
+            self.directory.glob(f"{prefix}*.json"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        return [path.stem for path in paths]
+
+    def latest(self, prefix: str = "") -> Optional[str]:
+        """Get the run with the most recent checkpoint, optionally by id prefix"""
+        runs = self.list_runs(prefix)
+        return runs[0] if runs else None
+
+
+def snapshot_agent(agent: "BaseAgent") -> Dict[str, Any]:
+    """Capture the resumable state of an agent"""
+    return {
+        "memory": agent.memory.model_dump(mode="json"),
+        "current_step": agent.current_step,
+    }
+
+
+def restore_agent(agent: "BaseAgent", snapshot: Dict[str, Any]) -> None:
+    """Restore an agent to a state captured by snapshot_agent"""
+    agent.memory = Memory.model_validate(snapshot["memory"])
+    agent.current_step = snapshot["current_step"]
@@ -25,18 +25,97 @@ class LLMSettings(BaseModel):
         None,
         description="Maximum input tokens to use across all requests (None for unlimited)",
     )
+    context_window: Optional[int] = Field(
+        None,
+        description="Context window of the model in tokens (None to infer it from the model name)",
+    )
     temperature: float = Field(1.0, description="Sampling temperature")
     api_type: str = Field(..., description="Azure, Openai, or Ollama")
     api_version: str = Field(..., description="Azure Openai version if AzureOpenai")
 
     # CodeBuddy-specific settings
-    backend: str = Field(default="openai", description="Backend type: 'openai' or 'codebuddy'")
+    backend: str = Field(
+        default="openai", description="Backend type: 'openai' or 'codebuddy'"
+    )
     codebuddy_code_path: Optional[str] = Field(
         None, description="Path to CodeBuddy CLI executable"
     )
     permission_mode: Optional[str] = Field(
         None,
-        description="CodeBuddy permission mode: 'default', 'acceptEdits', 'plan', or 'bypassPermissions'"
+        description="CodeBuddy permission mode: 'default', 'acceptEdits', 'plan', or 'bypassPermissions'",
+    )
+
+
+class LLMCacheSettings(BaseModel):
+    """Configuration for the persistent LLM response cache"""
+
+    enabled: bool = Field(False, description="Whether to cache LLM responses")
+    path: str = Field(
+        "cache/llm_responses.db",
+        description="SQLite database file, relative to the project root",
+    )
+    ttl_seconds: Optional[int] = Field(
+        None, description="Seconds before a cached response expires (None for never)"
+    )
+    max_entries: int = Field(
+        10000, description="Maximum number of cached responses to keep"
+    )
+    max_size_mb: float = Field(
+        256, description="Maximum total size of cached responses in megabytes"
+    )
+
+
+class PythonExecuteSettings(BaseModel):
+    """Configuration for the worker processes of PythonExecute"""
+
+    pool_size: int = Field(2, description="Number of idle worker processes kept ready")
+    session_idle_timeout: int = Field(
+        1800, description="Seconds before an unused stateful session is closed"
+    )
+    memory_limit_mb: Optional[int] = Field(
+        None,
+        description="Opt-in address space limit (RLIMIT_AS) in megabytes of the shared workers; it counts virtual reservations, so numeric libraries may fail under it while using little memory",
+    )
+    session_memory_limit_mb: Optional[int] = Field(
+        4096,
+        description="Address space limit (RLIMIT_AS) in megabytes of stateful session workers; a session that exceeds it is restarted",
+    )
+    session_kernel: bool = Field(
+        True,
+        description="Keep variables, imports and loaded data between the python calls of a DataAnalysis agent",
+    )
+
+
+class CheckpointSettings(BaseModel):
+    """Configuration for the checkpoints that let interrupted runs resume"""
+
+    enabled: bool = Field(
+        True, description="Whether to save a checkpoint after each completed step"
+    )
+    directory: str = Field(
+        "checkpoints",
+        description="Directory for checkpoint files, relative to the project root",
+    )
+
+
+class ServerSettings(BaseModel):
+    """Configuration for hosting many agent sessions in one server"""
+
+    max_running: int = Field(8, description="Requests run at the same time")
+    max_queued: int = Field(
+        64, description="Requests waiting to run before new ones are rejected"
+    )
+    queue_timeout: float = Field(
+        60, description="Seconds a request may wait to run before it is rejected"
+    )
+    session_idle_timeout: float = Field(
+        1800, description="Seconds before the agent of an unused session is closed"
+    )
+    tenant_llm_concurrency: int = Field(
+        4, description="Concurrent LLM calls per tenant"
+    )
+    tenant_sandbox_concurrency: int = Field(
+        2, description="Concurrent sandbox and code execution calls per tenant"
     )
 
 
@@ -68,12 +147,40 @@ class SearchSettings(BaseModel):
         default="us",
         description="Country code for search results (e.g., us, cn, uk)",
     )
+    hedge_delay: Optional[float] = Field(
+        default=None,
+        description="Seconds before also starting the next engine while earlier ones are still searching, 0 to race all engines, None to try engines one by one",
+    )
+    adaptive_order: bool = Field(
+        default=False,
+        description="Order engines by their observed latency and failure rate",
+    )
+    cache_ttl: Optional[int] = Field(
+        default=3600,
+        description="Seconds to keep search results cached, 0 or None to disable the cache",
+    )
+    cache_size: int = Field(
+        default=1024,
+        description="Maximum number of search results kept in the in-memory cache",
+    )
+    cache_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for an on-disk search result cache shared across runs",
+    )
 
 
 class RunflowSettings(BaseModel):
     use_data_analysis_agent: bool = Field(
         default=False, description="Enable data analysis agent in run flow"
     )
+    max_parallel_steps: int = Field(
+        default=4,
+        description="Maximum plan steps run at once when the plan declares step dependencies",
+    )
+    plan_window: Optional[int] = Field(
+        default=None,
+        description="Upcoming steps shown in step prompts besides the current ones, None for the whole plan",
+    )
 
 
 class BrowserSettings(BaseModel):
@@ -99,6 +206,35 @@ class BrowserSettings(BaseModel):
     max_content_length: int = Field(
         2000, description="Maximum length for content retrieval operations"
     )
+    screenshot_full_page: bool = Field(
+        False, description="Capture the full page instead of the viewport"
+    )
+    screenshot_quality: int = Field(75, description="JPEG quality of screenshots")
+    screenshot_max_width: Optional[int] = Field(
+        1280, description="Downscale screenshots wider than this many pixels"
+    )
+    screenshot_dedup: bool = Field(
+        True, description="Skip screenshots unchanged since the previous step"
+    )
+    screenshot_dedup_threshold: int = Field(
+        4, description="Max perceptual hash distance treated as unchanged"
+    )
+    state_diff: bool = Field(
+        True, description="Send only interactive elements changed since the last state"
+    )
+    state_full_refresh_interval: int = Field(
+        10, description="Send the full element listing at least every N states"
+    )
+    pool_max_browsers: int = Field(
+        0,
+        description="Long-lived browsers shared by all browser tools, 0 launches one per tool",
+    )
+    pool_max_contexts_per_browser: int = Field(
+        8, description="Maximum contexts leased from each pooled browser"
+    )
+    pool_idle_timeout: int = Field(
+        300, description="Seconds before an unused pooled browser is closed"
+    )
 
 
 class SandboxSettings(BaseModel):
@@ -199,6 +335,18 @@ class AppConfig(BaseModel):
     daytona_config: Optional[DaytonaSettings] = Field(
         None, description="Daytona configuration"
     )
+    llm_cache_config: Optional[LLMCacheSettings] = Field(
+        None, description="LLM response cache configuration"
+    )
+    python_execute_config: Optional[PythonExecuteSettings] = Field(
+        None, description="PythonExecute worker pool configuration"
+    )
+    checkpoint_config: Optional[CheckpointSettings] = Field(
+        None, description="Run checkpoint configuration"
+    )
+    server_config: Optional[ServerSettings] = Field(
+        None, description="Agent server configuration"
+    )
 
     class Config:
         arbitrary_types_allowed = True
@@ -253,6 +401,7 @@ class Config:
             "api_key": base_llm.get("api_key"),
             "max_tokens": base_llm.get("max_tokens", 4096),
             "max_input_tokens": base_llm.get("max_input_tokens"),
+            "context_window": base_llm.get("context_window"),
             "temperature": base_llm.get("temperature", 1.0),
             "api_type": base_llm.get("api_type", ""),
             "api_version": base_llm.get("api_version", ""),
@@ -309,6 +458,30 @@ class Config:
         else:
             daytona_settings = DaytonaSettings()
 
+        llm_cache_config = raw_config.get("llm_cache", {})
+        if llm_cache_config:
+            llm_cache_settings = LLMCacheSettings(**llm_cache_config)
+        else:
+            llm_cache_settings = LLMCacheSettings()
+
+        python_execute_config = raw_config.get("python_execute", {})
+        if python_execute_config:
+            python_execute_settings = PythonExecuteSettings(**python_execute_config)
+        else:
+            python_execute_settings = PythonExecuteSettings()
+
+        checkpoint_config = raw_config.get("checkpoint", {})
+        if checkpoint_config:
+            checkpoint_settings = CheckpointSettings(**checkpoint_config)
+        else:
+            checkpoint_settings = CheckpointSettings()
+
+        server_config = raw_config.get("server", {})
+        if server_config:
+            server_settings = ServerSettings(**server_config)
+        else:
+            server_settings = ServerSettings()
+
         mcp_config = raw_config.get("mcp", {})
         mcp_settings = None
         if mcp_config:
@@ -337,6 +510,10 @@ class Config:
             "mcp_config": mcp_settings,
             "run_flow_config": run_flow_settings,
             "daytona_config": daytona_settings,
+            "llm_cache_config": llm_cache_settings,
+            "python_execute_config": python_execute_settings,
+            "checkpoint_config": checkpoint_settings,
+            "server_config": server_settings,
         }
 
         self._config = AppConfig(**config_dict)
@@ -353,6 +530,26 @@ class Config:
     def daytona(self) -> DaytonaSettings:
         return self._config.daytona_config
 
+    @property
+    def llm_cache(self) -> LLMCacheSettings:
+        """Get the LLM response cache configuration"""
+        return self._config.llm_cache_config
+
+    @property
+    def python_execute(self) -> PythonExecuteSettings:
+        """Get the PythonExecute worker pool configuration"""
+        return self._config.python_execute_config
+
+    @property
+    def checkpoint(self) -> CheckpointSettings:
+        """Get the run checkpoint configuration"""
+        return self._config.checkpoint_config
+
+    @property
+    def server(self) -> ServerSettings:
+        """Get the agent server configuration"""
+        return self._config.server_config
+
     @property
     def browser_config(self) -> Optional[BrowserSettings]:
         return self._config.browser_config
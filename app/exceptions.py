@@ -11,3 +11,7 @@ class OpenManusError(Exception):
 
 class TokenLimitExceeded(OpenManusError):
     """Exception raised when the token limit is exceeded"""
+
+
+class ServerBusyError(OpenManusError):
+    """Exception raised when an agent server has no room for a request"""
@@ -1,15 +1,22 @@
+import asyncio
+import inspect
 import json
+import re
 import time
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from typing import Any, ClassVar, Dict, List, Optional, Set, Tuple, Union
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from app.agent.base import BaseAgent
+from app.checkpoint import CheckpointStore, restore_agent, snapshot_agent
+from app.config import config
 from app.flow.base import BaseFlow
 from app.llm import LLM
 from app.logger import logger
+from app.sandbox.client import SANDBOX_CLIENT, SANDBOX_HELD
 from app.schema import AgentState, Message, ToolChoice
+from app.tenancy import CURRENT_TENANT
 from app.tool import PlanningTool
 
 
@@ -43,13 +50,39 @@ class PlanStepStatus(str, Enum):
 
 
 class PlanningFlow(BaseFlow):
-    """A flow that manages planning and execution of tasks using agents."""
+    """A flow that manages planning and execution of tasks using agents.
+
+    Steps run one after another unless the plan declares step dependencies.
+    Then every step whose dependencies are done is ready, and up to
+    max_parallel_steps ready steps run at once, each on its own executor.
+
+    With a checkpoint_store, the plan, the agents and the output so far are
+    saved under the plan id after every completed step, and resume continues
+    an interrupted run from there.
+
+    Step prompts embed the plan; with plan_window set, they show only the
+    current steps, the steps they depend on and the next plan_window steps.
+    """
+
+    # Characters of a step result kept in its notes for dependent steps
+    STEP_NOTE_LIMIT: ClassVar[int] = 1000
 
     llm: LLM = Field(default_factory=lambda: LLM())
     planning_tool: PlanningTool = Field(default_factory=PlanningTool)
     executor_keys: List[str] = Field(default_factory=list)
     active_plan_id: str = Field(default_factory=lambda: f"plan_{int(time.time())}")
     current_step_index: Optional[int] = None
+    max_parallel_steps: int = Field(
+        default_factory=lambda: config.run_flow_config.max_parallel_steps
+    )
+    plan_window: Optional[int] = Field(
+        default_factory=lambda: config.run_flow_config.plan_window
+    )
+    checkpoint_store: Optional[CheckpointStore] = None
+
+    # Output of the steps completed before the run was resumed
+    _output: str = PrivateAttr(default="")
+    _agent_snapshots: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
 
     def __init__(
         self, agents: Union[BaseAgent, List[BaseAgent], Dict[str, BaseAgent]], **data
@@ -92,7 +125,22 @@ class PlanningFlow(BaseFlow):
         return self.primary_agent
 
     async def execute(self, input_text: str) -> str:
-        """Execute the planning flow with agents."""
+        """Execute the planning flow with agents.
+
+        The steps share the sandbox, which is cleaned up once the flow is done
+        rather than after each step.
+        """
+        outermost = not SANDBOX_HELD.get()
+        token = SANDBOX_HELD.set(True)
+        try:
+            return await self._execute_plan(input_text)
+        finally:
+            SANDBOX_HELD.reset(token)
+            if outermost and CURRENT_TENANT.get() is None:
+                await SANDBOX_CLIENT.cleanup()
+
+    async def _execute_plan(self, input_text: str) -> str:
+        """Create the plan if input is given, then run its steps"""
         try:
             if not self.primary_agent:
                 raise ValueError("No primary agent available")
@@ -108,6 +156,9 @@ class PlanningFlow(BaseFlow):
                     )
                     return f"Failed to create plan for: {input_text}"
 
+            if self.max_parallel_steps > 1 and self._plan_dependencies() is not None:
+                return self._finish_run(await self._execute_parallel())
+
             result = ""
             while True:
                 # Get current step to execute
@@ -123,16 +174,81 @@ class PlanningFlow(BaseFlow):
                 executor = self.get_executor(step_type)
                 step_result = await self._execute_step(executor, step_info)
                 result += step_result + "\n"
+                self._save_checkpoint(result)
 
                 # Check if agent wants to terminate
                 if hasattr(executor, "state") and executor.state == AgentState.FINISHED:
                     break
 
-            return result
+            return self._finish_run(result)
         except Exception as e:
             logger.error(f"Error in PlanningFlow: {str(e)}")
             return f"Execution failed: {str(e)}"
 
+    async def resume(self, run_id: Optional[str] = None) -> str:
+        """Continue an interrupted run from its last completed step.
+
+        The plan and the memories of the agents are restored from the
+        checkpoint, and steps that were in progress run again.
+
+        Args:
+            run_id: Plan id of the run, defaults to the active plan id.
+
+        Returns:
+            The output of the whole run, including the steps done before.
+        """
+        if not self.checkpoint_store:
+            raise ValueError("No checkpoint store to resume from")
+        run_id = run_id or self.active_plan_id
+        state = self.checkpoint_store.load(run_id)
+        if not state or state.get("kind") != "flow":
+            return f"No checkpoint found for run {run_id}"
+
+        self.active_plan_id = run_id
+        self.planning_tool.plans[run_id] = state["plan"]
+        self.current_step_index = state["current_step_index"]
+        for key, snapshot in state["agents"].items():
+            if key in self.agents:
+                restore_agent(self.agents[key], snapshot)
+        self._agent_snapshots = dict(state["agents"])
+        self._output = state["output"]
+
+        statuses = state["plan"].get("step_statuses", [])
+        completed = statuses.count(PlanStepStatus.COMPLETED.value)
+        logger.info(
+            f"Resuming plan {run_id} after {completed} of {len(statuses)} completed steps"
+        )
+        return await self.execute("")
+
+    def _save_checkpoint(self, result: str, busy: Set[int] = frozenset()) -> None:
+        """Save the plan, the agents and the output so far after a completed step.
+
+        Agents in the middle of a step keep the snapshot from their last step.
+        """
+        if not self.checkpoint_store:
+            return
+        for key, agent in self.agents.items():
+            if id(agent) not in busy:
+                self._agent_snapshots[key] = snapshot_agent(agent)
+        self.checkpoint_store.save(
+            self.active_plan_id,
+            {
+                "kind": "flow",
+                "plan": self.planning_tool.plans[self.active_plan_id],
+                "current_step_index": self.current_step_index,
+                "agents": self._agent_snapshots,
+                "output": self._output + result,
+            },
+        )
+
+    def _finish_run(self, result: str) -> str:
+        """Drop the checkpoint of a finished run and return its whole output"""
+        if self.checkpoint_store:
+            self.checkpoint_store.delete(self.active_plan_id)
+        result, self._output = self._output + result, ""
+        self._agent_snapshots = {}
+        return result
+
     async def _create_initial_plan(self, request: str) -> None:
         """Create an initial plan based on the request using the flow's LLM and PlanningTool."""
         logger.info(f"Creating initial plan with ID: {self.active_plan_id}")
@@ -151,6 +267,12 @@ class PlanningFlow(BaseFlow):
                         "description": self.agents[key].description,
                     }
                 )
+        if self.max_parallel_steps > 1:
+            system_message_content += (
+                "\nSteps that do not need each other's results can run in parallel: "
+                "give step_dependencies listing, for each step, the indices of the earlier "
+                "steps whose results it needs."
+            )
         if len(agents_description) > 1:
             # Add description of agents to select
             system_message_content += (
@@ -240,11 +362,7 @@ class PlanningFlow(BaseFlow):
                     step_info = {"text": step}
 
                     # Try to extract step type from the text (e.g., [SEARCH] or [CODE])
-                    import re
-
-                    type_match = re.search(r"\[([A-Z_]+)\]", step)
-                    if type_match:
-                        step_info["type"] = type_match.group(1).lower()
+                    step_info.update(self._parse_step_type(step))
 
                     # Mark current step as in_progress
                     try:
@@ -274,11 +392,160 @@ class PlanningFlow(BaseFlow):
             logger.warning(f"Error finding current step index: {e}")
             return None, None
 
-    async def _execute_step(self, executor: BaseAgent, step_info: dict) -> str:
+    @staticmethod
+    def _parse_step_type(step: str) -> dict:
+        """Extract the step type from a marker such as [SEARCH] or [CODE]"""
+        type_match = re.search(r"\[([A-Z_]+)\]", step)
+        return {"type": type_match.group(1).lower()} if type_match else {}
+
+    def _plan_dependencies(self) -> Optional[List[List[int]]]:
+        """Get the step dependencies of the active plan, if it declares any"""
+        plan_data = self.planning_tool.plans.get(self.active_plan_id, {})
+        return plan_data.get("step_dependencies")
+
+    def _step_status(self, step_index: int) -> str:
+        statuses = self.planning_tool.plans[self.active_plan_id].get(
+            "step_statuses", []
+        )
+        if step_index < len(statuses):
+            return statuses[step_index]
+        return PlanStepStatus.NOT_STARTED.value
+
+    def _get_ready_steps(self, running: Set[int]) -> List[int]:
+        """Get the active steps, not yet running, whose dependencies are done"""
+        plan_data = self.planning_tool.plans[self.active_plan_id]
+        dependencies = plan_data.get("step_dependencies") or []
+        active = PlanStepStatus.get_active_statuses()
+
+        return [
+            i
+            for i in range(len(plan_data.get("steps", [])))
+            if i not in running
+            and self._step_status(i) in active
+            and all(
+                self._step_status(d) not in active
+                for d in (dependencies[i] if i < len(dependencies) else [])
+            )
+        ]
+
+    async def _clone_executor(self, executor: BaseAgent) -> BaseAgent:
+        """Create a fresh agent like executor, with its own memory and tools.
+
+        Agents with an async create factory, such as Manus, are built with it,
+        so the clone sets up its own tools and MCP connections.
+        """
+        fields = dict(
+            name=executor.name,
+            description=executor.description,
+            system_prompt=executor.system_prompt,
+            next_step_prompt=executor.next_step_prompt,
+            llm=executor.llm,
+            max_steps=executor.max_steps,
+        )
+        create = getattr(type(executor), "create", None)
+        if inspect.iscoroutinefunction(create):
+            return await create(**fields)
+        return type(executor)(**fields)
+
+    @staticmethod
+    async def _cleanup_agent(agent: BaseAgent) -> None:
+        cleanup = getattr(agent, "cleanup", None)
+        if cleanup is None:
+            return
+        try:
+            await cleanup()
+        except Exception as e:
+            logger.warning(f"Error cleaning up agent {agent.name}: {e}")
+
+    async def _execute_parallel(self) -> str:
+        """Run ready steps concurrently until the plan is done.
+
+        A step runs on its executor agent when that agent is free, otherwise on
+        a clone of it, so concurrent steps never share memory. Clones are
+        cleaned up when the steps are done. The result of each step is kept in
+        its notes, where the steps depending on it can read it.
+        """
+        results: Dict[int, str] = {}
+        running: Dict[asyncio.Task, Tuple[int, BaseAgent]] = {}
+        busy: Set[int] = set()
+        clones: List[BaseAgent] = []
+        finished = False
+
+        try:
+            while True:
+                ready = (
+                    []
+                    if finished
+                    else self._get_ready_steps({index for index, _ in running.values()})
+                )
+                for index in ready[: self.max_parallel_steps - len(running)]:
+                    step_text = self.planning_tool.plans[self.active_plan_id]["steps"][
+                        index
+                    ]
+                    step_info = {"text": step_text, **self._parse_step_type(step_text)}
+                    executor = self.get_executor(step_info.get("type"))
+                    if id(executor) in busy:
+                        executor = await self._clone_executor(executor)
+                        clones.append(executor)
+                    busy.add(id(executor))
+
+                    await self.planning_tool.execute(
+                        command="mark_step",
+                        plan_id=self.active_plan_id,
+                        step_index=index,
+                        step_status=PlanStepStatus.IN_PROGRESS.value,
+                    )
+                    self.current_step_index = index
+                    task = asyncio.create_task(
+                        self._execute_step(executor, step_info, index)
+                    )
+                    running[task] = (index, executor)
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    index, executor = running.pop(task)
+                    busy.discard(id(executor))
+                    results[index] = task.result()
+                    if self._step_status(index) != PlanStepStatus.COMPLETED.value:
+                        # Failed steps are not retried; dependent steps go ahead
+                        await self.planning_tool.execute(
+                            command="mark_step",
+                            plan_id=self.active_plan_id,
+                            step_index=index,
+                            step_status=PlanStepStatus.BLOCKED.value,
+                            step_notes=results[index][-self.STEP_NOTE_LIMIT :],
+                        )
+                    # Check if agent wants to terminate
+                    if executor.state == AgentState.FINISHED:
+                        finished = True
+                    self._save_checkpoint(
+                        "".join(results[i] + "\n" for i in sorted(results)), busy
+                    )
+        finally:
+            for task in running:
+                task.cancel()
+            for clone in clones:
+                await self._cleanup_agent(clone)
+
+        result = "".join(results[i] + "\n" for i in sorted(results))
+        if not finished:
+            result += await self._finalize_plan()
+        return result
+
+    async def _execute_step(
+        self, executor: BaseAgent, step_info: dict, step_index: Optional[int] = None
+    ) -> str:
         """Execute the current step with the specified agent using agent.run()."""
+        if step_index is None:
+            step_index = self.current_step_index
         # Prepare context for the agent with current plan status
-        plan_status = await self._get_plan_text()
-        step_text = step_info.get("text", f"Step {self.current_step_index}")
+        plan_status = await self._get_plan_text(self.plan_window, step_index)
+        step_text = step_info.get("text", f"Step {step_index}")
 
         # Create a prompt for the agent to execute the current step
         step_prompt = f"""
@@ -286,7 +553,7 @@ class PlanningFlow(BaseFlow):
         {plan_status}
 
         YOUR CURRENT TASK:
-        You are now working on step {self.current_step_index}: "{step_text}"
+        You are now working on step {step_index}: "{step_text}"
 
         Please only execute this current step using the appropriate tools. When you're done, provide a summary of what you accomplished.
         """
@@ -295,17 +562,25 @@ class PlanningFlow(BaseFlow):
         try:
             step_result = await executor.run(step_prompt)
 
-            # Mark the step as completed after successful execution
-            await self._mark_step_completed()
+            # Mark the step as completed after successful execution, keeping the
+            # result for dependent steps when they may run on other agents
+            notes = None
+            if self._plan_dependencies() is not None:
+                notes = step_result[-self.STEP_NOTE_LIMIT :]
+            await self._mark_step_completed(step_index, notes)
 
             return step_result
         except Exception as e:
-            logger.error(f"Error executing step {self.current_step_index}: {e}")
-            return f"Error executing step {self.current_step_index}: {str(e)}"
-
-    async def _mark_step_completed(self) -> None:
-        """Mark the current step as completed."""
-        if self.current_step_index is None:
+            logger.error(f"Error executing step {step_index}: {e}")
+            return f"Error executing step {step_index}: {str(e)}"
+
+    async def _mark_step_completed(
+        self, step_index: Optional[int] = None, notes: Optional[str] = None
+    ) -> None:
+        """Mark the current step, or the given step, as completed."""
+        if step_index is None:
+            step_index = self.current_step_index
+        if step_index is None:
             return
 
         try:
@@ -313,11 +588,12 @@ class PlanningFlow(BaseFlow):
             await self.planning_tool.execute(
                 command="mark_step",
                 plan_id=self.active_plan_id,
-                step_index=self.current_step_index,
+                step_index=step_index,
                 step_status=PlanStepStatus.COMPLETED.value,
+                step_notes=notes,
             )
             logger.info(
-                f"Marked step {self.current_step_index} as completed in plan {self.active_plan_id}"
+                f"Marked step {step_index} as completed in plan {self.active_plan_id}"
             )
         except Exception as e:
             logger.warning(f"Failed to update plan status: {e}")
@@ -327,20 +603,21 @@ class PlanningFlow(BaseFlow):
                 step_statuses = plan_data.get("step_statuses", [])
 
                 # Ensure the step_statuses list is long enough
-                while len(step_statuses) <= self.current_step_index:
+                while len(step_statuses) <= step_index:
                     step_statuses.append(PlanStepStatus.NOT_STARTED.value)
 
                 # Update the status
-                step_statuses[self.current_step_index] = PlanStepStatus.COMPLETED.value
+                step_statuses[step_index] = PlanStepStatus.COMPLETED.value
                 plan_data["step_statuses"] = step_statuses
 
-    async def _get_plan_text(self) -> str:
-        """Get the current plan as formatted text."""
+    async def _get_plan_text(
+        self, lookahead: Optional[int] = None, step_index: Optional[int] = None
+    ) -> str:
+        """Get the current plan as formatted text, windowed around step_index with lookahead."""
         try:
-            result = await self.planning_tool.execute(
-                command="get", plan_id=self.active_plan_id
+            return self.planning_tool.get_plan_text(
+                self.active_plan_id, lookahead, step_index
             )
-            return result.output if hasattr(result, "output") else str(result)
         except Exception as e:
             logger.error(f"Error getting plan: {e}")
             return self._generate_plan_text_from_storage()
@@ -385,6 +662,7 @@ class PlanningFlow(BaseFlow):
             plan_text += "Steps:\n"
 
             status_marks = PlanStepStatus.get_status_marks()
+            dependencies = plan_data.get("step_dependencies")
 
             for i, (step, status, notes) in enumerate(
                 zip(steps, step_statuses, step_notes)
@@ -394,7 +672,10 @@ class PlanningFlow(BaseFlow):
                     status, status_marks[PlanStepStatus.NOT_STARTED.value]
                 )
 
-                plan_text += f"{i}. {status_mark} {step}\n"
+                plan_text += f"{i}. {status_mark} {step}"
+                if dependencies and dependencies[i]:
+                    plan_text += f" (after {', '.join(map(str, dependencies[i]))})"
+                plan_text += "\n"
                 if notes:
                     plan_text += f"   Notes: {notes}\n"
 
@@ -1,5 +1,8 @@
+import json
 import math
-from typing import Dict, List, Optional, Union
+from collections import OrderedDict
+from enum import Enum
+from typing import AsyncIterator, Dict, Hashable, List, Optional, Tuple, Union
 
 import tiktoken
 from openai import (
@@ -10,7 +13,15 @@ from openai import (
     OpenAIError,
     RateLimitError,
 )
-from openai.types.chat import ChatCompletion, ChatCompletionMessage
+from openai.types.chat import (
+    ChatCompletion,
+    ChatCompletionMessage,
+    ChatCompletionMessageToolCall,
+)
+from openai.types.chat.chat_completion_message_tool_call import (
+    Function as ChatCompletionFunction,
+)
+from pydantic import BaseModel
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -21,14 +32,19 @@ from tenacity import (
 from app.bedrock import BedrockClient
 from app.config import LLMSettings, config
 from app.exceptions import TokenLimitExceeded
+from app.llm_cache import LLMResponseCache, get_response_cache
 from app.logger import logger  # Assuming a logger is set up in your app
 from app.schema import (
     ROLE_VALUES,
     TOOL_CHOICE_TYPE,
     TOOL_CHOICE_VALUES,
+    Function,
     Message,
+    MessageDict,
+    ToolCall,
     ToolChoice,
 )
+from app.tenancy import limited
 
 
 REASONING_MODELS = ["o1", "o3-mini"]
@@ -41,6 +57,59 @@ MULTIMODAL_MODELS = [
     "claude-3-haiku-20240307",
 ]
 
+# Context windows in tokens by model name prefix, the longest matching prefix wins
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4-vision-preview": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "o1": 200000,
+    "o3": 200000,
+    "claude": 200000,
+    "us.anthropic.claude": 200000,
+    "deepseek": 64000,
+    "gemini": 1048576,
+    "qwen": 32768,
+    "llama3": 8192,
+}
+# Assumed for models not listed above
+DEFAULT_CONTEXT_WINDOW = 32768
+
+
+def context_window_for(model: str) -> int:
+    """Get the context window of a model from its name"""
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.startswith(prefix)]
+    if not matches:
+        return DEFAULT_CONTEXT_WINDOW
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)]
+
+
+class StreamEventType(str, Enum):
+    """Event types yielded by the streaming LLM APIs"""
+
+    TEXT = "text"
+    TOOL_CALL_DELTA = "tool_call_delta"
+    TOOL_CALL = "tool_call"
+    DONE = "done"
+
+
+class StreamEvent(BaseModel):
+    """A single event from `LLM.ask_tool_stream`.
+
+    - TEXT: `content` holds a text delta
+    - TOOL_CALL_DELTA: `index` and `content` hold an arguments delta
+    - TOOL_CALL: `tool_call` holds a fully assembled call, ready to dispatch
+    - DONE: `message` holds the complete assistant message
+    """
+
+    type: StreamEventType
+    content: Optional[str] = None
+    index: Optional[int] = None
+    tool_call: Optional[ToolCall] = None
+    message: Optional[ChatCompletionMessage] = None
+
 
 class TokenCounter:
     # Token constants
@@ -54,8 +123,19 @@ class TokenCounter:
     HIGH_DETAIL_TARGET_SHORT_SIDE = 768
     TILE_SIZE = 512
 
-    def __init__(self, tokenizer):
+    # Per-message cache constants
+    DEFAULT_CACHE_SIZE = 4096
+
+    def __init__(self, tokenizer, cache_size: int = DEFAULT_CACHE_SIZE):
         self.tokenizer = tokenizer
+        self.cache_size = cache_size
+        # LRU cache of message key -> token count, so that counting a history
+        # only encodes messages that have not been seen before
+        self._message_cache: "OrderedDict[Hashable, int]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Identifies the tokenizer in counts cached on MessageDict instances
+        self._tokenizer_key = getattr(tokenizer, "name", None) or id(tokenizer)
 
     def count_text(self, text: str) -> int:
         """Calculate tokens for a text string"""
@@ -144,32 +224,94 @@ class TokenCounter:
                 token_count += self.count_text(function.get("arguments", ""))
         return token_count
 
-    def count_message_tokens(self, messages: List[dict]) -> int:
-        """Calculate the total number of tokens in a message list"""
-        total_tokens = self.FORMAT_TOKENS  # Base format tokens
+    @staticmethod
+    def _message_key(message: dict) -> Hashable:
+        """Build a hashable cache key from the fields that contribute tokens"""
+        content = message.get("content")
+        if content is not None and not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        tool_calls = message.get("tool_calls")
+        if tool_calls is not None:
+            tool_calls = json.dumps(tool_calls, sort_keys=True, default=str)
+        return (
+            message.get("role", ""),
+            content,
+            tool_calls,
+            message.get("name", ""),
+            message.get("tool_call_id", ""),
+        )
 
-        for message in messages:
-            tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
+    def count_single_message_tokens(self, message: dict) -> int:
+        """Calculate the number of tokens in a single message"""
+        tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
+
+        # Add role tokens
+        tokens += self.count_text(message.get("role", ""))
 
-            # Add role tokens
-            tokens += self.count_text(message.get("role", ""))
+        # Add content tokens
+        if "content" in message:
+            tokens += self.count_content(message["content"])
 
-            # Add content tokens
-            if "content" in message:
-                tokens += self.count_content(message["content"])
+        # Add tool calls tokens
+        if "tool_calls" in message:
+            tokens += self.count_tool_calls(message["tool_calls"])
 
-            # Add tool calls tokens
-            if "tool_calls" in message:
-                tokens += self.count_tool_calls(message["tool_calls"])
+        # Add name and tool_call_id tokens
+        tokens += self.count_text(message.get("name", ""))
+        tokens += self.count_text(message.get("tool_call_id", ""))
 
-            # Add name and tool_call_id tokens
-            tokens += self.count_text(message.get("name", ""))
-            tokens += self.count_text(message.get("tool_call_id", ""))
+        return tokens
+
+    def count_message_tokens(self, messages: List[dict]) -> int:
+        """Calculate the total number of tokens in a message list
+
+        Token counts are cached per message, so re-counting a growing history
+        only encodes the messages added since the previous call. Messages
+        formatted from Message objects store their count on the MessageDict
+        itself.
+        """
+        total_tokens = self.FORMAT_TOKENS  # Base format tokens
+
+        for message in messages:
+            if self.cache_size <= 0:
+                total_tokens += self.count_single_message_tokens(message)
+                continue
+
+            if isinstance(message, MessageDict):
+                # Formatted memory messages carry their own count, so no key
+                # needs to be built from (possibly image-sized) content
+                tokens = message.token_counts.get(self._tokenizer_key)
+                if tokens is None:
+                    self.cache_misses += 1
+                    tokens = self.count_single_message_tokens(message)
+                    message.token_counts[self._tokenizer_key] = tokens
+                else:
+                    self.cache_hits += 1
+                total_tokens += tokens
+                continue
+
+            key = self._message_key(message)
+            tokens = self._message_cache.get(key)
+            if tokens is None:
+                self.cache_misses += 1
+                tokens = self.count_single_message_tokens(message)
+                self._message_cache[key] = tokens
+                if len(self._message_cache) > self.cache_size:
+                    self._message_cache.popitem(last=False)
+            else:
+                self.cache_hits += 1
+                self._message_cache.move_to_end(key)
 
             total_tokens += tokens
 
         return total_tokens
 
+    def clear_cache(self) -> None:
+        """Drop all cached per-message token counts"""
+        self._message_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
 
 class LLM:
     _instances: Dict[str, "LLM"] = {}
@@ -179,11 +321,17 @@ class LLM:
     ):
         # Check if we should use CodeBuddy backend
         llm_config_to_check = llm_config or config.llm
-        llm_config_to_check = llm_config_to_check.get(config_name, llm_config_to_check["default"])
+        llm_config_to_check = llm_config_to_check.get(
+            config_name, llm_config_to_check["default"]
+        )
 
         # If backend is "codebuddy", return CodeBuddyLLM instead
-        if hasattr(llm_config_to_check, "backend") and llm_config_to_check.backend == "codebuddy":
+        if (
+            hasattr(llm_config_to_check, "backend")
+            and llm_config_to_check.backend == "codebuddy"
+        ):
             from app.llm_codebuddy import CodeBuddyLLM
+
             # Create unique key for CodeBuddy instances
             codebuddy_key = f"codebuddy_{config_name}"
             if codebuddy_key not in cls._instances:
@@ -219,6 +367,9 @@ class LLM:
                 if hasattr(llm_config, "max_input_tokens")
                 else None
             )
+            self.context_window = getattr(
+                llm_config, "context_window", None
+            ) or context_window_for(self.model or "")
 
             # Initialize tokenizer
             try:
@@ -239,6 +390,7 @@ class LLM:
                 self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
 
             self.token_counter = TokenCounter(self.tokenizer)
+            self.response_cache: Optional[LLMResponseCache] = get_response_cache()
 
     def count_tokens(self, text: str) -> int:
         """Calculate the number of tokens in a text"""
@@ -277,6 +429,94 @@ class LLM:
 
         return "Token limit exceeded"
 
+    def _get_cached_response(
+        self, endpoint: str, params: dict
+    ) -> Tuple[Optional[str], Optional[Union[str, dict]]]:
+        """Look up a cached response, returning the cache key and any cached value"""
+        cache = getattr(self, "response_cache", None)
+        if cache is None:
+            return None, None
+        key = cache.make_key(endpoint, params)
+        value = cache.get(key)
+        if value is not None:
+            logger.info(
+                f"LLM response cache hit for {endpoint} "
+                f"(hits={cache.hits}, misses={cache.misses})"
+            )
+        return key, value
+
+    def _set_cached_response(self, key: Optional[str], value: Union[str, dict]) -> None:
+        """Store a response in the cache when caching is enabled"""
+        cache = getattr(self, "response_cache", None)
+        if cache is not None and key is not None:
+            cache.set(key, value)
+
+    @staticmethod
+    def _message_to_dict(message) -> dict:
+        """Serialise an OpenAI or Bedrock response message for caching"""
+        if isinstance(message, ChatCompletionMessage):
+            return message.model_dump(exclude_none=True)
+        return {
+            "role": "assistant",
+            "content": getattr(message, "content", None),
+            "tool_calls": [
+                {
+                    "id": call.id,
+                    "type": "function",
+                    "function": {
+                        "name": call.function.name,
+                        "arguments": call.function.arguments,
+                    },
+                }
+                for call in (getattr(message, "tool_calls", None) or [])
+            ]
+            or None,
+        }
+
+    @staticmethod
+    def _format_message(message: dict, supports_images: bool) -> dict:
+        """Convert a single message dict to OpenAI format, in place
+
+        Args:
+            message: Message dict, as produced by Message.to_dict()
+            supports_images: Flag indicating if the target model supports image inputs
+
+        Returns:
+            dict: The formatted message
+        """
+        # Process base64 images if present and model supports images
+        if supports_images and message.get("base64_image"):
+            # Initialize or convert content to appropriate format
+            if not message.get("content"):
+                message["content"] = []
+            elif isinstance(message["content"], str):
+                message["content"] = [{"type": "text", "text": message["content"]}]
+            elif isinstance(message["content"], list):
+                # Convert string items to proper text objects
+                message["content"] = [
+                    ({"type": "text", "text": item} if isinstance(item, str) else item)
+                    for item in message["content"]
+                ]
+
+            # Add the image to content
+            message["content"].append(
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:image/jpeg;base64,{message['base64_image']}"
+                    },
+                }
+            )
+
+            # Remove the base64_image field
+            del message["base64_image"]
+        # If model doesn't support images but message has base64_image, handle gracefully
+        elif not supports_images and message.get("base64_image"):
+            # Just remove the base64_image field and keep the text content
+            del message["base64_image"]
+
+        return message
+
     @staticmethod
     def format_messages(
         messages: List[Union[dict, Message]], supports_images: bool = False
@@ -306,58 +546,25 @@ class LLM:
         formatted_messages = []
 
         for message in messages:
-            # Convert Message objects to dictionaries
             if isinstance(message, Message):
-                message = message.to_dict()
-
-            if isinstance(message, dict):
+                # Reuse the formatted dict cached on the message; it is only
+                # rebuilt after the message changes
+                message = message.to_formatted_dict(
+                    ("openai", supports_images),
+                    lambda raw: LLM._format_message(raw, supports_images),
+                )
+            elif isinstance(message, dict):
                 # If message is a dict, ensure it has required fields
                 if "role" not in message:
                     raise ValueError("Message dict must contain 'role' field")
-
-                # Process base64 images if present and model supports images
-                if supports_images and message.get("base64_image"):
-                    # Initialize or convert content to appropriate format
-                    if not message.get("content"):
-                        message["content"] = []
-                    elif isinstance(message["content"], str):
-                        message["content"] = [
-                            {"type": "text", "text": message["content"]}
-                        ]
-                    elif isinstance(message["content"], list):
-                        # Convert string items to proper text objects
-                        message["content"] = [
-                            (
-                                {"type": "text", "text": item}
-                                if isinstance(item, str)
-                                else item
-                            )
-                            for item in message["content"]
-                        ]
-
-                    # Add the image to content
-                    message["content"].append(
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{message['base64_image']}"
-                            },
-                        }
-                    )
-
-                    # Remove the base64_image field
-                    del message["base64_image"]
-                # If model doesn't support images but message has base64_image, handle gracefully
-                elif not supports_images and message.get("base64_image"):
-                    # Just remove the base64_image field and keep the text content
-                    del message["base64_image"]
-
-                if "content" in message or "tool_calls" in message:
-                    formatted_messages.append(message)
-                # else: do not include the message
+                message = LLM._format_message(message, supports_images)
             else:
                 raise TypeError(f"Unsupported message type: {type(message)}")
 
+            if "content" in message or "tool_calls" in message:
+                formatted_messages.append(message)
+            # else: do not include the message
+
         # Validate all messages have required fields
         for msg in formatted_messages:
             if msg["role"] not in ROLE_VALUES:
@@ -372,6 +579,7 @@ class LLM:
             (OpenAIError, Exception, ValueError)
         ),  # Don't retry TokenLimitExceeded
     )
+    @limited("llm")
     async def ask(
         self,
         messages: List[Union[dict, Message]],
@@ -430,6 +638,10 @@ class LLM:
                     temperature if temperature is not None else self.temperature
                 )
 
+            cache_key, cached = self._get_cached_response("ask", params)
+            if cached is not None:
+                return cached
+
             if not stream:
                 # Non-streaming request
                 response = await self.client.chat.completions.create(
@@ -444,6 +656,9 @@ class LLM:
                     response.usage.prompt_tokens, response.usage.completion_tokens
                 )
 
+                self._set_cached_response(
+                    cache_key, response.choices[0].message.content
+                )
                 return response.choices[0].message.content
 
             # Streaming request, For streaming, update estimated token count before making the request
@@ -471,6 +686,7 @@ class LLM:
             )
             self.total_completion_tokens += completion_tokens
 
+            self._set_cached_response(cache_key, full_response)
             return full_response
 
         except TokenLimitExceeded:
@@ -499,6 +715,7 @@ class LLM:
             (OpenAIError, Exception, ValueError)
         ),  # Don't retry TokenLimitExceeded
     )
+    @limited("llm")
     async def ask_with_images(
         self,
         messages: List[Union[dict, Message]],
@@ -543,15 +760,17 @@ class LLM:
                     "The last message must be from the user to attach images"
                 )
 
-            # Process the last user message to include images
-            last_message = formatted_messages[-1]
+            # Process a copy of the last user message to include images, since
+            # formatted messages may be shared with the message cache
+            last_message = dict(formatted_messages[-1])
+            formatted_messages[-1] = last_message
 
             # Convert content to multimodal format if needed
             content = last_message["content"]
             multimodal_content = (
                 [{"type": "text", "text": content}]
                 if isinstance(content, str)
-                else content
+                else list(content)
                 if isinstance(content, list)
                 else []
             )
@@ -602,6 +821,10 @@ class LLM:
                     temperature if temperature is not None else self.temperature
                 )
 
+            cache_key, cached = self._get_cached_response("ask_with_images", params)
+            if cached is not None:
+                return cached
+
             # Handle non-streaming request
             if not stream:
                 response = await self.client.chat.completions.create(**params)
@@ -610,6 +833,9 @@ class LLM:
                     raise ValueError("Empty or invalid response from LLM")
 
                 self.update_token_count(response.usage.prompt_tokens)
+                self._set_cached_response(
+                    cache_key, response.choices[0].message.content
+                )
                 return response.choices[0].message.content
 
             # Handle streaming request
@@ -628,6 +854,7 @@ class LLM:
             if not full_response:
                 raise ValueError("Empty response from streaming LLM")
 
+            self._set_cached_response(cache_key, full_response)
             return full_response
 
         except TokenLimitExceeded:
@@ -648,6 +875,83 @@ class LLM:
             logger.error(f"Unexpected error in ask_with_images: {e}")
             raise
 
+    def _prepare_tool_request(
+        self,
+        messages: List[Union[dict, Message]],
+        system_msgs: Optional[List[Union[dict, Message]]] = None,
+        timeout: int = 300,
+        tools: Optional[List[dict]] = None,
+        tool_choice: TOOL_CHOICE_TYPE = ToolChoice.AUTO,  # type: ignore
+        temperature: Optional[float] = None,
+        **kwargs,
+    ) -> Tuple[dict, int]:
+        """
+        Format messages, check token limits and build tool request parameters.
+
+        Returns:
+            Tuple[dict, int]: Completion request parameters and estimated input tokens
+
+        Raises:
+            TokenLimitExceeded: If token limits are exceeded
+            ValueError: If tools, tool_choice, or messages are invalid
+        """
+        # Validate tool_choice
+        if tool_choice not in TOOL_CHOICE_VALUES:
+            raise ValueError(f"Invalid tool_choice: {tool_choice}")
+
+        # Check if the model supports images
+        supports_images = self.model in MULTIMODAL_MODELS
+
+        # Format messages
+        if system_msgs:
+            system_msgs = self.format_messages(system_msgs, supports_images)
+            messages = system_msgs + self.format_messages(messages, supports_images)
+        else:
+            messages = self.format_messages(messages, supports_images)
+
+        # Calculate input token count
+        input_tokens = self.count_message_tokens(messages)
+
+        # If there are tools, calculate token count for tool descriptions
+        tools_tokens = 0
+        if tools:
+            for tool in tools:
+                tools_tokens += self.count_tokens(str(tool))
+
+        input_tokens += tools_tokens
+
+        # Check if token limits are exceeded
+        if not self.check_token_limit(input_tokens):
+            error_message = self.get_limit_error_message(input_tokens)
+            # Raise a special exception that won't be retried
+            raise TokenLimitExceeded(error_message)
+
+        # Validate tools if provided
+        if tools:
+            for tool in tools:
+                if not isinstance(tool, dict) or "type" not in tool:
+                    raise ValueError("Each tool must be a dict with 'type' field")
+
+        # Set up the completion request
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "timeout": timeout,
+            **kwargs,
+        }
+
+        if self.model in REASONING_MODELS:
+            params["max_completion_tokens"] = self.max_tokens
+        else:
+            params["max_tokens"] = self.max_tokens
+            params["temperature"] = (
+                temperature if temperature is not None else self.temperature
+            )
+
+        return params, input_tokens
+
     @retry(
         wait=wait_random_exponential(min=1, max=60),
         stop=stop_after_attempt(6),
@@ -655,6 +959,7 @@ class LLM:
             (OpenAIError, Exception, ValueError)
         ),  # Don't retry TokenLimitExceeded
     )
+    @limited("llm")
     async def ask_tool(
         self,
         messages: List[Union[dict, Message]],
@@ -687,60 +992,19 @@ class LLM:
             Exception: For unexpected errors
         """
         try:
-            # Validate tool_choice
-            if tool_choice not in TOOL_CHOICE_VALUES:
-                raise ValueError(f"Invalid tool_choice: {tool_choice}")
-
-            # Check if the model supports images
-            supports_images = self.model in MULTIMODAL_MODELS
-
-            # Format messages
-            if system_msgs:
-                system_msgs = self.format_messages(system_msgs, supports_images)
-                messages = system_msgs + self.format_messages(messages, supports_images)
-            else:
-                messages = self.format_messages(messages, supports_images)
-
-            # Calculate input token count
-            input_tokens = self.count_message_tokens(messages)
-
-            # If there are tools, calculate token count for tool descriptions
-            tools_tokens = 0
-            if tools:
-                for tool in tools:
-                    tools_tokens += self.count_tokens(str(tool))
-
-            input_tokens += tools_tokens
-
-            # Check if token limits are exceeded
-            if not self.check_token_limit(input_tokens):
-                error_message = self.get_limit_error_message(input_tokens)
-                # Raise a special exception that won't be retried
-                raise TokenLimitExceeded(error_message)
-
-            # Validate tools if provided
-            if tools:
-                for tool in tools:
-                    if not isinstance(tool, dict) or "type" not in tool:
-                        raise ValueError("Each tool must be a dict with 'type' field")
-
-            # Set up the completion request
-            params = {
-                "model": self.model,
-                "messages": messages,
-                "tools": tools,
-                "tool_choice": tool_choice,
-                "timeout": timeout,
+            params, _ = self._prepare_tool_request(
+                messages,
+                system_msgs=system_msgs,
+                timeout=timeout,
+                tools=tools,
+                tool_choice=tool_choice,
+                temperature=temperature,
                 **kwargs,
-            }
+            )
 
-            if self.model in REASONING_MODELS:
-                params["max_completion_tokens"] = self.max_tokens
-            else:
-                params["max_tokens"] = self.max_tokens
-                params["temperature"] = (
-                    temperature if temperature is not None else self.temperature
-                )
+            cache_key, cached = self._get_cached_response("ask_tool", params)
+            if cached is not None:
+                return ChatCompletionMessage.model_validate(cached)
 
             params["stream"] = False  # Always use non-streaming for tool requests
             response: ChatCompletion = await self.client.chat.completions.create(
@@ -758,6 +1022,9 @@ class LLM:
                 response.usage.prompt_tokens, response.usage.completion_tokens
             )
 
+            self._set_cached_response(
+                cache_key, self._message_to_dict(response.choices[0].message)
+            )
             return response.choices[0].message
 
         except TokenLimitExceeded:
@@ -778,3 +1045,254 @@ class LLM:
         except Exception as e:
             logger.error(f"Unexpected error in ask_tool: {e}")
             raise
+
+    @limited("llm")
+    async def astream(
+        self,
+        messages: List[Union[dict, Message]],
+        system_msgs: Optional[List[Union[dict, Message]]] = None,
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a plain chat response from the LLM as text deltas.
+
+        Unlike `ask(stream=True)`, nothing is printed; the caller consumes each
+        delta as soon as it arrives. Streaming requests are not retried.
+
+        Args:
+            messages: List of conversation messages
+            system_msgs: Optional system messages to prepend
+            temperature (float): Sampling temperature for the response
+
+        Yields:
+            str: Text deltas in arrival order
+
+        Raises:
+            TokenLimitExceeded: If token limits are exceeded
+            ValueError: If messages are invalid or response is empty
+            OpenAIError: If API call fails
+        """
+        supports_images = self.model in MULTIMODAL_MODELS
+
+        if system_msgs:
+            system_msgs = self.format_messages(system_msgs, supports_images)
+            messages = system_msgs + self.format_messages(messages, supports_images)
+        else:
+            messages = self.format_messages(messages, supports_images)
+
+        input_tokens = self.count_message_tokens(messages)
+        if not self.check_token_limit(input_tokens):
+            raise TokenLimitExceeded(self.get_limit_error_message(input_tokens))
+
+        params = {"model": self.model, "messages": messages}
+        if self.model in REASONING_MODELS:
+            params["max_completion_tokens"] = self.max_tokens
+        else:
+            params["max_tokens"] = self.max_tokens
+            params["temperature"] = (
+                temperature if temperature is not None else self.temperature
+            )
+
+        if isinstance(self.client, BedrockClient):
+            # Bedrock responses are assembled client-side, emit them as one delta
+            response = await self.client.chat.completions.create(**params, stream=False)
+            if not response.choices or not response.choices[0].message.content:
+                raise ValueError("Empty or invalid response from LLM")
+            self.update_token_count(
+                response.usage.prompt_tokens, response.usage.completion_tokens
+            )
+            yield response.choices[0].message.content
+            return
+
+        self.update_token_count(input_tokens)
+        response = await self.client.chat.completions.create(**params, stream=True)
+
+        completion_text = ""
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            chunk_message = chunk.choices[0].delta.content or ""
+            if chunk_message:
+                completion_text += chunk_message
+                yield chunk_message
+
+        if not completion_text.strip():
+            raise ValueError("Empty response from streaming LLM")
+
+        self.total_completion_tokens += self.count_tokens(completion_text)
+
+    @limited("llm")
+    async def ask_tool_stream(
+        self,
+        messages: List[Union[dict, Message]],
+        system_msgs: Optional[List[Union[dict, Message]]] = None,
+        timeout: int = 300,
+        tools: Optional[List[dict]] = None,
+        tool_choice: TOOL_CHOICE_TYPE = ToolChoice.AUTO,  # type: ignore
+        temperature: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Stream a tool-enabled response from the LLM.
+
+        Text and tool-call argument deltas are yielded as they arrive. A
+        TOOL_CALL event is yielded as soon as a call's arguments form a complete
+        JSON document (or the next call starts), so the caller can dispatch it
+        before the completion finishes. The final DONE event carries the same
+        message `ask_tool` would return. Streaming requests are not retried.
+
+        Args:
+            messages: List of conversation messages
+            system_msgs: Optional system messages to prepend
+            timeout: Request timeout in seconds
+            tools: List of tools to use
+            tool_choice: Tool choice strategy
+            temperature: Sampling temperature for the response
+            **kwargs: Additional completion arguments
+
+        Yields:
+            StreamEvent: Text, tool call and completion events
+
+        Raises:
+            TokenLimitExceeded: If token limits are exceeded
+            ValueError: If tools, tool_choice, or messages are invalid
+            OpenAIError: If API call fails
+        """
+        params, input_tokens = self._prepare_tool_request(
+            messages,
+            system_msgs=system_msgs,
+            timeout=timeout,
+            tools=tools,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            **kwargs,
+        )
+
+        if isinstance(self.client, BedrockClient):
+            # Bedrock responses are assembled client-side, replay them as events
+            response = await self.client.chat.completions.create(**params, stream=False)
+            if not response.choices or not response.choices[0].message:
+                yield StreamEvent(type=StreamEventType.DONE)
+                return
+            self.update_token_count(
+                response.usage.prompt_tokens, response.usage.completion_tokens
+            )
+            message = response.choices[0].message
+            if message.content:
+                yield StreamEvent(type=StreamEventType.TEXT, content=message.content)
+            for index, call in enumerate(message.tool_calls or []):
+                yield StreamEvent(
+                    type=StreamEventType.TOOL_CALL,
+                    index=index,
+                    tool_call=ToolCall(
+                        id=call.id,
+                        function=Function(
+                            name=call.function.name,
+                            arguments=call.function.arguments,
+                        ),
+                    ),
+                )
+            yield StreamEvent(type=StreamEventType.DONE, message=message)
+            return
+
+        self.update_token_count(input_tokens)
+        response = await self.client.chat.completions.create(**params, stream=True)
+
+        content_parts: List[str] = []
+        partial_calls: Dict[int, dict] = {}
+        emitted: set = set()
+
+        def complete_call(index: int) -> Optional[StreamEvent]:
+            if index in emitted or index not in partial_calls:
+                return None
+            emitted.add(index)
+            call = partial_calls[index]
+            return StreamEvent(
+                type=StreamEventType.TOOL_CALL,
+                index=index,
+                tool_call=ToolCall(
+                    id=call["id"],
+                    function=Function(name=call["name"], arguments=call["arguments"]),
+                ),
+            )
+
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+
+            if delta.content:
+                content_parts.append(delta.content)
+                yield StreamEvent(type=StreamEventType.TEXT, content=delta.content)
+
+            for call_delta in delta.tool_calls or []:
+                index = call_delta.index
+                if index not in partial_calls:
+                    # A new call starting means every earlier call is complete
+                    for previous in sorted(partial_calls):
+                        event = complete_call(previous)
+                        if event:
+                            yield event
+                    partial_calls[index] = {
+                        "id": call_delta.id or f"call_{index}",
+                        "name": "",
+                        "arguments": "",
+                    }
+                call = partial_calls[index]
+                if call_delta.id:
+                    call["id"] = call_delta.id
+                if call_delta.function:
+                    call["name"] += call_delta.function.name or ""
+                    arguments_delta = call_delta.function.arguments or ""
+                    if arguments_delta:
+                        call["arguments"] += arguments_delta
+                        yield StreamEvent(
+                            type=StreamEventType.TOOL_CALL_DELTA,
+                            index=index,
+                            content=arguments_delta,
+                        )
+                        if _is_complete_json(call["arguments"]):
+                            event = complete_call(index)
+                            if event:
+                                yield event
+
+        for index in sorted(partial_calls):
+            event = complete_call(index)
+            if event:
+                yield event
+
+        content = "".join(content_parts)
+        tool_calls = [
+            ChatCompletionMessageToolCall(
+                id=call["id"],
+                type="function",
+                function=ChatCompletionFunction(
+                    name=call["name"], arguments=call["arguments"]
+                ),
+            )
+            for _, call in sorted(partial_calls.items())
+        ]
+        self.total_completion_tokens += self.count_tokens(content) + sum(
+            self.count_tokens(call["arguments"]) for call in partial_calls.values()
+        )
+
+        yield StreamEvent(
+            type=StreamEventType.DONE,
+            message=ChatCompletionMessage(
+                role="assistant",
+                content=content or None,
+                tool_calls=tool_calls or None,
+            ),
+        )
+
+
+def _is_complete_json(text: str) -> bool:
+    """Check whether streamed tool arguments already form a complete JSON object"""
+    text = text.rstrip()
+    if not text.endswith("}"):
+        return False
+    try:
+        json.loads(text)
+    except ValueError:
+        return False
+    return True
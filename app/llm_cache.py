@@ -0,0 +1,235 @@
+"""
+Persistent LLM response cache.
+
+Responses are stored in a local SQLite database keyed on a canonical hash of
+the request (model, messages, tools, tool_choice and temperature), so replaying
+an identical agent session can be served from disk without calling the API.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from app.config import PROJECT_ROOT, LLMCacheSettings, config
+from app.logger import logger
+
+
+# Request fields that determine the response
+CACHE_KEY_FIELDS = ("model", "messages", "tools", "tool_choice", "temperature")
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL and size-based LRU eviction.
+
+    Lookups only read the database. Access times of hits and removals of
+    expired entries are kept in memory and written in one transaction with
+    the next store, statistics call or close, or once ACCESS_FLUSH_SIZE of
+    them are pending, so a cache hit does not commit to disk.
+    """
+
+    # Pending access time updates that trigger a write
+    ACCESS_FLUSH_SIZE = 256
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: Optional[int] = None,
+        max_entries: int = 10000,
+        max_size_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._accessed: Dict[str, float] = {}
+        self._expired: Set[str] = set()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_accessed_at ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_settings(cls, settings: LLMCacheSettings) -> "LLMResponseCache":
+        """Create a cache from configuration settings"""
+        path = Path(settings.path)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        return cls(
+            path=path,
+            ttl_seconds=settings.ttl_seconds,
+            max_entries=settings.max_entries,
+            max_size_bytes=int(settings.max_size_mb * 1024 * 1024),
+        )
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """Build a canonical request fingerprint.
+
+        Args:
+            endpoint: Name of the calling API (e.g. "ask", "ask_tool")
+            params: Completion request parameters
+
+        Returns:
+            Hex digest identifying the request
+        """
+        request = {field: params.get(field) for field in CACHE_KEY_FIELDS}
+        request["endpoint"] = endpoint
+        canonical = json.dumps(
+            request, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._is_expired(row[1], now):
+                self._expired.add(key)
+                self._accessed.pop(key, None)
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._accessed[key] = now
+            self.hits += 1
+            if len(self._accessed) >= self.ACCESS_FLUSH_SIZE:
+                self._flush_accesses()
+                self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serialisable value and evict entries over the limits"""
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._expired.discard(key)
+            self._accessed.pop(key, None)
+            self._flush_accesses()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached response and reset counters"""
+        with self._lock:
+            self._accessed.clear()
+            self._expired.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and storage usage"""
+        with self._lock:
+            if self._flush_accesses():
+                self._conn.commit()
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            if self._flush_accesses():
+                self._conn.commit()
+            self._conn.close()
+
+    def _flush_accesses(self) -> bool:
+        """Write pending access times and removals, returning whether any were written"""
+        if not self._accessed and not self._expired:
+            return False
+        self._conn.executemany(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+        )
+        self._conn.executemany(
+            "DELETE FROM responses WHERE key = ?", [(key,) for key in self._expired]
+        )
+        self._accessed.clear()
+        self._expired.clear()
+        return True
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones over the limits"""
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+
+        entries, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if entries <= self.max_entries and size <= self.max_size_bytes:
+            return
+
+        evicted = []
+        for key, entry_size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ):
+            if entries <= self.max_entries and size <= self.max_size_bytes:
+                break
+            evicted.append((key,))
+            entries -= 1
+            size -= entry_size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.debug(f"Evicted {len(evicted)} cached LLM responses")
+
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Get the process-wide response cache, or None when caching is disabled"""
+    global _response_cache
+    settings = config.llm_cache
+    if not settings or not settings.enabled:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = LLMResponseCache.from_settings(settings)
+                logger.info(f"LLM response cache enabled at {_response_cache.path}")
+    return _response_cache
@@ -5,21 +5,20 @@ This module provides a CodeBuddy Agent SDK backend that implements the same
 interface as the OpenAI-based LLM class.
 """
 
-import asyncio
-import json
 from typing import Any, Dict, List, Optional, Union
 
 from openai.types.chat import ChatCompletionMessage
 
 from app.adapters.codebuddy_response import CodeBuddyResponseTranslator
-from app.adapters.codebuddy_tool_mapper import CodeBuddyToolMapper
 from app.config import LLMSettings
 from app.exceptions import TokenLimitExceeded
 from app.logger import logger
 from app.schema import TOOL_CHOICE_TYPE, Message, ToolChoice
+from app.tenancy import limited
 from app.tool.base import BaseTool
 from app.tool.tool_collection import ToolCollection
 
+
 try:
     from codebuddy_agent_sdk import (
         CodeBuddyAgentOptions,
@@ -28,19 +27,27 @@ try:
         PermissionResultAllow,
         PermissionResultDeny,
     )
+
     CODEBUDDY_AVAILABLE = True
 except ImportError:
-    logger.warning("CodeBuddy Agent SDK not installed. Install with: pip install codebuddy-agent-sdk")
+    logger.warning(
+        "CodeBuddy Agent SDK not installed. Install with: pip install codebuddy-agent-sdk"
+    )
     CODEBUDDY_AVAILABLE = False
+
     # Create mock classes for type hints
     class CodeBuddyAgentOptions:
         pass
+
     class CodeBuddySDKClient:
         pass
+
     class PermissionResult:
         pass
+
     class PermissionResultAllow:
         pass
+
     class PermissionResultDeny:
         pass
 
@@ -70,6 +77,7 @@ class CodeBuddyLLM:
             )
 
         from app.config import config
+
         llm_config = llm_config or config.llm
         llm_config = llm_config.get(config_name, llm_config["default"])
 
@@ -138,7 +146,9 @@ class CodeBuddyLLM:
             # This tells CodeBuddy which tools are available
             allowed_tool_names = list(self._tool_lookup.keys())
             options_dict["allowed_tools"] = allowed_tool_names
-            logger.info(f"Registered {len(allowed_tool_names)} tools with CodeBuddy: {allowed_tool_names}")
+            logger.info(
+                f"Registered {len(allowed_tool_names)} tools with CodeBuddy: {allowed_tool_names}"
+            )
 
         # Handle tool choice
         if tool_choice == ToolChoice.NONE:
@@ -162,7 +172,10 @@ class CodeBuddyLLM:
         Returns:
             Async function that handles tool permission and execution
         """
-        async def can_use_tool(tool_name: str, tool_input: Dict[str, Any], options: Any) -> PermissionResult:
+
+        async def can_use_tool(
+            tool_name: str, tool_input: Dict[str, Any], options: Any
+        ) -> PermissionResult:
             """
             Intercept tool calls from CodeBuddy and execute via OpenManus tools.
 
@@ -174,11 +187,15 @@ class CodeBuddyLLM:
             Returns:
                 PermissionResult indicating whether to allow or deny
             """
-            logger.info(f"🔧 can_use_tool callback invoked: tool_name='{tool_name}', tool_input={tool_input}")
+            logger.info(
+                f"🔧 can_use_tool callback invoked: tool_name='{tool_name}', tool_input={tool_input}"
+            )
 
             # Check if we have this tool in our collection
             if tool_name not in self._tool_lookup:
-                logger.warning(f"Tool '{tool_name}' not found in OpenManus tool collection. Available tools: {list(self._tool_lookup.keys())}")
+                logger.warning(
+                    f"Tool '{tool_name}' not found in OpenManus tool collection. Available tools: {list(self._tool_lookup.keys())}"
+                )
                 return PermissionResultDeny(
                     message=f"Tool '{tool_name}' is not available",
                     behavior="deny",
@@ -187,12 +204,16 @@ class CodeBuddyLLM:
             try:
                 # Execute the tool via OpenManus
                 tool = self._tool_lookup[tool_name]
-                logger.info(f"🚀 Executing tool '{tool_name}' via OpenManus with input: {tool_input}")
+                logger.info(
+                    f"🚀 Executing tool '{tool_name}' via OpenManus with input: {tool_input}"
+                )
                 result = await tool.execute(**tool_input)
 
                 # Convert result to string
                 result_str = str(result)
-                logger.info(f"✅ Executed tool '{tool_name}' via OpenManus: {result_str[:200]}...")
+                logger.info(
+                    f"✅ Executed tool '{tool_name}' via OpenManus: {result_str[:200]}..."
+                )
 
                 # Store the result in the tool input so CodeBuddy can access it
                 # CodeBuddy SDK expects the result to be available after tool execution
@@ -209,7 +230,9 @@ class CodeBuddyLLM:
                     behavior="allow",
                 )
             except Exception as e:
-                logger.error(f"❌ Error executing tool '{tool_name}': {e}", exc_info=True)
+                logger.error(
+                    f"❌ Error executing tool '{tool_name}': {e}", exc_info=True
+                )
                 return PermissionResultDeny(
                     message=f"Tool execution failed: {str(e)}",
                     behavior="deny",
@@ -328,6 +351,7 @@ class CodeBuddyLLM:
 
         return formatted_messages
 
+    @limited("llm")
     async def ask(
         self,
         messages: List[Union[dict, Message]],
@@ -355,7 +379,9 @@ class CodeBuddyLLM:
             # Format messages
             if system_msgs:
                 system_msgs = self.format_messages(system_msgs, supports_images=False)
-                messages = system_msgs + self.format_messages(messages, supports_images=False)
+                messages = system_msgs + self.format_messages(
+                    messages, supports_images=False
+                )
             else:
                 messages = self.format_messages(messages, supports_images=False)
 
@@ -386,13 +412,17 @@ class CodeBuddyLLM:
                 if message_type == "AssistantMessage":
                     # Extract text from content blocks
                     if hasattr(message, "content"):
-                        logger.info(f"AssistantMessage has {len(message.content)} content blocks")
+                        logger.info(
+                            f"AssistantMessage has {len(message.content)} content blocks"
+                        )
                         for i, block in enumerate(message.content):
                             block_type = type(block).__name__
                             logger.info(f"Block {i}: {block_type}")
                             if block_type == "TextBlock" and hasattr(block, "text"):
                                 text = block.text
-                                logger.info(f"Extracted text (len={len(text)}): {text[:100]}")
+                                logger.info(
+                                    f"Extracted text (len={len(text)}): {text[:100]}"
+                                )
                                 if stream:
                                     print(text, end="", flush=True)
                                 collected_text.append(text)
@@ -401,7 +431,9 @@ class CodeBuddyLLM:
 
                 elif message_type == "ResultMessage":
                     # Result message indicates completion
-                    logger.info(f"Result message received, collected {len(collected_text)} text blocks")
+                    logger.info(
+                        f"Result message received, collected {len(collected_text)} text blocks"
+                    )
                     if stream and collected_text:
                         print()  # Newline after streaming
                     break
@@ -424,6 +456,7 @@ class CodeBuddyLLM:
             logger.error(f"Error in CodeBuddy ask: {e}")
             raise
 
+    @limited("llm")
     async def ask_tool(
         self,
         messages: List[Union[dict, Message]],
@@ -457,7 +490,9 @@ class CodeBuddyLLM:
             # Format messages
             if system_msgs:
                 system_msgs = self.format_messages(system_msgs, supports_images=False)
-                messages = system_msgs + self.format_messages(messages, supports_images=False)
+                messages = system_msgs + self.format_messages(
+                    messages, supports_images=False
+                )
             else:
                 messages = self.format_messages(messages, supports_images=False)
 
@@ -496,7 +531,9 @@ class CodeBuddyLLM:
 
                 if tool_descriptions:
                     prompt += f"\n\n可用工具:\n" + "\n".join(tool_descriptions)
-                    logger.info(f"Added tool descriptions to prompt: {len(tool_descriptions)} tools")
+                    logger.info(
+                        f"Added tool descriptions to prompt: {len(tool_descriptions)} tools"
+                    )
 
             # Query CodeBuddy SDK
             from codebuddy_agent_sdk import query
@@ -513,9 +550,11 @@ class CodeBuddyLLM:
                         for i, block in enumerate(message.content):
                             block_type = type(block).__name__
                             if block_type == "ToolUseBlock":
-                                logger.info(f"🔧 Found ToolUseBlock {i}: tool={getattr(block, 'name', 'unknown')}, input={getattr(block, 'input', {})}")
+                                logger.info(
+                                    f"🔧 Found ToolUseBlock {i}: tool={getattr(block, 'name', 'unknown')}, input={getattr(block, 'input', {})}"
+                                )
                             elif block_type == "TextBlock":
-                                text = getattr(block, 'text', '')[:100]
+                                text = getattr(block, "text", "")[:100]
                                 logger.info(f"📝 Found TextBlock {i}: {text}...")
 
                 elif message_type == "ResultMessage":
@@ -575,9 +614,7 @@ class CodeBuddyLLM:
 
         # Ensure the last message is from the user to attach images
         if not formatted_messages or formatted_messages[-1]["role"] != "user":
-            raise ValueError(
-                "The last message must be from the user to attach images"
-            )
+            raise ValueError("The last message must be from the user to attach images")
 
         # Process the last user message to include images
         last_message = formatted_messages[-1]
@@ -651,7 +688,7 @@ class CodeBuddyLLM:
                         elif isinstance(item, str):
                             text_parts.append(item)
                     if text_parts:
-                        system_parts.append(' '.join(text_parts))
+                        system_parts.append(" ".join(text_parts))
             elif role == "user":
                 if isinstance(content, str):
                     user_messages.append(content)
@@ -664,17 +701,21 @@ class CodeBuddyLLM:
                         elif isinstance(item, str):
                             text_parts.append(item)
                     if text_parts:
-                        user_messages.append(' '.join(text_parts))
+                        user_messages.append(" ".join(text_parts))
 
         # Combine system and user messages
         prompt_parts = []
         if system_parts:
-            prompt_parts.append('\n'.join(system_parts))
+            prompt_parts.append("\n".join(system_parts))
         if user_messages:
-            prompt_parts.append('\n'.join(user_messages))
+            prompt_parts.append("\n".join(user_messages))
 
         # Return combined prompt or last user message
-        return '\n\n'.join(prompt_parts) if prompt_parts else (user_messages[-1] if user_messages else "")
+        return (
+            "\n\n".join(prompt_parts)
+            if prompt_parts
+            else (user_messages[-1] if user_messages else "")
+        )
 
     def set_tool_collection(self, tools: ToolCollection) -> None:
         """
@@ -688,4 +729,3 @@ class CodeBuddyLLM:
         self._current_tools = tools
         self._tool_lookup = {tool.name: tool for tool in tools.tools}
         logger.info(f"Set tool collection with {len(self._tool_lookup)} tools")
-
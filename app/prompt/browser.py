@@ -79,6 +79,7 @@ When you see [Current state starts here], focus on the following:
 - Interactive elements and their indices
 - Content above{content_above_placeholder} or below{content_below_placeholder} the viewport (if indicated)
 - Any action results or errors{results_placeholder}
+{elements_placeholder}
 
 For browser interactions:
 - To navigate: browser_use with action="go_to_url", url="..."
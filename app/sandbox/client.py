@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Protocol
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Protocol
 
 from app.config import SandboxSettings
 from app.sandbox.core.sandbox import DockerSandbox
+from app.tenancy import limited
 
 
 class SandboxFileOperations(Protocol):
@@ -46,6 +48,25 @@ class SandboxFileOperations(Protocol):
         """
         ...
 
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads multiple files from container in one transfer.
+
+        Args:
+            paths: File paths in container.
+
+        Returns:
+            Dict[str, str]: Mapping of path to file content.
+        """
+        ...
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes multiple files to container in one transfer.
+
+        Args:
+            files: Mapping of container path to content.
+        """
+        ...
+
 
 class BaseSandboxClient(ABC):
     """Base sandbox client interface."""
@@ -78,6 +99,14 @@ class BaseSandboxClient(ABC):
     async def write_file(self, path: str, content: str) -> None:
         """Writes file."""
 
+    @abstractmethod
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads multiple files."""
+
+    @abstractmethod
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes multiple files."""
+
     @abstractmethod
     async def cleanup(self) -> None:
         """Cleans up resources."""
@@ -107,6 +136,7 @@ class LocalSandboxClient(BaseSandboxClient):
         self.sandbox = DockerSandbox(config, volume_bindings)
         await self.sandbox.create()
 
+    @limited("sandbox")
     async def run_command(self, command: str, timeout: Optional[int] = None) -> str:
         """Runs command in sandbox.
 
@@ -124,6 +154,7 @@ class LocalSandboxClient(BaseSandboxClient):
             raise RuntimeError("Sandbox not initialized")
         return await self.sandbox.run_command(command, timeout)
 
+    @limited("sandbox")
     async def copy_from(self, container_path: str, local_path: str) -> None:
         """Copies file from container to local.
 
@@ -138,6 +169,7 @@ class LocalSandboxClient(BaseSandboxClient):
             raise RuntimeError("Sandbox not initialized")
         await self.sandbox.copy_from(container_path, local_path)
 
+    @limited("sandbox")
     async def copy_to(self, local_path: str, container_path: str) -> None:
         """Copies file from local to container.
 
@@ -152,6 +184,7 @@ class LocalSandboxClient(BaseSandboxClient):
             raise RuntimeError("Sandbox not initialized")
         await self.sandbox.copy_to(local_path, container_path)
 
+    @limited("sandbox")
     async def read_file(self, path: str) -> str:
         """Reads file from container.
 
@@ -168,6 +201,7 @@ class LocalSandboxClient(BaseSandboxClient):
             raise RuntimeError("Sandbox not initialized")
         return await self.sandbox.read_file(path)
 
+    @limited("sandbox")
     async def write_file(self, path: str, content: str) -> None:
         """Writes file to container.
 
@@ -182,6 +216,37 @@ class LocalSandboxClient(BaseSandboxClient):
             raise RuntimeError("Sandbox not initialized")
         await self.sandbox.write_file(path, content)
 
+    @limited("sandbox")
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads multiple files from container in one transfer.
+
+        Args:
+            paths: File paths in container.
+
+        Returns:
+            Mapping of path to file content.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        return await self.sandbox.read_files(paths)
+
+    @limited("sandbox")
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes multiple files to container in one transfer.
+
+        Args:
+            files: Mapping of container path to content.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        await self.sandbox.write_files(files)
+
     async def cleanup(self) -> None:
         """Cleans up resources."""
         if self.sandbox:
@@ -199,3 +264,7 @@ def create_sandbox_client() -> LocalSandboxClient:
 
 
 SANDBOX_CLIENT = create_sandbox_client()
+
+# Set while a flow runs its steps, which share the sandbox. Agent runs inside
+# it leave the cleanup to the flow, which cleans up once it is done.
+SANDBOX_HELD: ContextVar[bool] = ContextVar("sandbox_held", default=False)
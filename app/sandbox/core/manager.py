@@ -1,7 +1,9 @@
 import asyncio
+import time
 import uuid
+from collections import deque
 from contextlib import asynccontextmanager
-from typing import Dict, Optional, Set
+from typing import Deque, Dict, List, Optional, Set
 
 import docker
 from docker.errors import APIError, ImageNotFound
@@ -18,19 +20,32 @@ class SandboxManager:
     monitoring, and cleanup. Provides concurrent access control and automatic
     cleanup mechanisms for sandbox resources.
 
+    When pool_size is set, up to that many started sandboxes are kept warm per
+    SandboxSettings profile. create_sandbox hands them out without waiting for
+    container startup, release_sandbox resets and returns them to the pool, and
+    the pool is refilled in the background. Warm sandboxes count toward
+    max_sandboxes; when the limit is reached, a new sandbox replaces a warm
+    one of another profile.
+
     Attributes:
         max_sandboxes: Maximum allowed number of sandboxes.
         idle_timeout: Sandbox idle timeout in seconds.
         cleanup_interval: Cleanup check interval in seconds.
+        pool_size: Warm sandboxes kept per configuration profile.
         _sandboxes: Active sandbox instance mapping.
         _last_used: Last used time record for sandboxes.
+        _pools: Warm sandboxes keyed by configuration profile.
     """
 
+    # Number of recent acquisitions used for latency statistics
+    LATENCY_WINDOW = 1000
+
     def __init__(
         self,
         max_sandboxes: int = 100,
         idle_timeout: int = 3600,
         cleanup_interval: int = 300,
+        pool_size: int = 0,
     ):
         """Initializes sandbox manager.
 
@@ -38,10 +53,12 @@ class SandboxManager:
             max_sandboxes: Maximum sandbox count limit.
             idle_timeout: Idle timeout in seconds.
             cleanup_interval: Cleanup check interval in seconds.
+            pool_size: Warm sandboxes kept per configuration profile, 0 disables pooling.
         """
         self.max_sandboxes = max_sandboxes
         self.idle_timeout = idle_timeout
         self.cleanup_interval = cleanup_interval
+        self.pool_size = pool_size
 
         # Docker client
         self._client = docker.from_env()
@@ -55,6 +72,16 @@ class SandboxManager:
         self._global_lock = asyncio.Lock()
         self._active_operations: Set[str] = set()
 
+        # Warm pool
+        self._pools: Dict[str, List[DockerSandbox]] = {}
+        self._pool_profiles: Dict[str, str] = {}
+        self._refill_tasks: Dict[str, asyncio.Task] = {}
+        # Sandboxes being started or reset, neither active nor pooled
+        self._starting = 0
+        self._pool_hits = 0
+        self._pool_misses = 0
+        self._acquire_latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
         # Cleanup task
         self._cleanup_task: Optional[asyncio.Task] = None
         self._is_shutting_down = False
@@ -118,6 +145,9 @@ class SandboxManager:
     ) -> str:
         """Creates a new sandbox instance.
 
+        Sandboxes without volume bindings are taken from the warm pool when one
+        is available for the configuration profile.
+
         Args:
             config: Sandbox configuration.
             volume_bindings: Volume mapping configuration.
@@ -128,33 +158,230 @@ class SandboxManager:
         Raises:
             RuntimeError: If max sandbox count reached or creation fails.
         """
+        started = time.perf_counter()
+        config = config or SandboxSettings()
+        profile = self._profile_key(config) if not volume_bindings else None
+
+        if profile is not None and self.pool_size > 0:
+            sandbox_id = await self._acquire_pooled(profile, config)
+            if sandbox_id:
+                self._acquire_latencies.append(time.perf_counter() - started)
+                return sandbox_id
+            self._pool_misses += 1
+
         async with self._global_lock:
-            if len(self._sandboxes) >= self.max_sandboxes:
-                raise RuntimeError(
-                    f"Maximum number of sandboxes ({self.max_sandboxes}) reached"
-                )
+            evicted = None
+            if self._total_count() >= self.max_sandboxes:
+                evicted = self._evict_pooled()
+                if evicted is None:
+                    raise RuntimeError(
+                        f"Maximum number of sandboxes ({self.max_sandboxes}) reached"
+                    )
+
+            # Reserve the slot before awaiting so background refills see it
+            self._starting += 1
+            try:
+                if evicted is not None:
+                    await evicted.cleanup()
+
+                if not await self.ensure_image(config.image):
+                    raise RuntimeError(f"Failed to ensure Docker image: {config.image}")
+
+                sandbox_id = str(uuid.uuid4())
+                try:
+                    sandbox = DockerSandbox(config, volume_bindings)
+                    await sandbox.create()
+
+                    self._register(sandbox_id, sandbox, profile)
+
+                    logger.info(f"Created sandbox {sandbox_id}")
+                    self._acquire_latencies.append(time.perf_counter() - started)
+                    return sandbox_id
+
+                except Exception as e:
+                    logger.error(f"Failed to create sandbox: {e}")
+                    if sandbox_id in self._sandboxes:
+                        await self.delete_sandbox(sandbox_id)
+                    raise RuntimeError(f"Failed to create sandbox: {e}")
+            finally:
+                self._starting -= 1
+
+    async def _acquire_pooled(
+        self, profile: str, config: SandboxSettings
+    ) -> Optional[str]:
+        """Takes a warm sandbox from the pool and schedules a refill.
+
+        Args:
+            profile: Configuration profile key.
+            config: Sandbox configuration used for refilling.
+
+        Returns:
+            Optional[str]: Sandbox ID, or None if the pool is empty.
+
+        Raises:
+            RuntimeError: If max sandbox count reached.
+        """
+        async with self._global_lock:
+            pool = self._pools.get(profile)
+            if not pool:
+                sandbox_id = None
+            else:
+                # Already counted toward max_sandboxes while pooled
+                sandbox_id = str(uuid.uuid4())
+                self._register(sandbox_id, pool.pop(), profile)
+                self._pool_hits += 1
+                logger.info(f"Acquired sandbox {sandbox_id} from warm pool")
+
+        # The first request for a profile starts its pool
+        self._schedule_refill(profile, config)
+        return sandbox_id
+
+    def _register(
+        self, sandbox_id: str, sandbox: DockerSandbox, profile: Optional[str]
+    ) -> None:
+        """Records a sandbox as active. Must be called with the global lock held."""
+        self._sandboxes[sandbox_id] = sandbox
+        self._last_used[sandbox_id] = asyncio.get_event_loop().time()
+        self._locks[sandbox_id] = asyncio.Lock()
+        if profile is not None:
+            self._pool_profiles[sandbox_id] = profile
+
+    @staticmethod
+    def _profile_key(config: SandboxSettings) -> str:
+        """Builds the pool key identifying interchangeable sandboxes."""
+        return config.model_dump_json()
+
+    def _pooled_count(self) -> int:
+        return sum(len(pool) for pool in self._pools.values())
+
+    def _total_count(self) -> int:
+        """Active, warm, starting and resetting sandboxes, limited by max_sandboxes."""
+        return len(self._sandboxes) + self._pooled_count() + self._starting
+
+    def _evict_pooled(self) -> Optional[DockerSandbox]:
+        """Removes a warm sandbox from the largest pool to make room.
+
+        Must be called with the global lock held.
+
+        Returns:
+            Optional[DockerSandbox]: The removed sandbox, to be cleaned up, or
+                None if no sandbox is pooled.
+        """
+        pool = max(self._pools.values(), key=len, default=None)
+        if not pool:
+            return None
+        logger.info("Replacing a warm sandbox to stay within max_sandboxes")
+        return pool.pop()
+
+    def _schedule_refill(self, profile: str, config: SandboxSettings) -> None:
+        """Starts a background refill of a profile's pool if none is running."""
+        if self.pool_size <= 0 or self._is_shutting_down:
+            return
+        task = self._refill_tasks.get(profile)
+        if task and not task.done():
+            return
+        self._refill_tasks[profile] = asyncio.create_task(
+            self._refill_pool(profile, config)
+        )
 
-            config = config or SandboxSettings()
+    async def _refill_pool(self, profile: str, config: SandboxSettings) -> None:
+        """Creates sandboxes until the profile's pool is full.
+
+        Containers are started outside the global lock so that acquisitions
+        are not blocked while the pool fills.
+
+        Args:
+            profile: Configuration profile key.
+            config: Sandbox configuration.
+        """
+        pool = self._pools.setdefault(profile, [])
+        try:
             if not await self.ensure_image(config.image):
-                raise RuntimeError(f"Failed to ensure Docker image: {config.image}")
+                return
+            while (
+                not self._is_shutting_down
+                and len(pool) < self.pool_size
+                and self._total_count() < self.max_sandboxes
+            ):
+                self._starting += 1
+                try:
+                    sandbox = DockerSandbox(config)
+                    await sandbox.create()
+                finally:
+                    self._starting -= 1
+                if self._is_shutting_down:
+                    await sandbox.cleanup()
+                    return
+                pool.append(sandbox)
+                logger.debug(f"Warm pool refilled ({len(pool)}/{self.pool_size})")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to refill sandbox pool: {e}")
 
-            sandbox_id = str(uuid.uuid4())
-            try:
-                sandbox = DockerSandbox(config, volume_bindings)
-                await sandbox.create()
+    async def warm_pool(self, config: Optional[SandboxSettings] = None) -> int:
+        """Fills the warm pool for a configuration profile and waits for it.
 
-                self._sandboxes[sandbox_id] = sandbox
-                self._last_used[sandbox_id] = asyncio.get_event_loop().time()
-                self._locks[sandbox_id] = asyncio.Lock()
+        Args:
+            config: Sandbox configuration.
 
-                logger.info(f"Created sandbox {sandbox_id}")
-                return sandbox_id
+        Returns:
+            int: Number of warm sandboxes available for the profile.
+        """
+        config = config or SandboxSettings()
+        profile = self._profile_key(config)
+        self._schedule_refill(profile, config)
+        task = self._refill_tasks.get(profile)
+        if task:
+            await task
+        return len(self._pools.get(profile, []))
 
-            except Exception as e:
-                logger.error(f"Failed to create sandbox: {e}")
-                if sandbox_id in self._sandboxes:
-                    await self.delete_sandbox(sandbox_id)
-                raise RuntimeError(f"Failed to create sandbox: {e}")
+    async def release_sandbox(self, sandbox_id: str) -> None:
+        """Releases a sandbox, recycling it into the warm pool when possible.
+
+        The sandbox is reset before being pooled; sandboxes that fail to reset,
+        have volume bindings, or do not fit in the pool are deleted. A sandbox
+        that fails to reset is replaced by a fresh one in the background.
+
+        Args:
+            sandbox_id: Sandbox ID.
+        """
+        profile = self._pool_profiles.get(sandbox_id)
+        pool = self._pools.get(profile) if profile is not None else None
+        if (
+            pool is None
+            or len(pool) >= self.pool_size
+            or self._is_shutting_down
+            or sandbox_id in self._active_operations
+        ):
+            await self.delete_sandbox(sandbox_id)
+            return
+
+        async with self._global_lock:
+            sandbox = self._sandboxes.pop(sandbox_id, None)
+            self._last_used.pop(sandbox_id, None)
+            self._locks.pop(sandbox_id, None)
+            self._pool_profiles.pop(sandbox_id, None)
+        if sandbox is None:
+            return
+
+        # Still counted toward max_sandboxes while it is reset
+        self._starting += 1
+        try:
+            await sandbox.reset()
+        except Exception as e:
+            logger.warning(f"Failed to reset sandbox {sandbox_id}, discarding: {e}")
+            await sandbox.cleanup()
+            self._schedule_refill(profile, sandbox.config)
+            return
+        finally:
+            self._starting -= 1
+
+        if len(pool) < self.pool_size and not self._is_shutting_down:
+            pool.append(sandbox)
+            logger.info(f"Returned sandbox {sandbox_id} to warm pool")
+        else:
+            await sandbox.cleanup()
 
     async def get_sandbox(self, sandbox_id: str) -> DockerSandbox:
         """Gets a sandbox instance.
@@ -216,15 +443,26 @@ class SandboxManager:
             except (asyncio.CancelledError, asyncio.TimeoutError):
                 pass
 
-        # Get all sandbox IDs to clean up
+        # Stop pool refills
+        refill_tasks = list(self._refill_tasks.values())
+        for task in refill_tasks:
+            task.cancel()
+        if refill_tasks:
+            await asyncio.gather(*refill_tasks, return_exceptions=True)
+
+        # Get all sandbox IDs and warm sandboxes to clean up
         async with self._global_lock:
             sandbox_ids = list(self._sandboxes.keys())
+            pooled = [sandbox for pool in self._pools.values() for sandbox in pool]
+            self._pools.clear()
 
         # Concurrently clean up all sandboxes
         cleanup_tasks = []
         for sandbox_id in sandbox_ids:
             task = asyncio.create_task(self._safe_delete_sandbox(sandbox_id))
             cleanup_tasks.append(task)
+        for sandbox in pooled:
+            cleanup_tasks.append(asyncio.create_task(sandbox.cleanup()))
 
         if cleanup_tasks:
             # Wait for all cleanup tasks to complete, with timeout to avoid infinite waiting
@@ -238,6 +476,8 @@ class SandboxManager:
         self._last_used.clear()
         self._locks.clear()
         self._active_operations.clear()
+        self._pool_profiles.clear()
+        self._refill_tasks.clear()
 
         logger.info("Manager cleanup completed")
 
@@ -271,6 +511,7 @@ class SandboxManager:
                     self._sandboxes.pop(sandbox_id, None)
                     self._last_used.pop(sandbox_id, None)
                     self._locks.pop(sandbox_id, None)
+                    self._pool_profiles.pop(sandbox_id, None)
                     logger.info(f"Deleted sandbox {sandbox_id}")
         except Exception as e:
             logger.error(f"Error during cleanup of sandbox {sandbox_id}: {e}")
@@ -300,9 +541,14 @@ class SandboxManager:
     def get_stats(self) -> Dict:
         """Gets manager statistics.
 
+        Acquisition latencies are in seconds and cover the most recent
+        create_sandbox calls.
+
         Returns:
             Dict: Statistics information.
         """
+        lookups = self._pool_hits + self._pool_misses
+        latencies = sorted(self._acquire_latencies)
         return {
             "total_sandboxes": len(self._sandboxes),
             "active_operations": len(self._active_operations),
@@ -310,4 +556,16 @@ class SandboxManager:
             "idle_timeout": self.idle_timeout,
             "cleanup_interval": self.cleanup_interval,
             "is_shutting_down": self._is_shutting_down,
+            "pool_size": self.pool_size,
+            "pooled_sandboxes": self._pooled_count(),
+            "pool_hits": self._pool_hits,
+            "pool_misses": self._pool_misses,
+            "pool_hit_rate": self._pool_hits / lookups if lookups else 0.0,
+            "acquire_latency_avg": (
+                sum(latencies) / len(latencies) if latencies else 0.0
+            ),
+            "acquire_latency_p95": (
+                latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+            ),
+            "acquire_latency_max": latencies[-1] if latencies else 0.0,
         }
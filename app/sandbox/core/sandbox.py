@@ -4,7 +4,7 @@ import os
 import tarfile
 import tempfile
 import uuid
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import docker
 from docker.errors import NotFound
@@ -45,6 +45,8 @@ class DockerSandbox:
         self.client = docker.from_env()
         self.container: Optional[Container] = None
         self.terminal: Optional[AsyncDockerizedTerminal] = None
+        # Filesystem changes of the freshly started container, outside work_dir
+        self._initial_changes: Optional[Set[Tuple[str, int]]] = None
 
     async def create(self) -> "DockerSandbox":
         """Creates and starts the sandbox container.
@@ -95,6 +97,7 @@ class DockerSandbox:
                 # Ensure Python output is not buffered
             )
             await self.terminal.init()
+            self._initial_changes = await self._filesystem_changes()
 
             return self
 
@@ -102,6 +105,64 @@ class DockerSandbox:
             await self.cleanup()  # Ensure resources are cleaned up
             raise RuntimeError(f"Failed to create sandbox: {e}") from e
 
+    async def reset(self) -> None:
+        """Restores a running sandbox to a clean state for reuse.
+
+        Kills every process started in the container, empties the working
+        directory and opens a fresh terminal session. Files added, changed or
+        removed outside the working directory cannot be restored, so a sandbox
+        with such changes fails to reset and must be recreated instead.
+
+        Raises:
+            RuntimeError: If sandbox not initialized or the reset fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+
+        # Kill everything but the container's init process, including
+        # background jobs, before the shell can save any state on exit
+        await asyncio.to_thread(self.container.exec_run, ["sh", "-c", "kill -9 -1"])
+
+        if self.terminal:
+            await self.terminal.close()
+            self.terminal = None
+
+        result = await asyncio.to_thread(
+            self.container.exec_run,
+            ["find", self.config.work_dir, "-mindepth", "1", "-delete"],
+        )
+        if result.exit_code != 0:
+            raise RuntimeError(
+                f"Failed to clear working directory: {result.output.decode('utf-8')}"
+            )
+
+        if await self._filesystem_changes() != self._initial_changes:
+            raise RuntimeError(
+                "Sandbox has filesystem changes outside its working directory"
+            )
+
+        self.terminal = AsyncDockerizedTerminal(
+            self.container.id,
+            self.config.work_dir,
+            env_vars={"PYTHONUNBUFFERED": "1"},
+        )
+        await self.terminal.init()
+
+    async def _filesystem_changes(self) -> Set[Tuple[str, int]]:
+        """Gets the container's filesystem changes outside the working directory.
+
+        Returns:
+            Set of (path, kind) pairs as reported by Docker.
+        """
+        changes = await asyncio.to_thread(self.container.diff) or []
+        work_dir = self.config.work_dir.rstrip("/")
+        return {
+            (change["Path"], change["Kind"])
+            for change in changes
+            if change["Path"] != work_dir
+            and not change["Path"].startswith(work_dir + "/")
+        }
+
     def _prepare_volume_bindings(self) -> Dict[str, Dict[str, str]]:
         """Prepares volume binding configuration.
 
@@ -229,6 +290,98 @@ class DockerSandbox:
         except Exception as e:
             raise RuntimeError(f"Failed to write file: {e}")
 
+    async def read_files(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Reads multiple files from the container in a single transfer.
+
+        The files are packed into one tar stream inside the container instead
+        of fetching an archive per file.
+
+        Args:
+            paths: File paths.
+
+        Returns:
+            Mapping of each requested path to its contents.
+
+        Raises:
+            FileNotFoundError: If any of the files does not exist.
+            RuntimeError: If read operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+
+        paths = list(paths)
+        if not paths:
+            return {}
+
+        try:
+            members = {
+                os.path.normpath(self._safe_resolve_path(path)).lstrip("/"): path
+                for path in paths
+            }
+            result = await asyncio.to_thread(
+                self.container.exec_run,
+                ["tar", "-cf", "-", "-C", "/", "--", *members],
+                demux=True,
+            )
+            stdout, stderr = result.output
+
+            contents = {}
+            if stdout:
+                with tarfile.open(fileobj=io.BytesIO(stdout)) as tar:
+                    for member in tar:
+                        if member.name in members and member.isfile():
+                            data = tar.extractfile(member).read()
+                            contents[members[member.name]] = data.decode("utf-8")
+
+            missing = [path for path in paths if path not in contents]
+            if missing:
+                raise FileNotFoundError(f"Files not found: {', '.join(missing)}")
+            return contents
+
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to read files: {e}")
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes multiple files to the container in a single transfer.
+
+        All files are packed into one tar archive that also carries their parent
+        directories, so no separate mkdir command is needed.
+
+        Args:
+            files: Mapping of target paths to file contents.
+
+        Raises:
+            RuntimeError: If write operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+
+        if not files:
+            return
+
+        try:
+            resolved = {
+                os.path.normpath(self._safe_resolve_path(path)): content.encode("utf-8")
+                for path, content in files.items()
+            }
+            root = os.path.commonpath([os.path.dirname(path) for path in resolved])
+            tar_stream = await asyncio.to_thread(
+                self._create_multi_tar_stream, root, resolved
+            )
+
+            try:
+                await asyncio.to_thread(self.container.put_archive, root, tar_stream)
+            except NotFound:
+                # The archive root itself must exist before extraction
+                await self.run_command(f"mkdir -p {root}")
+                tar_stream.seek(0)
+                await asyncio.to_thread(self.container.put_archive, root, tar_stream)
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to write files: {e}")
+
     def _safe_resolve_path(self, path: str) -> str:
         """Safely resolves container path, preventing path traversal.
 
@@ -393,6 +546,42 @@ class DockerSandbox:
         tar_stream.seek(0)
         return tar_stream
 
+    @staticmethod
+    def _create_multi_tar_stream(root: str, files: Dict[str, bytes]) -> io.BytesIO:
+        """Creates a tar stream holding several files relative to a root.
+
+        Args:
+            root: Directory the archive will be extracted into.
+            files: Mapping of absolute file paths under root to contents.
+
+        Returns:
+            Tar file stream including entries for intermediate directories.
+        """
+        directories: List[str] = []
+        seen = set()
+        for path in files:
+            parent = os.path.relpath(os.path.dirname(path), root)
+            parts = [] if parent == "." else parent.split(os.sep)
+            for depth in range(1, len(parts) + 1):
+                directory = "/".join(parts[:depth])
+                if directory not in seen:
+                    seen.add(directory)
+                    directories.append(directory)
+
+        tar_stream = io.BytesIO()
+        with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+            for directory in directories:
+                tarinfo = tarfile.TarInfo(name=directory)
+                tarinfo.type = tarfile.DIRTYPE
+                tarinfo.mode = 0o755
+                tar.addfile(tarinfo)
+            for path, content in files.items():
+                tarinfo = tarfile.TarInfo(name=os.path.relpath(path, root))
+                tarinfo.size = len(content)
+                tar.addfile(tarinfo, io.BytesIO(content))
+        tar_stream.seek(0)
+        return tar_stream
+
     @staticmethod
     async def _read_from_tar(tar_stream) -> bytes:
         """Reads file content from a tar stream.
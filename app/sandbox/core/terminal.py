@@ -17,6 +17,9 @@ from docker.models.containers import Container
 
 
 class DockerSession:
+    # Bytes requested from the socket per read
+    RECV_SIZE = 65536
+
     def __init__(self, container_id: str) -> None:
         """Initializes a Docker session.
 
@@ -28,6 +31,18 @@ class DockerSession:
         self.exec_id = None
         self.socket = None
 
+    async def _recv(self) -> bytes:
+        """Receives the next chunk from the socket without blocking the event loop.
+
+        Returns:
+            Received bytes, or empty bytes once the connection is closed.
+        """
+        return await asyncio.get_running_loop().sock_recv(self.socket, self.RECV_SIZE)
+
+    async def _send(self, data: bytes) -> None:
+        """Sends data to the socket without blocking the event loop."""
+        await asyncio.get_running_loop().sock_sendall(self.socket, data)
+
     async def create(self, working_dir: str, env_vars: Dict[str, str]) -> None:
         """Creates an interactive session with the container.
 
@@ -47,7 +62,8 @@ class DockerSession:
             "exec bash --norc --noprofile",
         ]
 
-        exec_data = self.api.exec_create(
+        exec_data = await asyncio.to_thread(
+            self.api.exec_create,
             self.container_id,
             startup_command,
             stdin=True,
@@ -60,8 +76,13 @@ class DockerSession:
         )
         self.exec_id = exec_data["Id"]
 
-        socket_data = self.api.exec_start(
-            self.exec_id, socket=True, tty=True, stream=True, demux=True
+        socket_data = await asyncio.to_thread(
+            self.api.exec_start,
+            self.exec_id,
+            socket=True,
+            tty=True,
+            stream=True,
+            demux=True,
         )
 
         if hasattr(socket_data, "_sock"):
@@ -83,7 +104,7 @@ class DockerSession:
             if self.socket:
                 # Send exit command to close bash session
                 try:
-                    self.socket.sendall(b"exit\n")
+                    await asyncio.wait_for(self._send(b"exit\n"), 1)
                     # Allow time for command execution
                     await asyncio.sleep(0.1)
                 except:
@@ -101,7 +122,9 @@ class DockerSession:
             if self.exec_id:
                 try:
                     # Check exec instance status
-                    exec_inspect = self.api.exec_inspect(self.exec_id)
+                    exec_inspect = await asyncio.to_thread(
+                        self.api.exec_inspect, self.exec_id
+                    )
                     if exec_inspect.get("Running", False):
                         # If still running, wait for it to complete
                         await asyncio.sleep(0.5)
@@ -123,17 +146,16 @@ class DockerSession:
         Raises:
             socket.error: If socket communication fails.
         """
-        buffer = b""
-        while b"$ " not in buffer:
-            try:
-                chunk = self.socket.recv(4096)
-                if chunk:
-                    buffer += chunk
-            except socket.error as e:
-                if e.errno == socket.EWOULDBLOCK:
-                    await asyncio.sleep(0.1)
-                    continue
-                raise
+        buffer = bytearray()
+        while True:
+            # Only the new chunk (plus one byte of overlap) can complete the prompt
+            scan_from = max(0, len(buffer) - 1)
+            chunk = await self._recv()
+            if not chunk:
+                break
+            buffer += chunk
+            if buffer.find(b"$ ", scan_from) != -1:
+                break
         return buffer.decode("utf-8")
 
     async def execute(self, command: str, timeout: Optional[int] = None) -> str:
@@ -157,24 +179,26 @@ class DockerSession:
             # Sanitize command to prevent shell injection
             sanitized_command = self._sanitize_command(command)
             full_command = f"{sanitized_command}\necho $?\n"
-            self.socket.sendall(full_command.encode())
+            await self._send(full_command.encode())
 
             async def read_output() -> str:
-                buffer = b""
+                # Holds only the trailing partial line; complete lines are
+                # consumed as they arrive so old data is never re-scanned
+                buffer = bytearray()
                 result_lines = []
                 command_sent = False
 
                 while True:
-                    try:
-                        chunk = self.socket.recv(4096)
-                        if not chunk:
-                            break
+                    chunk = await self._recv()
+                    if not chunk:
+                        break
 
-                        buffer += chunk
-                        lines = buffer.split(b"\n")
-
-                        buffer = lines[-1]
-                        lines = lines[:-1]
+                    new_data_at = len(buffer)
+                    buffer += chunk
+                    last_newline = buffer.rfind(b"\n", new_data_at)
+                    if last_newline != -1:
+                        lines = bytes(buffer[:last_newline]).split(b"\n")
+                        del buffer[: last_newline + 1]
 
                         for line in lines:
                             line = line.rstrip(b"\r")
@@ -189,14 +213,8 @@ class DockerSession:
                             if line.strip():
                                 result_lines.append(line)
 
-                        if buffer.endswith(b"$ "):
-                            break
-
-                    except socket.error as e:
-                        if e.errno == socket.EWOULDBLOCK:
-                            await asyncio.sleep(0.1)
-                            continue
-                        raise
+                    if buffer.endswith(b"$ "):
+                        break
 
                 output = b"\n".join(result_lines).decode("utf-8")
                 output = re.sub(r"\n\$ echo \$\$?.*$", "", output)
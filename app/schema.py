@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import Any, List, Literal, Optional, Union
+from typing import Any, Callable, Dict, Hashable, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Role(str, Enum):
@@ -38,6 +38,29 @@ class AgentState(str, Enum):
     ERROR = "ERROR"
 
 
+class AgentEventType(str, Enum):
+    """Events an agent reports while it runs"""
+
+    THOUGHT = "thought"
+    TOOL_START = "tool_start"
+    TOOL_RESULT = "tool_result"
+    STEP = "step"
+    FINAL = "final"
+
+
+class AgentEvent(BaseModel):
+    """An event reported by a running agent.
+
+    For tool events, content holds the call arguments or the observation.
+    """
+
+    type: AgentEventType
+    step: int
+    content: str = ""
+    tool_name: Optional[str] = None
+    tool_call_id: Optional[str] = None
+
+
 class Function(BaseModel):
     name: str
     arguments: str
@@ -51,8 +74,41 @@ class ToolCall(BaseModel):
     function: Function
 
 
+class MessageDict(dict):
+    """A serialized message cached on its Message and shared between memory,
+    LLM.format_messages and TokenCounter. Treat instances as read-only; copy
+    with dict() before modifying.
+    """
+
+    __slots__ = ("token_counts",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Token count per tokenizer, filled in by TokenCounter
+        self.token_counts: Dict[Hashable, int] = {}
+
+
+class _SerializedMessage:
+    """Serialized forms of a Message, replaced whenever one of its fields is set"""
+
+    __slots__ = ("raw", "formatted")
+
+    def __init__(self):
+        self.raw: Optional[dict] = None
+        self.formatted: Dict[Hashable, MessageDict] = {}
+
+    def __eq__(self, other) -> bool:
+        # Cached forms are derived data and never affect Message equality
+        return isinstance(other, _SerializedMessage)
+
+
 class Message(BaseModel):
-    """Represents a chat message in the conversation"""
+    """Represents a chat message in the conversation
+
+    Serialized forms are cached on the message and dropped when a field is
+    assigned. Nested objects (e.g. tool call arguments) must not be mutated in
+    place once the message has been serialized.
+    """
 
     role: ROLE_TYPE = Field(...)  # type: ignore
     content: Optional[str] = Field(default=None)
@@ -61,6 +117,21 @@ class Message(BaseModel):
     tool_call_id: Optional[str] = Field(default=None)
     base64_image: Optional[str] = Field(default=None)
 
+    _serialized: _SerializedMessage = PrivateAttr(default_factory=_SerializedMessage)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in Message.model_fields:
+            self._serialized = _SerializedMessage()
+
+    def model_copy(
+        self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False
+    ) -> "Message":
+        copy = super().model_copy(update=update, deep=deep)
+        # Fields set through update bypass __setattr__
+        copy._serialized = _SerializedMessage()
+        return copy
+
     def __add__(self, other) -> List["Message"]:
         """支持 Message + list 或 Message + Message 的操作"""
         if isinstance(other, list):
@@ -83,18 +154,41 @@ class Message(BaseModel):
 
     def to_dict(self) -> dict:
         """Convert message to dictionary format"""
-        message = {"role": self.role}
-        if self.content is not None:
-            message["content"] = self.content
-        if self.tool_calls is not None:
-            message["tool_calls"] = [tool_call.dict() for tool_call in self.tool_calls]
-        if self.name is not None:
-            message["name"] = self.name
-        if self.tool_call_id is not None:
-            message["tool_call_id"] = self.tool_call_id
-        if self.base64_image is not None:
-            message["base64_image"] = self.base64_image
-        return message
+        serialized = self._serialized
+        if serialized.raw is None:
+            message = {"role": self.role}
+            if self.content is not None:
+                message["content"] = self.content
+            if self.tool_calls is not None:
+                message["tool_calls"] = [
+                    tool_call.model_dump() for tool_call in self.tool_calls
+                ]
+            if self.name is not None:
+                message["name"] = self.name
+            if self.tool_call_id is not None:
+                message["tool_call_id"] = self.tool_call_id
+            if self.base64_image is not None:
+                message["base64_image"] = self.base64_image
+            serialized.raw = message
+        # Callers may modify the returned dict, so hand out a shallow copy
+        return dict(serialized.raw)
+
+    def to_formatted_dict(
+        self, key: Hashable, formatter: Callable[[dict], dict]
+    ) -> MessageDict:
+        """Get the message serialized by formatter, cached under key until the
+        message changes
+
+        Args:
+            key: Identifies the formatter and its options
+            formatter: Converts the output of to_dict() into the target format
+        """
+        serialized = self._serialized
+        formatted = serialized.formatted.get(key)
+        if formatted is None:
+            formatted = MessageDict(formatter(self.to_dict()))
+            serialized.formatted[key] = formatted
+        return formatted
 
     @classmethod
     def user_message(
@@ -163,16 +257,25 @@ class Memory(BaseModel):
     def add_message(self, message: Message) -> None:
         """Add a message to memory"""
         self.messages.append(message)
-        # Optional: Implement message limit
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages :]
+        self._trim()
 
     def add_messages(self, messages: List[Message]) -> None:
         """Add multiple messages to memory"""
         self.messages.extend(messages)
-        # Optional: Implement message limit
+        self._trim()
+
+    def _trim(self) -> None:
+        """Drop the oldest messages beyond max_messages"""
         if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages :]
+            del self.messages[: -self.max_messages]
+            # Tool results whose tool call was dropped would be rejected by the API
+            orphans = 0
+            while (
+                orphans < len(self.messages)
+                and self.messages[orphans].role == Role.TOOL
+            ):
+                orphans += 1
+            del self.messages[:orphans]
 
     def clear(self) -> None:
         """Clear all messages"""
@@ -0,0 +1,123 @@
+"""Per-tenant caps on concurrent LLM and sandbox usage."""
+
+import asyncio
+import functools
+import inspect
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Dict, FrozenSet, Optional, Tuple
+
+
+class TenantLimits:
+    """Caps on the concurrent calls one tenant makes to each limited resource.
+
+    A call to a resource without a cap is not limited.
+
+    Attributes:
+        tenant: Name of the tenant.
+        limits: Maximum concurrent calls by resource name, such as "llm" or "sandbox".
+    """
+
+    def __init__(self, tenant: str, limits: Dict[str, int]):
+        self.tenant = tenant
+        self.limits = dict(limits)
+        self._semaphores = {
+            resource: asyncio.Semaphore(max(1, limit))
+            for resource, limit in self.limits.items()
+        }
+        self._in_use: Counter = Counter()
+        self._throttled: Counter = Counter()
+
+    @asynccontextmanager
+    async def slot(self, resource: str) -> AsyncIterator[None]:
+        """Hold one of the tenant's slots for resource, waiting for a free one."""
+        semaphore = self._semaphores.get(resource)
+        if semaphore is None:
+            yield
+            return
+        if semaphore.locked():
+            self._throttled[resource] += 1
+        async with semaphore:
+            self._in_use[resource] += 1
+            try:
+                yield
+            finally:
+                self._in_use[resource] -= 1
+
+    def get_stats(self) -> Dict:
+        """Gets the calls in use and the calls that had to wait, by resource.
+
+        Returns:
+            Dict: Statistics information.
+        """
+        return {
+            resource: {
+                "limit": limit,
+                "in_use": self._in_use[resource],
+                "throttled": self._throttled[resource],
+            }
+            for resource, limit in self.limits.items()
+        }
+
+
+# Limits of the tenant the running request belongs to. Tasks started by the
+# request inherit it, so calls deep inside an agent need no extra arguments.
+CURRENT_TENANT: ContextVar[Optional[TenantLimits]] = ContextVar(
+    "current_tenant", default=None
+)
+
+# Slots held by the running call, as (task, resource) pairs. Tasks started
+# inside a call inherit them but do not match, so they still take their own.
+_HELD_SLOTS: ContextVar[FrozenSet[Tuple[asyncio.Task, str]]] = ContextVar(
+    "held_slots", default=frozenset()
+)
+
+
+@asynccontextmanager
+async def usage_slot(resource: str) -> AsyncIterator[None]:
+    """Hold a slot of the current tenant for resource; a no-op outside tenants.
+
+    Re-entrant within a task: a call nested in one already holding the slot,
+    such as a tool asking the LLM while the LLM call that ran it is pending,
+    reuses that slot instead of waiting on itself.
+    """
+    limits = CURRENT_TENANT.get()
+    held = (asyncio.current_task(), resource)
+    if limits is None or held in _HELD_SLOTS.get():
+        yield
+        return
+    async with limits.slot(resource):
+        token = _HELD_SLOTS.set(_HELD_SLOTS.get() | {held})
+        try:
+            yield
+        finally:
+            _HELD_SLOTS.reset(token)
+
+
+def limited(resource: str) -> Callable:
+    """Decorator holding a slot of the current tenant for resource during each call.
+
+    Works on coroutine functions and on async generators, which hold the slot
+    until they are exhausted or closed.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def generator_wrapper(*args, **kwargs):
+                async with usage_slot(resource):
+                    async for item in func(*args, **kwargs):
+                        yield item
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with usage_slot(resource):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
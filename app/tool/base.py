@@ -88,12 +88,15 @@ class BaseTool(ABC, BaseModel):
         name (str): Tool name
         description (str): Tool description
         parameters (dict): Tool parameters schema
+        parallel_safe (bool): Whether calls may run concurrently with other tools
         _schemas (Dict[str, List[ToolSchema]]): Registered method schemas
     """
 
     name: str
     description: str
     parameters: Optional[dict] = None
+    # Side-effect-free tools may run concurrently with other parallel-safe calls
+    parallel_safe: bool = False
     # _schemas: Dict[str, List[ToolSchema]] = {}
 
     class Config:
@@ -121,6 +124,14 @@ class BaseTool(ABC, BaseModel):
     async def execute(self, **kwargs) -> Any:
         """Execute the tool with given parameters."""
 
+    def is_parallel_safe(self, **kwargs) -> bool:
+        """Check whether a call with the given arguments may run concurrently.
+
+        Tools whose safety depends on the arguments (e.g. read-only commands)
+        can override this; by default it returns `parallel_safe`.
+        """
+        return self.parallel_safe
+
     def to_param(self) -> Dict:
         """Convert tool to function call format.
 
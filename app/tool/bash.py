@@ -1,6 +1,9 @@
 import asyncio
+import codecs
+import inspect
 import os
-from typing import Optional
+import signal
+from typing import Awaitable, Callable, List, Optional, Union
 
 from app.exceptions import ToolError
 from app.tool.base import BaseTool, CLIResult
@@ -13,6 +16,71 @@ _BASH_DESCRIPTION = """Execute a bash command in the terminal.
 """
 
 
+class _OutputBuffer:
+    """Accumulates a pipe's output and locates the sentinel incrementally.
+
+    Only newly arrived bytes (plus a sentinel-sized overlap) are scanned, so
+    detecting the end of a command is linear in the output size.
+    """
+
+    def __init__(self, sentinel: bytes, notify: asyncio.Event):
+        self.data = bytearray()
+        self.sentinel_at: Optional[int] = None
+        self.closed = False
+        self._sentinel = sentinel
+        self._scan_from = 0
+        self._notify = notify
+
+    @property
+    def complete(self) -> bool:
+        return self.sentinel_at is not None or self.closed
+
+    @property
+    def safe_end(self) -> int:
+        """End of the data that can be handed out without splitting the sentinel"""
+        if self.sentinel_at is not None:
+            return self.sentinel_at
+        if self.closed:
+            return len(self.data)
+        # hold back a trailing partial sentinel until more data arrives
+        for size in range(min(len(self._sentinel) - 1, len(self.data)), 0, -1):
+            if self.data.endswith(self._sentinel[:size]):
+                return len(self.data) - size
+        return len(self.data)
+
+    def feed(self, chunk: bytes) -> None:
+        self.data += chunk
+        self._scan()
+        self._notify.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._notify.set()
+
+    def take(self) -> bytes:
+        """Return the output before the sentinel and keep anything after it."""
+        end = self.safe_end
+        output = bytes(self.data[:end])
+        if self.sentinel_at is not None:
+            end += len(self._sentinel)
+            if self.data[end : end + 1] == b"\n":
+                end += 1
+        del self.data[:end]
+        self.sentinel_at = None
+        self._scan_from = 0
+        self._scan()
+        return output
+
+    def _scan(self) -> None:
+        if self.sentinel_at is not None:
+            return
+        index = self.data.find(self._sentinel, self._scan_from)
+        if index != -1:
+            self.sentinel_at = index
+        else:
+            self._scan_from = max(0, len(self.data) - len(self._sentinel) + 1)
+
+
 class _BashSession:
     """A session of a bash shell."""
 
@@ -20,13 +88,14 @@ class _BashSession:
     _process: asyncio.subprocess.Process
 
     command: str = "/bin/bash"
-    _output_delay: float = 0.2  # seconds
+    _read_size: int = 64 * 1024  # bytes
     _timeout: float = 120.0  # seconds
     _sentinel: str = "<<exit>>"
 
     def __init__(self):
         self._started = False
         self._timed_out = False
+        self._readers: List[asyncio.Task] = []
 
     async def start(self):
         if self._started:
@@ -42,18 +111,49 @@ class _BashSession:
             stderr=asyncio.subprocess.PIPE,
         )
 
+        # consume stdout/stderr as they arrive instead of polling their buffers
+        self._output_event = asyncio.Event()
+        self._stdout = _OutputBuffer(self._sentinel.encode(), self._output_event)
+        self._stderr = _OutputBuffer(self._sentinel.encode(), self._output_event)
+        self._readers = [
+            asyncio.create_task(self._pump(self._process.stdout, self._stdout)),
+            asyncio.create_task(self._pump(self._process.stderr, self._stderr)),
+        ]
+
         self._started = True
 
+    async def _pump(self, stream: asyncio.StreamReader, buffer: _OutputBuffer):
+        """Move data from a pipe into its output buffer until EOF."""
+        try:
+            while chunk := await stream.read(self._read_size):
+                buffer.feed(chunk)
+        finally:
+            buffer.close()
+
     def stop(self):
         """Terminate the bash shell."""
         if not self._started:
             raise ToolError("Session has not started.")
         if self._process.returncode is not None:
             return
-        self._process.terminate()
+        # bash runs in its own session, so signal the whole process group;
+        # the readers finish on their own once the pipes reach EOF
+        try:
+            os.killpg(self._process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
 
-    async def run(self, command: str):
-        """Execute a command in the bash shell."""
+    async def run(
+        self,
+        command: str,
+        on_output: Optional[Callable[[str], Union[None, Awaitable[None]]]] = None,
+    ):
+        """Execute a command in the bash shell.
+
+        Args:
+            command: The command to execute.
+            on_output: Optional callback receiving stdout text as it arrives.
+        """
         if not self._started:
             raise ToolError("Session has not started.")
         if self._process.returncode is not None:
@@ -71,45 +171,47 @@ class _BashSession:
         assert self._process.stdout
         assert self._process.stderr
 
-        # send command to the process
+        # send command to the process; the sentinel is echoed on both pipes so
+        # that stderr is known to be complete as well
         self._process.stdin.write(
-            command.encode() + f"; echo '{self._sentinel}'\n".encode()
+            command.encode()
+            + f"\necho '{self._sentinel}'; echo '{self._sentinel}' >&2\n".encode()
         )
         await self._process.stdin.drain()
 
-        # read output from the process, until the sentinel is found
+        # wait for output until the sentinel has arrived on both pipes
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        emitted = 0
         try:
             async with asyncio.timeout(self._timeout):
                 while True:
-                    await asyncio.sleep(self._output_delay)
-                    # if we read directly from stdout/stderr, it will wait forever for
-                    # EOF. use the StreamReader buffer directly instead.
-                    output = (
-                        self._process.stdout._buffer.decode()
-                    )  # pyright: ignore[reportAttributeAccessIssue]
-                    if self._sentinel in output:
-                        # strip the sentinel and break
-                        output = output[: output.index(self._sentinel)]
+                    self._output_event.clear()
+                    if on_output and self._stdout.safe_end > emitted:
+                        text = decoder.decode(
+                            bytes(self._stdout.data[emitted : self._stdout.safe_end])
+                        )
+                        emitted = self._stdout.safe_end
+                        if text:
+                            result = on_output(text)
+                            if inspect.isawaitable(result):
+                                await result
+                    if self._stdout.complete and self._stderr.complete:
                         break
+                    await self._output_event.wait()
         except asyncio.TimeoutError:
             self._timed_out = True
             raise ToolError(
                 f"timed out: bash has not returned in {self._timeout} seconds and must be restarted",
             ) from None
 
+        output = self._stdout.take().decode(errors="replace")
         if output.endswith("\n"):
             output = output[:-1]
 
-        error = (
-            self._process.stderr._buffer.decode()
-        )  # pyright: ignore[reportAttributeAccessIssue]
+        error = self._stderr.take().decode(errors="replace")
         if error.endswith("\n"):
             error = error[:-1]
 
-        # clear the buffers so that the next output can be read correctly
-        self._process.stdout._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-        self._process.stderr._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-
         return CLIResult(output=output, error=error)
 
 
@@ -132,7 +234,11 @@ class Bash(BaseTool):
     _session: Optional[_BashSession] = None
 
     async def execute(
-        self, command: str | None = None, restart: bool = False, **kwargs
+        self,
+        command: str | None = None,
+        restart: bool = False,
+        on_output: Optional[Callable[[str], Union[None, Awaitable[None]]]] = None,
+        **kwargs,
     ) -> CLIResult:
         if restart:
             if self._session:
@@ -147,7 +253,7 @@ class Bash(BaseTool):
             await self._session.start()
 
         if command is not None:
-            return await self._session.run(command)
+            return await self._session.run(command, on_output=on_output)
 
         raise ToolError("no command provided.")
 
@@ -0,0 +1,202 @@
+"""Budgeted HTML-to-markdown conversion for page content extraction."""
+
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Iterator, List, Tuple
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+from markdownify import MarkdownConverter
+
+
+# Elements whose content never reaches the markdown, removed before parsing
+RAW_BLOCK_PATTERN = re.compile(
+    r"<(script|style|noscript|svg|template|iframe|canvas)\b.*?</\1\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+
+MAIN_START_PATTERN = re.compile(r"<main\b", re.IGNORECASE)
+
+BOILERPLATE_TAGS = {"nav", "aside", "footer", "dialog"}
+BOILERPLATE_ROLES = {
+    "navigation",
+    "contentinfo",
+    "complementary",
+    "search",
+    "dialog",
+}
+
+# Form controls, removed while the forms around them are kept, as some pages
+# wrap their whole body in a form
+CONTROL_TAGS = {"button", "input", "select", "textarea"}
+
+# Headings kept from page-level headers, which usually hold the page title
+HEADER_KEPT_TAGS = ["h1", "h2"]
+
+# Pruned content shorter than this, and than a tenth of the whole page, means
+# the page did not look like the pruning expects, so the whole body is used
+MIN_CONTENT_CHARS = 200
+
+# Containers whose children are converted one by one
+CONTAINER_TAGS = {"[document]", "html", "body", "main", "article", "section", "div"}
+
+# Separates the content of sibling containers, as converting them whole would
+BLOCK_BREAK = object()
+
+
+class PageExtractor:
+    """Converts page HTML to markdown within a length budget.
+
+    Boilerplate such as scripts, navigation, sidebars and footers is removed
+    before conversion, the main content is converted block by block until the
+    budget is reached, and results are cached per (URL, content hash) so that
+    retries on an unchanged page cost a hash lookup.
+    """
+
+    # Characters of HTML parsed first, growing until the budget is filled
+    PREFIX_SIZE = 64 * 1024
+
+    def __init__(self, cache_size: int = 32):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str, int], str]" = OrderedDict()
+        self._converter = MarkdownConverter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def extract(self, url: str, html: str, max_length: int) -> str:
+        """Return the markdown of a page, at most max_length characters long
+
+        Args:
+            url: URL of the page
+            html: Page HTML
+            max_length: Maximum length of the returned markdown
+
+        Returns:
+            str: Markdown of the page's main content
+        """
+        key = (
+            url,
+            hashlib.sha1(html.encode("utf-8", "replace")).hexdigest(),
+            max_length,
+        )
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        self.cache_misses += 1
+        markdown = self.convert(html, max_length)
+        if self.cache_size > 0:
+            self._cache[key] = markdown
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return markdown
+
+    def convert(self, html: str, max_length: int) -> str:
+        """Prune boilerplate and convert blocks until the budget is reached"""
+        html = RAW_BLOCK_PATTERN.sub("", html)
+
+        # Parsing dominates the cost, so only parse the main element if any
+        start = MAIN_START_PATTERN.search(html)
+        end = html.lower().rfind("</main>")
+        if start and end > start.start():
+            markdown = self._convert_prefixes(html[start.start() : end + 7], max_length)
+            if markdown:
+                return markdown
+        # No main element, or an empty one
+        return self._convert_prefixes(html, max_length)
+
+    def _convert_prefixes(self, html: str, max_length: int) -> str:
+        """Convert growing prefixes of the HTML until one fills the budget
+
+        The markdown of a prefix matches that of the whole page up to the last,
+        possibly cut off, block, so a prefix is enough once the budget is
+        reached before its last block.
+        """
+        size = self.PREFIX_SIZE
+        while True:
+            markdown, filled = self._convert_html(html[:size], max_length)
+            if filled or size >= len(html):
+                return markdown
+            size *= 4
+
+    def _convert_html(self, html: str, max_length: int) -> Tuple[str, bool]:
+        """Convert HTML, returning the markdown and whether it filled the budget
+        before the last block"""
+        soup = BeautifulSoup(html, "html.parser")
+        root = self._prune(soup)
+        pruned_length = len(root.get_text(strip=True))
+        if pruned_length < MIN_CONTENT_CHARS:
+            soup = BeautifulSoup(html, "html.parser")
+            body = soup.body or soup
+            if pruned_length * 10 < len(body.get_text(strip=True)):
+                root = body
+
+        parts: List[str] = []
+        length = 0
+        filled = False
+        for node in self._blocks(root):
+            if length >= max_length:
+                filled = True
+                break
+            if node is BLOCK_BREAK:
+                parts.append("\n\n")
+                continue
+            part = self._converter.process_element(node, parent_tags=set())
+            parts.append(part)
+            length += len(part)
+
+        markdown = re.sub(r"\n{3,}", "\n\n", "".join(parts)).strip()
+        return markdown[:max_length], filled
+
+    @staticmethod
+    def _prune(soup: BeautifulSoup) -> Tag:
+        """Remove boilerplate elements and return the main content root"""
+        for tag in soup.find_all(True):
+            if tag.decomposed:
+                continue
+            if (
+                tag.name in BOILERPLATE_TAGS
+                or tag.name in CONTROL_TAGS
+                or tag.get("role") in BOILERPLATE_ROLES
+                or tag.get("aria-hidden") == "true"
+                or tag.has_attr("hidden")
+            ):
+                tag.decompose()
+            elif (
+                tag.name == "header" or tag.get("role") == "banner"
+            ) and not tag.find_parent(["article", "main"]):
+                # Page-level headers, but not the headers of articles, keeping
+                # their headings
+                for heading in tag.find_all(HEADER_KEPT_TAGS):
+                    tag.insert_before(heading.extract())
+                tag.decompose()
+
+        main = soup.find(attrs={"role": "main"})
+        if main is None:
+            articles = soup.find_all("article")
+            main = articles[0] if len(articles) == 1 else None
+        return main or soup.body or soup
+
+    @staticmethod
+    def _blocks(node: Tag) -> Iterator:
+        """Yield convertible nodes in document order, descending into containers"""
+        for child in node.children:
+            if isinstance(child, Tag) and child.name in CONTAINER_TAGS:
+                yield BLOCK_BREAK
+                yield from PageExtractor._blocks(child)
+                yield BLOCK_BREAK
+            elif isinstance(child, Tag) or (
+                isinstance(child, NavigableString)
+                and not isinstance(child, PreformattedString)
+                and child.strip()
+            ):
+                yield child
+
+    def clear_cache(self) -> None:
+        """Drop all cached pages and reset hit statistics"""
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
@@ -0,0 +1,363 @@
+"""Process-wide pool of long-lived browsers that lease out isolated contexts."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from browser_use import Browser as BrowserUseBrowser
+
+from app.config import BrowserSettings, config
+from app.logger import logger
+
+
+def create_browser() -> BrowserUseBrowser:
+    """Create a browser_use Browser from the browser configuration"""
+    browser_config_kwargs = {"headless": False, "disable_security": True}
+
+    if config.browser_config:
+        from browser_use.browser.browser import ProxySettings
+
+        # handle proxy settings.
+        if config.browser_config.proxy and config.browser_config.proxy.server:
+            browser_config_kwargs["proxy"] = ProxySettings(
+                server=config.browser_config.proxy.server,
+                username=config.browser_config.proxy.username,
+                password=config.browser_config.proxy.password,
+            )
+
+        browser_attrs = [
+            "headless",
+            "disable_security",
+            "extra_chromium_args",
+            "chrome_instance_path",
+            "wss_url",
+            "cdp_url",
+        ]
+
+        for attr in browser_attrs:
+            value = getattr(config.browser_config, attr, None)
+            if value is not None:
+                if not isinstance(value, list) or value:
+                    browser_config_kwargs[attr] = value
+
+    # Newer browser_use versions accept dict directly
+    return BrowserUseBrowser(**browser_config_kwargs)
+
+
+class PooledBrowser:
+    """A browser process shared by several leased contexts."""
+
+    def __init__(self, browser: Any):
+        self.browser = browser
+        self.contexts: Set[Any] = set()
+        self.reserved = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def load(self) -> int:
+        return len(self.contexts) + self.reserved
+
+    def is_healthy(self) -> bool:
+        """Check that the underlying Playwright browser is still connected"""
+        playwright_browser = getattr(self.browser, "playwright_browser", None)
+        return playwright_browser is None or playwright_browser.is_connected()
+
+
+class BrowserPool:
+    """Leases isolated browser contexts from a few long-lived browsers.
+
+    Launching Chromium takes seconds, while opening a context on a running
+    browser takes milliseconds. The pool keeps up to max_browsers browsers
+    alive and hands out one fresh context per lease, so sessions share
+    browser processes but never cookies, storage or tabs.
+
+    Browsers without leases are closed after idle_timeout seconds, and
+    browsers that lost their connection are dropped by a periodic health
+    check.
+
+    Playwright browsers and asyncio primitives belong to the event loop they
+    were created in, so the pool binds to the running loop on first use and
+    starts over, without the browsers of the old loop, when it is used from
+    a new one. Owners of the pool call close before their loop ends.
+
+    Attributes:
+        max_browsers: Maximum number of browser processes.
+        max_contexts_per_browser: Maximum leased contexts per browser.
+        idle_timeout: Seconds after which an unused browser is closed.
+        health_check_interval: Seconds between idle and health checks.
+        acquire_timeout: Seconds to wait for a free context slot.
+    """
+
+    # Number of recent acquisitions used for latency statistics
+    LATENCY_WINDOW = 1000
+
+    def __init__(
+        self,
+        max_browsers: int = 2,
+        max_contexts_per_browser: int = 8,
+        idle_timeout: float = 300,
+        health_check_interval: float = 30,
+        acquire_timeout: float = 60,
+        browser_factory: Callable[[], BrowserUseBrowser] = create_browser,
+    ):
+        """Initializes the browser pool.
+
+        Args:
+            max_browsers: Maximum number of browser processes.
+            max_contexts_per_browser: Maximum leased contexts per browser.
+            idle_timeout: Seconds after which an unused browser is closed.
+            health_check_interval: Seconds between idle and health checks.
+            acquire_timeout: Seconds to wait for a free context slot.
+            browser_factory: Creates an unlaunched browser_use Browser.
+        """
+        self.max_browsers = max_browsers
+        self.max_contexts_per_browser = max_contexts_per_browser
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self.browser_factory = browser_factory
+
+        self._browsers: List[PooledBrowser] = []
+        self._leases: Dict[Any, PooledBrowser] = {}
+        self._launching = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_condition: Optional[asyncio.Condition] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+        self._launches = 0
+        self._evictions = 0
+        self._health_failures = 0
+        self._acquire_latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    @classmethod
+    def from_settings(cls, settings: Optional[BrowserSettings]) -> "BrowserPool":
+        """Create a pool from browser configuration settings"""
+        settings = settings or BrowserSettings()
+        return cls(
+            max_browsers=settings.pool_max_browsers,
+            max_contexts_per_browser=settings.pool_max_contexts_per_browser,
+            idle_timeout=settings.pool_idle_timeout,
+        )
+
+    @property
+    def _condition(self) -> asyncio.Condition:
+        """Condition guarding the pool, created for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._browsers:
+                logger.warning(
+                    f"Dropping {len(self._browsers)} pooled browsers of a previous event loop"
+                )
+            self._browsers = []
+            self._leases.clear()
+            self._launching = 0
+            self._maintenance_task = None
+            self._loop = loop
+            self._loop_condition = asyncio.Condition()
+        return self._loop_condition
+
+    async def acquire(self, context_config: Any = None) -> Any:
+        """Lease a new browser context, launching a browser if needed.
+
+        Args:
+            context_config: BrowserContextConfig for the new context.
+
+        Returns:
+            BrowserContext: An initialized context owned by the caller until
+            it is released.
+
+        Raises:
+            RuntimeError: If no context slot frees up within acquire_timeout.
+        """
+        started = time.perf_counter()
+        entry = await self._reserve()
+        self._start_maintenance()
+        try:
+            context = await entry.browser.new_context(context_config)
+            # Opens the Playwright context and its first page
+            await context.get_current_page()
+        except Exception:
+            async with self._condition:
+                entry.reserved -= 1
+                self._condition.notify_all()
+            raise
+
+        async with self._condition:
+            entry.reserved -= 1
+            entry.contexts.add(context)
+            entry.last_used = time.monotonic()
+            self._leases[context] = entry
+
+        self._acquire_latencies.append(time.perf_counter() - started)
+        return context
+
+    async def _reserve(self) -> PooledBrowser:
+        """Reserve a context slot on a running or newly launched browser"""
+        deadline = time.monotonic() + self.acquire_timeout
+        async with self._condition:
+            while True:
+                candidates = [
+                    entry
+                    for entry in self._browsers
+                    if entry.load < self.max_contexts_per_browser and entry.is_healthy()
+                ]
+                if candidates:
+                    entry = min(candidates, key=lambda e: e.load)
+                    entry.reserved += 1
+                    return entry
+
+                if len(self._browsers) + self._launching < self.max_browsers:
+                    self._launching += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(
+                        f"No browser context available within {self.acquire_timeout}s "
+                        f"({self.max_browsers} browsers x "
+                        f"{self.max_contexts_per_browser} contexts in use)"
+                    )
+                try:
+                    await asyncio.wait_for(self._condition.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+        # Launch outside the lock so that leases on running browsers proceed
+        try:
+            browser = self.browser_factory()
+            await browser.get_playwright_browser()
+        except Exception:
+            async with self._condition:
+                self._launching -= 1
+                self._condition.notify_all()
+            raise
+
+        entry = PooledBrowser(browser)
+        entry.reserved = 1
+        async with self._condition:
+            self._launching -= 1
+            self._browsers.append(entry)
+            self._launches += 1
+            self._condition.notify_all()
+        logger.info(f"Launched pooled browser ({len(self._browsers)} running)")
+        return entry
+
+    async def release(self, context: Any) -> None:
+        """Close a leased context and free its slot.
+
+        Args:
+            context: BrowserContext returned by acquire.
+        """
+        async with self._condition:
+            entry = self._leases.pop(context, None)
+            if entry is not None:
+                entry.contexts.discard(context)
+                entry.last_used = time.monotonic()
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser context: {e}")
+        async with self._condition:
+            self._condition.notify_all()
+
+    def _start_maintenance(self) -> None:
+        """Start the idle eviction and health check loop if it is not running"""
+        if self._maintenance_task and not self._maintenance_task.done():
+            return
+
+        async def maintenance_loop():
+            while True:
+                await asyncio.sleep(self.health_check_interval)
+                try:
+                    await self.check_browsers()
+                except Exception as e:
+                    logger.error(f"Error in browser pool maintenance: {e}")
+
+        self._maintenance_task = asyncio.create_task(maintenance_loop())
+
+    async def check_browsers(self) -> None:
+        """Close browsers that are idle for too long or no longer connected"""
+        now = time.monotonic()
+        closing = []
+        async with self._condition:
+            for entry in list(self._browsers):
+                if not entry.is_healthy():
+                    self._health_failures += 1
+                    logger.warning("Dropping disconnected pooled browser")
+                elif entry.load == 0 and now - entry.last_used > self.idle_timeout:
+                    self._evictions += 1
+                    logger.info("Closing idle pooled browser")
+                else:
+                    continue
+                self._browsers.remove(entry)
+                for context in entry.contexts:
+                    self._leases.pop(context, None)
+                closing.append(entry)
+            if closing:
+                self._condition.notify_all()
+
+        for entry in closing:
+            await self._close_browser(entry)
+
+    @staticmethod
+    async def _close_browser(entry: PooledBrowser) -> None:
+        try:
+            await entry.browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {e}")
+
+    async def close(self) -> None:
+        """Close all contexts and browsers and stop maintenance"""
+        if self._loop is None:
+            return
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._maintenance_task = None
+
+        async with self._condition:
+            entries, self._browsers = self._browsers, []
+            self._leases.clear()
+            self._condition.notify_all()
+
+        for entry in entries:
+            for context in list(entry.contexts):
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled browser context: {e}")
+            await self._close_browser(entry)
+
+    def get_stats(self) -> Dict:
+        """Gets pool statistics.
+
+        Acquisition latencies are in seconds and cover the most recent
+        acquire calls.
+
+        Returns:
+            Dict: Statistics information.
+        """
+        latencies = sorted(self._acquire_latencies)
+        return {
+            "browsers": len(self._browsers),
+            "leased_contexts": len(self._leases),
+            "max_browsers": self.max_browsers,
+            "max_contexts_per_browser": self.max_contexts_per_browser,
+            "launches": self._launches,
+            "evictions": self._evictions,
+            "health_failures": self._health_failures,
+            "acquire_latency_avg": (
+                sum(latencies) / len(latencies) if latencies else 0.0
+            ),
+            "acquire_latency_p95": (
+                latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+            ),
+            "acquire_latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+
+BROWSER_POOL = BrowserPool.from_settings(config.browser_config)
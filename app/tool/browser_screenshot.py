@@ -0,0 +1,137 @@
+"""Screenshot capture for browser state, with downscaling and deduplication."""
+
+import asyncio
+import base64
+import io
+from typing import Any, Dict, Optional
+
+from PIL import Image
+
+from app.config import BrowserSettings
+from app.logger import logger
+
+
+def difference_hash(image: Image.Image, hash_size: int = 8) -> int:
+    """Compute a 64-bit perceptual difference hash of an image.
+
+    The image is reduced to a (hash_size + 1) x hash_size grayscale thumbnail
+    and each bit records whether a pixel is brighter than its right neighbour,
+    so small rendering differences barely change the hash.
+    """
+    thumbnail = image.convert("L").resize(
+        (hash_size + 1, hash_size), Image.Resampling.LANCZOS
+    )
+    pixels = list(thumbnail.getdata())
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+class ScreenshotPipeline:
+    """Captures page screenshots for the LLM and tracks the bytes they cost.
+
+    Captures the viewport by default, downscales to a maximum width, re-encodes
+    as JPEG at the configured quality and skips frames that are perceptually
+    identical to the previously sent one.
+    """
+
+    def __init__(
+        self,
+        full_page: bool = False,
+        quality: int = 75,
+        max_width: Optional[int] = 1280,
+        dedup: bool = True,
+        dedup_threshold: int = 4,
+    ):
+        self.full_page = full_page
+        self.quality = quality
+        self.max_width = max_width
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+
+        self._last_hash: Optional[int] = None
+        self.frames = 0
+        self.frames_sent = 0
+        self.frames_deduplicated = 0
+        self.captured_bytes = 0
+        self.sent_bytes = 0
+
+    @classmethod
+    def from_settings(cls, settings: Optional[BrowserSettings]) -> "ScreenshotPipeline":
+        """Create a pipeline from browser configuration settings"""
+        settings = settings or BrowserSettings()
+        return cls(
+            full_page=settings.screenshot_full_page,
+            quality=settings.screenshot_quality,
+            max_width=settings.screenshot_max_width,
+            dedup=settings.screenshot_dedup,
+            dedup_threshold=settings.screenshot_dedup_threshold,
+        )
+
+    async def capture(self, page) -> Optional[str]:
+        """Capture the page and return a base64 JPEG, or None if unchanged.
+
+        Args:
+            page: Playwright page to capture
+
+        Returns:
+            Base64 encoded JPEG, or None when the frame duplicates the last one
+        """
+        raw = await page.screenshot(
+            full_page=self.full_page,
+            animations="disabled",
+            type="jpeg",
+            quality=self.quality,
+            scale="css",
+        )
+        return await asyncio.to_thread(self.process, raw)
+
+    def process(self, raw: bytes) -> Optional[str]:
+        """Downscale and deduplicate a captured JPEG frame."""
+        self.frames += 1
+        self.captured_bytes += len(raw)
+
+        image = Image.open(io.BytesIO(raw))
+        if self.dedup:
+            frame_hash = difference_hash(image)
+            if (
+                self._last_hash is not None
+                and bin(frame_hash ^ self._last_hash).count("1") <= self.dedup_threshold
+            ):
+                self.frames_deduplicated += 1
+                logger.debug("Skipping screenshot unchanged since the previous step")
+                return None
+            self._last_hash = frame_hash
+
+        data = raw
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            resized = image.convert("RGB").resize(
+                (self.max_width, height), Image.Resampling.LANCZOS
+            )
+            buffer = io.BytesIO()
+            resized.save(buffer, format="JPEG", quality=self.quality, optimize=True)
+            data = buffer.getvalue()
+
+        self.frames_sent += 1
+        self.sent_bytes += len(data)
+        return base64.b64encode(data).decode("utf-8")
+
+    def reset(self) -> None:
+        """Forget the previous frame so that the next capture is always sent"""
+        self._last_hash = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get frame counts and bytes saved by downscaling and deduplication"""
+        return {
+            "frames": self.frames,
+            "frames_sent": self.frames_sent,
+            "frames_deduplicated": self.frames_deduplicated,
+            "captured_bytes": self.captured_bytes,
+            "sent_bytes": self.sent_bytes,
+            "bytes_saved": self.captured_bytes - self.sent_bytes,
+        }
@@ -0,0 +1,188 @@
+"""Incremental rendering of interactive elements for browser state."""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import BrowserSettings
+
+
+INDEX_PATTERN = re.compile(r"^\*?\[(\d+)\]\*?")
+
+DIFF_HEADER = (
+    "Only changes since the previous state are listed; other elements are "
+    "unchanged and keep their indices."
+)
+
+
+def _highlighted_xpaths(node: Any) -> List[str]:
+    """Collect the xpaths of highlighted elements in rendering order"""
+    xpaths = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if getattr(current, "highlight_index", None) is not None:
+            xpaths.append(current.xpath)
+        stack.extend(reversed(getattr(current, "children", None) or []))
+    return xpaths
+
+
+def _snapshot(element_tree: Any) -> Tuple[str, Dict[Any, Tuple[Optional[int], str]]]:
+    """Render an element tree and key each line of it
+
+    Interactive elements are keyed by xpath, since highlight indices shift
+    whenever an element is inserted before them. Plain text lines are keyed by
+    their text and occurrence.
+
+    Returns:
+        The full listing, and a map from key to (highlight index, line)
+    """
+    listing = element_tree.clickable_elements_to_string()
+    xpaths = iter(_highlighted_xpaths(element_tree))
+    entries: Dict[Any, Tuple[Optional[int], str]] = {}
+    occurrences: Dict[str, int] = {}
+    for line in listing.splitlines():
+        content = line.strip()
+        match = INDEX_PATTERN.match(content)
+        if match:
+            xpath = next(xpaths, None)
+            # "*[n]*" only marks elements browser_use saw for the first time
+            line = f"[{match.group(1)}]{content[match.end():]}"
+            key: Any = ("element", xpath if xpath is not None else line)
+            entries[key] = (int(match.group(1)), line)
+        elif content:
+            occurrences[content] = occurrences.get(content, 0) + 1
+            entries[("text", content, occurrences[content])] = (None, content)
+    return listing, entries
+
+
+def _runs(moves: List[Tuple[int, int]]) -> List[Tuple[int, int, int]]:
+    """Group (old, new) index pairs into runs of consecutive old indices
+    that moved by the same offset, as (first old, last old, offset)"""
+    runs: List[Tuple[int, int, int]] = []
+    for old, new in sorted(moves):
+        if runs and runs[-1][1] == old - 1 and runs[-1][2] == new - old:
+            runs[-1] = (runs[-1][0], old, runs[-1][2])
+        else:
+            runs.append((old, old, new - old))
+    return runs
+
+
+class ElementTreeDiffer:
+    """Renders interactive elements as a diff against the previous state.
+
+    The previous state is kept per tab. A full listing is sent for the first
+    state of a tab, after navigating to another URL, every
+    full_refresh_interval states, and whenever the diff would not be much
+    smaller than the listing itself.
+    """
+
+    def __init__(self, full_refresh_interval: int = 10, max_diff_ratio: float = 0.5):
+        self.full_refresh_interval = full_refresh_interval
+        self.max_diff_ratio = max_diff_ratio
+
+        self._tabs: Dict[Any, Dict[str, Any]] = {}
+        self.states = 0
+        self.full_states = 0
+        self.full_chars = 0
+        self.sent_chars = 0
+
+    @classmethod
+    def from_settings(cls, settings: Optional[BrowserSettings]) -> "ElementTreeDiffer":
+        """Create a differ from browser configuration settings"""
+        settings = settings or BrowserSettings()
+        return cls(full_refresh_interval=settings.state_full_refresh_interval)
+
+    def render(self, tab: Any, url: str, element_tree: Any) -> Tuple[str, bool]:
+        """Render the interactive elements of a tab
+
+        Args:
+            tab: Identifier of the tab the element tree belongs to
+            url: Current URL of the tab
+            element_tree: Root DOM element of the page, or None
+
+        Returns:
+            The text to send, and whether it is the full listing
+        """
+        if element_tree is None:
+            self._tabs.pop(tab, None)
+            return "", True
+
+        listing, entries = _snapshot(element_tree)
+        previous = self._tabs.get(tab)
+        self._tabs[tab] = {
+            "url": url,
+            "entries": entries,
+            "since_full": 1 if previous is None else previous["since_full"] + 1,
+        }
+
+        text = None
+        if (
+            previous is not None
+            and previous["url"] == url
+            and previous["since_full"] < self.full_refresh_interval
+        ):
+            diff = self._diff(previous["entries"], entries)
+            if len(diff) < len(listing) * self.max_diff_ratio:
+                text = diff
+
+        self.states += 1
+        self.full_chars += len(listing)
+        if text is None:
+            self._tabs[tab]["since_full"] = 1
+            self.full_states += 1
+            text = listing
+        self.sent_chars += len(text)
+        return text, text is listing
+
+    @staticmethod
+    def _diff(
+        previous: Dict[Any, Tuple[Optional[int], str]],
+        current: Dict[Any, Tuple[Optional[int], str]],
+    ) -> str:
+        """Describe added, removed, changed and renumbered lines between snapshots
+
+        Elements that only moved to another index are collapsed into ranges, so
+        an element inserted near the top of the page costs a single line.
+        """
+        added, changed, moved, removed = [], [], [], []
+        for key, (index, line) in current.items():
+            before = previous.get(key)
+            if before is None:
+                added.append(f"+ {line}")
+            elif before[1] == line:
+                continue
+            elif INDEX_PATTERN.sub("", before[1]) == INDEX_PATTERN.sub("", line):
+                moved.append((before[0], index))
+            else:
+                changed.append(f"~ {line}")
+        for key, (index, line) in previous.items():
+            if key not in current:
+                # Removed elements have no index left to refer to
+                removed.append(f"- {INDEX_PATTERN.sub('', line)}")
+
+        renumbered = []
+        for start, end, offset in _runs(moved):
+            if start == end:
+                renumbered.append(f"~ [{start}] is now [{start + offset}]")
+            else:
+                renumbered.append(
+                    f"~ [{start}]..[{end}] are now [{start + offset}]..[{end + offset}]"
+                )
+
+        if not (added or changed or renumbered or removed):
+            return f"{DIFF_HEADER}\n(no changes)"
+        return "\n".join([DIFF_HEADER, *added, *changed, *renumbered, *removed])
+
+    def reset(self) -> None:
+        """Forget all previous states so that the next render is a full listing"""
+        self._tabs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get state counts and characters saved by sending diffs"""
+        return {
+            "states": self.states,
+            "full_states": self.full_states,
+            "full_chars": self.full_chars,
+            "sent_chars": self.sent_chars,
+            "chars_saved": self.full_chars - self.sent_chars,
+        }
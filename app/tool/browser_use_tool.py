@@ -1,9 +1,10 @@
 import asyncio
-import base64
 import json
 from typing import Generic, Optional, TypeVar
 
 from browser_use import Browser as BrowserUseBrowser
+
+
 # BrowserConfig is not available in newer browser_use versions
 BrowserConfig = None
 try:
@@ -17,7 +18,12 @@ from pydantic_core.core_schema import ValidationInfo
 
 from app.config import config
 from app.llm import LLM
+from app.logger import logger
 from app.tool.base import BaseTool, ToolResult
+from app.tool.browser_extraction import PageExtractor
+from app.tool.browser_pool import BROWSER_POOL, create_browser
+from app.tool.browser_screenshot import ScreenshotPipeline
+from app.tool.browser_state_diff import ElementTreeDiffer
 from app.tool.web_search import WebSearch
 
 
@@ -131,6 +137,25 @@ class BrowserUseTool(BaseTool, Generic[Context]):
     context: Optional[BrowserContext] = Field(default=None, exclude=True)
     dom_service: Optional[DomService] = Field(default=None, exclude=True)
     web_search_tool: WebSearch = Field(default_factory=WebSearch, exclude=True)
+    screenshots: ScreenshotPipeline = Field(
+        default_factory=lambda: ScreenshotPipeline.from_settings(config.browser_config),
+        exclude=True,
+    )
+    element_differ: Optional[ElementTreeDiffer] = Field(
+        default_factory=lambda: (
+            ElementTreeDiffer.from_settings(config.browser_config)
+            if not config.browser_config or config.browser_config.state_diff
+            else None
+        ),
+        exclude=True,
+    )
+    page_extractor: PageExtractor = Field(default_factory=PageExtractor, exclude=True)
+    use_pool: bool = Field(
+        default_factory=lambda: bool(
+            config.browser_config and config.browser_config.pool_max_browsers > 0
+        ),
+        exclude=True,
+    )
 
     # Context for generic functionality
     tool_context: Optional[Context] = Field(default=None, exclude=True)
@@ -145,51 +170,27 @@ class BrowserUseTool(BaseTool, Generic[Context]):
 
     async def _ensure_browser_initialized(self) -> BrowserContext:
         """Ensure browser and context are initialized."""
-        if self.browser is None:
-            browser_config_kwargs = {"headless": False, "disable_security": True}
-
-            if config.browser_config:
-                from browser_use.browser.browser import ProxySettings
-
-                # handle proxy settings.
-                if config.browser_config.proxy and config.browser_config.proxy.server:
-                    browser_config_kwargs["proxy"] = ProxySettings(
-                        server=config.browser_config.proxy.server,
-                        username=config.browser_config.proxy.username,
-                        password=config.browser_config.proxy.password,
-                    )
-
-                browser_attrs = [
-                    "headless",
-                    "disable_security",
-                    "extra_chromium_args",
-                    "chrome_instance_path",
-                    "wss_url",
-                    "cdp_url",
-                ]
-
-                for attr in browser_attrs:
-                    value = getattr(config.browser_config, attr, None)
-                    if value is not None:
-                        if not isinstance(value, list) or value:
-                            browser_config_kwargs[attr] = value
-
-            # Newer browser_use versions accept dict directly
-            self.browser = BrowserUseBrowser(**browser_config_kwargs)
-
-        if self.context is None:
-            context_config = BrowserContextConfig()
-
-            # if there is context config in the config, use it.
-            if (
-                config.browser_config
-                and hasattr(config.browser_config, "new_context_config")
-                and config.browser_config.new_context_config
-            ):
-                context_config = config.browser_config.new_context_config
-
+        if self.context is not None:
+            return self.context
+
+        context_config = BrowserContextConfig()
+
+        # if there is context config in the config, use it.
+        if (
+            config.browser_config
+            and hasattr(config.browser_config, "new_context_config")
+            and config.browser_config.new_context_config
+        ):
+            context_config = config.browser_config.new_context_config
+
+        if self.use_pool:
+            # Lease an isolated context from a shared, already running browser
+            self.context = await BROWSER_POOL.acquire(context_config)
+        else:
+            if self.browser is None:
+                self.browser = create_browser()
             self.context = await self.browser.new_context(context_config)
-            self.dom_service = DomService(await self.context.get_current_page())
+        self.dom_service = DomService(await self.context.get_current_page())
 
         return self.context
 
@@ -385,16 +386,20 @@ class BrowserUseTool(BaseTool, Generic[Context]):
                         )
 
                     page = await context.get_current_page()
-                    import markdownify
-
-                    content = markdownify.markdownify(await page.content())
+                    # Cached per URL and page content, so retries skip conversion
+                    content = await asyncio.to_thread(
+                        self.page_extractor.extract,
+                        page.url,
+                        await page.content(),
+                        max_content_length,
+                    )
 
                     prompt = f"""\
 Your task is to extract the content of the page. You will be given a page and a goal, and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format.
 Extraction goal: {goal}
 
 Page content:
-{content[:max_content_length]}
+{content}
 """
                     messages = [{"role": "system", "content": prompt}]
 
@@ -510,11 +515,18 @@ Page content:
             await page.bring_to_front()
             await page.wait_for_load_state()
 
-            screenshot = await page.screenshot(
-                full_page=True, animations="disabled", type="jpeg", quality=100
-            )
+            # None when the page looks the same as in the previous screenshot
+            screenshot = await self.screenshots.capture(page)
 
-            screenshot = base64.b64encode(screenshot).decode("utf-8")
+            if self.element_differ is not None:
+                # Pages keep their identity for as long as the tab is open
+                interactive_elements, _ = self.element_differ.render(
+                    id(page), state.url, state.element_tree
+                )
+            elif state.element_tree:
+                interactive_elements = state.element_tree.clickable_elements_to_string()
+            else:
+                interactive_elements = ""
 
             # Build the state info with all required fields
             state_info = {
@@ -522,11 +534,7 @@ Page content:
                 "title": state.title,
                 "tabs": [tab.model_dump() for tab in state.tabs],
                 "help": "[0], [1], [2], etc., represent clickable indices corresponding to the elements listed. Clicking on these indices will navigate to or interact with the respective content behind them.",
-                "interactive_elements": (
-                    state.element_tree.clickable_elements_to_string()
-                    if state.element_tree
-                    else ""
-                ),
+                "interactive_elements": interactive_elements,
                 "scroll_info": {
                     "pixels_above": getattr(state, "pixels_above", 0),
                     "pixels_below": getattr(state, "pixels_below", 0),
@@ -536,6 +544,8 @@ Page content:
                 },
                 "viewport_height": viewport_height,
             }
+            if screenshot is None:
+                state_info["screenshot"] = "unchanged since the previous step"
 
             return ToolResult(
                 output=json.dumps(state_info, indent=4, ensure_ascii=False),
@@ -547,17 +557,32 @@ Page content:
     async def cleanup(self):
         """Clean up browser resources."""
         async with self.lock:
+            if self.screenshots.frames:
+                logger.info(f"Browser screenshot stats: {self.screenshots.stats()}")
+            self.screenshots.reset()
+            if self.element_differ is not None:
+                if self.element_differ.states:
+                    logger.info(
+                        f"Browser element diff stats: {self.element_differ.stats()}"
+                    )
+                self.element_differ.reset()
             if self.context is not None:
-                await self.context.close()
+                if self.use_pool:
+                    await BROWSER_POOL.release(self.context)
+                else:
+                    await self.context.close()
                 self.context = None
                 self.dom_service = None
             if self.browser is not None:
                 await self.browser.close()
                 self.browser = None
+            await self.web_search_tool.cleanup()
 
     def __del__(self):
         """Ensure cleanup when object is destroyed."""
-        if self.browser is not None or self.context is not None:
+        # Pooled contexts belong to the running event loop and are released
+        # by cleanup, or closed with the pool
+        if self.browser is not None or (self.context is not None and not self.use_pool):
             try:
                 asyncio.run(self.cleanup())
             except RuntimeError:
@@ -2,6 +2,9 @@ from app.config import config
 from app.tool.python_execute import PythonExecute
 
 
+SESSION_NOTE = " Variables, imports and loaded data are kept between calls, so load each dataset once and reuse it in later calls. If a call reports that the session was restarted, load the data again."
+
+
 class NormalPythonExecute(PythonExecute):
     """A tool for executing Python code with timeout and safety restrictions."""
 
@@ -28,9 +31,27 @@ class NormalPythonExecute(PythonExecute):
                     directory=config.workspace_root
                 ),
             },
+            "reset": {
+                "description": "Restart the Python session before running the code, discarding variables and loaded data kept from earlier calls",
+                "type": "boolean",
+                "default": False,
+            },
         },
         "required": ["code"],
     }
 
-    async def execute(self, code: str, code_type: str | None = None, timeout=5):
+    def use_session(self, session_id: str) -> None:
+        """Keep variables, imports and loaded data between calls in the session"""
+        self.session_id = session_id
+        self.description += SESSION_NOTE
+
+    async def execute(
+        self,
+        code: str,
+        code_type: str | None = None,
+        timeout=5,
+        reset: bool = False,
+    ):
+        if reset:
+            self.reset_session()
         return await super().execute(code, timeout)
@@ -2,7 +2,7 @@
 
 import asyncio
 from pathlib import Path
-from typing import Optional, Protocol, Tuple, Union, runtime_checkable
+from typing import Dict, Iterable, Optional, Protocol, Tuple, Union, runtime_checkable
 
 from app.config import SandboxSettings
 from app.exceptions import ToolError
@@ -24,6 +24,14 @@ class FileOperator(Protocol):
         """Write content to a file."""
         ...
 
+    async def read_files(self, paths: Iterable[PathLike]) -> Dict[str, str]:
+        """Read several files, keyed by path."""
+        ...
+
+    async def write_files(self, files: Dict[PathLike, str]) -> None:
+        """Write several files."""
+        ...
+
     async def is_directory(self, path: PathLike) -> bool:
         """Check if path points to a directory."""
         ...
@@ -58,6 +66,15 @@ class LocalFileOperator(FileOperator):
         except Exception as e:
             raise ToolError(f"Failed to write to {path}: {str(e)}") from None
 
+    async def read_files(self, paths: Iterable[PathLike]) -> Dict[str, str]:
+        """Read several local files, keyed by path."""
+        return {str(path): await self.read_file(path) for path in paths}
+
+    async def write_files(self, files: Dict[PathLike, str]) -> None:
+        """Write several local files."""
+        for path, content in files.items():
+            await self.write_file(path, content)
+
     async def is_directory(self, path: PathLike) -> bool:
         """Check if path points to a directory."""
         return Path(path).is_dir()
@@ -120,6 +137,24 @@ class SandboxFileOperator(FileOperator):
         except Exception as e:
             raise ToolError(f"Failed to write to {path} in sandbox: {str(e)}") from None
 
+    async def read_files(self, paths: Iterable[PathLike]) -> Dict[str, str]:
+        """Read several files from sandbox in a single transfer."""
+        await self._ensure_sandbox_initialized()
+        try:
+            return await self.sandbox_client.read_files([str(path) for path in paths])
+        except Exception as e:
+            raise ToolError(f"Failed to read files in sandbox: {str(e)}") from None
+
+    async def write_files(self, files: Dict[PathLike, str]) -> None:
+        """Write several files to sandbox in a single transfer."""
+        await self._ensure_sandbox_initialized()
+        try:
+            await self.sandbox_client.write_files(
+                {str(path): content for path, content in files.items()}
+            )
+        except Exception as e:
+            raise ToolError(f"Failed to write files in sandbox: {str(e)}") from None
+
     async def is_directory(self, path: PathLike) -> bool:
         """Check if path points to a directory in sandbox."""
         await self._ensure_sandbox_initialized()
@@ -1,4 +1,5 @@
 # tool/planning.py
+from collections import Counter
 from typing import Dict, List, Literal, Optional
 
 from app.exceptions import ToolError
@@ -10,6 +11,161 @@ A planning tool that allows the agent to create and manage plans for solving com
 The tool provides functionality for creating plans, updating plan steps, and tracking progress.
 """
 
+_STATUS_MARKS = {
+    "not_started": "[ ]",
+    "in_progress": "[→]",
+    "completed": "[✓]",
+    "blocked": "[!]",
+}
+
+
+class PlanView:
+    """Rendered text of a plan, kept up to date step by step.
+
+    Formatting a long plan from scratch for every step prompt repeats the
+    same work, so the view keeps the line of each step and the status
+    counts, and re-renders only the steps whose text, status or notes
+    changed. A new title, number of steps or dependency list re-renders the
+    whole plan. The view keeps copies of what it rendered, so edits made in
+    place to the lists of the plan dict are picked up too.
+    """
+
+    def __init__(self, plan: Dict):
+        self.plan = plan
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        plan = self.plan
+        self._title = plan["title"]
+        self._steps = list(plan["steps"])
+        dependencies = plan.get("step_dependencies")
+        self._dependencies = (
+            None if dependencies is None else [list(d) for d in dependencies]
+        )
+        self._statuses = list(plan["step_statuses"])
+        self._notes = list(plan["step_notes"])
+        self._counts = Counter(self._statuses)
+        self._lines = [self._format_step(i) for i in range(len(self._steps))]
+        self._text: Optional[str] = None
+
+    def _format_step(self, index: int) -> str:
+        line = f"{index}. {_STATUS_MARKS.get(self._statuses[index], '[ ]')} {self._steps[index]}"
+        if self._dependencies and self._dependencies[index]:
+            line += f" (after {', '.join(map(str, self._dependencies[index]))})"
+        line += "\n"
+        if self._notes[index]:
+            line += f"   Notes: {self._notes[index]}\n"
+        return line
+
+    def update_step(self, index: int) -> None:
+        """Re-render a step after its text, status or notes changed."""
+        status = self.plan["step_statuses"][index]
+        self._counts[self._statuses[index]] -= 1
+        self._counts[status] += 1
+        self._steps[index] = self.plan["steps"][index]
+        self._statuses[index] = status
+        self._notes[index] = self.plan["step_notes"][index]
+        self._lines[index] = self._format_step(index)
+        self._text = None
+
+    def _sync(self) -> None:
+        """Pick up changes made to the plan dict without going through the view."""
+        plan = self.plan
+        if (
+            plan["title"] != self._title
+            or len(plan["steps"]) != len(self._steps)
+            or len(plan["step_statuses"]) != len(self._statuses)
+            or len(plan["step_notes"]) != len(self._notes)
+            or plan.get("step_dependencies") != self._dependencies
+        ):
+            self._rebuild()
+        elif (
+            plan["steps"] != self._steps
+            or plan["step_statuses"] != self._statuses
+            or plan["step_notes"] != self._notes
+        ):
+            for i, (step, status, notes) in enumerate(
+                zip(plan["steps"], plan["step_statuses"], plan["step_notes"])
+            ):
+                if (
+                    step != self._steps[i]
+                    or status != self._statuses[i]
+                    or notes != self._notes[i]
+                ):
+                    self.update_step(i)
+
+    def _header(self) -> str:
+        output = f"Plan: {self._title} (ID: {self.plan['plan_id']})\n"
+        output += "=" * len(output) + "\n\n"
+
+        total_steps = len(self._steps)
+        completed = self._counts["completed"]
+        output += f"Progress: {completed}/{total_steps} steps completed "
+        if total_steps > 0:
+            percentage = (completed / total_steps) * 100
+            output += f"({percentage:.1f}%)\n"
+        else:
+            output += "(0%)\n"
+
+        output += (
+            f"Status: {completed} completed, {self._counts['in_progress']} in progress, "
+            f"{self._counts['blocked']} blocked, {self._counts['not_started']} not started\n\n"
+        )
+        return output + "Steps:\n"
+
+    def render(self) -> str:
+        """Get the full text of the plan."""
+        self._sync()
+        if self._text is None:
+            self._text = self._header() + "".join(self._lines)
+        return self._text
+
+    def render_window(self, lookahead: int, step_index: Optional[int] = None) -> str:
+        """Get a compact text of the plan around the current step.
+
+        The current step is step_index, or else the steps in progress or the
+        first step not started. Done steps are summarised in one line, except
+        those the current steps depend on, whose notes may hold results they
+        need. The current steps are followed by the next lookahead steps not
+        started.
+
+        Args:
+            lookahead: Number of upcoming steps to show.
+            step_index: Step about to run, if known.
+        """
+        self._sync()
+        upcoming = [i for i, s in enumerate(self._statuses) if s == "not_started"]
+        if step_index is not None:
+            current = [step_index]
+            upcoming = [i for i in upcoming if i > step_index]
+        else:
+            current = [i for i, s in enumerate(self._statuses) if s == "in_progress"]
+            if not current:
+                current, upcoming = upcoming[:1], upcoming[1:]
+        shown = set(current) | set(upcoming[:lookahead])
+        if self._dependencies:
+            for i in current:
+                shown.update(self._dependencies[i])
+
+        shown_statuses = Counter(self._statuses[i] for i in shown)
+        hidden_done = (
+            self._counts["completed"]
+            + self._counts["blocked"]
+            - shown_statuses["completed"]
+            - shown_statuses["blocked"]
+        )
+        hidden_running = self._counts["in_progress"] - shown_statuses["in_progress"]
+        output = self._header()
+        if hidden_done:
+            output += f"({hidden_done} other steps done, not shown)\n"
+        if hidden_running:
+            output += f"({hidden_running} other steps in progress, not shown)\n"
+        output += "".join(self._lines[i] for i in sorted(shown))
+        hidden_upcoming = self._counts["not_started"] - shown_statuses["not_started"]
+        if hidden_upcoming:
+            output += f"({hidden_upcoming} more steps not started, not shown)\n"
+        return output
+
 
 class PlanningTool(BaseTool):
     """
@@ -48,6 +204,11 @@ class PlanningTool(BaseTool):
                 "type": "array",
                 "items": {"type": "string"},
             },
+            "step_dependencies": {
+                "description": "For each step, the 0-based indices of earlier steps that must be completed before it can start. Steps with no dependencies can run in parallel. Optional for create and update commands; without it steps run one after another.",
+                "type": "array",
+                "items": {"type": "array", "items": {"type": "integer"}},
+            },
             "step_index": {
                 "description": "Index of the step to update (0-based). Required for mark_step command.",
                 "type": "integer",
@@ -68,6 +229,7 @@ class PlanningTool(BaseTool):
 
     plans: dict = {}  # Dictionary to store plans by plan_id
     _current_plan_id: Optional[str] = None  # Track the current active plan
+    _views: Dict[str, PlanView] = {}  # Rendered text of each plan
 
     async def execute(
         self,
@@ -78,6 +240,7 @@ class PlanningTool(BaseTool):
         plan_id: Optional[str] = None,
         title: Optional[str] = None,
         steps: Optional[List[str]] = None,
+        step_dependencies: Optional[List[List[int]]] = None,
         step_index: Optional[int] = None,
         step_status: Optional[
             Literal["not_started", "in_progress", "completed", "blocked"]
@@ -93,15 +256,16 @@ class PlanningTool(BaseTool):
         - plan_id: Unique identifier for the plan
         - title: Title for the plan (used with create command)
         - steps: List of steps for the plan (used with create command)
+        - step_dependencies: Indices of earlier steps each step depends on (used with create and update commands)
         - step_index: Index of the step to update (used with mark_step command)
         - step_status: Status to set for a step (used with mark_step command)
         - step_notes: Additional notes for a step (used with mark_step command)
         """
 
         if command == "create":
-            return self._create_plan(plan_id, title, steps)
+            return self._create_plan(plan_id, title, steps, step_dependencies)
         elif command == "update":
-            return self._update_plan(plan_id, title, steps)
+            return self._update_plan(plan_id, title, steps, step_dependencies)
         elif command == "list":
             return self._list_plans()
         elif command == "get":
@@ -118,7 +282,11 @@ class PlanningTool(BaseTool):
             )
 
     def _create_plan(
-        self, plan_id: Optional[str], title: Optional[str], steps: Optional[List[str]]
+        self,
+        plan_id: Optional[str],
+        title: Optional[str],
+        steps: Optional[List[str]],
+        step_dependencies: Optional[List[List[int]]] = None,
     ) -> ToolResult:
         """Create a new plan with the given ID, title, and steps."""
         if not plan_id:
@@ -149,6 +317,10 @@ class PlanningTool(BaseTool):
             "step_statuses": ["not_started"] * len(steps),
             "step_notes": [""] * len(steps),
         }
+        if step_dependencies is not None:
+            plan["step_dependencies"] = self._validate_dependencies(
+                step_dependencies, len(steps)
+            )
 
         self.plans[plan_id] = plan
         self._current_plan_id = plan_id  # Set as active plan
@@ -158,7 +330,11 @@ class PlanningTool(BaseTool):
         )
 
     def _update_plan(
-        self, plan_id: Optional[str], title: Optional[str], steps: Optional[List[str]]
+        self,
+        plan_id: Optional[str],
+        title: Optional[str],
+        steps: Optional[List[str]],
+        step_dependencies: Optional[List[List[int]]] = None,
     ) -> ToolResult:
         """Update an existing plan with new title or steps."""
         if not plan_id:
@@ -201,11 +377,43 @@ class PlanningTool(BaseTool):
             plan["steps"] = steps
             plan["step_statuses"] = new_statuses
             plan["step_notes"] = new_notes
+            # Dependencies refer to step positions, so they only carry over if restated
+            if step_dependencies is None:
+                plan.pop("step_dependencies", None)
+
+        if step_dependencies is not None:
+            plan["step_dependencies"] = self._validate_dependencies(
+                step_dependencies, len(plan["steps"])
+            )
 
         return ToolResult(
             output=f"Plan updated successfully: {plan_id}\n\n{self._format_plan(plan)}"
         )
 
+    @staticmethod
+    def _validate_dependencies(
+        step_dependencies: List[List[int]], step_count: int
+    ) -> List[List[int]]:
+        """Check that each step depends only on earlier steps."""
+        if (
+            not isinstance(step_dependencies, list)
+            or len(step_dependencies) != step_count
+        ):
+            raise ToolError(
+                "Parameter `step_dependencies` must have one list of step indices per step"
+            )
+        validated = []
+        for index, dependencies in enumerate(step_dependencies):
+            if not isinstance(dependencies, list) or not all(
+                isinstance(d, int) and 0 <= d < index for d in dependencies
+            ):
+                raise ToolError(
+                    f"Invalid dependencies for step {index}: {dependencies}. "
+                    "A step can only depend on earlier steps."
+                )
+            validated.append(sorted(set(dependencies)))
+        return validated
+
     def _list_plans(self) -> ToolResult:
         """List all available plans."""
         if not self.plans:
@@ -298,6 +506,7 @@ class PlanningTool(BaseTool):
 
         if step_notes:
             plan["step_notes"][step_index] = step_notes
+        self._view(plan_id).update_step(step_index)
 
         return ToolResult(
             output=f"Step {step_index} updated in plan '{plan_id}'.\n\n{self._format_plan(plan)}"
@@ -312,6 +521,7 @@ class PlanningTool(BaseTool):
             raise ToolError(f"No plan found with ID: {plan_id}")
 
         del self.plans[plan_id]
+        self._views.pop(plan_id, None)
 
         # If the deleted plan was the active plan, clear the active plan
         if self._current_plan_id == plan_id:
@@ -319,45 +529,33 @@ class PlanningTool(BaseTool):
 
         return ToolResult(output=f"Plan '{plan_id}' has been deleted.")
 
-    def _format_plan(self, plan: Dict) -> str:
-        """Format a plan for display."""
-        output = f"Plan: {plan['title']} (ID: {plan['plan_id']})\n"
-        output += "=" * len(output) + "\n\n"
-
-        # Calculate progress statistics
-        total_steps = len(plan["steps"])
-        completed = sum(1 for status in plan["step_statuses"] if status == "completed")
-        in_progress = sum(
-            1 for status in plan["step_statuses"] if status == "in_progress"
-        )
-        blocked = sum(1 for status in plan["step_statuses"] if status == "blocked")
-        not_started = sum(
-            1 for status in plan["step_statuses"] if status == "not_started"
-        )
-
-        output += f"Progress: {completed}/{total_steps} steps completed "
-        if total_steps > 0:
-            percentage = (completed / total_steps) * 100
-            output += f"({percentage:.1f}%)\n"
-        else:
-            output += "(0%)\n"
-
-        output += f"Status: {completed} completed, {in_progress} in progress, {blocked} blocked, {not_started} not started\n\n"
-        output += "Steps:\n"
+    def get_plan_text(
+        self,
+        plan_id: str,
+        lookahead: Optional[int] = None,
+        step_index: Optional[int] = None,
+    ) -> str:
+        """Get the text of a plan, or with lookahead only the steps around the current one.
 
-        # Add each step with its status and notes
-        for i, (step, status, notes) in enumerate(
-            zip(plan["steps"], plan["step_statuses"], plan["step_notes"])
-        ):
-            status_symbol = {
-                "not_started": "[ ]",
-                "in_progress": "[→]",
-                "completed": "[✓]",
-                "blocked": "[!]",
-            }.get(status, "[ ]")
+        Raises:
+            ToolError: If there is no plan with the given ID.
+        """
+        if plan_id not in self.plans:
+            raise ToolError(f"No plan found with ID: {plan_id}")
+        view = self._view(plan_id)
+        if lookahead is None:
+            return view.render()
+        return view.render_window(lookahead, step_index)
 
-            output += f"{i}. {status_symbol} {step}\n"
-            if notes:
-                output += f"   Notes: {notes}\n"
+    def _view(self, plan_id: str) -> PlanView:
+        plan = self.plans[plan_id]
+        view = self._views.get(plan_id)
+        if view is None or view.plan is not plan:
+            view = self._views[plan_id] = PlanView(plan)
+        return view
 
-        return output
+    def _format_plan(self, plan: Dict) -> str:
+        """Format a plan for display."""
+        if self.plans.get(plan.get("plan_id")) is plan:
+            return self._view(plan["plan_id"]).render()
+        return PlanView(plan).render()
@@ -1,9 +1,8 @@
-import multiprocessing
-import sys
-from io import StringIO
-from typing import Dict
+from typing import Dict, Optional
 
+from app.tenancy import limited
 from app.tool.base import BaseTool
+from app.tool.python_pool import PYTHON_POOL
 
 
 class PythonExecute(BaseTool):
@@ -22,20 +21,10 @@ class PythonExecute(BaseTool):
         "required": ["code"],
     }
 
-    def _run_code(self, code: str, result_dict: dict, safe_globals: dict) -> None:
-        original_stdout = sys.stdout
-        try:
-            output_buffer = StringIO()
-            sys.stdout = output_buffer
-            exec(code, safe_globals, safe_globals)
-            result_dict["observation"] = output_buffer.getvalue()
-            result_dict["success"] = True
-        except Exception as e:
-            result_dict["observation"] = str(e)
-            result_dict["success"] = False
-        finally:
-            sys.stdout = original_stdout
+    # Keep globals between calls made with this session id
+    session_id: Optional[str] = None
 
+    @limited("sandbox")
     async def execute(
         self,
         code: str,
@@ -51,25 +40,19 @@ class PythonExecute(BaseTool):
         Returns:
             Dict: Contains 'output' with execution output or error message and 'success' status.
         """
+        return await PYTHON_POOL.run(code, timeout, session_id=self.session_id)
 
-        with multiprocessing.Manager() as manager:
-            result = manager.dict({"observation": "", "success": False})
-            if isinstance(__builtins__, dict):
-                safe_globals = {"__builtins__": __builtins__}
-            else:
-                safe_globals = {"__builtins__": __builtins__.__dict__.copy()}
-            proc = multiprocessing.Process(
-                target=self._run_code, args=(code, result, safe_globals)
-            )
-            proc.start()
-            proc.join(timeout)
+    def reset_session(self) -> None:
+        """Discard the globals kept for this tool's session"""
+        if self.session_id:
+            PYTHON_POOL.reset_session(self.session_id)
 
-            # timeout process
-            if proc.is_alive():
-                proc.terminate()
-                proc.join(1)
-                return {
-                    "observation": f"Execution timeout after {timeout} seconds",
-                    "success": False,
-                }
-            return dict(result)
+    def close_session(self) -> None:
+        """Stop the worker kept for this tool's session.
+
+        Not part of cleanup, which agents run after every run: the session
+        outlives runs and is closed when its owner is disposed of or after
+        the pool's session_idle_timeout.
+        """
+        if self.session_id:
+            PYTHON_POOL.close_session(self.session_id)
@@ -0,0 +1,439 @@
+"""Pool of pre-forked worker processes that run code for PythonExecute."""
+
+import asyncio
+import builtins
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from io import StringIO
+from multiprocessing.connection import Connection
+from typing import Deque, Dict, List, Optional, Set
+
+from app.config import PythonExecuteSettings, config
+from app.logger import logger
+
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Shared calls run in a child forked from the worker, so that nothing they
+# change outlives them. Without fork the worker is replaced after each call.
+FORK_TASKS = hasattr(os, "fork")
+
+
+def _fresh_globals() -> dict:
+    return {"__builtins__": builtins.__dict__.copy()}
+
+
+def _run_code(code: str, namespace: dict) -> Dict:
+    """Run code in namespace, capturing what it prints"""
+    original_stdout = sys.stdout
+    try:
+        output_buffer = StringIO()
+        sys.stdout = output_buffer
+        exec(code, namespace, namespace)
+        return {"observation": output_buffer.getvalue(), "success": True}
+    except MemoryError as e:
+        return {
+            "observation": f"MemoryError: {e}" if str(e) else "MemoryError",
+            "success": False,
+            "out_of_memory": True,
+        }
+    except (Exception, SystemExit) as e:
+        return {"observation": str(e), "success": False}
+    finally:
+        sys.stdout = original_stdout
+
+
+def _run_forked(code: str) -> Dict:
+    """Run code in fresh globals in a forked child of this process"""
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    pid = os.fork()
+    if pid == 0:
+        reader.close()
+        try:
+            writer.send(_run_code(code, _fresh_globals()))
+        finally:
+            os._exit(0)
+
+    writer.close()
+    try:
+        result = reader.recv()
+    except EOFError:
+        result = None
+    finally:
+        reader.close()
+    _, status = os.waitpid(pid, 0)
+    if result is None:
+        return {
+            "observation": f"Execution process exited with code {os.waitstatus_to_exitcode(status)}",
+            "success": False,
+            "crashed": True,
+        }
+    return result
+
+
+def _worker_main(conn: Connection, memory_limit_mb: Optional[int] = None) -> None:
+    """Run code sent over conn until the pipe is closed.
+
+    Each message is (code, keep_state). Code with keep_state runs in this
+    process and shares the globals of earlier keep_state calls. Other code
+    runs in fresh globals, in a forked child where supported, so the worker
+    stays as clean as when it started. With memory_limit_mb, allocations
+    beyond the limit raise MemoryError in the running code.
+    """
+    if FORK_TASKS:
+        # Lets the pool kill forked children together with the worker
+        os.setpgrp()
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            # Not supported on this platform, or above the hard limit
+            pass
+
+    session_globals = _fresh_globals()
+    while True:
+        try:
+            code, keep_state = conn.recv()
+        except (EOFError, OSError):
+            break
+        if keep_state:
+            conn.send(_run_code(code, session_globals))
+        elif FORK_TASKS:
+            conn.send(_run_forked(code))
+        else:
+            conn.send(_run_code(code, _fresh_globals()))
+
+
+class PythonWorker:
+    """A worker process and the parent end of its pipe."""
+
+    def __init__(
+        self,
+        context: multiprocessing.context.BaseContext,
+        memory_limit_mb: Optional[int] = None,
+    ):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.last_used = time.monotonic()
+        # Serialises calls to a session worker
+        self.lock = threading.Lock()
+
+    def run(self, code: str, keep_state: bool, timeout: float) -> Optional[Dict]:
+        """Run code in the worker.
+
+        Returns:
+            Optional[Dict]: The result, or None if it did not finish in time.
+
+        Raises:
+            EOFError: If the worker process died while running the code.
+        """
+        self.last_used = time.monotonic()
+        self.conn.send((code, keep_state))
+        if not self.conn.poll(timeout):
+            return None
+        return self.conn.recv()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        """Stop the worker process, any child it forked, and close its pipe"""
+        if FORK_TASKS:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                # The worker has not made its process group yet, or is gone
+                pass
+        self.process.terminate()
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(1)
+        self.conn.close()
+
+
+class PythonWorkerPool:
+    """Runs Python snippets in a pool of long-lived worker processes.
+
+    Starting a process per snippet costs far more than running a typical
+    snippet. The pool keeps size idle workers, forked by start ahead of the
+    first call, and sends code and results over a pipe. Each worker runs a
+    snippet in a child forked from itself, a few milliseconds rather than
+    the cost of a new interpreter, so environment variables, the working
+    directory, imported modules or patched functions changed by one snippet
+    never reach the next. Where fork is not available, the worker is
+    replaced after each snippet instead. A worker that times out or dies is
+    killed and replaced.
+
+    Snippets run with a session_id share globals: the session gets its own
+    worker that keeps state between calls until the session is reset,
+    closed, idle for session_idle_timeout seconds, or its worker is killed.
+    A session whose worker runs out of memory is restarted. When a session
+    lost its state other than by a reset or close, the observation of its
+    next call says so.
+
+    session_memory_limit_mb caps the address space (RLIMIT_AS) of session
+    workers, whose state would otherwise grow without bound. Shared workers
+    are only capped when memory_limit_mb is set: an address space cap counts
+    virtual reservations rather than resident memory, so thread buffers of
+    numeric libraries or large memory-mapped imports can fail under it while
+    using little memory. Code that allocates beyond a cap fails with
+    MemoryError. On platforms without the resource module no cap is applied.
+
+    Attributes:
+        size: Number of idle workers kept ready.
+        session_idle_timeout: Seconds after which an unused session is closed.
+        memory_limit_mb: Address space limit of shared workers in megabytes, None for no limit.
+        session_memory_limit_mb: Address space limit of session workers in megabytes, None for no limit.
+    """
+
+    # Number of recent executions used for latency statistics
+    LATENCY_WINDOW = 1000
+
+    def __init__(
+        self,
+        size: int = 2,
+        session_idle_timeout: float = 1800,
+        memory_limit_mb: Optional[int] = None,
+        session_memory_limit_mb: Optional[int] = None,
+    ):
+        """Initializes the worker pool.
+
+        Args:
+            size: Number of idle workers kept ready.
+            session_idle_timeout: Seconds after which an unused session is closed.
+            memory_limit_mb: Address space limit of shared workers in megabytes, None for no limit.
+            session_memory_limit_mb: Address space limit of session workers in megabytes, None for no limit.
+        """
+        self.size = size
+        self.session_idle_timeout = session_idle_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.session_memory_limit_mb = session_memory_limit_mb
+
+        self._context = multiprocessing.get_context()
+        self._idle: List[PythonWorker] = []
+        self._sessions: Dict[str, PythonWorker] = {}
+        # Sessions closed for being idle, told about it on their next call
+        self._expired_sessions: Set[str] = set()
+        self._lock = threading.Lock()
+
+        self._spawned = 0
+        self._recycled = 0
+        self._timeouts = 0
+        self._crashes = 0
+        self._out_of_memory = 0
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    @classmethod
+    def from_settings(
+        cls, settings: Optional[PythonExecuteSettings]
+    ) -> "PythonWorkerPool":
+        """Create a pool from PythonExecute configuration settings"""
+        settings = settings or PythonExecuteSettings()
+        return cls(
+            size=settings.pool_size,
+            session_idle_timeout=settings.session_idle_timeout,
+            memory_limit_mb=settings.memory_limit_mb,
+            session_memory_limit_mb=settings.session_memory_limit_mb,
+        )
+
+    async def run(
+        self, code: str, timeout: float = 5, session_id: Optional[str] = None
+    ) -> Dict:
+        """Run code in a worker process.
+
+        Args:
+            code: Python code to execute.
+            timeout: Seconds before the worker is killed.
+            session_id: Keep globals between calls with the same session id.
+
+        Returns:
+            Dict: 'observation' with the printed output or error message and
+            'success' status.
+        """
+        return await asyncio.to_thread(self.run_sync, code, timeout, session_id)
+
+    def run_sync(
+        self, code: str, timeout: float = 5, session_id: Optional[str] = None
+    ) -> Dict:
+        """Blocking version of run"""
+        started = time.perf_counter()
+        self._close_idle_sessions()
+        if session_id is None:
+            result = self._run_shared(code, timeout)
+        else:
+            result = self._run_session(code, timeout, session_id)
+        self._latencies.append(time.perf_counter() - started)
+        return result
+
+    def _run_shared(self, code: str, timeout: float) -> Dict:
+        worker = self._checkout()
+        result = self._run_on(worker, code, timeout, keep_state=False)
+        self._checkin(worker)
+        return result
+
+    def _run_session(self, code: str, timeout: float, session_id: str) -> Dict:
+        with self._lock:
+            worker = self._sessions.get(session_id)
+            restarted = session_id in self._expired_sessions or (
+                worker is not None and not worker.is_alive()
+            )
+            self._expired_sessions.discard(session_id)
+            if worker is None or not worker.is_alive():
+                worker = self._sessions[session_id] = self._spawn(
+                    self.session_memory_limit_mb
+                )
+
+        with worker.lock:
+            result = self._run_on(worker, code, timeout, keep_state=True)
+        if restarted:
+            result["observation"] = (
+                "The session was restarted; variables and data from earlier calls were lost.\n"
+                + result["observation"]
+            )
+        if not worker.is_alive():
+            self.close_session(session_id)
+            result["observation"] += "\nThe session was restarted; its state was lost."
+        return result
+
+    def _run_on(
+        self, worker: PythonWorker, code: str, timeout: float, keep_state: bool
+    ) -> Dict:
+        """Run code on worker, killing the worker on timeout, crash or out of memory"""
+        try:
+            result = worker.run(code, keep_state, timeout)
+        except (EOFError, OSError):
+            self._crashes += 1
+            worker.kill()
+            return {
+                "observation": f"Execution process exited with code {worker.process.exitcode}",
+                "success": False,
+            }
+        if result is None:
+            self._timeouts += 1
+            worker.kill()
+            return {
+                "observation": f"Execution timeout after {timeout} seconds",
+                "success": False,
+            }
+        if result.pop("crashed", False):
+            self._crashes += 1
+        if result.pop("out_of_memory", False):
+            self._out_of_memory += 1
+            if keep_state:
+                # State left behind by a failed allocation is not worth keeping
+                worker.kill()
+        return result
+
+    def _spawn(self, memory_limit_mb: Optional[int] = None) -> PythonWorker:
+        worker = PythonWorker(self._context, memory_limit_mb)
+        self._spawned += 1
+        return worker
+
+    def _checkout(self) -> PythonWorker:
+        """Take an idle worker, or start one if all are busy"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._spawn(self.memory_limit_mb)
+
+    def _checkin(self, worker: PythonWorker) -> None:
+        """Return a worker to the pool, replacing it if it is dead or not clean"""
+        if worker.is_alive() and not FORK_TASKS:
+            self._recycled += 1
+            worker.kill()
+        if not worker.is_alive():
+            worker = self._spawn(self.memory_limit_mb)
+
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(worker)
+                return
+        worker.kill()
+
+    def start(self) -> None:
+        """Fork idle workers up to the pool size"""
+        while True:
+            with self._lock:
+                if len(self._idle) >= self.size:
+                    return
+            worker = self._spawn(self.memory_limit_mb)
+            with self._lock:
+                self._idle.append(worker)
+
+    def reset_session(self, session_id: str) -> None:
+        """Discard the globals of a session; its next call starts afresh"""
+        self.close_session(session_id)
+
+    def close_session(self, session_id: str) -> None:
+        """Stop the worker of a session"""
+        with self._lock:
+            worker = self._sessions.pop(session_id, None)
+            self._expired_sessions.discard(session_id)
+        if worker is not None:
+            worker.kill()
+
+    def _close_idle_sessions(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                session_id
+                for session_id, worker in self._sessions.items()
+                if now - worker.last_used > self.session_idle_timeout
+                and not worker.lock.locked()
+            ]
+        for session_id in expired:
+            logger.info(f"Closing idle Python session {session_id}")
+            self.close_session(session_id)
+            with self._lock:
+                self._expired_sessions.add(session_id)
+
+    def close(self) -> None:
+        """Stop all workers, including those of sessions"""
+        with self._lock:
+            workers = self._idle + list(self._sessions.values())
+            self._idle = []
+            self._sessions.clear()
+            self._expired_sessions.clear()
+        for worker in workers:
+            worker.kill()
+
+    def get_stats(self) -> Dict:
+        """Gets pool statistics.
+
+        Execution latencies are in seconds and cover the most recent runs.
+
+        Returns:
+            Dict: Statistics information.
+        """
+        latencies = sorted(self._latencies)
+        return {
+            "idle_workers": len(self._idle),
+            "sessions": len(self._sessions),
+            "spawned": self._spawned,
+            "recycled": self._recycled,
+            "timeouts": self._timeouts,
+            "crashes": self._crashes,
+            "out_of_memory": self._out_of_memory,
+            "latency_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_p95": (
+                latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+            ),
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+
+PYTHON_POOL = PythonWorkerPool.from_settings(config.python_execute)
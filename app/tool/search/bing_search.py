@@ -1,7 +1,10 @@
-from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from typing import Iterable, List, Optional, Tuple, Union
+from urllib.parse import quote_plus
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from app.logger import logger
 from app.tool.search.base import SearchItem, WebSearchEngine
@@ -34,6 +37,10 @@ HEADERS = {
 BING_HOST_URL = "https://www.bing.com"
 BING_SEARCH_URL = "https://www.bing.com/search?q="
 
+RESULTS_PER_PAGE = 10
+MAX_PARALLEL_PAGES = 5
+CHUNK_SIZE = 16 * 1024
+
 
 class BingSearchEngine(WebSearchEngine):
     session: Optional[requests.Session] = None
@@ -48,6 +55,9 @@ class BingSearchEngine(WebSearchEngine):
         """
         Synchronous Bing search implementation to retrieve search results.
 
+        The first page is fetched on its own; once it confirms there are results,
+        the further pages needed for num_results are fetched in parallel.
+
         Args:
             query (str): The search query to submit to Bing.
             num_results (int, optional): Maximum number of results to return. Defaults to 10.
@@ -58,81 +68,128 @@ class BingSearchEngine(WebSearchEngine):
         if not query:
             return []
 
-        list_result = []
+        list_result: List[SearchItem] = []
+        seen_urls = set()
+
+        def add(items: List[SearchItem]) -> None:
+            for item in items:
+                if item.url in seen_urls:
+                    continue
+                seen_urls.add(item.url)
+                item.title = item.title or f"Bing Result {len(list_result) + 1}"
+                list_result.append(item)
+
         first = 1
-        next_url = BING_SEARCH_URL + query
+        data, next_url = self._fetch_page(self._page_url(query, first))
+        add(data)
+        per_page = max(len(data), 1)
 
-        while len(list_result) < num_results:
-            data, next_url = self._parse_html(
-                next_url, rank_start=len(list_result), first=first
+        while data and next_url and len(list_result) < num_results:
+            pages = min(
+                ceil((num_results - len(list_result)) / per_page), MAX_PARALLEL_PAGES
             )
-            if data:
-                list_result.extend(data)
-            if not next_url:
-                break
-            first += 10
+            offsets = [first + RESULTS_PER_PAGE * (i + 1) for i in range(pages)]
+            with ThreadPoolExecutor(max_workers=pages) as executor:
+                responses = list(
+                    executor.map(
+                        lambda offset: self._fetch_page(self._page_url(query, offset)),
+                        offsets,
+                    )
+                )
+            first = offsets[-1]
+
+            # Keep page order, and stop at the first page that ends the results
+            for data, next_url in responses:
+                add(data)
+                if not data or not next_url:
+                    break
 
         return list_result[:num_results]
 
-    def _parse_html(
-        self, url: str, rank_start: int = 0, first: int = 1
-    ) -> Tuple[List[SearchItem], str]:
+    @staticmethod
+    def _page_url(query: str, first: int) -> str:
+        """URL of the result page starting at the given (1-based) rank."""
+        url = BING_SEARCH_URL + quote_plus(query)
+        return url if first == 1 else f"{url}&first={first}"
+
+    def _fetch_page(self, url: str) -> Tuple[List[SearchItem], Optional[str]]:
         """
-        Parse Bing search result HTML to extract search results and the next page URL.
+        Fetch a Bing result page and parse it while it downloads.
 
         Returns:
             tuple: (List of SearchItem objects, next page URL or None)
         """
         try:
-            res = self.session.get(url=url)
-            res.encoding = "utf-8"
-            root = BeautifulSoup(res.text, "lxml")
-
-            list_data = []
-            ol_results = root.find("ol", id="b_results")
-            if not ol_results:
-                return [], None
-
-            for li in ol_results.find_all("li", class_="b_algo"):
-                title = ""
-                url = ""
-                abstract = ""
-                try:
-                    h2 = li.find("h2")
-                    if h2:
-                        title = h2.text.strip()
-                        url = h2.a["href"].strip()
-
-                    p = li.find("p")
-                    if p:
-                        abstract = p.text.strip()
-
-                    if ABSTRACT_MAX_LENGTH and len(abstract) > ABSTRACT_MAX_LENGTH:
-                        abstract = abstract[:ABSTRACT_MAX_LENGTH]
-
-                    rank_start += 1
-
-                    # Create a SearchItem object
-                    list_data.append(
-                        SearchItem(
-                            title=title or f"Bing Result {rank_start}",
-                            url=url,
-                            description=abstract,
-                        )
-                    )
-                except Exception:
-                    continue
-
-            next_btn = root.find("a", title="Next page")
-            if not next_btn:
-                return list_data, None
-
-            next_url = BING_HOST_URL + next_btn["href"]
-            return list_data, next_url
+            with self.session.get(url=url, stream=True) as res:
+                return self._parse_results(res.iter_content(chunk_size=CHUNK_SIZE))
         except Exception as e:
             logger.warning(f"Error parsing HTML: {e}")
             return [], None
 
+    @staticmethod
+    def _parse_results(
+        chunks: Iterable[Union[bytes, str]]
+    ) -> Tuple[List[SearchItem], Optional[str]]:
+        """
+        Parse Bing search result HTML to extract search results and the next page URL.
+
+        Only the end of <li> and <a> elements is reported by the parser, so just the
+        li.b_algo result nodes and the next page link are walked; each result node
+        is discarded once read.
+
+        Args:
+            chunks: The page HTML, whole or in chunks as it is received.
+
+        Returns:
+            tuple: (List of SearchItem objects, next page URL or None)
+        """
+        parser = etree.HTMLPullParser(
+            events=("end",), tag=("li", "a"), encoding="utf-8"
+        )
+        list_data = []
+        next_url = None
+
+        def read_events() -> None:
+            nonlocal next_url
+            for _, element in parser.read_events():
+                if element.tag == "a":
+                    if element.get("title") == "Next page" and element.get("href"):
+                        next_url = BING_HOST_URL + element.get("href")
+                    continue
+                if "b_algo" not in (element.get("class") or "").split():
+                    continue
+                item = BingSearchEngine._parse_result(element)
+                if item:
+                    list_data.append(item)
+                element.clear()
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            read_events()
+        parser.close()
+        read_events()
+        return list_data, next_url
+
+    @staticmethod
+    def _parse_result(li: etree._Element) -> Optional[SearchItem]:
+        """Build a search item from a li.b_algo node, or None if it has no link."""
+        h2 = li.find(".//h2")
+        link = h2.find(".//a") if h2 is not None else None
+        if link is None or not link.get("href"):
+            return None
+        title = "".join(h2.itertext()).strip()
+        url = link.get("href").strip()
+
+        abstract = ""
+        p = li.find(".//p")
+        if p is not None:
+            abstract = "".join(p.itertext()).strip()
+
+        if ABSTRACT_MAX_LENGTH and len(abstract) > ABSTRACT_MAX_LENGTH:
+            abstract = abstract[:ABSTRACT_MAX_LENGTH]
+
+        return SearchItem(title=title, url=url, description=abstract)
+
     def perform_search(
         self, query: str, num_results: int = 10, *args, **kwargs
     ) -> List[SearchItem]:
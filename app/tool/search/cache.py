@@ -0,0 +1,216 @@
+"""Result cache shared by all search engines."""
+
+import hashlib
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.config import SearchSettings, config
+from app.logger import logger
+from app.tool.search.base import SearchItem
+
+
+CacheKey = Tuple[str, str, Optional[str], Optional[str], int]
+
+PUNCTUATION = "\"'`.,;:!?()[]{}"
+
+
+def normalize_query(query: str) -> str:
+    """Normalise a query so that trivially different spellings share results
+
+    Case, Unicode compatibility forms, whitespace, surrounding punctuation and
+    word order are ignored. Queries with quoted phrases keep their word order,
+    since it matters to exact-phrase search.
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    if '"' in text:
+        return " ".join(text.split())
+    words = (word.strip(PUNCTUATION) for word in text.split())
+    return " ".join(sorted(word for word in words if word))
+
+
+class SearchCache:
+    """Caches search results in memory and, optionally, on disk.
+
+    Entries are keyed on engine, normalised query, language, country and the
+    number of results, and expire after ttl seconds. The memory tier is an
+    LRU of max_entries results; the disk tier keeps one JSON file per entry
+    so that results survive restarts and are shared between processes.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 3600,
+        max_entries: int = 1024,
+        cache_dir: Optional[str] = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        self._memory: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Optional[SearchSettings]) -> "SearchCache":
+        """Create a cache from search configuration settings"""
+        settings = settings or SearchSettings()
+        return cls(
+            ttl=settings.cache_ttl,
+            max_entries=settings.cache_size,
+            cache_dir=settings.cache_dir,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.ttl) and self.max_entries > 0
+
+    def search(
+        self,
+        engine: str,
+        query: str,
+        num_results: int,
+        lang: Optional[str],
+        country: Optional[str],
+        perform_search: Callable[[], List[Any]],
+    ) -> List[SearchItem]:
+        """Return cached results, or run perform_search and cache its results
+
+        Args:
+            engine: Name of the search engine
+            query: Search query as given by the caller
+            num_results: Number of results requested
+            lang: Language code of the search
+            country: Country code of the search
+            perform_search: Runs the search on a cache miss
+
+        Returns:
+            List[SearchItem]: The search results
+        """
+        if not self.enabled:
+            return [self._to_item(item) for item in perform_search()]
+
+        key = (engine, normalize_query(query), lang, country, num_results)
+        entry = self._get(key)
+        if entry is not None:
+            self.saved_seconds += entry["latency"]
+            logger.debug(f"Search cache hit for {engine} query '{query}'")
+            return [SearchItem(**item) for item in entry["items"]]
+
+        self.misses += 1
+        started = time.perf_counter()
+        items = [self._to_item(item) for item in perform_search()]
+        if items:
+            self._put(
+                key,
+                {
+                    "created": time.time(),
+                    "latency": time.perf_counter() - started,
+                    "items": [item.model_dump() for item in items],
+                },
+            )
+        return items
+
+    @staticmethod
+    def _to_item(item: Any) -> SearchItem:
+        return item if isinstance(item, SearchItem) else SearchItem(**item)
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["created"] > self.ttl
+
+    def _get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        if entry is None:
+            return None
+        with self._lock:
+            self.disk_hits += 1
+            self._store_memory(key, entry)
+        return entry
+
+    def _put(self, key: CacheKey, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._store_memory(key, entry)
+        self._write_disk(key, entry)
+
+    def _store_memory(self, key: CacheKey, entry: Dict[str, Any]) -> None:
+        """Insert into the memory tier. Must be called with the lock held."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: CacheKey) -> Path:
+        digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _read_disk(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search cache entry {path}: {e}")
+            return None
+        if self._expired(entry):
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _write_disk(self, key: CacheKey, entry: Dict[str, Any]) -> None:
+        if self.cache_dir is None:
+            return
+        path = self._disk_path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so that readers never see a partial entry
+            temp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            temp.write_text(json.dumps(entry), encoding="utf-8")
+            temp.replace(path)
+        except OSError as e:
+            logger.warning(f"Failed to write search cache entry {path}: {e}")
+
+    def clear(self) -> None:
+        """Drop all cached results, including those on disk, and reset stats"""
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.disk_hits = self.misses = 0
+            self.saved_seconds = 0.0
+        if self.cache_dir is not None and self.cache_dir.is_dir():
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit rates and the search latency avoided by cache hits"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "saved_seconds": self.saved_seconds,
+        }
+
+
+SEARCH_CACHE = SearchCache.from_settings(config.search_config)
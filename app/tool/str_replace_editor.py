@@ -102,6 +102,10 @@ class StrReplaceEditor(BaseTool):
     _local_operator: LocalFileOperator = LocalFileOperator()
     _sandbox_operator: SandboxFileOperator = SandboxFileOperator()
 
+    def is_parallel_safe(self, command: Optional[str] = None, **kwargs) -> bool:
+        """Only the read-only `view` command may run concurrently."""
+        return command == "view"
+
     # def _get_operator(self, use_sandbox: bool) -> FileOperator:
     def _get_operator(self) -> FileOperator:
         """Get the appropriate file operator based on execution mode."""
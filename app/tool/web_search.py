@@ -1,7 +1,8 @@
 import asyncio
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, ClassVar, Dict, List, Optional
 
-import requests
+import httpx
 from bs4 import BeautifulSoup
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -17,6 +18,7 @@ from app.tool.search import (
     WebSearchEngine,
 )
 from app.tool.search.base import SearchItem
+from app.tool.search.cache import SEARCH_CACHE
 
 
 class SearchResult(BaseModel):
@@ -104,10 +106,56 @@ class SearchResponse(ToolResult):
 
 
 class WebContentFetcher:
-    """Utility class for fetching web content."""
+    """Utility class for fetching web content.
+
+    Requests share one async HTTP client per event loop, so connections to a
+    host are kept alive and reused. Concurrent requests to a single host are
+    limited, bodies are read up to a byte cap, and responses that are not
+    HTML or text are abandoned before their body is downloaded.
+    """
+
+    MAX_CONNECTIONS = 100
+    MAX_CONNECTIONS_PER_HOST = 6
+    MAX_CONTENT_BYTES = 2 * 1024 * 1024
+    TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+    _client: Optional[httpx.AsyncClient] = None
+    _client_loop: Optional[asyncio.AbstractEventLoop] = None
+    _host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def _create_client(cls) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers={
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+            },
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=cls.MAX_CONNECTIONS,
+                max_keepalive_connections=cls.MAX_CONNECTIONS,
+            ),
+        )
 
-    @staticmethod
-    async def fetch_content(url: str, timeout: int = 10) -> Optional[str]:
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """Get the client of the running event loop, creating it if needed"""
+        loop = asyncio.get_running_loop()
+        if cls._client is None or cls._client_loop is not loop:
+            # Connections cannot be shared across event loops
+            cls._client = cls._create_client()
+            cls._client_loop = loop
+            cls._host_limits = {}
+        return cls._client
+
+    @classmethod
+    def _host_limit(cls, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        if host not in cls._host_limits:
+            cls._host_limits[host] = asyncio.Semaphore(cls.MAX_CONNECTIONS_PER_HOST)
+        return cls._host_limits[host]
+
+    @classmethod
+    async def fetch_content(cls, url: str, timeout: int = 10) -> Optional[str]:
         """
         Fetch and extract the main content from a webpage.
 
@@ -118,39 +166,120 @@ class WebContentFetcher:
         Returns:
             Extracted text content or None if fetching fails
         """
-        headers = {
-            "WebSearch": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-
         try:
-            # Use asyncio to run requests in a thread pool
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: requests.get(url, headers=headers, timeout=timeout)
-            )
+            client = cls._get_client()
+            async with cls._host_limit(url):
+                html = await asyncio.wait_for(
+                    cls._read_html(client, url, timeout), timeout=timeout
+                )
+            if html is None:
+                return None
 
+            return await asyncio.to_thread(cls._extract_text, html)
+
+        except Exception as e:
+            logger.warning(f"Error fetching content from {url}: {e!r}")
+            return None
+
+    @classmethod
+    async def _read_html(
+        cls, client: httpx.AsyncClient, url: str, timeout: int
+    ) -> Optional[str]:
+        """Stream a response body up to the byte cap, or None if unusable"""
+        async with client.stream("GET", url, timeout=timeout) as response:
             if response.status_code != 200:
                 logger.warning(
                     f"Failed to fetch content from {url}: HTTP {response.status_code}"
                 )
                 return None
 
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(response.text, "html.parser")
+            content_type = response.headers.get("content-type", "").lower()
+            if content_type and not content_type.startswith(cls.TEXT_CONTENT_TYPES):
+                logger.debug(f"Skipping {url}: unsupported content type {content_type}")
+                return None
 
-            # Remove script and style elements
-            for script in soup(["script", "style", "header", "footer", "nav"]):
-                script.extract()
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= cls.MAX_CONTENT_BYTES:
+                    break
 
-            # Get text content
-            text = soup.get_text(separator="\n", strip=True)
+            body = b"".join(chunks)[: cls.MAX_CONTENT_BYTES]
+            return body.decode(response.encoding or "utf-8", errors="replace")
 
-            # Clean up whitespace and limit size (100KB max)
-            text = " ".join(text.split())
-            return text[:10000] if text else None
+    @staticmethod
+    def _extract_text(html: str) -> Optional[str]:
+        """Extract the visible text of an HTML page"""
+        # Parse HTML with BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
 
-        except Exception as e:
-            logger.warning(f"Error fetching content from {url}: {e}")
-            return None
+        # Remove script and style elements
+        for script in soup(["script", "style", "header", "footer", "nav"]):
+            script.extract()
+
+        # Get text content
+        text = soup.get_text(separator="\n", strip=True)
+
+        # Clean up whitespace and limit size (100KB max)
+        text = " ".join(text.split())
+        return text[:10000] if text else None
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared client and its pooled connections
+
+        Requests made afterwards open a new client.
+        """
+        client, cls._client = cls._client, None
+        cls._client_loop = None
+        cls._host_limits = {}
+        if client is not None:
+            await client.aclose()
+
+
+class EngineStats:
+    """Latency and failure statistics of a search engine, as moving averages."""
+
+    ALPHA = 0.3
+    # Latency assumed for engines without a successful search, so that an
+    # engine that keeps failing ranks below one that was never tried
+    PRIOR_LATENCY = 2.0
+
+    def __init__(self):
+        self.searches = 0
+        self.failures = 0
+        self.latency: Optional[float] = None
+        self.failure_rate = 0.0
+
+    def record(self, latency: float, success: bool) -> None:
+        """Record the outcome of one search"""
+        self.searches += 1
+        self.failure_rate += self.ALPHA * (
+            (0.0 if success else 1.0) - self.failure_rate
+        )
+        if success:
+            self.latency = (
+                latency
+                if self.latency is None
+                else self.latency + self.ALPHA * (latency - self.latency)
+            )
+        else:
+            self.failures += 1
+
+    def score(self) -> float:
+        """Expected seconds until a good result, lower is better"""
+        latency = self.PRIOR_LATENCY if self.latency is None else self.latency
+        return latency / max(1.0 - self.failure_rate, 0.05)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "searches": self.searches,
+            "failures": self.failures,
+            "latency": self.latency,
+            "failure_rate": self.failure_rate,
+        }
 
 
 class WebSearch(BaseTool):
@@ -190,6 +319,7 @@ class WebSearch(BaseTool):
         },
         "required": ["query"],
     }
+    parallel_safe: bool = True
     _search_engine: dict[str, WebSearchEngine] = {
         "google": GoogleSearchEngine(),
         "baidu": BaiduSearchEngine(),
@@ -197,6 +327,8 @@ class WebSearch(BaseTool):
         "bing": BingSearchEngine(),
     }
     content_fetcher: WebContentFetcher = WebContentFetcher()
+    # Shared by all instances, like the engines themselves
+    _engine_stats: ClassVar[Dict[str, EngineStats]] = {}
 
     async def execute(
         self,
@@ -246,11 +378,19 @@ class WebSearch(BaseTool):
                 else "us"
             )
 
+        hedge_delay = (
+            getattr(config.search_config, "hedge_delay", None)
+            if config.search_config
+            else None
+        )
+
         search_params = {"lang": lang, "country": country}
 
         # Try searching with retries when all engines fail
         for retry_count in range(max_retries + 1):
-            results = await self._try_all_engines(query, num_results, search_params)
+            results = await self._try_all_engines(
+                query, num_results, search_params, hedge_delay
+            )
 
             if results:
                 # Fetch content if requested
@@ -288,43 +428,118 @@ class WebSearch(BaseTool):
         )
 
     async def _try_all_engines(
-        self, query: str, num_results: int, search_params: Dict[str, Any]
+        self,
+        query: str,
+        num_results: int,
+        search_params: Dict[str, Any],
+        hedge_delay: Optional[float] = None,
     ) -> List[SearchResult]:
-        """Try all search engines in the configured order."""
+        """Try all search engines in the configured order.
+
+        Without a hedge delay each engine is tried after the previous one
+        failed. With one, the next engine is also started whenever the running
+        ones have not answered within hedge_delay seconds, and the first good
+        result wins; a delay of 0 races all engines at once.
+        """
         engine_order = self._get_engine_order()
-        failed_engines = []
+        if hedge_delay is None:
+            failed_engines = []
+            for engine_name in engine_order:
+                logger.info(f"🔎 Attempting search with {engine_name.capitalize()}...")
+                search_items = await self._search_and_record(
+                    engine_name, query, num_results, search_params
+                )
+                if search_items:
+                    if failed_engines:
+                        logger.info(
+                            f"Search successful with {engine_name.capitalize()} after trying: {', '.join(failed_engines)}"
+                        )
+                    return self._to_results(engine_name, search_items)
+                failed_engines.append(engine_name)
+
+            if failed_engines:
+                logger.error(f"All search engines failed: {', '.join(failed_engines)}")
+            return []
+
+        waiting = list(engine_order)
+        running: Dict[asyncio.Task, str] = {}
 
-        for engine_name in engine_order:
-            engine = self._search_engine[engine_name]
+        def launch() -> None:
+            engine_name = waiting.pop(0)
             logger.info(f"🔎 Attempting search with {engine_name.capitalize()}...")
-            search_items = await self._perform_search_with_engine(
-                engine, query, num_results, search_params
+            task = asyncio.create_task(
+                self._search_and_record(engine_name, query, num_results, search_params)
             )
+            running[task] = engine_name
 
-            if not search_items:
-                continue
-
-            if failed_engines:
-                logger.info(
-                    f"Search successful with {engine_name.capitalize()} after trying: {', '.join(failed_engines)}"
+        try:
+            while waiting and (not running or hedge_delay <= 0):
+                launch()
+
+            while running:
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=hedge_delay if waiting else None,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
+                for task in done:
+                    engine_name = running.pop(task)
+                    search_items = task.result()
+                    if search_items:
+                        return self._to_results(engine_name, search_items)
+
+                # Fall back after a failure, or hedge against slow engines
+                if waiting:
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+
+        logger.error(f"All search engines failed: {', '.join(engine_order)}")
+        return []
 
-            # Transform search items into structured results
-            return [
-                SearchResult(
-                    position=i + 1,
-                    url=item.url,
-                    title=item.title
-                    or f"Result {i+1}",  # Ensure we always have a title
-                    description=item.description or "",
-                    source=engine_name,
-                )
-                for i, item in enumerate(search_items)
-            ]
+    @staticmethod
+    def _to_results(
+        engine_name: str, search_items: List[SearchItem]
+    ) -> List[SearchResult]:
+        """Transform search items into structured results"""
+        return [
+            SearchResult(
+                position=i + 1,
+                url=item.url,
+                title=item.title or f"Result {i+1}",  # Ensure we always have a title
+                description=item.description or "",
+                source=engine_name,
+            )
+            for i, item in enumerate(search_items)
+        ]
 
-        if failed_engines:
-            logger.error(f"All search engines failed: {', '.join(failed_engines)}")
-        return []
+    async def _search_and_record(
+        self,
+        engine_name: str,
+        query: str,
+        num_results: int,
+        search_params: Dict[str, Any],
+    ) -> List[SearchItem]:
+        """Search with one engine, recording its latency and outcome"""
+        stats = self._engine_stats.setdefault(engine_name, EngineStats())
+        started = time.perf_counter()
+        try:
+            search_items = await self._perform_search_with_engine(
+                engine_name, query, num_results, search_params
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Search with {engine_name.capitalize()} failed: {e}")
+            search_items = []
+        stats.record(time.perf_counter() - started, bool(search_items))
+        return search_items
+
+    @classmethod
+    def get_engine_stats(cls) -> Dict[str, Dict[str, Any]]:
+        """Get latency and failure statistics per engine"""
+        return {name: stats.to_dict() for name, stats in cls._engine_stats.items()}
 
     async def _fetch_content_for_results(
         self, results: List[SearchResult]
@@ -357,6 +572,10 @@ class WebSearch(BaseTool):
                 result.raw_content = content
         return result
 
+    async def cleanup(self) -> None:
+        """Close the pooled connections of the content fetcher"""
+        await self.content_fetcher.aclose()
+
     def _get_engine_order(self) -> List[str]:
         """Determines the order in which to try search engines."""
         preferred = (
@@ -382,6 +601,22 @@ class WebSearch(BaseTool):
         )
         engine_order.extend([e for e in self._search_engine if e not in engine_order])
 
+        adaptive = (
+            getattr(config.search_config, "adaptive_order", False)
+            if config.search_config
+            else False
+        )
+        if adaptive:
+            # Fastest reliable engines first, failing ones last; ties keep the
+            # configured order
+            configured = list(engine_order)
+            engine_order.sort(
+                key=lambda e: (
+                    self._engine_stats.get(e, EngineStats()).score(),
+                    configured.index(e),
+                )
+            )
+
         return engine_order
 
     @retry(
@@ -389,21 +624,28 @@ class WebSearch(BaseTool):
     )
     async def _perform_search_with_engine(
         self,
-        engine: WebSearchEngine,
+        engine_name: str,
         query: str,
         num_results: int,
         search_params: Dict[str, Any],
     ) -> List[SearchItem]:
-        """Execute search with the given engine and parameters."""
+        """Execute search with the given engine and parameters, through the result cache."""
+        engine = self._search_engine[engine_name]
+        lang = search_params.get("lang")
+        country = search_params.get("country")
         return await asyncio.get_event_loop().run_in_executor(
             None,
-            lambda: list(
-                engine.perform_search(
-                    query,
-                    num_results=num_results,
-                    lang=search_params.get("lang"),
-                    country=search_params.get("country"),
-                )
+            lambda: SEARCH_CACHE.search(
+                engine_name,
+                query,
+                num_results,
+                lang,
+                country,
+                lambda: list(
+                    engine.perform_search(
+                        query, num_results=num_results, lang=lang, country=country
+                    )
+                ),
             ),
         )
 
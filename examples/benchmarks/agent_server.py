@@ -0,0 +1,118 @@
+"""
+Load test for hosting many agent sessions in one AgentServer.
+
+Sessions arrive at a fixed rate from several tenants, each sending one request
+that takes a few steps of simulated LLM and sandbox latency. The same load runs
+against servers allowing different numbers of concurrent requests, and the
+throughput, the p50/p99 session latency and the requests rejected by
+backpressure are reported.
+
+Usage:
+    python -m examples.benchmarks.agent_server [--sessions 200] [--rate 100] [--tenants 4] [--steps 3] [--llm-ms 100] [--tool-ms 50]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.agent.base import BaseAgent
+from app.agent_server import AgentServer
+from app.exceptions import ServerBusyError
+from app.llm import LLM
+from app.schema import AgentState
+from app.tenancy import limited, usage_slot
+
+
+class SimulatedLLM(LLM):
+    """LLM answering after a fixed latency, without a model"""
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    @limited("llm")
+    async def ask(self, *args, **kwargs) -> str:
+        await asyncio.sleep(self.latency)
+        return "thought"
+
+
+class SimulatedAgent(BaseAgent):
+    """Agent whose steps are one LLM call followed by one sandbox call"""
+
+    name: str = "worker"
+    max_steps: int = 3
+    tool_latency: float = 0.0
+
+    async def step(self) -> str:
+        await self.llm.ask()
+        async with usage_slot("sandbox"):
+            await asyncio.sleep(self.tool_latency)
+        if self.current_step == self.max_steps - 1:
+            self.state = AgentState.FINISHED
+        return "done"
+
+
+async def _load(server: AgentServer, sessions: int, rate: float, tenants: int):
+    """Send one request per session at the given rate, returning the wall time"""
+    rng = random.Random(0)
+
+    async def request(i: int) -> None:
+        try:
+            await server.submit(f"session-{i}", "task", tenant=f"t{i % tenants}")
+        except ServerBusyError:
+            pass
+
+    start = time.perf_counter()
+    tasks = []
+    for i in range(sessions):
+        tasks.append(asyncio.create_task(request(i)))
+        await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - start
+
+
+async def main(args) -> None:
+    llm = SimulatedLLM(args.llm_ms / 1000)
+
+    async def factory() -> SimulatedAgent:
+        return SimulatedAgent(
+            llm=llm, max_steps=args.steps + 1, tool_latency=args.tool_ms / 1000
+        )
+
+    print(
+        f"{args.sessions} sessions at {args.rate}/s from {args.tenants} tenants, "
+        f"{args.steps} steps of {args.llm_ms}ms LLM + {args.tool_ms}ms sandbox"
+    )
+    print(
+        f"{'max_running':>11} {'done':>5} {'rejected':>8} {'req/s':>7} "
+        f"{'p50':>7} {'p99':>7}"
+    )
+    for max_running in (1, 16, 64):
+        server = AgentServer(
+            factory,
+            max_running=max_running,
+            max_queued=64,
+            queue_timeout=5,
+            tenant_limits={"llm": 16, "sandbox": 8},
+        )
+        elapsed = await _load(server, args.sessions, args.rate, args.tenants)
+        stats = server.get_stats()
+        print(
+            f"{max_running:>11} {stats['completed']:>5} {stats['rejected']:>8} "
+            f"{stats['completed'] / elapsed:>7.1f} "
+            f"{stats['latency_p50']:>6.2f}s {stats['latency_p99']:>6.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=100)
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--llm-ms", type=int, default=100)
+    parser.add_argument("--tool-ms", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
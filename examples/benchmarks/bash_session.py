@@ -0,0 +1,87 @@
+"""
+Benchmark for the bash tool's session reader.
+
+Compares the event-driven `_BashSession` against the previous implementation,
+which slept `_output_delay` seconds between polls and re-decoded the whole
+stdout buffer on every poll, for commands producing ~10MB of output and for
+commands producing none.
+
+Usage:
+    python -m examples.benchmarks.bash_session [--empty-runs 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.tool.base import CLIResult
+from app.tool.bash import _BashSession
+
+
+LARGE_OUTPUT_COMMAND = "head -c 10000000 /dev/zero | tr '\\0' 'a' | fold -w 100"
+
+
+class PollingBashSession(_BashSession):
+    """The previous sleep-polling reader, kept for comparison."""
+
+    _output_delay: float = 0.2  # seconds
+
+    async def start(self):
+        if self._started:
+            return
+        await super().start()
+        # read the pipes' StreamReader buffers directly, as the old reader did
+        for reader in self._readers:
+            reader.cancel()
+
+    async def run(self, command: str, on_output=None):
+        self._process.stdin.write(
+            command.encode() + f"; echo '{self._sentinel}'\n".encode()
+        )
+        await self._process.stdin.drain()
+
+        while True:
+            await asyncio.sleep(self._output_delay)
+            output = self._process.stdout._buffer.decode()
+            if self._sentinel in output:
+                output = output[: output.index(self._sentinel)]
+                break
+
+        error = self._process.stderr._buffer.decode()
+        self._process.stdout._buffer.clear()
+        self._process.stderr._buffer.clear()
+        return CLIResult(output=output.rstrip("\n"), error=error.rstrip("\n"))
+
+
+async def _time(session: _BashSession, command: str, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = await session.run(command)
+    elapsed = time.perf_counter() - start
+    if command == LARGE_OUTPUT_COMMAND:
+        assert len(result.output) > 9_000_000, "large output was truncated"
+    return elapsed
+
+
+async def main(empty_runs: int) -> None:
+    print(f"{'reader':<10} {'10MB output':>12} {f'{empty_runs}x no output':>16}")
+    for name, session_class in (
+        ("polling", PollingBashSession),
+        ("streaming", _BashSession),
+    ):
+        session = session_class()
+        await session.start()
+        # raise the StreamReader limit so the polling reader can buffer 10MB
+        session._process.stdout._limit = 2**30
+        large = await _time(session, LARGE_OUTPUT_COMMAND, runs=1)
+        empty = await _time(session, "true", runs=empty_runs)
+        session.stop()
+        await session._process.wait()
+        print(f"{name:<10} {large:>11.2f}s {empty:>15.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--empty-runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.empty_runs))
@@ -0,0 +1,109 @@
+"""
+Benchmark for parsing Bing result pages in BingSearchEngine.
+
+Parses result pages with the previous full BeautifulSoup tree walk and with
+the selective pull parser, and checks that both find the same results. Pass
+a directory of saved Bing result pages to use them; otherwise pages shaped
+like Bing's (inline scripts and styles, header, answers, sidebar) are
+generated.
+
+Usage:
+    python -m examples.benchmarks.bing_parse [--pages-dir DIR] [--pages 20] [--repeat 5]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from bs4 import BeautifulSoup
+
+from app.tool.search.bing_search import BingSearchEngine
+
+
+def _generate_page(page: int) -> str:
+    scripts = "".join(f"<script>var s{i} = '{'x' * 2000}';</script>" for i in range(30))
+    styles = "".join(f"<style>.c{i} {{ color: red; }}</style>" for i in range(20))
+    header = "".join(
+        f"<div class='nav'><a href='/n{i}'>Nav {i}</a><span>|</span></div>"
+        for i in range(150)
+    )
+    results = ""
+    for i in range(10):
+        rank = page * 10 + i
+        results += (
+            f"<li class='b_algo' data-bm='{rank}'><div class='b_tpcn'>"
+            f"<a class='tilk' href='https://site{rank}.test'><div class='tptt'>Site {rank}"
+            f"</div><cite>https://site{rank}.test/path</cite></a></div>"
+            f"<h2><a href='https://site{rank}.test/page'>Result <strong>{rank}</strong>"
+            f"</a></h2><div class='b_caption'><p class='b_lineclamp2'>"
+            f"<span class='news_dt'>Jan 1, 2025</span>&ensp;&#0183;&ensp;"
+            f"{'Snippet text about the result. ' * 8}</p></div></li>"
+        )
+        if i % 3 == 0:
+            results += "<li class='b_ans'>" + "<div><span>Related</span></div>" * 80
+            results += "</li>"
+    sidebar = (
+        "<div class='b_entity'><a href='#'>Entity</a><span>Fact</span></div>" * 600
+    )
+    return (
+        f"<!DOCTYPE html><html><head>{styles}{scripts}</head><body>"
+        f"<header id='b_header'>{header}</header><main><ol id='b_results'>{results}"
+        f"<li class='b_pag'><a title='Next page' href='/search?q=x&first={page * 10 + 11}'>"
+        f"Next</a></li></ol></main><aside id='b_context'>{sidebar}</aside></body></html>"
+    )
+
+
+def _legacy_parse(html: str) -> Tuple[List[str], str]:
+    """Previous behaviour: build the whole tree, then search it"""
+    root = BeautifulSoup(html, "lxml")
+    ol_results = root.find("ol", id="b_results")
+    urls = [
+        li.find("h2").a["href"].strip()
+        for li in ol_results.find_all("li", class_="b_algo")
+    ]
+    next_btn = root.find("a", title="Next page")
+    return urls, next_btn["href"] if next_btn else None
+
+
+def _selective_parse(html: str) -> Tuple[List[str], str]:
+    items, next_url = BingSearchEngine._parse_results([html.encode()])
+    return [item.url for item in items], next_url
+
+
+def main(pages_dir: str, pages: int, repeat: int) -> None:
+    if pages_dir:
+        html_pages = [
+            p.read_text(encoding="utf-8")
+            for p in sorted(Path(pages_dir).glob("*.htm*"))
+        ]
+    else:
+        html_pages = [_generate_page(i) for i in range(pages)]
+    size = sum(len(html) for html in html_pages) / len(html_pages) / 1024
+    print(f"{len(html_pages)} pages, {size:.0f} KB on average")
+
+    for html in html_pages:
+        legacy_urls, legacy_next = _legacy_parse(html)
+        urls, next_url = _selective_parse(html)
+        assert urls == legacy_urls, "parsers found different results"
+        assert (next_url is None) == (legacy_next is None)
+
+    for name, parse in (
+        ("beautifulsoup", _legacy_parse),
+        ("selective", _selective_parse),
+    ):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for html in html_pages:
+                parse(html)
+        per_page = (time.perf_counter() - start) / (repeat * len(html_pages))
+        print(f"{name:<14} {per_page * 1000:>7.2f}ms per page")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages-dir", default=None)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.pages_dir, args.pages, args.repeat)
@@ -0,0 +1,155 @@
+"""
+Benchmark for incremental interactive element listings in browser state.
+
+Replays a recorded-style browsing session over a search results page: typing
+opens and closes an autocomplete list, results are expanded and added to the
+cart, the page is scrolled, and a second page of results is visited. Each
+state is rendered both as the full `clickable_elements_to_string()` listing
+and through `ElementTreeDiffer`, and the prompt tokens of both are compared.
+
+Usage:
+    python -m examples.benchmarks.browser_state_diff [--results 20] [--encoding cl100k_base]
+"""
+
+import argparse
+import time
+from typing import List, Tuple
+
+import tiktoken
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+from app.tool.browser_state_diff import ElementTreeDiffer
+
+
+Element = Tuple[str, str, str]
+
+
+def _build_tree(elements: List[Element]) -> DOMElementNode:
+    """Build a page from (xpath, tag, text) tuples; tag "#text" is plain text"""
+    root = DOMElementNode(
+        is_visible=True,
+        parent=None,
+        tag_name="body",
+        xpath="/body",
+        attributes={},
+        children=[],
+        is_top_element=True,
+    )
+    index = 0
+    for xpath, tag, text in elements:
+        if tag == "#text":
+            root.children.append(DOMTextNode(is_visible=True, parent=root, text=text))
+            continue
+        element = DOMElementNode(
+            is_visible=True,
+            parent=root,
+            tag_name=tag,
+            xpath=xpath,
+            attributes={},
+            children=[],
+            highlight_index=index,
+        )
+        element.children.append(DOMTextNode(is_visible=True, parent=element, text=text))
+        root.children.append(element)
+        index += 1
+    return root
+
+
+def _results_page(
+    page: int,
+    results: int,
+    first: int = 0,
+    suggestions: int = 0,
+    expanded: Tuple[int, ...] = (),
+    in_cart: Tuple[int, ...] = (),
+) -> List[Element]:
+    elements: List[Element] = [
+        (f"/nav/a[{i}]", "a", f"Category {i}") for i in range(12)
+    ]
+    elements.append(("/header/input", "input", "Search products"))
+    elements += [
+        (f"/header/ul/li[{i}]", "li", f"suggestion {i} for laptop")
+        for i in range(suggestions)
+    ]
+    elements.append(("/header/a[@id='cart']", "a", f"Cart ({len(in_cart)})"))
+    for r in range(first, min(first + results, 40)):
+        base = f"/main/div[{r}]"
+        item = page * 100 + r
+        elements.append(
+            (f"{base}/a", "a", f"Laptop model {item} - 16GB RAM, 512GB SSD")
+        )
+        elements.append((f"{base}/p", "#text", f"${500 + item}.99 - free shipping"))
+        if r in expanded:
+            elements.append((f"{base}/p[2]", "#text", f"Model {item} specifications"))
+            elements.append((f"{base}/a[2]", "a", "Compare"))
+            elements.append((f"{base}/a[3]", "a", "Reviews"))
+        else:
+            elements.append((f"{base}/button[1]", "button", "Show details"))
+        elements.append(
+            (
+                f"{base}/button[2]",
+                "button",
+                "In cart" if r in in_cart else "Add to cart",
+            )
+        )
+    elements += [(f"/main/nav/a[{i}]", "a", f"Page {i + 1}") for i in range(10)]
+    elements += [(f"/footer/a[{i}]", "a", f"Footer link {i}") for i in range(20)]
+    return elements
+
+
+def _session(results: int) -> List[Tuple[str, List[Element]]]:
+    """Recorded states as (url, elements), one per agent step"""
+    url = "https://shop.test/search?q=laptop"
+    page2 = url + "&page=2"
+    return [
+        (url, _results_page(1, results)),
+        (url, _results_page(1, results, suggestions=8)),
+        (url, _results_page(1, results)),
+        (url, _results_page(1, results, expanded=(2,))),
+        (url, _results_page(1, results, expanded=(2,), in_cart=(2,))),
+        (url, _results_page(1, results, expanded=(2, 5), in_cart=(2,))),
+        (url, _results_page(1, results, first=4, expanded=(5,), in_cart=(2,))),
+        (url, _results_page(1, results, first=8, in_cart=(2,))),
+        (page2, _results_page(2, results, in_cart=(2,))),
+        (page2, _results_page(2, results, expanded=(0,), in_cart=(2,))),
+        (page2, _results_page(2, results, expanded=(0,), in_cart=(0, 2))),
+        (page2, _results_page(2, results, first=4, in_cart=(0, 2))),
+    ]
+
+
+def main(results: int, encoding: str) -> None:
+    tokenizer = tiktoken.get_encoding(encoding)
+    differ = ElementTreeDiffer()
+    total_full = total_sent = 0
+    render_time = 0.0
+
+    print(f"{'step':>4} {'mode':>5} {'full tokens':>12} {'sent tokens':>12}")
+    for step, (url, elements) in enumerate(_session(results)):
+        tree = _build_tree(elements)
+        listing = tree.clickable_elements_to_string()
+
+        start = time.perf_counter()
+        text, full = differ.render(0, url, tree)
+        render_time += time.perf_counter() - start
+
+        full_tokens = len(tokenizer.encode(listing))
+        sent_tokens = len(tokenizer.encode(text))
+        total_full += full_tokens
+        total_sent += sent_tokens
+        mode = "full" if full else "diff"
+        print(f"{step:>4} {mode:>5} {full_tokens:>12} {sent_tokens:>12}")
+
+    states = len(_session(results))
+    print(
+        f"total: {total_full} -> {total_sent} tokens "
+        f"({100 * (1 - total_sent / total_full):.1f}% fewer), "
+        f"render {render_time / states * 1000:.2f}ms/state"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--results", type=int, default=20)
+    parser.add_argument("--encoding", default="cl100k_base")
+    args = parser.parse_args()
+    main(args.results, args.encoding)
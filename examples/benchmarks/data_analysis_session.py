@@ -0,0 +1,84 @@
+"""
+Benchmark for the stateful Python session of the DataAnalysis agent.
+
+Runs a sequence of analysis steps over a generated CSV file. Without a
+session every step has to load the file again; with a session the first
+step loads it and later steps reuse the loaded rows.
+
+Usage:
+    python -m examples.benchmarks.data_analysis_session [--rows 200000] [--steps 10]
+"""
+
+import argparse
+import asyncio
+import csv
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.tool.python_pool import PythonWorkerPool
+
+
+LOAD = """
+import csv
+with open({path!r}, newline="") as f:
+    rows = [(r["region"], float(r["amount"])) for r in csv.DictReader(f)]
+"""
+
+STEP = """
+totals = {{}}
+for region, amount in rows:
+    if amount > {threshold}:
+        totals[region] = totals.get(region, 0.0) + amount
+print(len(totals))
+"""
+
+
+def _write_csv(path: Path, rows: int) -> None:
+    rng = random.Random(0)
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["region", "amount"])
+        for _ in range(rows):
+            writer.writerow(
+                [f"region-{rng.randint(1, 50)}", f"{rng.random() * 1000:.2f}"]
+            )
+
+
+async def _analyse(
+    pool: PythonWorkerPool, path: Path, steps: int, session_id=None
+) -> float:
+    start = time.perf_counter()
+    for step in range(steps):
+        code = STEP.format(threshold=step * 50)
+        # Without a session each step has to load the data again
+        if session_id is None or step == 0:
+            code = LOAD.format(path=str(path)) + code
+        result = await pool.run(code, timeout=60, session_id=session_id)
+        assert result["success"], result["observation"]
+    return time.perf_counter() - start
+
+
+async def main(rows: int, steps: int) -> None:
+    pool = PythonWorkerPool()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sales.csv"
+        _write_csv(path, rows)
+        print(f"{steps} steps over {rows} rows")
+        try:
+            for name, session_id in (("stateless", None), ("session", "bench")):
+                elapsed = await _analyse(pool, path, steps, session_id)
+                print(
+                    f"{name:<10} {elapsed:>7.2f}s  {elapsed / steps * 1000:>8.1f}ms/step"
+                )
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.steps))
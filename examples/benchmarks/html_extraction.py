@@ -0,0 +1,99 @@
+"""
+Benchmark for page content extraction in the browser tool.
+
+Converts a corpus of large HTML pages to markdown the way `extract_content`
+does, comparing the previous full `markdownify` conversion followed by
+truncation against `PageExtractor`, both on first extraction and on a retry
+of the same unchanged page. Without --corpus, synthetic pages with heavy
+navigation, inline scripts and long articles are generated.
+
+Usage:
+    python -m examples.benchmarks.html_extraction [--corpus DIR] [--max-length 2000]
+"""
+
+import argparse
+import random
+import string
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import markdownify
+
+from app.tool.browser_extraction import PageExtractor
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        for _ in range(count)
+    )
+
+
+def _synthetic_page(seed: int, sections: int) -> str:
+    rng = random.Random(seed)
+    nav = "".join(f'<li><a href="/c/{i}">{_words(rng, 2)}</a></li>' for i in range(300))
+    script = "<script>" + "var x = 1;" * 20000 + "</script>"
+    article = "".join(
+        f"<section><h2>{_words(rng, 4)}</h2>"
+        + "".join(f"<p>{_words(rng, 80)}</p>" for _ in range(5))
+        + f'<ul>{"".join(f"<li>{_words(rng, 6)}</li>" for _ in range(5))}</ul>'
+        + "</section>"
+        for _ in range(sections)
+    )
+    sidebar = "".join(
+        f"<div><a href='/p/{i}'>{_words(rng, 8)}</a></div>" for i in range(200)
+    )
+    return (
+        f"<html><head><style>{'.a{color:red}' * 2000}</style>{script}</head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main><article><h1>{_words(rng, 6)}</h1>{article}</article></main>"
+        f"<aside>{sidebar}</aside><footer>{_words(rng, 200)}</footer>"
+        "</body></html>"
+    )
+
+
+def _load_corpus(corpus: str) -> List[Tuple[str, str]]:
+    if corpus:
+        return [
+            (path.as_uri(), path.read_text(encoding="utf-8", errors="replace"))
+            for path in sorted(Path(corpus).glob("*.html"))
+        ]
+    return [
+        (f"https://example.test/{seed}", _synthetic_page(seed, 200))
+        for seed in range(5)
+    ]
+
+
+def _measure(pages: List[Tuple[str, str]], extract: Callable[[str, str], str]) -> float:
+    start = time.perf_counter()
+    for url, html in pages:
+        extract(url, html)
+    return (time.perf_counter() - start) / len(pages)
+
+
+def main(corpus: str, max_length: int) -> None:
+    pages = _load_corpus(corpus)
+    if not pages:
+        raise SystemExit(f"No .html files found in {corpus}")
+    size = sum(len(html) for _, html in pages) / len(pages)
+    print(f"{len(pages)} pages, {size / 1024:.0f}KB average, budget {max_length} chars")
+
+    extractor = PageExtractor()
+    variants = [
+        ("markdownify", lambda url, html: markdownify.markdownify(html)[:max_length]),
+        ("extractor", lambda url, html: extractor.extract(url, html, max_length)),
+        ("cached", lambda url, html: extractor.extract(url, html, max_length)),
+    ]
+    print(f"{'variant':<12} {'time/page':>12}")
+    for name, extract in variants:
+        per_page = _measure(pages, extract)
+        print(f"{name:<12} {per_page * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", default="", help="Directory of saved .html pages")
+    parser.add_argument("--max-length", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.corpus, args.max_length)
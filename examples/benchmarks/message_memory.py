@@ -0,0 +1,92 @@
+"""
+Benchmark for per-step message formatting and token counting.
+
+Simulates agent steps over a 100-message history in which every tenth message
+carries a screenshot, formatting the whole memory and counting its tokens the
+way `LLM.ask_tool` does each step. Compares the cached serialized messages
+against rebuilding every dict from scratch, reporting time and peak allocation
+per step.
+
+Usage:
+    python -m examples.benchmarks.message_memory [--steps 50] [--screenshot-kb 200]
+"""
+
+import argparse
+import base64
+import os
+import time
+import tracemalloc
+from typing import Callable, List
+
+from app.llm import LLM, TokenCounter
+from app.schema import Memory, Message
+
+
+class WhitespaceTokenizer:
+    """Cheap tokenizer so that the benchmark measures serialization overhead."""
+
+    name = "whitespace"
+
+    def encode(self, text: str):
+        return text.split()
+
+
+def _build_memory(messages: int, screenshot_kb: int) -> Memory:
+    screenshot = base64.b64encode(os.urandom(screenshot_kb * 768)).decode()
+    memory = Memory(max_messages=messages)
+    for i in range(messages):
+        if i % 10 == 9:
+            memory.add_message(
+                Message.tool_message(
+                    f"Screenshot of step {i}",
+                    name="browser_use",
+                    tool_call_id=f"call_{i}",
+                    base64_image=screenshot,
+                )
+            )
+        else:
+            memory.add_message(Message.user_message(f"Observation {i}: " + "x " * 200))
+    return memory
+
+
+def _uncached_format(messages: List[Message]) -> List[dict]:
+    """Previous behaviour: a fresh dict per message on every step"""
+    return LLM.format_messages([m.to_dict() for m in messages], supports_images=True)
+
+
+def _cached_format(messages: List[Message]) -> List[dict]:
+    return LLM.format_messages(messages, supports_images=True)
+
+
+def _measure(
+    memory: Memory, steps: int, format_fn: Callable[[List[Message]], List[dict]]
+) -> tuple:
+    counter = TokenCounter(WhitespaceTokenizer())
+    # Warm up caches so that both variants are measured in steady state
+    counter.count_message_tokens(format_fn(memory.messages))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(steps):
+        counter.count_message_tokens(format_fn(memory.messages))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / steps, peak
+
+
+def main(steps: int, screenshot_kb: int) -> None:
+    memory = _build_memory(100, screenshot_kb)
+    print(f"100 messages, 10 screenshots of {screenshot_kb}KB, {steps} steps")
+    print(f"{'variant':<10} {'time/step':>12} {'peak alloc':>12}")
+    for name, format_fn in (("uncached", _uncached_format), ("cached", _cached_format)):
+        per_step, peak = _measure(memory, steps, format_fn)
+        print(f"{name:<10} {per_step * 1000:>10.2f}ms {peak / 1024:>10.0f}KB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--screenshot-kb", type=int, default=200)
+    args = parser.parse_args()
+    main(args.steps, args.screenshot_kb)
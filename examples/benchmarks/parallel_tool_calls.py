@@ -0,0 +1,113 @@
+"""
+Benchmark for parallel tool-call execution in ToolCallAgent.
+
+A scripted LLM emits one step with three `web_search`-like calls and one
+`str_replace_editor view`-like call, each backed by a tool that sleeps to mock
+network or disk latency, followed by a `terminate` call. The same run is
+timed with sequential and parallel tool execution.
+
+Usage:
+    python -m examples.benchmarks.parallel_tool_calls [--latency 0.5]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion_message_tool_call import Function
+
+from app.agent.toolcall import ToolCallAgent
+from app.llm import LLM
+from app.tool import Terminate, ToolCollection
+from app.tool.base import BaseTool, ToolResult
+
+
+class LatencyTool(BaseTool):
+    """A read-only tool that sleeps for a fixed latency."""
+
+    name: str = "mock_search"
+    description: str = "Mocked search with fixed latency"
+    parameters: dict = {
+        "type": "object",
+        "properties": {"query": {"type": "string"}},
+    }
+    parallel_safe: bool = True
+    latency: float = 0.5
+
+    async def execute(self, query: str = "") -> ToolResult:
+        await asyncio.sleep(self.latency)
+        return ToolResult(output=f"results for {query}")
+
+
+class ScriptedLLM(LLM):
+    """An LLM replaying a fixed sequence of assistant messages."""
+
+    def __new__(cls, script: List[ChatCompletionMessage]):
+        return object.__new__(cls)
+
+    def __init__(self, script: List[ChatCompletionMessage]):
+        self.script = list(script)
+
+    async def ask_tool(self, *args, **kwargs) -> ChatCompletionMessage:
+        return self.script.pop(0)
+
+
+def _call(call_id: str, name: str, arguments: str) -> ChatCompletionMessageToolCall:
+    return ChatCompletionMessageToolCall(
+        id=call_id,
+        type="function",
+        function=Function(name=name, arguments=arguments),
+    )
+
+
+def _script() -> List[ChatCompletionMessage]:
+    return [
+        ChatCompletionMessage(
+            role="assistant",
+            content="Gathering information",
+            tool_calls=[
+                _call("1", "mock_search", '{"query": "a"}'),
+                _call("2", "mock_search", '{"query": "b"}'),
+                _call("3", "mock_search", '{"query": "c"}'),
+                _call("4", "mock_view", '{"query": "/tmp/report.md"}'),
+            ],
+        ),
+        ChatCompletionMessage(
+            role="assistant",
+            content="Done",
+            tool_calls=[_call("5", "terminate", '{"status": "success"}')],
+        ),
+    ]
+
+
+async def run_once(parallel: bool, latency: float) -> float:
+    agent = ToolCallAgent(
+        llm=ScriptedLLM(_script()),
+        available_tools=ToolCollection(
+            LatencyTool(latency=latency),
+            LatencyTool(name="mock_view", latency=latency),
+            Terminate(),
+        ),
+        parallel_tool_calls=parallel,
+        max_steps=5,
+    )
+    start = time.perf_counter()
+    await agent.run("Research a, b and c")
+    return time.perf_counter() - start
+
+
+async def main(latency: float) -> None:
+    sequential = await run_once(parallel=False, latency=latency)
+    parallel = await run_once(parallel=True, latency=latency)
+    print(f"sequential: {sequential:.2f}s")
+    print(f"parallel:   {parallel:.2f}s")
+    print(f"speedup:    {sequential / parallel:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency))
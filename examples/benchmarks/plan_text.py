@@ -0,0 +1,54 @@
+"""
+Benchmark for rendering the plan text that PlanningFlow embeds in step prompts.
+
+Walks a long plan step by step the way PlanningFlow does: each step is marked
+in progress, the plan text for its prompt is rendered, and the step is marked
+completed with a short note. Rendering the whole plan from scratch every time
+is compared with the incrementally updated plan view, and the prompt size of
+the whole plan with that of the windowed rendering.
+
+Usage:
+    python -m examples.benchmarks.plan_text [--steps 100] [--window 5]
+"""
+
+import argparse
+import time
+
+from app.tool.planning import PlanningTool, PlanView
+
+
+def _walk(steps: int, render) -> tuple:
+    """Run through a plan, returning seconds spent rendering and prompt chars"""
+    tool = PlanningTool()
+    tool._create_plan("bench", "Long plan", [f"Do task {i}" for i in range(steps)])
+    elapsed = 0.0
+    chars = 0
+    for i in range(steps):
+        tool._mark_step("bench", i, "in_progress", None)
+        start = time.perf_counter()
+        text = render(tool, i)
+        elapsed += time.perf_counter() - start
+        chars += len(text)
+        tool._mark_step("bench", i, "completed", f"Finished task {i} with a result")
+    return elapsed, chars
+
+
+def main(steps: int, window: int) -> None:
+    modes = {
+        "rebuild": lambda tool, i: PlanView(tool.plans["bench"]).render(),
+        "incremental": lambda tool, i: tool.get_plan_text("bench"),
+        f"window ({window})": lambda tool, i: tool.get_plan_text("bench", window, i),
+    }
+    print(f"{steps} steps")
+    print(f"{'mode':<14} {'ms/step':>9} {'chars/prompt':>13}")
+    for name, render in modes.items():
+        elapsed, chars = _walk(steps, render)
+        print(f"{name:<14} {elapsed / steps * 1000:>9.3f} {chars // steps:>13}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--window", type=int, default=5)
+    args = parser.parse_args()
+    main(args.steps, args.window)
@@ -0,0 +1,112 @@
+"""
+Benchmark for running plan steps with PlanningFlow.
+
+Runs a research-style plan whose steps take a fixed simulated LLM and tool
+latency: several independent research steps, comparisons that depend on
+some of them, and a report that depends on everything. The plan runs once
+one step at a time and once with dependency-aware parallel steps, and the
+runtime is compared with the sum of all steps and with the critical path.
+
+Usage:
+    python -m examples.benchmarks.planning_flow [--research 6] [--llm-ms 300] [--tool-ms 200] [--parallel 6]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from app.agent.base import BaseAgent
+from app.flow.planning import PlanningFlow
+from app.llm import LLM
+
+
+class SimulatedLLM(LLM):
+    """LLM answering after a fixed latency, without a model"""
+
+    latency: float = 0.0
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def ask(self, *args, **kwargs) -> str:
+        await asyncio.sleep(self.latency)
+        return "summary"
+
+
+class SimulatedAgent(BaseAgent):
+    """Agent whose single step is one LLM call followed by one tool call"""
+
+    name: str = "worker"
+    max_steps: int = 1
+    tool_latency: float = 0.0
+
+    async def step(self) -> str:
+        await self.llm.ask()
+        await asyncio.sleep(self.tool_latency)
+        return "done"
+
+
+class SimulatedFlow(PlanningFlow):
+    def _clone_executor(self, executor: SimulatedAgent) -> SimulatedAgent:
+        return SimulatedAgent(llm=executor.llm, tool_latency=executor.tool_latency)
+
+
+def _plan(research: int):
+    steps: List[str] = [f"Research source {i}" for i in range(research)]
+    dependencies: List[List[int]] = [[] for _ in range(research)]
+    # Each comparison needs two research results
+    for i in range(0, research - 1, 2):
+        steps.append(f"Compare sources {i} and {i + 1}")
+        dependencies.append([i, i + 1])
+    steps.append("Write the report")
+    dependencies.append(list(range(len(dependencies))))
+    return steps, dependencies
+
+
+async def _run(steps, dependencies, llm_latency, tool_latency, parallel) -> float:
+    llm = SimulatedLLM(llm_latency)
+    agent = SimulatedAgent(llm=llm, tool_latency=tool_latency)
+    flow = SimulatedFlow(
+        {"worker": agent}, llm=llm, plan_id="bench", max_parallel_steps=parallel
+    )
+    await flow.planning_tool.execute(
+        command="create",
+        plan_id="bench",
+        title="Research report",
+        steps=steps,
+        step_dependencies=dependencies,
+    )
+    start = time.perf_counter()
+    await flow.execute("")
+    return time.perf_counter() - start
+
+
+async def main(research: int, llm_ms: int, tool_ms: int, parallel: int) -> None:
+    steps, dependencies = _plan(research)
+    step_time = (llm_ms + tool_ms) / 1000
+    # Levels of the plan: research, comparisons, report; plus the final summary
+    summary = llm_ms / 1000
+    print(
+        f"{len(steps)} steps, {llm_ms}ms LLM + {tool_ms}ms tool per step, "
+        f"up to {parallel} in parallel"
+    )
+    print(f"sum of steps   {len(steps) * step_time + summary:>7.2f}s")
+    print(f"critical path  {3 * step_time + summary:>7.2f}s")
+
+    for name, limit in (("sequential", 1), ("parallel", parallel)):
+        elapsed = await _run(steps, dependencies, llm_ms / 1000, tool_ms / 1000, limit)
+        print(f"{name:<14} {elapsed:>7.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--research", type=int, default=6)
+    parser.add_argument("--llm-ms", type=int, default=300)
+    parser.add_argument("--tool-ms", type=int, default=200)
+    parser.add_argument("--parallel", type=int, default=6)
+    args = parser.parse_args()
+    asyncio.run(main(args.research, args.llm_ms, args.tool_ms, args.parallel))
@@ -0,0 +1,88 @@
+"""
+Benchmark for running small snippets with PythonExecute.
+
+Runs many small snippets one after another, with the previous
+implementation (a Manager server process and a new Process per snippet)
+and with the pooled worker processes, then runs a stateful session that
+reuses data loaded by an earlier snippet.
+
+Usage:
+    python -m examples.benchmarks.python_execute [--runs 1000]
+"""
+
+import argparse
+import asyncio
+import builtins
+import multiprocessing
+import sys
+import time
+from io import StringIO
+
+from app.tool.python_pool import PythonWorkerPool
+
+
+SNIPPET = "print(sum(range(100)))"
+
+
+def _legacy_run_code(code: str, result_dict: dict, safe_globals: dict) -> None:
+    original_stdout = sys.stdout
+    try:
+        output_buffer = StringIO()
+        sys.stdout = output_buffer
+        exec(code, safe_globals, safe_globals)
+        result_dict["observation"] = output_buffer.getvalue()
+        result_dict["success"] = True
+    except Exception as e:
+        result_dict["observation"] = str(e)
+        result_dict["success"] = False
+    finally:
+        sys.stdout = original_stdout
+
+
+def _legacy_execute(code: str, timeout: int = 5) -> dict:
+    """Previous behaviour: a Manager and a new process per snippet"""
+    with multiprocessing.Manager() as manager:
+        result = manager.dict({"observation": "", "success": False})
+        safe_globals = {"__builtins__": builtins.__dict__.copy()}
+        proc = multiprocessing.Process(
+            target=_legacy_run_code, args=(code, result, safe_globals)
+        )
+        proc.start()
+        proc.join(timeout)
+        return dict(result)
+
+
+def _report(name: str, runs: int, elapsed: float) -> None:
+    print(
+        f"{name:<10} {runs:>5} runs {elapsed:>8.2f}s {elapsed / runs * 1000:>9.2f}ms/run"
+    )
+
+
+async def main(runs: int) -> None:
+    start = time.perf_counter()
+    for _ in range(runs):
+        assert _legacy_execute(SNIPPET)["success"]
+    _report("legacy", runs, time.perf_counter() - start)
+
+    pool = PythonWorkerPool()
+    try:
+        start = time.perf_counter()
+        for _ in range(runs):
+            assert (await pool.run(SNIPPET))["success"]
+        _report("pooled", runs, time.perf_counter() - start)
+
+        await pool.run("data = list(range(10 ** 6))", session_id="bench")
+        start = time.perf_counter()
+        for _ in range(runs):
+            assert (await pool.run("print(len(data))", session_id="bench"))["success"]
+        _report("session", runs, time.perf_counter() - start)
+        print(pool.get_stats())
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
@@ -0,0 +1,62 @@
+"""
+Benchmark for per-file vs batched file transfer into a Docker sandbox.
+
+Writes and reads back a generated project of small files, once with
+`write_file`/`read_file` per file and once with a single
+`write_files`/`read_files` call. Requires a running Docker daemon.
+
+Usage:
+    python -m examples.benchmarks.sandbox_file_transfer [--files 200] [--size 2048]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.config import SandboxSettings
+from app.sandbox.core.sandbox import DockerSandbox
+
+
+def _project(files: int, size: int) -> dict:
+    return {
+        f"project/pkg{i % 10}/module_{i}.py": f"# module {i}\n".ljust(size, "x")
+        for i in range(files)
+    }
+
+
+async def main(files: int, size: int) -> None:
+    project = _project(files, size)
+    async with DockerSandbox(SandboxSettings()) as sandbox:
+        start = time.perf_counter()
+        for path, content in project.items():
+            await sandbox.write_file(path, content)
+        per_file_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in project:
+            await sandbox.read_file(path)
+        per_file_read = time.perf_counter() - start
+
+        await sandbox.run_command("rm -rf project")
+
+        start = time.perf_counter()
+        await sandbox.write_files(project)
+        batch_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        contents = await sandbox.read_files(list(project))
+        batch_read = time.perf_counter() - start
+        assert contents == project, "batched round trip lost data"
+
+    print(f"{files} files of {size} bytes")
+    print(f"{'mode':<10} {'write':>8} {'read':>8}")
+    print(f"{'per-file':<10} {per_file_write:>7.2f}s {per_file_read:>7.2f}s")
+    print(f"{'batched':<10} {batch_write:>7.2f}s {batch_read:>7.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size", type=int, default=2048)
+    args = parser.parse_args()
+    asyncio.run(main(args.files, args.size))
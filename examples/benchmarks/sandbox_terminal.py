@@ -0,0 +1,65 @@
+"""
+Benchmark for concurrent commands on the Docker sandbox terminal.
+
+Opens many `AsyncDockerizedTerminal` sessions against one container and runs a
+command on all of them at once, reporting total wall time and the longest
+event-loop stall observed while they run. Requires a running Docker daemon.
+
+Usage:
+    python -m examples.benchmarks.sandbox_terminal [--sessions 50] [--image python:3.12-slim]
+"""
+
+import argparse
+import asyncio
+import time
+
+import docker
+
+from app.sandbox.core.terminal import AsyncDockerizedTerminal
+
+
+async def _monitor_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Return the largest delay between scheduled wake-ups of the event loop"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def main(sessions: int, image: str) -> None:
+    client = docker.from_env()
+    container = client.containers.run(image, "tail -f /dev/null", detach=True)
+    terminals = [AsyncDockerizedTerminal(container) for _ in range(sessions)]
+    try:
+        await asyncio.gather(*(terminal.init() for terminal in terminals))
+
+        stop = asyncio.Event()
+        monitor = asyncio.create_task(_monitor_loop_lag(stop))
+        start = time.perf_counter()
+        outputs = await asyncio.gather(
+            *(
+                terminal.run_command(f"sleep 0.5 && seq 1 2000 && echo done-{i}")
+                for i, terminal in enumerate(terminals)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        lag = await monitor
+
+        for i, output in enumerate(outputs):
+            assert output.endswith(f"done-{i}"), f"session {i} output is incomplete"
+        print(f"{sessions} concurrent commands: {elapsed:.2f}s")
+        print(f"max event loop stall: {lag * 1000:.1f}ms")
+    finally:
+        await asyncio.gather(*(terminal.close() for terminal in terminals))
+        container.remove(force=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--image", default="python:3.12-slim")
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.image))
@@ -0,0 +1,63 @@
+"""
+Benchmark for the search result cache shared by the search engines.
+
+Replays a query log in which agents repeat a set of topics with different
+case, spacing and word order, against a stand-in engine with a fixed
+latency, and reports the cache hit rate and the search latency avoided.
+
+Usage:
+    python -m examples.benchmarks.search_cache [--queries 500] [--topics 50] [--latency-ms 100]
+"""
+
+import argparse
+import random
+import time
+
+from app.tool.search.base import SearchItem
+from app.tool.search.cache import SearchCache
+
+
+WORDS = "python asyncio tutorial rust memory model react hooks pandas merge".split()
+
+
+def _query_log(queries: int, topics: int, seed: int = 0):
+    rng = random.Random(seed)
+    subjects = [rng.sample(WORDS, 3) for _ in range(topics)]
+    for _ in range(queries):
+        words = list(rng.choice(subjects))
+        rng.shuffle(words)
+        words = [w.upper() if rng.random() < 0.2 else w for w in words]
+        yield (" " * rng.randint(1, 2)).join(words)
+
+
+def main(queries: int, topics: int, latency_ms: int) -> None:
+    latency = latency_ms / 1000
+    cache = SearchCache()
+
+    def search(query: str):
+        def perform_search():
+            time.sleep(latency)
+            return [SearchItem(title=query, url="https://r.test/")]
+
+        return perform_search
+
+    start = time.perf_counter()
+    for query in _query_log(queries, topics):
+        cache.search("google", query, 10, "en", "us", search(query))
+    elapsed = time.perf_counter() - start
+
+    stats = cache.stats()
+    print(f"{queries} queries over {topics} topics, {latency_ms}ms per search")
+    print(f"hit rate       {stats['hit_rate']:>8.1%}")
+    print(f"avoided        {stats['saved_seconds']:>8.1f}s")
+    print(f"without cache  {queries * latency:>8.1f}s (estimated)")
+    print(f"with cache     {elapsed:>8.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--latency-ms", type=int, default=100)
+    args = parser.parse_args()
+    main(args.queries, args.topics, args.latency_ms)
@@ -0,0 +1,98 @@
+"""
+Benchmark for incremental token counting.
+
+Simulates a ToolCallAgent run where every step appends an assistant tool call
+and a large tool observation, then re-counts the whole formatted history the
+way ``LLM.ask_tool`` does. With the per-message cache the per-step cost stays
+flat as the history grows; without it the cost grows linearly.
+
+Usage:
+    python -m examples.benchmarks.token_counting [--steps 30] [--observation-kb 8]
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import List
+
+import tiktoken
+
+from app.llm import TokenCounter
+
+
+def _random_text(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        for _ in range(size // 6)
+    ]
+    return " ".join(words)[:size]
+
+
+def _build_step(step: int, observation_size: int) -> List[dict]:
+    call_id = f"call_{step}"
+    return [
+        {"role": "user", "content": "Decide the next action."},
+        {
+            "role": "assistant",
+            "content": f"Step {step}: running a search.",
+            "tool_calls": [
+                {
+                    "id": call_id,
+                    "type": "function",
+                    "function": {
+                        "name": "web_search",
+                        "arguments": f'{{"query": "topic {step}"}}',
+                    },
+                }
+            ],
+        },
+        {
+            "role": "tool",
+            "content": _random_text(observation_size, seed=step),
+            "name": "web_search",
+            "tool_call_id": call_id,
+        },
+    ]
+
+
+def run(steps: int, observation_kb: int) -> None:
+    tokenizer = tiktoken.get_encoding("cl100k_base")
+    counters = {
+        "uncached": TokenCounter(tokenizer, cache_size=0),
+        "cached": TokenCounter(tokenizer),
+    }
+    history = [{"role": "system", "content": "You are a helpful agent."}]
+    timings = {name: [] for name in counters}
+
+    for step in range(1, steps + 1):
+        history.extend(_build_step(step, observation_kb * 1024))
+        totals = set()
+        for name, counter in counters.items():
+            start = time.perf_counter()
+            totals.add(counter.count_message_tokens(history))
+            timings[name].append((time.perf_counter() - start) * 1000)
+        assert len(totals) == 1, "cached and uncached counts diverged"
+
+    print(f"{'step':>5} {'messages':>9} {'uncached ms':>12} {'cached ms':>10}")
+    for step in range(steps):
+        if step in (0, steps - 1) or (step + 1) % 5 == 0:
+            print(
+                f"{step + 1:>5} {3 * (step + 1) + 1:>9} "
+                f"{timings['uncached'][step]:>12.2f} {timings['cached'][step]:>10.2f}"
+            )
+    cached = counters["cached"]
+    print(
+        f"total: uncached={sum(timings['uncached']):.1f}ms "
+        f"cached={sum(timings['cached']):.1f}ms "
+        f"(hits={cached.cache_hits}, misses={cached.cache_misses})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=30)
+    parser.add_argument("--observation-kb", type=int, default=8)
+    args = parser.parse_args()
+    run(args.steps, args.observation_kb)
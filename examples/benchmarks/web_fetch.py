@@ -0,0 +1,113 @@
+"""
+Benchmark for fetching search result pages in WebSearch.
+
+Starts a local HTTP/1.1 server that serves many HTML pages, adding a delay
+to every new connection to stand in for TCP/TLS setup and a delay to every
+request to stand in for server latency. Fetches the pages concurrently the
+way `_fetch_content_for_results` does, once with the previous per-request
+`requests.get` in the default thread pool and once with the pooled
+`WebContentFetcher`.
+
+Usage:
+    python -m examples.benchmarks.web_fetch [--pages 200] [--hosts 10] [--connect-ms 100] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+from app.tool.web_search import WebContentFetcher
+
+
+PAGE = (
+    "<html><head><title>Page</title></head><body><nav>Menu</nav>"
+    + "".join(f"<p>Paragraph {i} with some searchable text.</p>" for i in range(20))
+    + "</body></html>"
+).encode()
+
+
+def _start_server(connect_delay: float, latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            time.sleep(connect_delay)
+            super().setup()
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 1024
+
+    server = Server(("0.0.0.0", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _legacy_fetch(url: str, timeout: int = 10) -> Optional[str]:
+    """Previous behaviour: a new connection per request in the thread pool"""
+    response = await asyncio.get_event_loop().run_in_executor(
+        None, lambda: requests.get(url, timeout=timeout)
+    )
+    if response.status_code != 200:
+        return None
+    soup = BeautifulSoup(response.text, "html.parser")
+    text = " ".join(soup.get_text(separator="\n", strip=True).split())
+    return text[:10000] if text else None
+
+
+async def _measure(fetch, urls) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(fetch(url) for url in urls))
+    elapsed = time.perf_counter() - start
+    assert all(results), "some pages failed to fetch"
+    return elapsed
+
+
+async def main(pages: int, hosts: int, connect_ms: int, latency_ms: int) -> None:
+    server = _start_server(connect_ms / 1000, latency_ms / 1000)
+    port = server.server_address[1]
+    # Results of several searches, spread over loopback addresses as hosts
+    urls = [f"http://127.0.0.{1 + i % hosts}:{port}/page/{i}" for i in range(pages)]
+    print(
+        f"{pages} pages on {hosts} hosts, {connect_ms}ms per connection, "
+        f"{latency_ms}ms per request"
+    )
+
+    try:
+        for name, fetch in (
+            ("requests", _legacy_fetch),
+            ("pooled", WebContentFetcher.fetch_content),
+            ("pooled-warm", WebContentFetcher.fetch_content),
+        ):
+            elapsed = await _measure(fetch, urls)
+            print(f"{name:<12} {elapsed:>7.2f}s  {pages / elapsed:>8.0f} pages/s")
+    finally:
+        await WebContentFetcher.aclose()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--hosts", type=int, default=10)
+    parser.add_argument("--connect-ms", type=int, default=100)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.hosts, args.connect_ms, args.latency_ms))
@@ -1,8 +1,13 @@
 import argparse
 import asyncio
+import time
 
 from app.agent.manus import Manus
+from app.checkpoint import CheckpointStore
+from app.config import config
 from app.logger import logger
+from app.tool.browser_pool import BROWSER_POOL
+from app.tool.python_pool import PYTHON_POOL
 
 
 async def main():
@@ -11,17 +16,40 @@ async def main():
     parser.add_argument(
         "--prompt", type=str, required=False, help="Input prompt for the agent"
     )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="",
+        metavar="RUN_ID",
+        help="Resume an interrupted run from its last completed step (default: the latest run)",
+    )
     args = parser.parse_args()
+    store = CheckpointStore.from_settings(config.checkpoint)
 
+    # Fork the python_execute workers before the first snippet needs them
+    PYTHON_POOL.start()
     # Create and initialize Manus agent
     agent = await Manus.create()
     try:
+        if args.resume is not None:
+            run_id = args.resume or (store and store.latest("manus_"))
+            if not store or not run_id or not agent.restore_checkpoint(store, run_id):
+                logger.warning("No checkpoint to resume from.")
+                return
+            logger.warning(f"Resuming run {run_id}...")
+            await agent.run()
+            logger.info("Request processing completed.")
+            return
+
         # Use command line prompt if provided, otherwise ask for input
         prompt = args.prompt if args.prompt else input("Enter your prompt: ")
         if not prompt.strip():
             logger.warning("Empty prompt provided.")
             return
 
+        if store:
+            agent.checkpoint_store = store
+            agent.checkpoint_id = f"manus_{int(time.time())}"
         logger.warning("Processing your request...")
         await agent.run(prompt)
         logger.info("Request processing completed.")
@@ -30,6 +58,7 @@ async def main():
     finally:
         # Ensure agent resources are cleaned up before exiting
         await agent.cleanup()
+        await BROWSER_POOL.close()
 
 
 if __name__ == "__main__":
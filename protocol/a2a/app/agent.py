@@ -3,6 +3,7 @@ from typing import Any, AsyncIterable, ClassVar, Dict, List, Literal
 from pydantic import BaseModel
 
 from app.agent.manus import Manus
+from app.schema import AgentEventType
 
 
 class ResponseFormat(BaseModel):
@@ -19,8 +20,17 @@ class A2AManus(Manus):
         return self.get_agent_response(config, response)
 
     async def stream(self, query: str) -> AsyncIterable[Dict[str, Any]]:
-        """Streaming is not supported by Manus."""
-        raise NotImplementedError("Streaming is not supported by Manus yet.")
+        """Run the query, yielding a response for each agent event as it happens.
+
+        The last response, for the final answer, completes the task.
+        """
+        async for event in self.run_stream(query):
+            yield {
+                "is_task_complete": event.type == AgentEventType.FINAL,
+                "require_user_input": False,
+                "content": event.content,
+                "event_type": event.type.value,
+            }
 
     def get_agent_response(self, config, agent_response):
         return {
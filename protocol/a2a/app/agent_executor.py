@@ -1,5 +1,6 @@
+import inspect
 import logging
-from typing import Awaitable, Callable
+from typing import Any, Awaitable, Callable, Optional
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
@@ -7,12 +8,20 @@ from a2a.types import (
     InvalidParamsError,
     Part,
     Task,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
     TextPart,
     UnsupportedOperationError,
 )
-from a2a.utils import completed_task, new_artifact
+from a2a.utils import completed_task, new_agent_text_message, new_artifact
 from a2a.utils.errors import ServerError
 
+from app.agent_server import AgentServer
+from app.config import config
+from app.exceptions import ServerBusyError
+from app.schema import AgentEvent, AgentEventType
+
 from .agent import A2AManus
 
 
@@ -21,10 +30,28 @@ logger = logging.getLogger(__name__)
 
 
 class ManusExecutor(AgentExecutor):
-    """Currency Conversion AgentExecutor Example."""
+    """AgentExecutor running each A2A context as its own Manus session.
+
+    Requests go through an AgentServer, which keeps one agent per context,
+    runs many contexts concurrently and rejects requests beyond its capacity.
+    While a request runs, the thoughts and tool calls of its agent are sent to
+    the client as working status updates.
+    """
 
-    def __init__(self, agent_factory: Callable[[], Awaitable[A2AManus]]):
+    # Longest event text sent in a status update, in characters
+    EVENT_TEXT_LIMIT = 2000
+
+    def __init__(
+        self,
+        agent_factory: Callable[[], Awaitable[A2AManus]],
+        server: Optional[AgentServer] = None,
+    ):
         self.agent_factory = agent_factory
+        self.server = server or AgentServer.from_settings(config.server, agent_factory)
+
+    async def close(self) -> None:
+        """Close the agent server, its sessions and their shared resources"""
+        await self.server.close()
 
     async def execute(
         self,
@@ -36,36 +63,86 @@ class ManusExecutor(AgentExecutor):
             raise ServerError(error=InvalidParamsError())
 
         query = context.get_user_input()
+
+        async def on_event(event: AgentEvent) -> None:
+            text = self._format_event(event)
+            if text is None:
+                return
+            await self._enqueue(
+                event_queue,
+                TaskStatusUpdateEvent(
+                    contextId=context.context_id,
+                    taskId=context.task_id,
+                    final=False,
+                    status=TaskStatus(
+                        state=TaskState.working,
+                        message=new_agent_text_message(
+                            text, context.context_id, context.task_id
+                        ),
+                    ),
+                ),
+            )
+
         try:
-            self.agent = await self.agent_factory()
-            result = await self.agent.invoke(query, context.context_id)
-            print(f"Final Result ===> {result}")
+            result = await self.server.submit(
+                context.context_id,
+                query,
+                tenant=self._get_tenant(context),
+                on_event=on_event,
+            )
+            logger.info("Final Result ===> %s", result)
+        except ServerBusyError as e:
+            raise ServerError(error=ValueError(str(e))) from e
         except Exception as e:
-            print("Error invoking agent: %s", e)
+            logger.error("Error invoking agent: %s", e)
             raise ServerError(error=ValueError(f"Error invoking agent: {e}")) from e
         parts = [
             Part(
-                root=TextPart(
-                    text=(
-                        result["content"]
-                        if result["content"]
-                        else "failed to generate response"
-                    )
-                ),
+                root=TextPart(text=result or "failed to generate response"),
             )
         ]
-        event_queue.enqueue_event(
+        await self._enqueue(
+            event_queue,
             completed_task(
                 context.task_id,
                 context.context_id,
                 [new_artifact(parts, f"task_{context.task_id}")],
                 [context.message],
-            )
+            ),
         )
 
+    @classmethod
+    def _format_event(cls, event: AgentEvent) -> Optional[str]:
+        """Text of a status update for an agent event, None to skip the event"""
+        if event.type == AgentEventType.THOUGHT:
+            text = event.content
+        elif event.type == AgentEventType.TOOL_START:
+            text = f"Using {event.tool_name}: {event.content}"
+        elif event.type == AgentEventType.TOOL_RESULT:
+            text = f"{event.tool_name} returned: {event.content}"
+        else:
+            # Step results repeat the tool results, the final answer is the artifact
+            return None
+        if len(text) > cls.EVENT_TEXT_LIMIT:
+            text = text[: cls.EVENT_TEXT_LIMIT] + "..."
+        return text
+
+    @staticmethod
+    async def _enqueue(event_queue: EventQueue, event: Any) -> None:
+        # enqueue_event is a coroutine in newer a2a-sdk releases
+        result = event_queue.enqueue_event(event)
+        if inspect.isawaitable(result):
+            await result
+
     def _validate_request(self, context: RequestContext) -> bool:
         return False
 
+    @staticmethod
+    def _get_tenant(context: RequestContext) -> str:
+        """Tenant named in the message metadata, for per-tenant limits"""
+        metadata = (context.message.metadata if context.message else None) or {}
+        return str(metadata.get("tenant", "default"))
+
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
     ) -> Task | None:
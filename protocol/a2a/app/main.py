@@ -1,6 +1,7 @@
 import argparse
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from typing import Optional
 
 import httpx
@@ -27,7 +28,7 @@ logger = logging.getLogger(__name__)
 async def main(host: str = "localhost", port: int = 10000):
     """Starts the Manus Agent server."""
     try:
-        capabilities = AgentCapabilities(streaming=False, pushNotifications=True)
+        capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
         skills = [
             AgentSkill(
                 id="Python Execute",
@@ -81,10 +82,11 @@ async def main(host: str = "localhost", port: int = 10000):
         )
 
         httpx_client = httpx.AsyncClient()
+        agent_executor = ManusExecutor(
+            agent_factory=lambda: A2AManus.create(max_steps=3)
+        )
         request_handler = DefaultRequestHandler(
-            agent_executor=ManusExecutor(
-                agent_factory=lambda: A2AManus.create(max_steps=3)
-            ),
+            agent_executor=agent_executor,
             task_store=InMemoryTaskStore(),
             push_notifier=InMemoryPushNotifier(httpx_client),
         )
@@ -93,8 +95,18 @@ async def main(host: str = "localhost", port: int = 10000):
             agent_card=agent_card, http_handler=request_handler
         )
 
+        @asynccontextmanager
+        async def lifespan(app):
+            try:
+                yield
+            finally:
+                # Close the agents of open sessions, the shared sandbox and
+                # the browser pool
+                await agent_executor.close()
+                await httpx_client.aclose()
+
         logger.info(f"Starting server on {host}:{port}")
-        return server.build()
+        return server.build(lifespan=lifespan)
     except Exception as e:
         logger.error(f"An error occurred during server startup: {e}")
         exit(1)
@@ -1,36 +1,61 @@
+import argparse
 import asyncio
 import time
 
 from app.agent.data_analysis import DataAnalysis
 from app.agent.manus import Manus
+from app.checkpoint import CheckpointStore
 from app.config import config
 from app.flow.flow_factory import FlowFactory, FlowType
 from app.logger import logger
+from app.tool.browser_pool import BROWSER_POOL
+from app.tool.python_pool import PYTHON_POOL
 
 
 async def run_flow():
+    parser = argparse.ArgumentParser(description="Run a planning flow with a prompt")
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="",
+        metavar="PLAN_ID",
+        help="Resume an interrupted run from its last completed step (default: the latest run)",
+    )
+    args = parser.parse_args()
+    store = CheckpointStore.from_settings(config.checkpoint)
+    # Fork the python_execute workers before the first snippet needs them
+    PYTHON_POOL.start()
+
     agents = {
-        "manus": Manus(),
+        "manus": await Manus.create(),
     }
     if config.run_flow_config.use_data_analysis_agent:
         agents["data_analysis"] = DataAnalysis()
     try:
-        prompt = input("Enter your prompt: ")
+        if args.resume is not None:
+            run_id = args.resume or (store and store.latest("plan_"))
+            if not store or not run_id:
+                logger.warning("No checkpoint to resume from.")
+                return
+            prompt = None
+        else:
+            prompt = input("Enter your prompt: ")
 
-        if prompt.strip().isspace() or not prompt:
-            logger.warning("Empty prompt provided.")
-            return
+            if prompt.strip().isspace() or not prompt:
+                logger.warning("Empty prompt provided.")
+                return
 
         flow = FlowFactory.create_flow(
             flow_type=FlowType.PLANNING,
             agents=agents,
+            checkpoint_store=store,
         )
         logger.warning("Processing your request...")
 
         try:
             start_time = time.time()
             result = await asyncio.wait_for(
-                flow.execute(prompt),
+                flow.resume(run_id) if prompt is None else flow.execute(prompt),
                 timeout=3600,  # 60 minute timeout for the entire execution
             )
             elapsed_time = time.time() - start_time
@@ -46,6 +71,8 @@ async def run_flow():
         logger.info("Operation cancelled by user.")
     except Exception as e:
         logger.error(f"Error: {str(e)}")
+    finally:
+        await BROWSER_POOL.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion_message_tool_call import Function
+
+from app.agent.toolcall import ToolCallAgent
+from app.llm import LLM
+from app.schema import AgentEventType
+from app.tool import Terminate, ToolCollection
+from app.tool.base import BaseTool, ToolResult
+
+
+class EchoTool(BaseTool):
+    name: str = "echo"
+    description: str = "Echoes its text"
+    parameters: dict = {"type": "object", "properties": {"text": {"type": "string"}}}
+
+    async def execute(self, text: str = "") -> ToolResult:
+        await asyncio.sleep(0.05)
+        return ToolResult(output=text)
+
+
+class ScriptedLLM(LLM):
+    """LLM calling echo on its first turn and terminate on its second"""
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self):
+        self.turns = 0
+
+    async def ask_tool(self, *args, **kwargs) -> ChatCompletionMessage:
+        self.turns += 1
+        name, arguments = (
+            ("echo", '{"text": "hi"}')
+            if self.turns == 1
+            else ("terminate", '{"status": "success"}')
+        )
+        return ChatCompletionMessage(
+            role="assistant",
+            content=f"thinking {self.turns}",
+            tool_calls=[
+                ChatCompletionMessageToolCall(
+                    id=f"call{self.turns}",
+                    type="function",
+                    function=Function(name=name, arguments=arguments),
+                )
+            ],
+        )
+
+
+def _agent(**kwargs) -> ToolCallAgent:
+    return ToolCallAgent(
+        llm=ScriptedLLM(),
+        available_tools=ToolCollection(EchoTool(), Terminate()),
+        max_steps=5,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_events_follow_the_run():
+    """Tests that thoughts, tool calls, steps and the answer are reported in order."""
+    events = []
+    agent = _agent(event_hook=events.append)
+
+    result = await agent.run("say hi")
+
+    assert [(e.type, e.step) for e in events] == [
+        (AgentEventType.THOUGHT, 1),
+        (AgentEventType.TOOL_START, 1),
+        (AgentEventType.TOOL_RESULT, 1),
+        (AgentEventType.STEP, 1),
+        (AgentEventType.THOUGHT, 2),
+        (AgentEventType.TOOL_START, 2),
+        (AgentEventType.TOOL_RESULT, 2),
+        (AgentEventType.STEP, 2),
+        (AgentEventType.FINAL, 2),
+    ]
+    assert events[1].tool_name == "echo" and events[1].tool_call_id == "call1"
+    assert "hi" in events[2].content
+    assert events[-1].content == result
+
+
+@pytest.mark.asyncio
+async def test_run_stream_yields_events_as_they_happen():
+    """Tests that events are yielded before the run finishes."""
+    agent = _agent()
+    seen = []
+
+    async for event in agent.run_stream("say hi"):
+        seen.append((event.type, agent.state.value))
+
+    assert seen[0] == (AgentEventType.THOUGHT, "RUNNING")
+    assert seen[-1][0] == AgentEventType.FINAL
+    assert agent.event_hook is None
+
+
+@pytest.mark.asyncio
+async def test_failing_hook_does_not_stop_the_run():
+    """Tests that errors of an event hook are logged, not raised."""
+
+    async def hook(event):
+        raise RuntimeError("listener gone")
+
+    agent = _agent(event_hook=hook)
+
+    result = await agent.run("say hi")
+
+    assert "Step 2" in result
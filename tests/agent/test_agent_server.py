@@ -0,0 +1,223 @@
+import asyncio
+import time
+from collections import Counter
+
+import pytest
+
+from app.agent.base import BaseAgent
+from app.agent_server import AgentServer
+from app.exceptions import ServerBusyError
+from app.llm import LLM
+from app.sandbox.client import LocalSandboxClient
+from app.schema import AgentState
+from app.tenancy import CURRENT_TENANT, TenantLimits, limited
+
+
+class StubLLM(LLM):
+    """LLM answering after a delay, recording concurrent calls per tenant"""
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+        self.active = Counter()
+        self.peak = Counter()
+
+    @limited("llm")
+    async def ask(self, *args, **kwargs) -> str:
+        tenant = CURRENT_TENANT.get().tenant
+        self.active[tenant] += 1
+        self.peak[tenant] = max(self.peak[tenant], self.active[tenant])
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active[tenant] -= 1
+        return "answer"
+
+
+class EchoAgent(BaseAgent):
+    """Agent answering each request in one step with one LLM call"""
+
+    name: str = "echo"
+    max_steps: int = 2
+    cleaned_up: bool = False
+
+    async def step(self) -> str:
+        await self.llm.ask()
+        self.state = AgentState.FINISHED
+        return f"{len(self.memory.messages)} messages"
+
+    async def cleanup(self) -> None:
+        self.cleaned_up = True
+
+
+class FakeSandbox:
+    """Container behind a LocalSandboxClient, recording concurrent commands per tenant"""
+
+    def __init__(self):
+        self.active = Counter()
+        self.peak = Counter()
+
+    async def run_command(self, command: str, timeout=None) -> str:
+        tenant = CURRENT_TENANT.get().tenant
+        self.active[tenant] += 1
+        self.peak[tenant] = max(self.peak[tenant], self.active[tenant])
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            self.active[tenant] -= 1
+        return command
+
+
+class ShellAgent(BaseAgent):
+    """Agent running one sandbox command per request"""
+
+    name: str = "shell"
+    max_steps: int = 2
+    client: LocalSandboxClient
+
+    async def step(self) -> str:
+        output = await self.client.run_command("echo hi")
+        self.state = AgentState.FINISHED
+        return output
+
+
+def _server(llm=None, **kwargs):
+    llm = llm or StubLLM()
+    agents = []
+
+    async def factory():
+        agents.append(EchoAgent(llm=llm))
+        return agents[-1]
+
+    return AgentServer(factory, **kwargs), agents
+
+
+@pytest.mark.asyncio
+async def test_sessions_run_concurrently_with_their_own_memory():
+    """Tests that sessions overlap and keep separate memories across requests."""
+    server, agents = _server(max_running=10)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(server.submit(f"s{i}", "hello") for i in range(10))
+    )
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+    assert len(agents) == 10
+    assert results == ["Step 1: 1 messages"] * 10
+    # A second request of a session sees the first one
+    assert await server.submit("s0", "again") == "Step 1: 2 messages"
+    assert server.get_stats()["completed"] == 11
+
+
+@pytest.mark.asyncio
+async def test_requests_of_a_session_run_in_order():
+    """Tests that one session never runs two requests at once."""
+    llm = StubLLM()
+    server, agents = _server(llm, max_running=10)
+
+    results = await asyncio.gather(*(server.submit("s", f"q{i}") for i in range(3)))
+
+    assert llm.peak["default"] == 1
+    assert results == [f"Step 1: {n} messages" for n in (1, 2, 3)]
+    assert len(agents) == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_beyond_capacity_are_rejected():
+    """Tests backpressure from a full queue and from waiting too long."""
+    server, _ = _server(max_running=1, max_queued=1, queue_timeout=0.15)
+
+    results = await asyncio.gather(
+        *(server.submit(f"s{i}", "hello") for i in range(3)),
+        return_exceptions=True,
+    )
+
+    # One runs, one waits and times out, one finds the queue full
+    assert isinstance(results[0], str)
+    assert all(isinstance(r, ServerBusyError) for r in results[1:])
+    assert server.get_stats()["rejected"] == 2
+    assert server.get_stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_capped_per_tenant():
+    """Tests that a tenant's cap does not hold back other tenants."""
+    llm = StubLLM()
+    server, _ = _server(llm, max_running=10, tenant_limits={"llm": 2})
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(server.submit(f"a{i}", "hello", tenant="a") for i in range(6)),
+        server.submit("b0", "hello", tenant="b"),
+    )
+    elapsed = time.perf_counter() - started
+
+    assert llm.peak == {"a": 2, "b": 1}
+    assert elapsed >= 0.3
+    stats = server.get_stats()["tenants"]
+    assert stats["a"]["llm"]["throttled"] == 4
+    assert stats["b"]["llm"]["throttled"] == 0
+
+    with pytest.raises(ValueError):
+        await server.submit("a0", "hello", tenant="b")
+
+
+class NestingLLM(StubLLM):
+    """LLM whose tool calls ask the LLM again, as browser extraction does"""
+
+    @limited("llm")
+    async def ask_tool(self, *args, **kwargs) -> str:
+        return await self.ask()
+
+
+@pytest.mark.asyncio
+async def test_nested_llm_calls_reuse_the_held_slot():
+    """Tests that a limited call nested in another does not wait on its own slot."""
+    llm = NestingLLM(latency=0.05)
+    token = CURRENT_TENANT.set(TenantLimits("a", {"llm": 1}))
+    try:
+        assert await asyncio.wait_for(llm.ask_tool(), timeout=1) == "answer"
+
+        # The cap still holds across tasks
+        await asyncio.wait_for(asyncio.gather(llm.ask_tool(), llm.ask_tool()), 1)
+        assert llm.peak["a"] == 1
+        assert CURRENT_TENANT.get().get_stats()["llm"]["throttled"] == 1
+    finally:
+        CURRENT_TENANT.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_closed():
+    """Tests that unused sessions are cleaned up on later requests."""
+    server, agents = _server(session_idle_timeout=0.05)
+    await server.submit("old", "hello")
+    await asyncio.sleep(0.1)
+
+    await server.submit("new", "hello")
+
+    assert agents[0].cleaned_up and not agents[1].cleaned_up
+    assert server.get_stats()["sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sandbox_client_calls_are_capped_per_tenant():
+    """Tests the tenant cap on the limited methods of the real sandbox client."""
+    client = LocalSandboxClient()
+    client.sandbox = FakeSandbox()
+
+    async def factory():
+        return ShellAgent(llm=StubLLM(), client=client)
+
+    server = AgentServer(factory, max_running=10, tenant_limits={"sandbox": 1})
+    results = await asyncio.gather(
+        *(server.submit(f"a{i}", "run", tenant="a") for i in range(3)),
+        server.submit("b0", "run", tenant="b"),
+    )
+
+    assert results == ["Step 1: echo hi"] * 4
+    assert client.sandbox.peak == {"a": 1, "b": 1}
+    assert server.get_stats()["tenants"]["a"]["sandbox"]["throttled"] == 2
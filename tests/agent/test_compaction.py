@@ -0,0 +1,161 @@
+from app.agent.compaction import COMPACTION_MARKER, ContextCompactor
+from app.agent.toolcall import ToolCallAgent
+from app.llm import DEFAULT_CONTEXT_WINDOW, LLM, context_window_for
+from app.schema import Memory, Message, ToolCall
+
+
+def _count(message: Message) -> int:
+    """Counts words, plus a flat cost for screenshots."""
+    return len((message.content or "").split()) + (1000 if message.base64_image else 0)
+
+
+def _turn(step: int, observation_words: int):
+    call = ToolCall(
+        id=f"call_{step}",
+        function={"name": "bash", "arguments": f'{{"step": {step}}}'},
+    )
+    return [
+        Message(role="assistant", content=f"step {step}", tool_calls=[call]),
+        Message.tool_message(
+            "word " * observation_words, name="bash", tool_call_id=f"call_{step}"
+        ),
+    ]
+
+
+def _history(steps: int, observation_words: int = 500):
+    messages = [Message.user_message("the task")]
+    for step in range(steps):
+        messages += _turn(step, observation_words)
+    return messages
+
+
+def _assert_pairs_consistent(messages):
+    open_calls = set()
+    for message in messages:
+        if message.tool_calls:
+            open_calls = {call.id for call in message.tool_calls}
+        elif message.role == "tool":
+            assert message.tool_call_id in open_calls
+
+
+def test_within_budget_is_unchanged():
+    """Tests that a history within budget is returned as is."""
+    messages = _history(3)
+    assert ContextCompactor(max_tokens=10000).compact(messages, _count) is messages
+
+
+def test_stale_screenshots_dropped():
+    """Tests that only the most recent screenshots are kept."""
+    messages = [
+        Message.user_message(f"shot {i}", base64_image="aW1n") for i in range(4)
+    ]
+
+    compacted = ContextCompactor(keep_images=1).compact(messages, _count)
+
+    assert [bool(m.base64_image) for m in compacted] == [False, False, False, True]
+    assert all(m.base64_image for m in messages)
+
+
+def test_old_observations_elided_first():
+    """Tests that old observations are shortened before any turn is dropped."""
+    messages = _history(10)
+    compactor = ContextCompactor(
+        max_tokens=3000, keep_recent=4, max_observation_chars=200
+    )
+
+    compacted = compactor.compact(messages, _count)
+
+    assert len(compacted) == len(messages)
+    assert "characters elided" in compacted[2].content
+    assert compacted[-1] is messages[-1]
+    assert sum(_count(m) for m in compacted) <= 3000
+
+
+def test_oldest_turns_dropped_with_marker():
+    """Tests that whole turns are dropped and replaced by a marker."""
+    messages = _history(20)
+    compactor = ContextCompactor(max_tokens=1500, keep_recent=4)
+
+    compacted = compactor.compact(messages, _count)
+
+    assert compacted[0] is messages[0]
+    assert compacted[1].content.startswith(COMPACTION_MARKER)
+    assert compacted[-4:] == messages[-4:]
+    assert sum(_count(m) for m in compacted) <= 1500
+    _assert_pairs_consistent(compacted[2:])
+    assert compacted[2].role == "assistant"
+
+
+def test_repeated_compaction_merges_markers():
+    """Tests that compacting again updates the existing marker."""
+    compactor = ContextCompactor(max_tokens=1500, keep_recent=4)
+    compacted = compactor.compact(_history(20), _count)
+    first_dropped = int(compacted[1].content.split()[2])
+
+    compacted = compactor.compact(compacted + _turn(20, 500), _count)
+
+    markers = [m for m in compacted if m.content.startswith(COMPACTION_MARKER)]
+    assert len(markers) == 1
+    assert int(markers[0].content.split()[2]) > first_dropped
+
+
+def test_agent_compacts_memory_in_place():
+    """Tests that ToolCallAgent.compact_context rewrites its memory."""
+    llm = object.__new__(LLM)
+    llm.model = "gpt-4o"
+    llm.count_message_tokens = lambda messages: sum(
+        len(str(m.get("content", "")).split()) for m in messages
+    )
+    agent = ToolCallAgent(
+        llm=llm, compactor=ContextCompactor(max_tokens=1500, keep_recent=4)
+    )
+    agent.memory.add_messages(_history(20))
+
+    agent.compact_context()
+
+    assert agent.memory.messages[1].content.startswith(COMPACTION_MARKER)
+    assert len(agent.memory.messages) < 41
+
+
+def test_memory_trim_drops_orphaned_tool_results():
+    """Tests that trimming memory never leaves a tool result first."""
+    memory = Memory(max_messages=3)
+    memory.add_messages(_history(3))
+
+    assert [m.role for m in memory.messages] == ["assistant", "tool"]
+    _assert_pairs_consistent(memory.messages)
+
+
+def test_budget_follows_the_llm_context_window():
+    """Tests that the default budget leaves room for the reply and overhead."""
+    small = object.__new__(LLM)
+    small.context_window, small.max_tokens = 8192, 1024
+    large = object.__new__(LLM)
+    large.context_window, large.max_tokens = 200000, 8192
+    compactor = ContextCompactor()
+
+    assert compactor.budget_for(small, overhead_tokens=1000) == 6168
+    assert compactor.budget_for(large) == 191808
+    assert ContextCompactor(max_tokens=1500).budget_for(large) == 1500
+    assert context_window_for("gpt-4o-mini") == 128000
+    assert context_window_for("gpt-4") == 8192
+    assert context_window_for("unknown-model") == DEFAULT_CONTEXT_WINDOW
+
+
+def test_agent_budget_comes_from_its_llm():
+    """Tests that an agent without an explicit budget compacts to its LLM's window."""
+    llm = object.__new__(LLM)
+    llm.model = "gpt-4o"
+    llm.context_window, llm.max_tokens = 3000, 1000
+    llm.count_tokens = lambda text: 0
+    llm.count_message_tokens = lambda messages: sum(
+        len(str(m.get("content", "")).split()) for m in messages
+    )
+    agent = ToolCallAgent(llm=llm, compactor=ContextCompactor(keep_recent=4))
+    agent.memory.add_messages(_history(20))
+
+    agent.compact_context()
+
+    assert agent.memory.messages[1].content.startswith(COMPACTION_MARKER)
+    total = llm.count_message_tokens([m.to_dict() for m in agent.memory.messages])
+    assert total <= 2000
@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import pytest
+from openai.types.chat import ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion_message_tool_call import Function
+
+from app.agent.toolcall import ToolCallAgent
+from app.llm import LLM
+from app.tool import ToolCollection
+from app.tool.base import BaseTool, ToolResult
+
+
+class SleepTool(BaseTool):
+    name: str = "sleep"
+    description: str = "Sleeps, then echoes its label"
+    parameters: dict = {"type": "object", "properties": {"label": {"type": "string"}}}
+    parallel_safe: bool = True
+
+    async def execute(self, label: str = "") -> ToolResult:
+        await asyncio.sleep(0.2)
+        return ToolResult(output=label)
+
+
+class WriteTool(SleepTool):
+    name: str = "write"
+    parallel_safe: bool = False
+
+
+def _call(call_id: str, name: str) -> ChatCompletionMessageToolCall:
+    return ChatCompletionMessageToolCall(
+        id=call_id,
+        type="function",
+        function=Function(name=name, arguments=f'{{"label": "{call_id}"}}'),
+    )
+
+
+def _agent(parallel: bool) -> ToolCallAgent:
+    return ToolCallAgent(
+        llm=object.__new__(LLM),
+        available_tools=ToolCollection(SleepTool(), WriteTool()),
+        parallel_tool_calls=parallel,
+    )
+
+
+@pytest.mark.asyncio
+async def test_parallel_safe_calls_run_concurrently_in_order():
+    """Tests that parallel-safe calls overlap and results keep call order."""
+    agent = _agent(parallel=True)
+    agent.tool_calls = [_call(str(i), "sleep") for i in range(4)]
+
+    start = time.perf_counter()
+    await agent.act()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6
+    assert [m.tool_call_id for m in agent.memory.messages] == ["0", "1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_unsafe_calls_split_batches():
+    """Tests that a side-effecting call is never batched with others."""
+    agent = _agent(parallel=True)
+    calls = [_call("a", "sleep"), _call("b", "write"), _call("c", "sleep")]
+
+    batches = agent._group_tool_calls(calls)
+
+    assert [[c.id for c in batch] for batch in batches] == [["a"], ["b"], ["c"]]
+
+
+def test_sequential_by_default():
+    """Tests that calls are not grouped unless parallel mode is enabled."""
+    agent = _agent(parallel=False)
+    calls = [_call("a", "sleep"), _call("b", "sleep")]
+
+    assert len(agent._group_tool_calls(calls)) == 2
@@ -0,0 +1,165 @@
+import os
+from typing import List
+
+import pytest
+from pydantic import Field
+
+from app.agent.base import BaseAgent
+from app.checkpoint import CheckpointStore
+from app.flow.planning import PlanningFlow
+from app.llm import LLM
+from app.schema import AgentState
+
+
+class StubLLM(LLM):
+    """LLM answering without a model"""
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self):
+        pass
+
+    async def ask(self, *args, **kwargs) -> str:
+        return "summary"
+
+
+class Crash(BaseException):
+    """Stands in for the process dying in the middle of a step"""
+
+
+class StepAgent(BaseAgent):
+    """Agent that completes one plan step per run, crashing on a given task"""
+
+    name: str = "worker"
+    max_steps: int = 1
+    crash_on: str = ""
+    tasks: List[str] = Field(default_factory=list)
+
+    async def step(self) -> str:
+        task = self.memory.messages[-1].content.split('"')[-2]
+        if task == self.crash_on:
+            raise Crash()
+        self.tasks.append(task)
+        return f"done {task}"
+
+
+class CountingAgent(BaseAgent):
+    """Agent that counts its steps, crashing at a given step"""
+
+    name: str = "counter"
+    max_steps: int = 4
+    crash_at: int = 0
+
+    async def step(self) -> str:
+        if self.current_step == self.crash_at:
+            raise Crash()
+        self.update_memory("assistant", f"step {self.current_step}")
+        if self.current_step == self.max_steps:
+            self.state = AgentState.FINISHED
+        return "ok"
+
+
+STEPS = ["collect", "analyse", "write"]
+
+
+def _flow(store, **kwargs):
+    agent = StepAgent(llm=StubLLM(), **kwargs)
+    flow = PlanningFlow(
+        {"worker": agent}, llm=StubLLM(), plan_id="plan_1", checkpoint_store=store
+    )
+    return flow, agent
+
+
+def test_store_replaces_and_lists_checkpoints(tmp_path):
+    """Tests saving, loading and listing checkpoints by recency and prefix."""
+    store = CheckpointStore(tmp_path)
+    store.save("plan_1", {"step": 1})
+    store.save("plan_1", {"step": 2})
+    store.save("manus_1", {"step": 1})
+    os.utime(tmp_path / "plan_1.json", (0, 0))
+
+    assert store.load("plan_1")["step"] == 2
+    assert store.load("missing") is None
+    assert store.list_runs() == ["manus_1", "plan_1"]
+    assert store.latest("plan_") == "plan_1"
+    assert not list(tmp_path.glob("*.tmp"))
+
+    store.delete("plan_1")
+    assert store.list_runs() == ["manus_1"]
+
+
+@pytest.mark.asyncio
+async def test_flow_resumes_after_last_completed_step(tmp_path):
+    """Tests that a resumed flow skips completed steps and keeps their output."""
+    store = CheckpointStore(tmp_path)
+    flow, agent = _flow(store, crash_on="analyse")
+    await flow.planning_tool.execute(
+        command="create", plan_id="plan_1", title="Report", steps=STEPS
+    )
+    with pytest.raises(Crash):
+        await flow.execute("")
+    assert agent.tasks == ["collect"]
+    checkpoint = store.load("plan_1")
+    assert checkpoint["plan"]["step_statuses"][0] == "completed"
+
+    # A new process starts from nothing but the checkpoint
+    flow, agent = _flow(store)
+    result = await flow.resume()
+
+    assert agent.tasks == ["analyse", "write"]
+    assert result.startswith("Step 1: done collect\n")
+    assert "done write" in result and result.endswith("summary")
+    # Memory of the steps done before the crash is restored
+    assert "collect" in agent.memory.messages[0].content
+    assert store.load("plan_1") is None
+
+
+@pytest.mark.asyncio
+async def test_parallel_flow_resumes_in_progress_steps(tmp_path):
+    """Tests that steps running when a parallel flow stopped run again."""
+    store = CheckpointStore(tmp_path)
+    flow, agent = _flow(store, crash_on="analyse")
+    await flow.planning_tool.execute(
+        command="create",
+        plan_id="plan_1",
+        title="Report",
+        steps=STEPS,
+        step_dependencies=[[], [0], [1]],
+    )
+    with pytest.raises(Crash):
+        await flow.execute("")
+
+    flow, agent = _flow(store)
+    await flow.resume("plan_1")
+
+    assert agent.tasks == ["analyse", "write"]
+    statuses = flow.planning_tool.plans["plan_1"]["step_statuses"]
+    assert statuses == ["completed"] * 3
+
+
+@pytest.mark.asyncio
+async def test_agent_resumes_from_checkpoint(tmp_path):
+    """Tests that an agent run continues from its last completed step."""
+    store = CheckpointStore(tmp_path)
+    agent = CountingAgent(
+        llm=StubLLM(), crash_at=3, checkpoint_store=store, checkpoint_id="manus_1"
+    )
+    with pytest.raises(Crash):
+        await agent.run("count")
+
+    agent = CountingAgent(llm=StubLLM())
+    assert agent.restore_checkpoint(store, "manus_1")
+    assert agent.current_step == 2
+    result = await agent.run()
+
+    assert result.splitlines()[:2] == ["Step 3: ok", "Step 4: ok"]
+    assert [m.content for m in agent.memory.messages] == [
+        "count",
+        "step 1",
+        "step 2",
+        "step 3",
+        "step 4",
+    ]
+    assert store.load("manus_1") is None
+    assert not CountingAgent(llm=StubLLM()).restore_checkpoint(store, "manus_1")
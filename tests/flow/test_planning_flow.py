@@ -0,0 +1,238 @@
+import asyncio
+import time
+from typing import List
+
+import pytest
+from pydantic import Field
+
+from app.agent.base import BaseAgent
+from app.agent.manus import Manus
+from app.exceptions import ToolError
+from app.flow.planning import PlanningFlow
+from app.llm import LLM
+from app.sandbox.client import SANDBOX_CLIENT
+from app.tool import PlanningTool
+
+
+class StubLLM(LLM):
+    """LLM answering without a model"""
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self):
+        pass
+
+    async def ask(self, *args, **kwargs) -> str:
+        return "summary"
+
+
+class Recorder:
+    """Prompts and concurrency seen by an agent and its clones"""
+
+    def __init__(self):
+        self.tasks: List[str] = []
+        self.prompts: List[str] = []
+        self.active = 0
+        self.peak = 0
+        self.cleanups = 0
+
+
+class StepAgent(BaseAgent):
+    """Agent that takes a fixed time per step and records its work"""
+
+    name: str = "worker"
+    max_steps: int = 1
+    latency: float = 0.2
+    recorder: Recorder = Field(default_factory=Recorder)
+
+    async def step(self) -> str:
+        prompt = self.memory.messages[-1].content
+        task = prompt.split('"')[-2]
+        self.recorder.tasks.append(task)
+        self.recorder.prompts.append(prompt)
+        self.recorder.active += 1
+        self.recorder.peak = max(self.recorder.peak, self.recorder.active)
+        try:
+            if task.startswith("fail"):
+                raise RuntimeError("step failed")
+            await asyncio.sleep(self.latency)
+        finally:
+            self.recorder.active -= 1
+        return f"done {task}"
+
+    async def cleanup(self) -> None:
+        self.recorder.cleanups += 1
+
+
+class StubFlow(PlanningFlow):
+    async def _clone_executor(self, executor: StepAgent) -> StepAgent:
+        # Clones share the records of the original agent
+        return StepAgent(llm=executor.llm, recorder=executor.recorder)
+
+
+def _flow(**kwargs):
+    agent = StepAgent(llm=StubLLM())
+    flow = StubFlow({"worker": agent}, llm=StubLLM(), plan_id="plan", **kwargs)
+    return flow, agent.recorder
+
+
+async def _create(flow, steps, dependencies=None):
+    await flow.planning_tool.execute(
+        command="create",
+        plan_id="plan",
+        title="Report",
+        steps=steps,
+        step_dependencies=dependencies,
+    )
+
+
+RESEARCH = ["research A", "research B", "research C", "write report"]
+
+
+def test_dependencies_are_validated_and_shown():
+    """Tests that steps may only depend on earlier steps."""
+    tool = PlanningTool()
+    with pytest.raises(ToolError):
+        tool._create_plan("p", "t", ["a", "b"], [[1], []])
+    with pytest.raises(ToolError):
+        tool._create_plan("p", "t", ["a", "b"], [[]])
+
+    result = tool._create_plan("p", "t", RESEARCH, [[], [], [], [0, 1, 2]])
+    assert "3. [ ] write report (after 0, 1, 2)" in result.output
+
+    # Dependencies refer to positions, so new steps drop them unless restated
+    tool._update_plan("p", None, ["a", "b"])
+    assert "step_dependencies" not in tool.plans["p"]
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently():
+    """Tests that ready steps overlap and results reach dependent steps."""
+    flow, recorder = _flow()
+    await _create(flow, RESEARCH, [[], [], [], [0, 1, 2]])
+
+    started = time.perf_counter()
+    result = await flow.execute("")
+    elapsed = time.perf_counter() - started
+
+    # Critical path of two steps rather than the sum of four
+    assert elapsed < 0.6
+    assert recorder.peak == 3
+    # The two clones that ran next to the agent were cleaned up
+    assert recorder.cleanups == 2
+    assert result.endswith("Plan completed:\n\nsummary")
+    report_prompt = recorder.prompts[recorder.tasks.index("write report")]
+    assert "done research A" in report_prompt and "done research C" in report_prompt
+    statuses = flow.planning_tool.plans["plan"]["step_statuses"]
+    assert statuses == ["completed"] * 4
+
+
+@pytest.mark.asyncio
+async def test_sandbox_is_cleaned_up_once_after_all_steps(monkeypatch):
+    """Tests that steps leave the shared sandbox to the flow, which cleans it up at the end."""
+    flow, recorder = _flow()
+    await _create(flow, RESEARCH, [[], [], [], [0, 1, 2]])
+    cleanups = []
+
+    async def cleanup():
+        cleanups.append(list(recorder.tasks))
+
+    monkeypatch.setattr(SANDBOX_CLIENT, "cleanup", cleanup)
+
+    await flow.execute("")
+
+    assert cleanups == [recorder.tasks] and len(recorder.tasks) == 4
+
+
+@pytest.mark.asyncio
+async def test_parallelism_is_limited():
+    """Tests that no more than max_parallel_steps steps run at once."""
+    steps = [f"research {i}" for i in range(4)]
+    flow, recorder = _flow(max_parallel_steps=2)
+    await _create(flow, steps, [[]] * 4)
+
+    started = time.perf_counter()
+    await flow.execute("")
+
+    assert recorder.peak == 2
+    assert time.perf_counter() - started >= 0.4
+
+
+@pytest.mark.asyncio
+async def test_plans_without_dependencies_run_in_order():
+    """Tests that plans without dependencies keep sequential execution."""
+    flow, recorder = _flow()
+    await _create(flow, RESEARCH)
+
+    started = time.perf_counter()
+    await flow.execute("")
+
+    assert time.perf_counter() - started >= 0.8
+    assert recorder.peak == 1
+    assert recorder.tasks == RESEARCH
+
+
+@pytest.mark.asyncio
+async def test_failed_steps_are_blocked_without_stopping_the_plan():
+    """Tests that a failing step is not retried and dependent steps still run."""
+    steps = ["fail early", "research B", "write report"]
+    flow, recorder = _flow()
+    await _create(flow, steps, [[], [], [0, 1]])
+
+    await flow.execute("")
+
+    statuses = flow.planning_tool.plans["plan"]["step_statuses"]
+    assert statuses == ["blocked", "completed", "completed"]
+    assert recorder.tasks.count("fail early") == 1
+
+
+@pytest.mark.asyncio
+async def test_plan_window_shortens_step_prompts():
+    """Tests that windowed prompts keep dependency results and drop far steps."""
+    steps = [f"research {i}" for i in range(8)] + ["write report"]
+    flow, recorder = _flow(plan_window=1)
+    await _create(flow, steps, [[]] * 8 + [[0, 1]])
+
+    await flow.execute("")
+
+    first_prompt = recorder.prompts[recorder.tasks.index("research 0")]
+    assert "research 1" not in first_prompt and "research 7" not in first_prompt
+    report_prompt = recorder.prompts[recorder.tasks.index("write report")]
+    assert "done research 0" in report_prompt and "done research 1" in report_prompt
+    assert "research 5" not in report_prompt
+
+
+@pytest.mark.asyncio
+async def test_cloned_manus_keeps_its_toolset(monkeypatch):
+    """Tests that clones are built by the agent's async factory and cleaned up."""
+    # Tools that create their own LLM get the stub instead of a model client
+    monkeypatch.setitem(LLM._instances, "default", StubLLM())
+    created = []
+    cleaned_up = []
+
+    class TrackedManus(Manus):
+        @classmethod
+        async def create(cls, **kwargs) -> "TrackedManus":
+            created.append(await super().create(**kwargs))
+            return created[-1]
+
+        async def cleanup(self):
+            cleaned_up.append(self)
+            await super().cleanup()
+
+    agent = await TrackedManus.create(llm=StubLLM(), max_steps=5)
+    flow = PlanningFlow({"manus": agent}, llm=StubLLM(), plan_id="plan")
+
+    clone = await flow._clone_executor(agent)
+
+    assert clone is created[-1] and clone is not agent
+    assert (
+        clone.available_tools.tool_map.keys() == agent.available_tools.tool_map.keys()
+    )
+    assert clone.available_tools.tools[0] is not agent.available_tools.tools[0]
+    assert clone.max_steps == 5 and clone.llm is agent.llm
+    assert clone._initialized and not clone.memory.messages
+
+    await flow._cleanup_agent(clone)
+    assert cleaned_up == [clone] and not clone._initialized
@@ -0,0 +1,100 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.llm import LLM, StreamEventType, TokenCounter
+
+
+class WhitespaceTokenizer:
+    """Offline stand-in for a tiktoken encoding."""
+
+    def encode(self, text: str):
+        return text.split()
+
+
+def _chunk(content=None, tool_calls=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def _call_delta(index, arguments, id=None, name=None):
+    return SimpleNamespace(
+        index=index,
+        id=id,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+class FakeStreamingClient:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **params):
+        assert params["stream"] is True
+
+        async def generator():
+            for chunk in self.chunks:
+                yield chunk
+
+        return generator()
+
+
+def _make_llm(chunks) -> LLM:
+    llm = object.__new__(LLM)
+    llm.model = "test-model"
+    llm.max_tokens = 256
+    llm.temperature = 0.0
+    llm.max_input_tokens = None
+    llm.total_input_tokens = 0
+    llm.total_completion_tokens = 0
+    llm.tokenizer = WhitespaceTokenizer()
+    llm.token_counter = TokenCounter(llm.tokenizer)
+    llm.client = FakeStreamingClient(chunks)
+    return llm
+
+
+@pytest.mark.asyncio
+async def test_astream_yields_text_deltas():
+    """Tests that astream yields each text delta without buffering."""
+    llm = _make_llm([_chunk("Hello"), _chunk(", "), _chunk("world")])
+
+    deltas = [delta async for delta in llm.astream([{"role": "user", "content": "hi"}])]
+
+    assert deltas == ["Hello", ", ", "world"]
+
+
+@pytest.mark.asyncio
+async def test_ask_tool_stream_emits_tool_call_when_arguments_complete():
+    """Tests that a tool call is emitted before the stream finishes."""
+    llm = _make_llm(
+        [
+            _chunk("Searching"),
+            _chunk(tool_calls=[_call_delta(0, '{"query": ', id="a", name="search")]),
+            _chunk(tool_calls=[_call_delta(0, '"cats"}')]),
+            _chunk(tool_calls=[_call_delta(1, '{"path"', id="b", name="view")]),
+            _chunk(tool_calls=[_call_delta(1, ': "/tmp"}')]),
+        ]
+    )
+
+    events = [
+        event
+        async for event in llm.ask_tool_stream(
+            [{"role": "user", "content": "find cats"}],
+            tools=[{"type": "function", "function": {"name": "search"}}],
+        )
+    ]
+    types = [event.type for event in events]
+
+    first_call = types.index(StreamEventType.TOOL_CALL)
+    # The first call is ready before the second call's arguments start streaming
+    assert first_call < types.index(StreamEventType.TOOL_CALL_DELTA, first_call)
+    calls = [e.tool_call for e in events if e.type == StreamEventType.TOOL_CALL]
+    assert [c.id for c in calls] == ["a", "b"]
+    assert json.loads(calls[1].function.arguments) == {"path": "/tmp"}
+
+    done = events[-1]
+    assert done.type == StreamEventType.DONE
+    assert done.message.content == "Searching"
+    assert [c.function.name for c in done.message.tool_calls] == ["search", "view"]
@@ -0,0 +1,88 @@
+from app.llm import LLM, TokenCounter
+from app.schema import Memory, Message, MessageDict
+
+
+class WhitespaceTokenizer:
+    """Offline stand-in for a tiktoken encoding."""
+
+    def encode(self, text: str):
+        return text.split()
+
+
+def test_formatted_dict_is_cached():
+    """Tests that formatting the same message twice reuses the cached dict."""
+    message = Message.user_message("look at this", base64_image="aGVsbG8=")
+
+    first = LLM.format_messages([message], supports_images=True)[0]
+    second = LLM.format_messages([message], supports_images=True)[0]
+
+    assert first is second
+    assert isinstance(first, MessageDict)
+    assert first["content"][1]["image_url"]["url"] == "data:image/jpeg;base64,aGVsbG8="
+
+
+def test_formatted_dict_matches_dict_input():
+    """Tests that cached formatting produces the same output as dict input."""
+    messages = [
+        Message.system_message("system"),
+        Message.user_message("hello", base64_image="aW1n"),
+        Message.tool_message("result", name="bash", tool_call_id="call_1"),
+    ]
+
+    for supports_images in (True, False):
+        cached = LLM.format_messages(messages, supports_images)
+        plain = LLM.format_messages([m.to_dict() for m in messages], supports_images)
+        assert cached == plain
+
+
+def test_assignment_invalidates_cache():
+    """Tests that setting a field rebuilds the serialized forms."""
+    message = Message.assistant_message("before")
+    formatted = LLM.format_messages([message])[0]
+
+    message.content = "after"
+
+    assert LLM.format_messages([message])[0]["content"] == "after"
+    assert formatted["content"] == "before"
+    assert message.to_dict()["content"] == "after"
+
+
+def test_to_dict_returns_copy():
+    """Tests that modifying the result of to_dict does not affect the cache."""
+    message = Message.user_message("hello")
+    message.to_dict()["content"] = "changed"
+
+    assert message.to_dict()["content"] == "hello"
+
+
+def test_cache_does_not_affect_equality():
+    """Tests that a serialized message still equals an unserialized one."""
+    message = Message.user_message("hello")
+    LLM.format_messages([message])
+
+    assert message == Message.user_message("hello")
+
+
+def test_token_count_stored_on_message_dict():
+    """Tests that counts for formatted messages are stored on the dict."""
+    counter = TokenCounter(WhitespaceTokenizer())
+    memory = Memory()
+    memory.add_message(Message.user_message("one two three"))
+    formatted = LLM.format_messages(memory.messages)
+
+    first = counter.count_message_tokens(formatted)
+    second = counter.count_message_tokens(LLM.format_messages(memory.messages))
+
+    assert first == second == counter.count_message_tokens(memory.to_dict_list())
+    assert counter.cache_hits == 1
+    assert formatted[0].token_counts
+
+
+def test_memory_trim_keeps_latest():
+    """Tests that trimming memory keeps the most recent messages in place."""
+    memory = Memory(max_messages=3)
+    messages = memory.messages
+    memory.add_messages([Message.user_message(str(i)) for i in range(5)])
+
+    assert memory.messages is messages
+    assert [m.content for m in memory.messages] == ["2", "3", "4"]
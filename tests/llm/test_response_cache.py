@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from app.llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResponseCache(tmp_path / "responses.db")
+    yield cache
+    cache.close()
+
+
+def _params(content: str, **overrides):
+    params = {
+        "model": "gpt-4o",
+        "messages": [{"role": "user", "content": content}],
+        "tools": None,
+        "tool_choice": "auto",
+        "temperature": 0.0,
+        "timeout": 300,
+    }
+    params.update(overrides)
+    return params
+
+
+def test_key_ignores_non_semantic_fields():
+    """Tests that only model, messages, tools, tool_choice and temperature matter."""
+    base = LLMResponseCache.make_key("ask_tool", _params("hi"))
+
+    assert base == LLMResponseCache.make_key("ask_tool", _params("hi", timeout=5))
+    assert base != LLMResponseCache.make_key("ask_tool", _params("hi", temperature=1))
+    assert base != LLMResponseCache.make_key("ask", _params("hi"))
+
+
+def test_hit_and_miss_counters(cache):
+    """Tests round-tripping a response and the hit/miss counters."""
+    key = cache.make_key("ask", _params("hello"))
+    assert cache.get(key) is None
+
+    cache.set(key, {"role": "assistant", "content": "hi there"})
+    assert cache.get(key) == {"role": "assistant", "content": "hi there"}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_persists_across_instances(tmp_path):
+    """Tests that responses survive reopening the database."""
+    first = LLMResponseCache(tmp_path / "responses.db")
+    first.set("key", "value")
+    first.close()
+
+    second = LLMResponseCache(tmp_path / "responses.db")
+    assert second.get("key") == "value"
+    second.close()
+
+
+def test_ttl_expiry(tmp_path):
+    """Tests that expired entries are treated as misses."""
+    cache = LLMResponseCache(tmp_path / "responses.db", ttl_seconds=0)
+    cache.set("key", "value")
+    time.sleep(0.01)
+
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_lru_eviction_by_entries_and_size(tmp_path):
+    """Tests that least recently used entries are evicted over the limits."""
+    cache = LLMResponseCache(tmp_path / "responses.db", max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    cache.close()
+
+    cache = LLMResponseCache(tmp_path / "sized.db", max_size_bytes=20)
+    cache.set("a", "x" * 10)
+    cache.set("b", "y" * 10)
+    assert cache.stats()["entries"] == 1
+    cache.close()
+
+
+def test_hits_do_not_write_until_flushed(cache):
+    """Tests that hit access times are written in a batch, not per lookup."""
+    cache.set("a", "1")
+    changes = cache._conn.total_changes
+
+    for _ in range(10):
+        assert cache.get("a") == "1"
+    assert cache._conn.total_changes == changes
+
+    cache.stats()
+    assert cache._conn.total_changes == changes + 1
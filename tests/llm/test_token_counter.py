@@ -0,0 +1,66 @@
+import pytest
+
+from app.llm import TokenCounter
+
+
+class WhitespaceTokenizer:
+    """Offline stand-in for a tiktoken encoding."""
+
+    def encode(self, text: str):
+        return text.split()
+
+
+@pytest.fixture
+def tokenizer():
+    return WhitespaceTokenizer()
+
+
+def _history(n: int):
+    return [{"role": "user", "content": f"message number {i} " * 20} for i in range(n)]
+
+
+def test_cached_count_matches_uncached(tokenizer):
+    """Tests that caching does not change the computed token count."""
+    messages = _history(10) + [
+        {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [
+                {"id": "1", "function": {"name": "bash", "arguments": '{"a": 1}'}}
+            ],
+        },
+        {"role": "tool", "content": "ok", "name": "bash", "tool_call_id": "1"},
+    ]
+    cached = TokenCounter(tokenizer)
+    uncached = TokenCounter(tokenizer, cache_size=0)
+
+    assert cached.count_message_tokens(messages) == uncached.count_message_tokens(
+        messages
+    )
+    assert cached.count_message_tokens(messages) == uncached.count_message_tokens(
+        messages
+    )
+
+
+def test_only_new_messages_are_encoded(tokenizer):
+    """Tests that re-counting a grown history only misses on new messages."""
+    counter = TokenCounter(tokenizer)
+    history = _history(20)
+    counter.count_message_tokens(history)
+    assert counter.cache_misses == 20
+
+    history.append({"role": "assistant", "content": "a new reply"})
+    counter.count_message_tokens(history)
+    assert counter.cache_misses == 21
+    assert counter.cache_hits == 20
+
+
+def test_cache_is_bounded(tokenizer):
+    """Tests LRU eviction once the cache size is exceeded."""
+    counter = TokenCounter(tokenizer, cache_size=5)
+    counter.count_message_tokens(_history(12))
+    assert len(counter._message_cache) == 5
+
+    counter.clear_cache()
+    assert len(counter._message_cache) == 0
+    assert counter.cache_hits == counter.cache_misses == 0
@@ -0,0 +1,75 @@
+"""Tests for DockerSession output handling over a non-blocking socket."""
+
+import asyncio
+import socket
+
+import pytest
+
+from app.sandbox.core.terminal import DockerSession
+
+
+def _session_with_socket():
+    """Creates a session wired to one end of a socket pair instead of Docker."""
+    ours, theirs = socket.socketpair()
+    ours.setblocking(False)
+    theirs.setblocking(False)
+    session = DockerSession.__new__(DockerSession)
+    session.socket = ours
+    session.exec_id = None
+    return session, theirs
+
+
+async def _fake_shell(peer: socket.socket, replies: list[bytes]):
+    """Answers each command with a tty-style echo, its output and a prompt."""
+    loop = asyncio.get_running_loop()
+    for reply in replies:
+        await loop.sock_recv(peer, 4096)
+        # Deliver the reply in small pieces to exercise partial-line handling
+        for i in range(0, len(reply), 7):
+            await loop.sock_sendall(peer, reply[i : i + 7])
+            await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_execute_parses_split_output():
+    """Tests that output split across many chunks is reassembled by line."""
+    session, peer = _session_with_socket()
+    reply = b"echo hi\r\nhi\r\nthere\r\n$ echo $?\r\n0\r\n$ "
+    shell = asyncio.create_task(_fake_shell(peer, [reply]))
+
+    result = await session.execute("echo hi", timeout=5)
+
+    await shell
+    assert result == "hi\nthere"
+    session.socket.close()
+    peer.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sessions_do_not_block_loop():
+    """Tests that many sessions waiting on output can share one event loop."""
+    pairs = [_session_with_socket() for _ in range(20)]
+    replies = [b"cmd\r\nok\r\n$ echo $?\r\n0\r\n$ "]
+    shells = [asyncio.create_task(_fake_shell(peer, replies)) for _, peer in pairs]
+
+    results = await asyncio.gather(
+        *(session.execute("cmd", timeout=5) for session, _ in pairs)
+    )
+
+    await asyncio.gather(*shells)
+    assert results == ["ok"] * 20
+    for session, peer in pairs:
+        session.socket.close()
+        peer.close()
+
+
+@pytest.mark.asyncio
+async def test_execute_times_out_without_prompt():
+    """Tests that a command that never returns a prompt times out."""
+    session, peer = _session_with_socket()
+
+    with pytest.raises(TimeoutError):
+        await session.execute("sleep 10", timeout=0.2)
+
+    session.socket.close()
+    peer.close()
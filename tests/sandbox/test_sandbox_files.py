@@ -0,0 +1,107 @@
+"""Tests for DockerSandbox batch file transfer, using a directory-backed fake container."""
+
+import io
+import os
+import subprocess
+import tarfile
+from types import SimpleNamespace
+
+import pytest
+from docker.errors import NotFound
+
+from app.config import SandboxSettings
+from app.sandbox.core.sandbox import DockerSandbox
+
+
+class DirectoryContainer:
+    """Mimics the container archive APIs on top of a host directory."""
+
+    def __init__(self, root):
+        self.root = str(root)
+        self.put_calls = 0
+        self.exec_calls = 0
+
+    def _host(self, path):
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def put_archive(self, path, data):
+        self.put_calls += 1
+        if not os.path.isdir(self._host(path)):
+            raise NotFound(f"{path} not found")
+        with tarfile.open(fileobj=io.BytesIO(data.read())) as tar:
+            tar.extractall(self._host(path))
+        return True
+
+    def exec_run(self, cmd, demux=False):
+        self.exec_calls += 1
+        cmd = [self.root if arg == "/" else arg for arg in cmd]
+        process = subprocess.run(cmd, capture_output=True)
+        return SimpleNamespace(
+            exit_code=process.returncode, output=(process.stdout, process.stderr)
+        )
+
+
+@pytest.fixture
+def sandbox(tmp_path):
+    """Creates a sandbox whose container is a fake rooted in a temp directory."""
+    sandbox = DockerSandbox.__new__(DockerSandbox)
+    sandbox.config = SandboxSettings(work_dir="/workspace")
+    sandbox.container = DirectoryContainer(tmp_path)
+    sandbox.terminal = None
+    (tmp_path / "workspace").mkdir()
+
+    async def run_command(cmd, timeout=None):
+        subprocess.run(cmd.replace(" /", f" {tmp_path}/"), shell=True, check=True)
+        return ""
+
+    sandbox.run_command = run_command
+    return sandbox
+
+
+@pytest.mark.asyncio
+async def test_write_files_single_archive(sandbox, tmp_path):
+    """Tests that many files in nested directories are written in one call."""
+    files = {f"src/pkg{i % 5}/module{i}.py": f"value = {i}\n" for i in range(50)}
+    files["/workspace/README.md"] = "# readme\n"
+
+    await sandbox.write_files(files)
+
+    assert sandbox.container.put_calls == 1
+    assert (tmp_path / "workspace/src/pkg3/module8.py").read_text() == "value = 8\n"
+    assert (tmp_path / "workspace/README.md").read_text() == "# readme\n"
+
+
+@pytest.mark.asyncio
+async def test_write_files_creates_missing_root(sandbox, tmp_path):
+    """Tests that a missing archive root is created before retrying."""
+    await sandbox.write_files({"/opt/app/a.txt": "a", "/opt/app/b/c.txt": "c"})
+
+    assert (tmp_path / "opt/app/b/c.txt").read_text() == "c"
+
+
+@pytest.mark.asyncio
+async def test_read_files_round_trip(sandbox):
+    """Tests that batch reads return contents keyed by the requested paths."""
+    files = {"a.txt": "alpha", "nested/b.txt": "beta", "/workspace/c.txt": "gamma"}
+    await sandbox.write_files(files)
+
+    contents = await sandbox.read_files(list(files))
+
+    assert contents == files
+    assert sandbox.container.exec_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_read_files_missing(sandbox):
+    """Tests that missing files are reported as FileNotFoundError."""
+    await sandbox.write_files({"a.txt": "alpha"})
+
+    with pytest.raises(FileNotFoundError, match="missing.txt"):
+        await sandbox.read_files(["a.txt", "missing.txt"])
+
+
+@pytest.mark.asyncio
+async def test_unsafe_paths_rejected(sandbox):
+    """Tests that path traversal is rejected for batch operations."""
+    with pytest.raises(RuntimeError, match="unsafe"):
+        await sandbox.write_files({"../etc/passwd": "x"})
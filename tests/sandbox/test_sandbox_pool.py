@@ -0,0 +1,227 @@
+"""Tests for the SandboxManager warm pool, using in-process fake sandboxes."""
+
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from app.config import SandboxSettings
+from app.sandbox.core import manager as manager_module
+from app.sandbox.core import sandbox as sandbox_module
+from app.sandbox.core.manager import SandboxManager
+from app.sandbox.core.sandbox import DockerSandbox
+
+
+class FakeImages:
+    def get(self, image):
+        return image
+
+
+class FakeClient:
+    images = FakeImages()
+
+
+class FakeSandbox:
+    """Stands in for DockerSandbox with a configurable startup delay."""
+
+    startup_delay = 0.05
+    created = 0
+
+    def __init__(self, config=None, volume_bindings=None):
+        self.config = config
+        self.volume_bindings = volume_bindings or {}
+        self.resets = 0
+        self.cleaned_up = False
+
+    async def create(self):
+        await asyncio.sleep(self.startup_delay)
+        FakeSandbox.created += 1
+        return self
+
+    async def reset(self):
+        self.resets += 1
+
+    async def cleanup(self):
+        self.cleaned_up = True
+
+
+@pytest_asyncio.fixture
+async def manager(monkeypatch) -> AsyncGenerator[SandboxManager, None]:
+    """Creates a pooled manager backed by fake sandboxes."""
+    monkeypatch.setattr(manager_module.docker, "from_env", lambda: FakeClient())
+    monkeypatch.setattr(manager_module, "DockerSandbox", FakeSandbox)
+    FakeSandbox.created = 0
+    manager = SandboxManager(max_sandboxes=5, pool_size=2)
+    try:
+        yield manager
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_serves_acquisitions(manager):
+    """Tests that a warmed pool hands out sandboxes without creating new ones."""
+    assert await manager.warm_pool() == 2
+    created = FakeSandbox.created
+
+    sandbox_id = await manager.create_sandbox()
+
+    assert sandbox_id in manager._sandboxes
+    assert FakeSandbox.created == created
+    stats = manager.get_stats()
+    assert stats["pool_hits"] == 1
+    assert stats["pool_misses"] == 0
+    assert stats["pool_hit_rate"] == 1.0
+    assert stats["acquire_latency_max"] < FakeSandbox.startup_delay
+
+
+@pytest.mark.asyncio
+async def test_cold_acquisition_starts_background_refill(manager):
+    """Tests that a miss creates a sandbox directly and then fills the pool."""
+    await manager.create_sandbox()
+
+    stats = manager.get_stats()
+    assert stats["pool_misses"] == 1
+    assert stats["pool_hit_rate"] == 0.0
+
+    await manager._refill_tasks[manager._profile_key(SandboxSettings())]
+    assert manager.get_stats()["pooled_sandboxes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_release_recycles_sandbox(manager):
+    """Tests that a released sandbox is reset and returned to the pool."""
+    sandbox_id = await manager.create_sandbox()
+    sandbox = manager._sandboxes[sandbox_id]
+    await manager.warm_pool()
+    manager._pools[manager._profile_key(SandboxSettings())].pop()
+
+    await manager.release_sandbox(sandbox_id)
+
+    assert sandbox_id not in manager._sandboxes
+    assert sandbox.resets == 1
+    assert not sandbox.cleaned_up
+    assert manager.get_stats()["pooled_sandboxes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_release_deletes_when_pool_full(manager):
+    """Tests that a released sandbox is deleted if the pool is already full."""
+    sandbox_id = await manager.create_sandbox()
+    sandbox = manager._sandboxes[sandbox_id]
+    await manager.warm_pool()
+
+    await manager.release_sandbox(sandbox_id)
+
+    assert sandbox.cleaned_up
+    assert manager.get_stats()["pooled_sandboxes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_volume_bindings_bypass_pool(manager):
+    """Tests that sandboxes with volume bindings are never pooled."""
+    await manager.warm_pool()
+
+    sandbox_id = await manager.create_sandbox(volume_bindings={"/tmp": "/data"})
+    await manager.release_sandbox(sandbox_id)
+
+    stats = manager.get_stats()
+    assert stats["pool_hits"] == 0
+    assert stats["pool_misses"] == 0
+    assert stats["pooled_sandboxes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_profiles_have_separate_pools(manager):
+    """Tests that pools are keyed by the sandbox configuration."""
+    await manager.warm_pool()
+
+    await manager.create_sandbox(SandboxSettings(memory_limit="1g"))
+
+    assert manager.get_stats()["pool_misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pooled_sandboxes_count_toward_limit(manager):
+    """Tests that warm sandboxes are replaced rather than exceeding max_sandboxes."""
+    manager.max_sandboxes = 3
+    await manager.warm_pool()
+
+    await manager.create_sandbox(SandboxSettings(memory_limit="1g"))
+    await manager.create_sandbox(SandboxSettings(memory_limit="2g"))
+
+    stats = manager.get_stats()
+    assert stats["total_sandboxes"] + stats["pooled_sandboxes"] == 3
+    await manager.create_sandbox(SandboxSettings(memory_limit="3g"))
+    with pytest.raises(RuntimeError):
+        await manager.create_sandbox(SandboxSettings(memory_limit="4g"))
+
+
+@pytest.mark.asyncio
+async def test_failed_reset_discards_and_refills(manager):
+    """Tests that a sandbox that cannot be reset is replaced by a fresh one."""
+    sandbox_id = await manager.create_sandbox()
+    sandbox = manager._sandboxes[sandbox_id]
+
+    async def fail():
+        raise RuntimeError("changes outside the working directory")
+
+    sandbox.reset = fail
+    await manager.release_sandbox(sandbox_id)
+    await manager.warm_pool()
+
+    pool = manager._pools[manager._profile_key(SandboxSettings())]
+    assert sandbox.cleaned_up
+    assert sandbox not in pool and len(pool) == 2
+
+
+class FakeContainer:
+    """Container recording exec commands and reporting scripted diffs."""
+
+    def __init__(self, diffs):
+        self.id = "container"
+        self.commands = []
+        self.diffs = list(diffs)
+
+    def exec_run(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        return type("Result", (), {"exit_code": 0, "output": b""})()
+
+    def diff(self):
+        return self.diffs.pop(0)
+
+
+class FakeTerminal:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def init(self):
+        pass
+
+
+def _docker_sandbox(monkeypatch, diffs) -> DockerSandbox:
+    monkeypatch.setattr(sandbox_module, "AsyncDockerizedTerminal", FakeTerminal)
+    sandbox = object.__new__(DockerSandbox)
+    sandbox.config = SandboxSettings()
+    sandbox.container = FakeContainer(diffs)
+    sandbox.terminal = None
+    sandbox._initial_changes = {("/etc/hosts", 0)}
+    return sandbox
+
+
+@pytest.mark.asyncio
+async def test_reset_kills_processes_and_checks_filesystem(monkeypatch):
+    """Tests that reset kills processes and rejects changes outside work_dir."""
+    clean = [{"Path": "/etc/hosts", "Kind": 0}, {"Path": "/workspace/a", "Kind": 1}]
+    sandbox = _docker_sandbox(monkeypatch, [clean])
+
+    await sandbox.reset()
+
+    assert sandbox.container.commands[0] == ["sh", "-c", "kill -9 -1"]
+    assert sandbox.terminal is not None
+
+    dirty = clean + [{"Path": "/tmp/secret", "Kind": 1}]
+    sandbox = _docker_sandbox(monkeypatch, [dirty])
+    with pytest.raises(RuntimeError):
+        await sandbox.reset()
@@ -0,0 +1,80 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from app.exceptions import ToolError
+from app.tool.bash import _BashSession, _OutputBuffer
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session() -> AsyncGenerator[_BashSession, None]:
+    """Creates a bash session for testing."""
+    session = _BashSession()
+    await session.start()
+    try:
+        yield session
+    finally:
+        session.stop()
+        await session._process.wait()
+
+
+@pytest.mark.asyncio
+async def test_stdout_and_stderr(session: _BashSession):
+    """Tests that stdout and stderr are both fully collected."""
+    result = await session.run("echo out; echo err >&2")
+
+    assert result.output == "out"
+    assert result.error == "err"
+
+
+@pytest.mark.asyncio
+async def test_consecutive_commands_do_not_leak(session: _BashSession):
+    """Tests that each command only sees its own output."""
+    assert (await session.run("echo first")).output == "first"
+    result = await session.run("true")
+    assert result.output == ""
+    assert result.error == ""
+
+
+@pytest.mark.asyncio
+async def test_large_output(session: _BashSession):
+    """Tests that a multi-megabyte output is returned intact."""
+    result = await session.run("head -c 3000000 /dev/zero | tr '\\0' 'a'")
+
+    assert len(result.output) == 3000000
+
+
+@pytest.mark.asyncio
+async def test_partial_output_streaming(session: _BashSession):
+    """Tests that output is delivered while the command is still running."""
+    chunks = []
+    result = await session.run(
+        "for i in 1 2 3; do echo $i; sleep 0.1; done", on_output=chunks.append
+    )
+
+    assert chunks == ["1\n", "2\n", "3\n"]
+    assert result.output == "1\n2\n3"
+
+
+@pytest.mark.asyncio
+async def test_timeout(session: _BashSession):
+    """Tests that a hanging command raises and marks the session timed out."""
+    session._timeout = 0.2
+    with pytest.raises(ToolError):
+        await session.run("sleep 5")
+    with pytest.raises(ToolError):
+        await session.run("echo again")
+
+
+def test_sentinel_split_across_chunks():
+    """Tests sentinel detection when it arrives in pieces."""
+    buffer = _OutputBuffer(b"<<exit>>", asyncio.Event())
+    buffer.feed(b"hello\n<<ex")
+    assert buffer.sentinel_at is None
+    assert buffer.safe_end == len(b"hello\n")
+
+    buffer.feed(b"it>>\ntrailing")
+    assert buffer.take() == b"hello\n"
+    assert bytes(buffer.data) == b"trailing"
@@ -0,0 +1,100 @@
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from app.tool.search.bing_search import BingSearchEngine
+
+
+def _page(first: int, results: int = 10, last: bool = False) -> str:
+    items = "".join(
+        f'<li class="b_algo"><h2><a href="https://r.test/{first + i}">Result '
+        f"<strong>{first + i}</strong></a></h2><div><p>About {first + i}</p></div></li>"
+        for i in range(results)
+    )
+    next_link = (
+        ""
+        if last
+        else f'<a title="Next page" href="/search?first={first + 10}">Next</a>'
+    )
+    return (
+        "<html><head><script>var x = '<li class=\"b_algo\">';</script></head><body>"
+        f'<ol id="b_results"><li class="b_ans"><p>Answer</p></li>{items}'
+        f'<li class="b_pag">{next_link}</li></ol></body></html>'
+    )
+
+
+class FakeResponse:
+    def __init__(self, html: str):
+        self.html = html.encode()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.html), 100):
+            yield self.html[i : i + 100]
+
+
+class FakeSession:
+    """Serves numbered result pages, recording requests and concurrency"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.firsts = []
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, stream=False):
+        first = int(parse_qs(urlparse(url).query).get("first", ["1"])[0])
+        with self.lock:
+            self.firsts.append(first)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        results = max(0, min(10, self.total - first + 1))
+        return FakeResponse(_page(first, results, last=first + 10 > self.total))
+
+
+def _engine(total: int) -> BingSearchEngine:
+    engine = BingSearchEngine()
+    engine.session = FakeSession(total)
+    return engine
+
+
+def test_parser_reads_only_result_nodes():
+    """Tests that results, titles, snippets and the next page link are parsed."""
+    items, next_url = BingSearchEngine._parse_results([_page(1, results=2)])
+
+    assert [(i.title, i.url, i.description) for i in items] == [
+        ("Result 1", "https://r.test/1", "About 1"),
+        ("Result 2", "https://r.test/2", "About 2"),
+    ]
+    assert next_url == "https://www.bing.com/search?first=11"
+
+
+def test_pages_after_the_first_are_fetched_in_parallel():
+    """Tests that later pages are requested together once page 1 has results."""
+    engine = _engine(total=100)
+    started = time.perf_counter()
+    results = engine.perform_search("python asyncio", num_results=40)
+
+    assert [r.url for r in results] == [f"https://r.test/{i}" for i in range(1, 41)]
+    assert engine.session.firsts[0] == 1
+    assert sorted(engine.session.firsts[1:]) == [11, 21, 31]
+    assert engine.session.peak == 3
+    assert time.perf_counter() - started < 0.15
+
+
+def test_stops_at_the_last_page():
+    """Tests that pagination ends at the last page and with no results."""
+    engine = _engine(total=15)
+    assert len(engine.perform_search("q", num_results=50)) == 15
+
+    empty = _engine(total=0)
+    assert empty.perform_search("q", num_results=50) == []
+    assert empty.session.firsts == [1]
@@ -0,0 +1,108 @@
+from app.tool.browser_extraction import PageExtractor
+
+
+PAGE = """<!doctype html>
+<html>
+<head><title>Page</title><style>body { color: red; }</style></head>
+<body>
+<header><a href="/">Logo</a> Site menu</header>
+<nav><ul><li><a href="/docs">Docs</a></li></ul></nav>
+<div class="cookie" role="dialog">Accept cookies</div>
+<main>
+  <article>
+    <header><h1>Release notes</h1></header>
+    <script>track("view");</script>
+    <p>Version 2 adds <a href="/streaming">streaming</a>.</p>
+    <div>First change</div><div>Second change</div>
+    <p hidden>Hidden text</p>
+    <!-- a comment -->
+  </article>
+</main>
+<aside>Related posts</aside>
+<footer>Copyright</footer>
+</body>
+</html>
+"""
+
+
+def test_boilerplate_is_pruned():
+    """Tests that navigation, scripts and hidden content are removed."""
+    markdown = PageExtractor().extract("https://a.test", PAGE, 2000)
+
+    assert markdown == (
+        "Release notes\n=============\n\n"
+        "Version 2 adds [streaming](/streaming).\n\n"
+        "First change\n\nSecond change"
+    )
+
+
+def test_conversion_stops_at_budget():
+    """Tests that long pages are cut to the budget without converting the rest."""
+    paragraphs = "".join(f"<p>Paragraph {i} {'text ' * 20}</p>" for i in range(5000))
+    html = f"<html><body>{paragraphs}</body></html>"
+    markdown = PageExtractor().extract("https://a.test", html, 500)
+
+    assert len(markdown) == 500
+    assert markdown.startswith("Paragraph 0 text")
+    assert "Paragraph 10 " not in markdown
+
+    # Converting a prefix of the page gives the same result as the whole page
+    whole_page = PageExtractor()
+    whole_page.PREFIX_SIZE = len(html)
+    assert whole_page.extract("https://a.test", html, 500) == markdown
+
+
+def test_empty_main_falls_back_to_body():
+    """Tests that the whole page is used when the main element has no content."""
+    html = "<html><body><main></main><p>Loaded outside main</p></body></html>"
+    assert (
+        PageExtractor().extract("https://a.test", html, 2000) == "Loaded outside main"
+    )
+
+
+def test_forms_keep_their_content():
+    """Tests that a body wrapped in a form is kept, without its controls."""
+    html = (
+        '<html><body><form id="aspnetForm"><div><h1>Quarterly report</h1>'
+        "<p>Revenue grew.</p><input value='q'><button>Search</button>"
+        "</div></form></body></html>"
+    )
+    assert PageExtractor().extract("https://a.test", html, 2000) == (
+        "Quarterly report\n================\n\nRevenue grew."
+    )
+
+
+def test_page_header_keeps_its_title():
+    """Tests that the headings of a page-level header are kept."""
+    html = (
+        "<html><body><header><a href='/'>Logo</a><h1>Quarterly report</h1></header>"
+        "<p>Revenue grew.</p></body></html>"
+    )
+    assert PageExtractor().extract("https://a.test", html, 2000) == (
+        "Quarterly report\n================\n\nRevenue grew."
+    )
+
+
+def test_pruning_everything_falls_back_to_body():
+    """Tests that the unpruned body is used when pruning leaves no text."""
+    html = (
+        "<html><body><div role='navigation'><p>The only content</p></div>"
+        "</body></html>"
+    )
+    assert PageExtractor().extract("https://a.test", html, 2000) == "The only content"
+
+
+def test_results_are_cached_per_url_and_content():
+    """Tests cache hits for unchanged pages and misses for changed ones."""
+    extractor = PageExtractor(cache_size=2)
+    first = extractor.extract("https://a.test", PAGE, 2000)
+    assert extractor.extract("https://a.test", PAGE, 2000) is first
+    assert extractor.cache_hits == 1
+
+    extractor.extract("https://a.test", PAGE.replace("Version 2", "Version 3"), 2000)
+    extractor.extract("https://b.test", PAGE, 2000)
+    assert extractor.cache_misses == 3
+    assert len(extractor._cache) == 2
+
+    extractor.clear_cache()
+    assert extractor.cache_hits == extractor.cache_misses == 0
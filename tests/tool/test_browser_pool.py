@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.tool.browser_pool import BrowserPool
+
+
+class FakePlaywrightBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def get_current_page(self):
+        return object()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.playwright_browser = None
+        self.closed = False
+
+    async def get_playwright_browser(self):
+        await asyncio.sleep(0.01)
+        self.playwright_browser = FakePlaywrightBrowser()
+        return self.playwright_browser
+
+    async def new_context(self, config=None):
+        return FakeContext(self)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest_asyncio.fixture
+async def pool():
+    pool = BrowserPool(
+        max_browsers=2,
+        max_contexts_per_browser=2,
+        idle_timeout=0,
+        health_check_interval=3600,
+        acquire_timeout=0.2,
+        browser_factory=FakeBrowser,
+    )
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_contexts_share_running_browsers(pool):
+    """Tests that leases are spread over browsers and reuse them after release."""
+    contexts = await asyncio.gather(*(pool.acquire() for _ in range(4)))
+    assert len({id(context.browser) for context in contexts}) == 2
+    assert len({id(context) for context in contexts}) == 4
+    assert pool.get_stats()["launches"] == 2
+
+    await pool.release(contexts[0])
+    assert contexts[0].closed
+
+    context = await pool.acquire()
+    assert context.browser is contexts[0].browser
+    stats = pool.get_stats()
+    assert stats["launches"] == 2
+    assert stats["leased_contexts"] == 4
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_free_slot(pool):
+    """Tests that a full pool blocks until a context is released or times out."""
+    contexts = [await pool.acquire() for _ in range(4)]
+
+    with pytest.raises(RuntimeError):
+        await pool.acquire()
+
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    await pool.release(contexts[1])
+    context = await waiter
+    assert context.browser is contexts[1].browser
+
+
+@pytest.mark.asyncio
+async def test_check_browsers_evicts_idle_and_disconnected(pool):
+    """Tests idle eviction and dropping of browsers that lost their connection."""
+    first, second, third = [await pool.acquire() for _ in range(3)]
+    idle_browser, busy_browser = first.browser, third.browser
+    assert second.browser is idle_browser and busy_browser is not idle_browser
+
+    # Leave one browser without leases and disconnect the other
+    await pool.release(first)
+    await pool.release(second)
+    busy_browser.playwright_browser.connected = False
+
+    await pool.check_browsers()
+
+    assert idle_browser.closed and busy_browser.closed
+    stats = pool.get_stats()
+    assert stats["browsers"] == 0
+    assert stats["evictions"] == 1
+    assert stats["health_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_close_shuts_down_contexts_and_browsers(pool):
+    """Tests that closing the pool closes every leased context and browser."""
+    contexts = [await pool.acquire() for _ in range(3)]
+    await pool.close()
+
+    assert all(context.closed for context in contexts)
+    assert all(context.browser.closed for context in contexts)
+    assert pool.get_stats()["browsers"] == 0
+
+
+def test_pool_works_across_event_loops():
+    """Tests that a pool used by one event loop can be used by the next one."""
+    pool = BrowserPool(
+        health_check_interval=3600, acquire_timeout=0.2, browser_factory=FakeBrowser
+    )
+
+    async def lease(close: bool = False):
+        context = await pool.acquire()
+        await pool.release(context)
+        if close:
+            await pool.close()
+        return context
+
+    first = asyncio.run(lease())
+    second = asyncio.run(lease(close=True))
+
+    assert second.browser is not first.browser
+    assert second.browser.closed
+    assert pool.get_stats()["launches"] == 2
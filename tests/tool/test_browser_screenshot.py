@@ -0,0 +1,103 @@
+import base64
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+
+from app.tool.browser_screenshot import ScreenshotPipeline, difference_hash
+
+
+def _page_image(width: int, height: int, label: str, shade: int = 0) -> bytes:
+    """Renders a fake page with a header bar, text and content blocks."""
+    image = Image.new("RGB", (width, height), (255 - shade, 255, 255))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, width, height // 10], fill=(30, 60, 120))
+    draw.text((20, height // 5), label, fill=(0, 0, 0))
+    for i in range(5):
+        top = height // 3 + i * height // 8
+        draw.rectangle(
+            [40, top, width // (i + 2), top + height // 20], fill=(90, 90, 90)
+        )
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+class FakePage:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.calls = []
+
+    async def screenshot(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.frames.pop(0)
+
+
+def test_difference_hash_stable_under_small_changes():
+    """Tests that re-encoding a frame barely changes its hash."""
+    original = Image.open(io.BytesIO(_page_image(800, 600, "hello")))
+    buffer = io.BytesIO()
+    original.save(buffer, format="JPEG", quality=40)
+    reencoded = Image.open(io.BytesIO(buffer.getvalue()))
+
+    assert bin(difference_hash(original) ^ difference_hash(reencoded)).count("1") <= 4
+
+
+def test_downscales_wide_frames():
+    """Tests that frames wider than max_width are downscaled."""
+    pipeline = ScreenshotPipeline(max_width=640, dedup=False)
+
+    encoded = pipeline.process(_page_image(1920, 1080, "wide"))
+
+    image = Image.open(io.BytesIO(base64.b64decode(encoded)))
+    assert image.size == (640, 360)
+    assert pipeline.stats()["bytes_saved"] > 0
+
+
+def test_unchanged_frame_is_skipped():
+    """Tests that a repeated frame is deduplicated and counted as saved."""
+    pipeline = ScreenshotPipeline()
+    frame = _page_image(1280, 800, "same")
+
+    assert pipeline.process(frame) is not None
+    assert pipeline.process(frame) is None
+
+    stats = pipeline.stats()
+    assert stats["frames_deduplicated"] == 1
+    assert stats["bytes_saved"] == len(frame)
+
+
+def test_changed_frame_is_sent():
+    """Tests that a different page layout is sent again."""
+    pipeline = ScreenshotPipeline()
+    pipeline.process(_page_image(1280, 800, "first"))
+
+    changed = Image.new("RGB", (1280, 800), (255, 255, 255))
+    ImageDraw.Draw(changed).rectangle([600, 0, 1280, 800], fill=(0, 0, 0))
+    buffer = io.BytesIO()
+    changed.save(buffer, format="JPEG")
+
+    assert pipeline.process(buffer.getvalue()) is not None
+
+
+def test_reset_forces_next_frame():
+    """Tests that reset makes the next identical frame be sent."""
+    pipeline = ScreenshotPipeline()
+    frame = _page_image(1280, 800, "same")
+    pipeline.process(frame)
+
+    pipeline.reset()
+
+    assert pipeline.process(frame) is not None
+
+
+@pytest.mark.asyncio
+async def test_capture_uses_viewport_settings():
+    """Tests that capture requests a viewport JPEG at the configured quality."""
+    page = FakePage([_page_image(1280, 800, "page")])
+    pipeline = ScreenshotPipeline(quality=60)
+
+    assert await pipeline.capture(page)
+    assert page.calls[0]["full_page"] is False
+    assert page.calls[0]["quality"] == 60
+    assert page.calls[0]["type"] == "jpeg"
@@ -0,0 +1,153 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+from app.agent.browser import BrowserContextHelper
+from app.schema import Memory
+from app.tool import ToolCollection
+from app.tool.base import BaseTool, ToolResult
+from app.tool.browser_state_diff import DIFF_HEADER, ElementTreeDiffer
+
+
+def _page(*elements):
+    """Build an element tree from (xpath, tag, text) tuples, highlighted in order"""
+    root = DOMElementNode(
+        is_visible=True,
+        parent=None,
+        tag_name="body",
+        xpath="/body",
+        attributes={},
+        children=[],
+    )
+    for index, (xpath, tag, text) in enumerate(elements):
+        element = DOMElementNode(
+            is_visible=True,
+            parent=root,
+            tag_name=tag,
+            xpath=xpath,
+            attributes={},
+            children=[],
+            highlight_index=index,
+        )
+        element.children.append(DOMTextNode(is_visible=True, parent=element, text=text))
+        root.children.append(element)
+    return root
+
+
+LINKS = [(f"/body/a[{i}]", "a", f"Result {i}") for i in range(50)]
+
+
+def test_first_state_and_navigation_send_full_listing():
+    """Tests that a new tab or a new URL gets the full element listing."""
+    differ = ElementTreeDiffer()
+    tree = _page(*LINKS)
+
+    text, full = differ.render(1, "https://a.test", tree)
+    assert full and text == tree.clickable_elements_to_string()
+
+    text, full = differ.render(1, "https://b.test", tree)
+    assert full and text == tree.clickable_elements_to_string()
+
+    text, full = differ.render(2, "https://b.test", tree)
+    assert full
+
+
+def test_unchanged_state_sends_no_elements():
+    """Tests that an identical state is reported as having no changes."""
+    differ = ElementTreeDiffer()
+    differ.render(1, "https://a.test", _page(*LINKS))
+
+    text, full = differ.render(1, "https://a.test", _page(*LINKS))
+    assert not full
+    assert text == f"{DIFF_HEADER}\n(no changes)"
+
+
+def test_diff_lists_added_changed_and_removed_elements():
+    """Tests that the diff keys elements by xpath and reports index shifts."""
+    differ = ElementTreeDiffer()
+    differ.render(1, "https://a.test", _page(*LINKS))
+
+    button = ("/body/button[1]", "button", "Close")
+    edited = [LINKS[0], (LINKS[1][0], "a", "Result 1 (visited)")] + LINKS[2:49]
+    text, full = differ.render(1, "https://a.test", _page(button, *edited))
+
+    assert not full
+    assert text.splitlines() == [
+        DIFF_HEADER,
+        "+ [0]<button >Close />",
+        "~ [2]<a >Result 1 (visited) />",
+        "~ [0] is now [1]",
+        "~ [2]..[48] are now [3]..[49]",
+        "- <a >Result 49 />",
+    ]
+
+
+def test_large_diff_and_refresh_interval_fall_back_to_full_listing():
+    """Tests the full listing when the diff is too large or too many states passed."""
+    differ = ElementTreeDiffer(full_refresh_interval=3)
+    differ.render(1, "https://a.test", _page(*LINKS))
+
+    renamed = [(xpath, tag, f"{text}!") for xpath, tag, text in LINKS]
+    _, full = differ.render(1, "https://a.test", _page(*renamed))
+    assert full
+
+    assert not differ.render(1, "https://a.test", _page(*renamed))[1]
+    assert not differ.render(1, "https://a.test", _page(*renamed))[1]
+    assert differ.render(1, "https://a.test", _page(*renamed))[1]
+
+    stats = differ.stats()
+    assert stats["states"] == 5
+    assert stats["full_states"] == 3
+    assert stats["chars_saved"] > 0
+
+    differ.reset()
+    assert differ.render(1, "https://a.test", _page(*renamed))[1]
+
+
+class FakeBrowserTool(BaseTool):
+    """Browser tool whose state is a scripted sequence of pages"""
+
+    name: str = "browser_use"
+    description: str = "Fake browser"
+    pages: list = []
+    element_differ: ElementTreeDiffer = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    async def execute(self, **kwargs) -> ToolResult:
+        return ToolResult(output="")
+
+    async def get_current_state(self) -> ToolResult:
+        elements, _ = self.element_differ.render(
+            1, "https://a.test", _page(*self.pages.pop(0))
+        )
+        state = {"url": "https://a.test", "interactive_elements": elements}
+        return ToolResult(output=json.dumps(state))
+
+
+@pytest.mark.asyncio
+async def test_next_step_prompt_includes_element_diffs():
+    """Tests that listings and diffs reach the prompt, and gaps reset the diff."""
+    tool = FakeBrowserTool(
+        pages=[LINKS, LINKS[:-1], LINKS, LINKS], element_differ=ElementTreeDiffer()
+    )
+    agent = SimpleNamespace(
+        available_tools=ToolCollection(tool), memory=Memory(), current_step=1
+    )
+    helper = BrowserContextHelper(agent)
+
+    prompt = await helper.format_next_step_prompt()
+    assert "[49]<a >Result 49 />" in prompt
+
+    agent.current_step = 2
+    prompt = await helper.format_next_step_prompt()
+    assert DIFF_HEADER in prompt and "- <a >Result 49 />" in prompt
+    assert "[0]<a >Result 0 />" not in prompt
+
+    # A step without browser state means the next one cannot build on it
+    agent.current_step = 4
+    prompt = await helper.format_next_step_prompt()
+    assert DIFF_HEADER not in prompt and "[0]<a >Result 0 />" in prompt
@@ -0,0 +1,49 @@
+import pytest
+
+from app.tool import python_execute
+from app.tool.chart_visualization.python_execute import NormalPythonExecute
+from app.tool.python_pool import PythonWorkerPool
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = PythonWorkerPool(size=0, session_memory_limit_mb=512)
+    monkeypatch.setattr(python_execute, "PYTHON_POOL", pool)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def tool(pool):
+    tool = NormalPythonExecute()
+    tool.use_session("test-data-analysis")
+    return tool
+
+
+@pytest.mark.asyncio
+async def test_reset_discards_session_state(tool):
+    """Tests that reset=True runs the code in a fresh session."""
+    await tool.execute("rows = list(range(5))")
+    assert (await tool.execute("print(len(rows))"))["observation"] == "5\n"
+
+    result = await tool.execute("print(len(rows))", reset=True)
+    assert result == {"observation": "name 'rows' is not defined", "success": False}
+
+    await tool.execute("rows = [1]")
+    assert (await tool.execute("print(len(rows))"))["observation"] == "1\n"
+
+
+@pytest.mark.asyncio
+async def test_out_of_memory_reports_lost_state(tool, pool):
+    """Tests that the model is told the session restarted after running out of memory."""
+    await tool.execute("rows = list(range(5))")
+
+    result = await tool.execute("data = bytearray(1024 ** 3)")
+    assert not result["success"]
+    assert result["observation"].startswith("MemoryError")
+    assert result["observation"].endswith(
+        "The session was restarted; its state was lost."
+    )
+
+    assert not (await tool.execute("print(rows)"))["success"]
+    assert pool.get_stats()["out_of_memory"] == 1
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from app.tool.planning import PlanningTool, PlanView
+
+
+STEPS = [f"step {i}" for i in range(50)]
+
+
+@pytest.fixture
+def tool():
+    tool = PlanningTool()
+    tool._create_plan("p", "Report", STEPS)
+    return tool
+
+
+def test_plan_text_is_unchanged():
+    """Tests that the view renders plans in the established format."""
+    tool = PlanningTool()
+    tool._create_plan("p", "Report", ["collect", "write"], [[], [0]])
+    tool._mark_step("p", 0, "completed", "found 3 sources")
+
+    assert tool.get_plan_text("p") == (
+        "Plan: Report (ID: p)\n"
+        "=====================\n\n"
+        "Progress: 1/2 steps completed (50.0%)\n"
+        "Status: 1 completed, 0 in progress, 0 blocked, 1 not started\n\n"
+        "Steps:\n"
+        "0. [✓] collect\n"
+        "   Notes: found 3 sources\n"
+        "1. [ ] write (after 0)\n"
+    )
+
+
+def test_marking_a_step_renders_only_that_step(tool, monkeypatch):
+    """Tests that mark_step re-renders one line and matches a fresh render."""
+    tool.get_plan_text("p")
+    formatted = []
+    original = PlanView._format_step
+
+    def format_step(self, index):
+        formatted.append(index)
+        return original(self, index)
+
+    monkeypatch.setattr(PlanView, "_format_step", format_step)
+    rng = random.Random(0)
+    for _ in range(200):
+        index = rng.randrange(len(STEPS))
+        status = rng.choice(["not_started", "in_progress", "completed", "blocked"])
+        tool._mark_step("p", index, status, rng.choice(["", f"note {index}"]))
+    monkeypatch.setattr(PlanView, "_format_step", original)
+
+    assert len(formatted) == 200
+    assert tool.get_plan_text("p") == PlanView(tool.plans["p"]).render()
+
+
+def test_changes_outside_the_tool_are_picked_up(tool):
+    """Tests that direct edits of the plan dict reach the rendered text."""
+    tool.get_plan_text("p")
+    tool.plans["p"]["step_statuses"][3] = "completed"
+    assert "3. [✓] step 3" in tool.get_plan_text("p")
+
+    tool.plans["p"]["steps"][4] = "CHANGED"
+    assert "4. [ ] CHANGED" in tool.get_plan_text("p")
+    tool.plans["p"]["step_dependencies"] = [[]] * 49 + [[4]]
+    assert "49. [ ] step 49 (after 4)" in tool.get_plan_text("p")
+    tool.plans["p"]["step_dependencies"][49].append(3)
+    assert "49. [ ] step 49 (after 4, 3)" in tool.get_plan_text("p")
+
+    tool._update_plan("p", "Final report", STEPS[:2])
+    text = tool.get_plan_text("p")
+    assert text.startswith("Plan: Final report") and "2. " not in text
+
+
+def test_window_shows_current_and_upcoming_steps(tool):
+    """Tests the compact rendering around the current step."""
+    tool._update_plan("p", None, None, [[]] * 10 + [[2, 5]] + [[]] * 39)
+    for i in range(10):
+        tool._mark_step("p", i, "completed", f"result {i}")
+    tool._mark_step("p", 10, "in_progress", None)
+
+    text = tool.get_plan_text("p", lookahead=3)
+    steps = text.split("Steps:\n")[1]
+
+    assert "Progress: 10/50 steps completed" in text
+    assert steps.splitlines() == [
+        "(8 other steps done, not shown)",
+        "2. [✓] step 2",
+        "   Notes: result 2",
+        "5. [✓] step 5",
+        "   Notes: result 5",
+        "10. [→] step 10 (after 2, 5)",
+        "11. [ ] step 11",
+        "12. [ ] step 12",
+        "13. [ ] step 13",
+        "(36 more steps not started, not shown)",
+    ]
+    assert len(text) < len(tool.get_plan_text("p")) / 3
+
+
+def test_window_centres_on_the_given_step(tool):
+    """Tests that steps running in parallel stay out of each other's window."""
+    for i in range(3):
+        tool._mark_step("p", i, "in_progress", None)
+
+    text = tool.get_plan_text("p", lookahead=1, step_index=1)
+    steps = text.split("Steps:\n")[1]
+
+    assert steps.splitlines() == [
+        "(2 other steps in progress, not shown)",
+        "1. [→] step 1",
+        "3. [ ] step 3",
+        "(46 more steps not started, not shown)",
+    ]
@@ -0,0 +1,197 @@
+import asyncio
+import json
+
+import pytest
+from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion_message_tool_call import Function
+
+from app.agent.toolcall import ToolCallAgent
+from app.llm import LLM
+from app.schema import AgentState
+from app.tool import Terminate, ToolCollection
+from app.tool.python_execute import PythonExecute
+from app.tool.python_pool import PythonWorkerPool
+
+
+@pytest.fixture
+def pool():
+    pool = PythonWorkerPool(size=1)
+    yield pool
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_execute_captures_output_and_errors():
+    """Tests printed output, errors and fresh globals per call."""
+    tool = PythonExecute()
+
+    assert await tool.execute("x = 2\nprint(x * 21)") == {
+        "observation": "42\n",
+        "success": True,
+    }
+    assert await tool.execute("print(x)") == {
+        "observation": "name 'x' is not defined",
+        "success": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_shared_calls_do_not_leak_state(pool):
+    """Tests that changes made by one call never reach the next one."""
+    await pool.run(
+        "import os, json\n"
+        "os.environ['SECRET'] = 'tenantA'\n"
+        "json.dumps = lambda *a, **k: 'hijacked'\n"
+        "os.chdir('/tmp')"
+    )
+    result = await pool.run(
+        "import os, json\n"
+        "print(os.environ.get('SECRET'), json.dumps(1), os.getcwd() == '/tmp')"
+    )
+
+    assert result["observation"] == "None 1 False\n"
+    # Both calls were served by the same worker
+    assert pool.get_stats()["spawned"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_crash_replace_the_worker(pool):
+    """Tests that hung or dead workers are killed and the pool keeps working."""
+    assert await pool.run("while True: pass", timeout=0.5) == {
+        "observation": "Execution timeout after 0.5 seconds",
+        "success": False,
+    }
+    result = await pool.run("import os; os._exit(3)")
+    assert result == {
+        "observation": "Execution process exited with code 3",
+        "success": False,
+    }
+
+    assert (await pool.run("print('ok')"))["observation"] == "ok\n"
+    stats = pool.get_stats()
+    assert stats["timeouts"] == 1 and stats["crashes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sessions_keep_state_until_reset(pool):
+    """Tests that session globals persist, are isolated and can be reset."""
+    await pool.run("import math\nx = 1", session_id="a")
+    await pool.run("x += 1", session_id="a")
+    assert (await pool.run("print(math.pi > 3, x)", session_id="a"))[
+        "observation"
+    ] == "True 2\n"
+    assert not (await pool.run("print(x)", session_id="b"))["success"]
+
+    pool.reset_session("a")
+    assert not (await pool.run("print(x)", session_id="a"))["success"]
+
+    result = await pool.run("y = 1\nwhile True: pass", timeout=0.5, session_id="b")
+    assert "state was lost" in result["observation"]
+    assert pool.get_stats()["sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_session_restarts_when_out_of_memory():
+    """Tests that a session exceeding its memory limit is restarted."""
+    pool = PythonWorkerPool(size=0, session_memory_limit_mb=512)
+    try:
+        await pool.run("data = [1, 2, 3]", session_id="a")
+        result = await pool.run("x = bytearray(1024 ** 3)", session_id="a")
+
+        assert not result["success"]
+        assert result["observation"].startswith("MemoryError")
+        assert "state was lost" in result["observation"]
+        assert not (await pool.run("print(data)", session_id="a"))["success"]
+        assert pool.get_stats()["out_of_memory"] == 1
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_limit_is_opt_in_for_shared_workers():
+    """Tests that only session workers are capped unless shared workers opt in."""
+    resource = pytest.importorskip("resource")
+    unlimited = f"{resource.getrlimit(resource.RLIMIT_AS)[0]}\n"
+    code = "import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])"
+    pool = PythonWorkerPool(size=0, session_memory_limit_mb=512)
+    capped = PythonWorkerPool(size=0, memory_limit_mb=256)
+    try:
+        assert (await pool.run(code))["observation"] == unlimited
+        assert (await pool.run(code, session_id="a"))["observation"] == (
+            f"{512 * 1024 * 1024}\n"
+        )
+        assert (await capped.run(code))["observation"] == f"{256 * 1024 * 1024}\n"
+    finally:
+        pool.close()
+        capped.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_session_reports_lost_state():
+    """Tests that a session closed for being idle says so on its next call."""
+    pool = PythonWorkerPool(size=0, session_idle_timeout=0.05)
+    try:
+        await pool.run("rows = [1]", session_id="a")
+        await asyncio.sleep(0.1)
+
+        result = await pool.run("print(rows)", session_id="a")
+        assert not result["success"]
+        assert result["observation"].startswith("The session was restarted")
+        # Only the first call after the restart carries the notice
+        assert (await pool.run("print(1)", session_id="a"))["observation"] == "1\n"
+
+        pool.reset_session("a")
+        assert (await pool.run("print(2)", session_id="a"))["observation"] == "2\n"
+    finally:
+        pool.close()
+
+
+class ScriptedLLM(LLM):
+    """LLM running the next snippet with python_execute, then terminating"""
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self, snippets):
+        self.snippets = list(snippets)
+        self.turn = 0
+
+    async def ask_tool(self, *args, **kwargs) -> ChatCompletionMessage:
+        self.turn += 1
+        if self.turn % 2:
+            name = "python_execute"
+            arguments = json.dumps({"code": self.snippets.pop(0)})
+        else:
+            name, arguments = "terminate", '{"status": "success"}'
+        return ChatCompletionMessage(
+            role="assistant",
+            content="",
+            tool_calls=[
+                ChatCompletionMessageToolCall(
+                    id=f"call{self.turn}",
+                    type="function",
+                    function=Function(name=name, arguments=arguments),
+                )
+            ],
+        )
+
+
+@pytest.mark.asyncio
+async def test_session_survives_agent_runs():
+    """Tests that session globals are kept from one agent run to the next."""
+    tool = PythonExecute(session_id="test-agent-runs")
+    agent = ToolCallAgent(
+        llm=ScriptedLLM(["rows = list(range(5))", "print(len(rows))"]),
+        available_tools=ToolCollection(tool, Terminate()),
+        max_steps=5,
+    )
+    try:
+        await agent.run("load the rows")
+        agent.state = AgentState.IDLE
+        agent.current_step = 0
+        await agent.run("count the rows")
+
+        observations = [m.content for m in agent.memory.messages if m.role == "tool"]
+        assert "'observation': '5\\n'" in observations[-2]
+    finally:
+        tool.close_session()
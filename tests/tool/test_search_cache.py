@@ -0,0 +1,87 @@
+import time
+
+from app.tool.search.base import SearchItem
+from app.tool.search.cache import SearchCache, normalize_query
+
+
+def _results(query, count=2):
+    return [
+        SearchItem(title=f"{query} {i}", url=f"https://r.test/{i}")
+        for i in range(count)
+    ]
+
+
+class CountingSearch:
+    """Search callback counting how often it runs"""
+
+    def __init__(self, query="q", delay=0.0, count=2):
+        self.calls = 0
+        self.query, self.delay, self.count = query, delay, count
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return _results(self.query, self.count)
+
+
+def test_normalize_query():
+    """Tests that case, spacing, punctuation and word order are ignored."""
+    assert normalize_query("  Python  Asyncio tutorial?") == "asyncio python tutorial"
+    assert normalize_query("tutorial python ASYNCIO") == "asyncio python tutorial"
+    # Exact phrases keep their word order
+    assert normalize_query('"New  York" to Paris') == '"new york" to paris'
+
+
+def test_hits_on_equivalent_queries_and_records_saved_latency():
+    """Tests cache hits for equivalent queries and misses for other parameters."""
+    cache = SearchCache()
+    search = CountingSearch(delay=0.02)
+
+    first = cache.search("google", "Python asyncio", 2, "en", "us", search)
+    again = cache.search("google", "asyncio  python", 2, "en", "us", search)
+    assert again == first and search.calls == 1
+
+    cache.search("bing", "python asyncio", 2, "en", "us", search)
+    cache.search("google", "python asyncio", 2, "zh", "cn", search)
+    cache.search("google", "python asyncio", 5, "en", "us", search)
+    assert search.calls == 4
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 4
+    assert stats["hit_rate"] == 0.2
+    assert stats["saved_seconds"] >= 0.02
+
+
+def test_expiry_eviction_and_empty_results():
+    """Tests that entries expire, the LRU is bounded and failures are not cached."""
+    cache = SearchCache(ttl=60, max_entries=2)
+    search = CountingSearch()
+    for query in ("a", "b", "a", "c"):
+        cache.search("google", query, 2, None, None, search)
+    # "b" was least recently used when "c" was added
+    assert list(key[1] for key in cache._memory) == ["a", "c"]
+
+    cache._memory[("google", "a", None, None, 2)]["created"] -= 61
+    cache.search("google", "a", 2, None, None, search)
+    assert search.calls == 4
+
+    empty = CountingSearch(count=0)
+    cache.search("google", "nothing", 2, None, None, empty)
+    cache.search("google", "nothing", 2, None, None, empty)
+    assert empty.calls == 2
+
+
+def test_disk_tier_is_shared_between_caches(tmp_path):
+    """Tests that results written to disk are served to a fresh cache."""
+    search = CountingSearch()
+    SearchCache(cache_dir=str(tmp_path)).search(
+        "duckduckgo", "q", 2, None, None, search
+    )
+
+    cache = SearchCache(cache_dir=str(tmp_path))
+    results = cache.search("duckduckgo", "Q", 2, None, None, search)
+    assert results == _results("q") and search.calls == 1
+    assert cache.stats()["disk_hits"] == 1
+
+    cache.clear()
+    assert not list(tmp_path.glob("*.json"))
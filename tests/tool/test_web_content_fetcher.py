@@ -0,0 +1,132 @@
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.tool.web_search import WebContentFetcher, WebSearch
+
+
+PAGE = "<html><body><nav>Menu</nav><h1>Title</h1><p>Body text</p></body></html>"
+
+
+@pytest_asyncio.fixture
+async def serve(monkeypatch):
+    """Route the shared client to a handler instead of the network"""
+
+    def install(handler):
+        monkeypatch.setattr(
+            WebContentFetcher,
+            "_create_client",
+            classmethod(
+                lambda cls: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            ),
+        )
+
+    await WebContentFetcher.aclose()
+    yield install
+    await WebContentFetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetches_text_with_shared_client(serve):
+    """Tests text extraction and reuse of one client across requests."""
+    serve(
+        lambda request: httpx.Response(
+            200, headers={"content-type": "text/html"}, text=PAGE
+        )
+    )
+
+    first = await WebContentFetcher.fetch_content("https://a.test/1")
+    client = WebContentFetcher._client
+    second = await WebContentFetcher.fetch_content("https://a.test/2")
+
+    assert first == second == "Title Body text"
+    assert WebContentFetcher._client is client
+
+
+@pytest.mark.asyncio
+async def test_non_html_and_errors_return_none(serve):
+    """Tests that binary content types and HTTP errors are skipped."""
+    chunks_sent = 0
+
+    async def pdf():
+        nonlocal chunks_sent
+        for _ in range(100):
+            chunks_sent += 1
+            yield b"%PDF" * 1024
+
+    def handler(request):
+        if request.url.path == "/missing":
+            return httpx.Response(404, text="not found")
+        return httpx.Response(
+            200, headers={"content-type": "application/pdf"}, content=pdf()
+        )
+
+    serve(handler)
+
+    assert await WebContentFetcher.fetch_content("https://a.test/doc.pdf") is None
+    assert chunks_sent <= 1
+    assert await WebContentFetcher.fetch_content("https://a.test/missing") is None
+
+
+@pytest.mark.asyncio
+async def test_body_is_capped(serve, monkeypatch):
+    """Tests that reading stops once the byte cap is reached."""
+    monkeypatch.setattr(WebContentFetcher, "MAX_CONTENT_BYTES", 4096)
+    chunks_sent = 0
+
+    async def endless():
+        nonlocal chunks_sent
+        yield b"<html><body><p>"
+        while True:
+            chunks_sent += 1
+            yield b"word " * 200
+
+    serve(
+        lambda request: httpx.Response(
+            200, headers={"content-type": "text/html"}, content=endless()
+        )
+    )
+
+    text = await WebContentFetcher.fetch_content("https://a.test/big")
+    assert text.startswith("word word")
+    assert len(text) <= 4096
+    assert chunks_sent < 10
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_limited_per_host(serve, monkeypatch):
+    """Tests that requests to one host never exceed the per-host limit."""
+    monkeypatch.setattr(WebContentFetcher, "MAX_CONNECTIONS_PER_HOST", 2)
+    active = {"a.test": 0, "b.test": 0}
+    peak = {"a.test": 0, "b.test": 0}
+
+    async def handler(request):
+        host = request.url.host
+        active[host] += 1
+        peak[host] = max(peak[host], active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return httpx.Response(200, headers={"content-type": "text/html"}, text=PAGE)
+
+    serve(handler)
+
+    urls = [f"https://{host}/{i}" for host in active for i in range(6)]
+    results = await asyncio.gather(*(WebContentFetcher.fetch_content(u) for u in urls))
+
+    assert all(results)
+    assert peak == {"a.test": 2, "b.test": 2}
+
+
+@pytest.mark.asyncio
+async def test_tool_cleanup_closes_the_client(serve):
+    """Tests that cleaning up the search tool closes the pooled connections."""
+    serve(lambda request: httpx.Response(200, text=PAGE))
+    await WebContentFetcher.fetch_content("https://a.test/")
+    client = WebContentFetcher._client
+
+    await WebSearch().cleanup()
+
+    assert client.is_closed
+    assert WebContentFetcher._client is None
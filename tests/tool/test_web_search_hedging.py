@@ -0,0 +1,119 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import SearchSettings
+from app.tool.search import WebSearchEngine
+from app.tool.search.base import SearchItem
+from app.tool.search.cache import SearchCache
+from app.tool.web_search import EngineStats, WebSearch
+
+
+class StubEngine(WebSearchEngine):
+    """Search engine answering after a fixed delay"""
+
+    delay: float = 0.0
+    results: int = 3
+    calls: int = 0
+
+    def perform_search(self, query, num_results=10, *args, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        return [
+            SearchItem(title=f"{query} {i}", url=f"https://r.test/{i}")
+            for i in range(self.results)
+        ]
+
+
+@pytest.fixture
+def search(monkeypatch):
+    """WebSearch over a slow primary, a broken fallback and a fast fallback"""
+
+    def build(**settings):
+        monkeypatch.setattr(
+            "app.tool.web_search.config",
+            SimpleNamespace(
+                search_config=SearchSettings(
+                    engine="slow", fallback_engines=["broken", "fast"], **settings
+                )
+            ),
+        )
+        tool = WebSearch()
+        tool._search_engine = {
+            "slow": StubEngine(delay=0.5),
+            "broken": StubEngine(results=0),
+            "fast": StubEngine(delay=0.01),
+        }
+        return tool
+
+    monkeypatch.setattr(WebSearch, "_engine_stats", {})
+    monkeypatch.setattr("app.tool.web_search.SEARCH_CACHE", SearchCache(ttl=0))
+    return build
+
+
+async def _search(tool: WebSearch, hedge_delay):
+    started = time.perf_counter()
+    results = await tool._try_all_engines("query", 3, {}, hedge_delay)
+    return results, time.perf_counter() - started
+
+
+@pytest.mark.asyncio
+async def test_sequential_mode_waits_for_each_engine(search):
+    """Tests that without hedging the slow primary answers before fallbacks run."""
+    tool = search()
+    results, elapsed = await _search(tool, None)
+
+    assert results[0].source == "slow"
+    assert elapsed >= 0.5
+    assert tool._search_engine["fast"].calls == 0
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_falls_back_while_primary_is_slow(search):
+    """Tests that hedged fallbacks start after the delay and the first good result wins."""
+    tool = search()
+    results, elapsed = await _search(tool, 0.05)
+
+    assert results[0].source == "fast"
+    assert elapsed < 0.4
+    stats = WebSearch.get_engine_stats()
+    assert stats["broken"]["failures"] == 1
+    assert stats["fast"]["searches"] == 1 and stats["fast"]["failures"] == 0
+    # The slow primary was cancelled before it could report
+    assert "slow" not in stats or stats["slow"]["searches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_race_starts_all_engines(search):
+    """Tests that a hedge delay of 0 starts every engine at once."""
+    tool = search()
+    results, elapsed = await _search(tool, 0)
+
+    assert results[0].source == "fast"
+    assert elapsed < 0.4
+    assert all(engine.calls == 1 for engine in tool._search_engine.values())
+
+
+def test_adaptive_order_prefers_fast_reliable_engines(search):
+    """Tests that observed latency and failures reorder the engines."""
+    tool = search(adaptive_order=True)
+    assert tool._get_engine_order() == ["slow", "broken", "fast"]
+
+    for name, latency, success in (
+        ("slow", 0.5, True),
+        ("fast", 0.01, True),
+        ("broken", 0.01, False),
+    ):
+        WebSearch._engine_stats.setdefault(name, EngineStats()).record(latency, success)
+
+    assert tool._get_engine_order() == ["fast", "slow", "broken"]
+
+
+def test_failing_engine_ranks_below_untried_ones(search):
+    """Tests that an engine that keeps failing is tried after engines without history."""
+    tool = search(adaptive_order=True)
+    for _ in range(3):
+        WebSearch._engine_stats.setdefault("slow", EngineStats()).record(0.01, False)
+
+    assert tool._get_engine_order() == ["broken", "fast", "slow"]